@@ -6,6 +6,11 @@ Unified entry point for LLM agentic workflows.
 
 from typing import Dict, Any
 
+# Installed before the endpoint imports so their import times are captured
+# when ACOUSTIC_STARTUP_PROFILE is set (no-op otherwise)
+from src.utils.startup_profiler import get_startup_profiler
+get_startup_profiler().install_import_hook()
+
 from src.api.endpoints.rt60_api import RT60CalculationService
 from src.api.endpoints.hvac_api import HVACNoiseService
 from src.api.endpoints.materials_api import MaterialsService
@@ -58,10 +63,13 @@ class AcousticAnalysisAPI:
 
     def __init__(self):
         """Initialize all service instances."""
-        self.rt60 = RT60CalculationService()
-        self.hvac = HVACNoiseService()
-        self.materials = MaterialsService()
-        self.simulation = SimulationService()
+        profiler = get_startup_profiler()
+        with profiler.phase("API services construction", category="api"):
+            self.rt60 = RT60CalculationService()
+            self.hvac = HVACNoiseService()
+            self.materials = MaterialsService()
+            self.simulation = SimulationService()
+        profiler.finish(entry_point='api')
 
     def get_api_schema(self) -> Dict[str, Any]:
         """
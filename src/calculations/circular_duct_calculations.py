@@ -12,17 +12,15 @@ Author: HVAC Acoustics Calculator
 Date: 2024
 """
 
-import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from typing import Tuple, Dict, List, Optional, Union, Any
+from typing import Tuple, Dict, List, Optional, Union, Any, TYPE_CHECKING
 import warnings
 from .acoustic_utilities import AcousticConstants
+from .plotting_support import get_pandas, get_pyplot
+
+if TYPE_CHECKING:
+    import pandas as pd
 
-# Set up plotting style
-plt.style.use('seaborn-v0_8')
-sns.set_palette("husl")
 
 class CircularDuctCalculator:
     """
@@ -214,7 +212,7 @@ class CircularDuctCalculator:
         return spectrum
         
     def create_comparison_dataframe(self, diameters: List[float], lining_thicknesses: List[float], 
-                                  length: float = 1.0) -> pd.DataFrame:
+                                  length: float = 1.0) -> 'pd.DataFrame':
         """
         Create a comparison DataFrame for multiple duct configurations.
         
@@ -226,6 +224,7 @@ class CircularDuctCalculator:
         Returns:
             DataFrame with comparison data
         """
+        pd = get_pandas()
         data = []
         
         for diameter in diameters:
@@ -265,6 +264,7 @@ class CircularDuctCalculator:
             length: Duct length in feet
             save_path: Optional path to save the plot
         """
+        plt = get_pyplot()
         # Get spectra
         unlined_spectrum = self.get_unlined_attenuation_spectrum(diameter, length)
         lined_spectrum = self.get_lined_insertion_loss_spectrum(diameter, lining_thickness, length)
@@ -312,6 +312,7 @@ class CircularDuctCalculator:
             length: Duct length in feet
             save_path: Optional path to save the plot
         """
+        plt = get_pyplot()
         fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
         
         frequencies = self.frequency_bands[:-1]  # Exclude 8000 Hz for unlined
@@ -15,17 +15,15 @@ Author: HVAC Acoustics Calculator
 Date: 2024
 """
 
-import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from typing import Tuple, Dict, List, Optional, Union, Any
+from typing import Tuple, Dict, List, Optional, Union, Any, TYPE_CHECKING
 import warnings
 from .acoustic_utilities import AcousticConstants
+from .plotting_support import get_pandas, get_pyplot
+
+if TYPE_CHECKING:
+    import pandas as pd
 
-# Set up plotting style
-plt.style.use('seaborn-v0_8')
-sns.set_palette("husl")
 
 class ElbowTurningVaneCalculator:
     """
@@ -240,7 +238,7 @@ class ElbowTurningVaneCalculator:
     def create_spectrum_dataframe(self, flow_rate: float, duct_area: float, 
                                 duct_height: float, vane_chord_length: float,
                                 num_vanes: int, total_pressure_drop: float,
-                                flow_velocity: float) -> pd.DataFrame:
+                                flow_velocity: float) -> 'pd.DataFrame':
         """
         Create a pandas DataFrame with the complete spectrum data.
         
@@ -250,6 +248,7 @@ class ElbowTurningVaneCalculator:
         Returns:
             DataFrame with frequency bands and sound power levels
         """
+        pd = get_pandas()
         spectrum = self.calculate_complete_spectrum(flow_rate, duct_area, duct_height,
                                                   vane_chord_length, num_vanes,
                                                   total_pressure_drop, flow_velocity)
@@ -275,6 +274,7 @@ class ElbowTurningVaneCalculator:
             Same parameters as calculate_complete_spectrum
             save_path: Optional path to save the plot
         """
+        plt = get_pyplot()
         df = self.create_spectrum_dataframe(flow_rate, duct_area, duct_height,
                                           vane_chord_length, num_vanes,
                                           total_pressure_drop, flow_velocity)
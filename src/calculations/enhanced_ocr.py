@@ -3,12 +3,15 @@ Enhanced OCR Engine
 ------------------
 Multi-tier OCR system with PaddleOCR/EasyOCR and Tesseract fallback.
 Provides better accuracy than Tesseract alone with confidence scoring.
+The backends are loaded once per process through the engine registry
+(see ocr_engines), so EnhancedOCR instances are cheap to create.
 """
 
 from __future__ import annotations
 
 import os
 import logging
+import threading
 from typing import List, Tuple, Optional, Dict, Any
 from dataclasses import dataclass
 from enum import Enum
@@ -17,6 +20,9 @@ import numpy as np
 import cv2
 from PIL import Image
 
+from .ocr_cache import get_ocr_cache, image_key
+from .ocr_engines import engine_registry
+
 logger = logging.getLogger(__name__)
 
 
@@ -66,6 +72,45 @@ class TableOCRResult:
         return total / count if count > 0 else 0.0
 
 
+def _load_tesseract() -> str:
+    import pytesseract
+    return str(pytesseract.get_tesseract_version())
+
+
+def _load_paddle():
+    try:
+        from paddleocr import PaddleOCR
+    except ImportError as e:
+        raise ImportError("PaddleOCR not installed. Install with: pip install paddleocr") from e
+    
+    # Initialize with English language, no logging
+    paddle_ocr = PaddleOCR(
+        use_angle_cls=True,  # Enable angle classification
+        lang='en',
+        use_gpu=False,  # Use CPU by default (GPU auto-detected if available)
+        show_log=False
+    )
+    logger.info("PaddleOCR initialized successfully")
+    return paddle_ocr
+
+
+def _load_easy():
+    try:
+        import easyocr
+    except ImportError as e:
+        raise ImportError("EasyOCR not installed. Install with: pip install easyocr") from e
+    
+    # Initialize with English language
+    easy_ocr = easyocr.Reader(['en'], gpu=False)
+    logger.info("EasyOCR initialized successfully")
+    return easy_ocr
+
+
+engine_registry.register("tesseract", _load_tesseract)
+engine_registry.register("paddle", _load_paddle)
+engine_registry.register("easy", _load_easy)
+
+
 class EnhancedOCR:
     """
     Enhanced OCR engine with multiple backends and fallback chain
@@ -75,6 +120,9 @@ class EnhancedOCR:
         self.preferred_engine = preferred_engine
         self.paddle_ocr = None
         self.easy_ocr = None
+        # Replaced by the registry's shared locks once a backend is loaded
+        self._paddle_lock = threading.RLock()
+        self._easy_lock = threading.RLock()
         self.tesseract_available = self._check_tesseract()
         
         # Try to initialize preferred engine
@@ -84,65 +132,40 @@ class EnhancedOCR:
             self._init_easy()
     
     def _check_tesseract(self) -> bool:
-        """Check if Tesseract is available"""
-        try:
-            import pytesseract
-            pytesseract.get_tesseract_version()
-            return True
-        except Exception as e:
-            logger.warning(f"Tesseract not available: {e}")
-            return False
+        """Check if Tesseract is available (checked once per process)"""
+        return engine_registry.get("tesseract") is not None
     
     def _init_paddle(self) -> bool:
-        """Initialize PaddleOCR"""
+        """Attach the shared PaddleOCR instance, loading it on first use"""
         if self.paddle_ocr is not None:
             return True
         
-        try:
-            from paddleocr import PaddleOCR
-            
-            # Initialize with English language, no logging
-            self.paddle_ocr = PaddleOCR(
-                use_angle_cls=True,  # Enable angle classification
-                lang='en',
-                use_gpu=False,  # Use CPU by default (GPU auto-detected if available)
-                show_log=False
-            )
-            logger.info("PaddleOCR initialized successfully")
-            return True
-        except ImportError:
-            logger.warning("PaddleOCR not installed. Install with: pip install paddleocr")
-            return False
-        except Exception as e:
-            logger.error(f"Failed to initialize PaddleOCR: {e}")
+        loaded = engine_registry.get("paddle")
+        if loaded is None:
             return False
+        self.paddle_ocr, self._paddle_lock = loaded.engine, loaded.lock
+        return True
     
     def _init_easy(self) -> bool:
-        """Initialize EasyOCR"""
+        """Attach the shared EasyOCR reader, loading it on first use"""
         if self.easy_ocr is not None:
             return True
         
-        try:
-            import easyocr
-            
-            # Initialize with English language
-            self.easy_ocr = easyocr.Reader(['en'], gpu=False)
-            logger.info("EasyOCR initialized successfully")
-            return True
-        except ImportError:
-            logger.warning("EasyOCR not installed. Install with: pip install easyocr")
-            return False
-        except Exception as e:
-            logger.error(f"Failed to initialize EasyOCR: {e}")
+        loaded = engine_registry.get("easy")
+        if loaded is None:
             return False
+        self.easy_ocr, self._easy_lock = loaded.engine, loaded.lock
+        return True
     
-    def extract_text(self, image: np.ndarray, bbox: Optional[Tuple[int, int, int, int]] = None) -> OCRResult:
+    def extract_text(self, image: np.ndarray, bbox: Optional[Tuple[int, int, int, int]] = None,
+                     use_cache: bool = True) -> OCRResult:
         """
         Extract text from image or image region with confidence scoring
         
         Args:
             image: Image as numpy array (BGR format)
             bbox: Optional bounding box (x, y, w, h) to crop before OCR
+            use_cache: Serve a region OCR'd before with the same engines from the OCR cache
         
         Returns:
             OCRResult with text, confidence, and engine used
@@ -163,15 +186,33 @@ class EnhancedOCR:
         if self.tesseract_available:
             engines_to_try.append(OCREngine.TESSERACT)
         
+        # The key covers the engine chain and which backends loaded, so installing
+        # a better engine later is not masked by results cached from a fallback
+        cache = get_ocr_cache() if use_cache else None
+        cache_key = None
+        if cache is not None:
+            cache_key = image_key(image, op="text", engines=[e.value for e in engines_to_try],
+                                  paddle=self.paddle_ocr is not None, easy=self.easy_ocr is not None)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return OCRResult(text=cached["text"], confidence=cached["confidence"],
+                                 engine_used=OCREngine(cached["engine"]))
+        
         last_error = None
         for engine in engines_to_try:
             try:
                 if engine == OCREngine.PADDLE:
-                    return self._extract_paddle(image)
+                    result = self._extract_paddle(image)
                 elif engine == OCREngine.EASY:
-                    return self._extract_easy(image)
+                    result = self._extract_easy(image)
                 elif engine == OCREngine.TESSERACT:
-                    return self._extract_tesseract(image)
+                    result = self._extract_tesseract(image)
+                else:
+                    continue
+                if cache is not None:
+                    cache.put(cache_key, {"text": result.text, "confidence": result.confidence,
+                                          "engine": result.engine_used.value})
+                return result
             except Exception as e:
                 last_error = e
                 logger.warning(f"{engine.value} OCR failed: {e}")
@@ -192,7 +233,8 @@ class EnhancedOCR:
         else:
             image_rgb = image
         
-        results = self.paddle_ocr.ocr(image_rgb, cls=True)
+        with self._paddle_lock:
+            results = self.paddle_ocr.ocr(image_rgb, cls=True)
         
         if not results or not results[0]:
             return OCRResult(text="", confidence=0.0, engine_used=OCREngine.PADDLE)
@@ -227,7 +269,8 @@ class EnhancedOCR:
         else:
             image_rgb = image
         
-        results = self.easy_ocr.readtext(image_rgb)
+        with self._easy_lock:
+            results = self.easy_ocr.readtext(image_rgb)
         
         if not results:
             return OCRResult(text="", confidence=0.0, engine_used=OCREngine.EASY)
@@ -368,18 +411,18 @@ class EnhancedOCR:
         return engines
 
 
-# Global instance for convenience
-_global_ocr_instance: Optional[EnhancedOCR] = None
+# Shared instances for convenience, one per preferred engine (the backends behind them are shared too)
+_ocr_instances: Dict[OCREngine, EnhancedOCR] = {}
+_ocr_instances_lock = threading.Lock()
 
 
 def get_ocr_engine(preferred: OCREngine = OCREngine.PADDLE) -> EnhancedOCR:
-    """Get or create global OCR engine instance"""
-    global _global_ocr_instance
-    
-    if _global_ocr_instance is None:
-        _global_ocr_instance = EnhancedOCR(preferred_engine=preferred)
-    
-    return _global_ocr_instance
+    """Get or create the shared OCR engine instance for a preferred backend"""
+    with _ocr_instances_lock:
+        ocr = _ocr_instances.get(preferred)
+        if ocr is None:
+            ocr = _ocr_instances[preferred] = EnhancedOCR(preferred_engine=preferred)
+        return ocr
 
 
 def extract_text_with_confidence(image: np.ndarray, engine: OCREngine = OCREngine.PADDLE) -> OCRResult:
@@ -11,17 +11,15 @@ Author: HVAC Acoustics Calculator
 Date: 2024
 """
 
-import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from typing import Tuple, Dict, List, Optional, Union
+from typing import Tuple, Dict, List, Optional, Union, TYPE_CHECKING
 import warnings
 from scipy.interpolate import RegularGridInterpolator
+from .plotting_support import get_pandas, get_pyplot, get_seaborn
+
+if TYPE_CHECKING:
+    import pandas as pd
 
-# Set up plotting style
-plt.style.use('seaborn-v0_8')
-sns.set_palette("husl")
 
 class FlexDuctCalculator:
     """
@@ -260,7 +258,7 @@ class FlexDuctCalculator:
         return validation
     
     def create_insertion_loss_dataframe(self, diameters: List[float], 
-                                      lengths: List[float]) -> pd.DataFrame:
+                                      lengths: List[float]) -> 'pd.DataFrame':
         """
         Create a comprehensive DataFrame of insertion loss values.
         
@@ -271,6 +269,7 @@ class FlexDuctCalculator:
         Returns:
             DataFrame with insertion loss values for all combinations
         """
+        pd = get_pandas()
         data = []
         
         for diameter in diameters:
@@ -292,6 +291,8 @@ class FlexDuctCalculator:
             length: Duct length in feet
             save_path: Optional path to save the plot
         """
+        plt = get_pyplot()
+        sns = get_seaborn()
         insertion_loss = self.get_insertion_loss(diameter, length)
         
         plt.figure(figsize=(12, 8))
@@ -378,6 +379,7 @@ class FlexDuctCalculator:
             frequency: Frequency in Hz for the heatmap
             save_path: Optional path to save the plot
         """
+        plt = get_pyplot()
         diameters = np.arange(4, 17, 0.5)  # 4 to 16 inches in 0.5" steps
         lengths = np.arange(3, 13, 0.5)    # 3 to 12 feet in 0.5' steps
         
@@ -36,8 +36,9 @@ import argparse
 import os
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 
 import cv2
 import numpy as np
@@ -45,9 +46,22 @@ import pandas as pd
 import pytesseract
 from PIL import Image
 
+try:
+    from .ocr_cache import get_ocr_cache, image_key
+except ImportError:
+    # Loaded as a script or by file path (see pdf_table_to_mechanical_units)
+    from ocr_cache import get_ocr_cache, image_key
+
 
 logger = logging.getLogger(__name__)
 
+# Cells are OCR'd in batches: stacked into tall montages separated by white
+# gaps, one Tesseract call per montage, words mapped back to cells by offset.
+MONTAGE_MAX_HEIGHT = 8000  # px; keeps each montage well inside Tesseract's image limits
+MONTAGE_GAP = 40  # px of white between cells so text lines never merge across cells
+# Montages are independent Tesseract processes, so a few run concurrently
+OCR_BATCH_WORKERS = max(1, min(4, os.cpu_count() or 1))
+
 
 @dataclass
 class CellBox:
@@ -98,11 +112,18 @@ def read_image_bgr(image_path: str) -> np.ndarray:
     return image_bgr
 
 
+def to_gray(image: np.ndarray) -> np.ndarray:
+    """Return a grayscale view of a BGR or already-grayscale image."""
+    if image.ndim == 2:
+        return image
+    return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+
 def preprocess_for_grid(image_bgr: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
     """Return grayscale, binary, and inverted binary images suitable for grid detection."""
     logger.debug("Preprocessing image for grid detection (grayscale + adaptive threshold)")
     t0 = time.perf_counter()
-    gray = cv2.cvtColor(image_bgr, cv2.COLOR_BGR2GRAY)
+    gray = to_gray(image_bgr)
     # Use adaptive threshold to be robust to lighting; invert so lines are white
     bin_img = cv2.adaptiveThreshold(
         gray, 255, cv2.ADAPTIVE_THRESH_MEAN_C, cv2.THRESH_BINARY, 15, 10
@@ -171,7 +192,7 @@ def _estimate_skew_angle(gray: np.ndarray) -> float:
 def preprocess_for_grid_enhanced(image_bgr: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, float]:
     logger.debug("Enhanced preprocessing: deskew + CLAHE + denoise + adaptive threshold")
     t0 = time.perf_counter()
-    gray0 = cv2.cvtColor(image_bgr, cv2.COLOR_BGR2GRAY)
+    gray0 = to_gray(image_bgr)
     # CLAHE and denoise before skew estimation to stabilize edges
     gray1 = _apply_clahe(gray0)
     gray1 = _denoise_gray(gray1)
@@ -179,7 +200,7 @@ def preprocess_for_grid_enhanced(image_bgr: np.ndarray) -> Tuple[np.ndarray, np.
     angle = _estimate_skew_angle(gray1)
     rotated = _rotate_image(image_bgr, -angle)
     # Recompute grayscale after rotation
-    gray = cv2.cvtColor(rotated, cv2.COLOR_BGR2GRAY)
+    gray = to_gray(rotated)
     gray = _apply_clahe(gray)
     gray = _denoise_gray(gray)
     bin_img = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_MEAN_C, cv2.THRESH_BINARY, 15, 10)
@@ -292,20 +313,28 @@ def crop_cell(image_bgr: np.ndarray, box: CellBox, pad: int = 2) -> np.ndarray:
     return crop
 
 
-def ocr_image_to_text(image_bgr: np.ndarray, psm: int = 6, dpi: int = 300, whitelist: Optional[str] = None) -> str:
-    logger.debug(f"Running OCR on cell image (psm={psm}, dpi={dpi})")
-    t0 = time.perf_counter()
-    gray = cv2.cvtColor(image_bgr, cv2.COLOR_BGR2GRAY)
-    # Binarize and upscale to help OCR
+def _binarize_for_ocr(image_bgr: np.ndarray) -> np.ndarray:
+    """Binarize and upscale to help OCR."""
+    gray = to_gray(image_bgr)
     scale = 2
     resized = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC)
     _, th = cv2.threshold(resized, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-    pil_img = Image.fromarray(th)
+    return th
+
+
+def _tesseract_config(psm: int, dpi: int, whitelist: Optional[str]) -> str:
+    config = f"--psm {psm} -c user_defined_dpi={dpi}"
+    if whitelist:
+        config += f" -c tessedit_char_whitelist={whitelist}"
+    return config
+
+
+def ocr_image_to_text(image_bgr: np.ndarray, psm: int = 6, dpi: int = 300, whitelist: Optional[str] = None) -> str:
+    logger.debug(f"Running OCR on cell image (psm={psm}, dpi={dpi})")
+    t0 = time.perf_counter()
+    pil_img = Image.fromarray(_binarize_for_ocr(image_bgr))
     try:
-        config = f"--psm {psm} -c user_defined_dpi={dpi}"
-        if whitelist:
-            config += f" -c tessedit_char_whitelist={whitelist}"
-        text = pytesseract.image_to_string(pil_img, config=config)
+        text = pytesseract.image_to_string(pil_img, config=_tesseract_config(psm, dpi, whitelist))
     except Exception as exc:
         logger.exception(f"OCR failed: {exc}")
         text = ""
@@ -317,13 +346,144 @@ def ocr_image_to_text(image_bgr: np.ndarray, psm: int = 6, dpi: int = 300, white
     return text
 
 
-def extract_table(image_bgr: np.ndarray, enhanced: bool = False) -> List[List[str]]:
+def _build_montages(cells: List[np.ndarray]) -> List[Tuple[np.ndarray, List[Tuple[int, int, int]]]]:
+    """Stack binarized cells into white-separated montages no taller than MONTAGE_MAX_HEIGHT.
+
+    Returns (montage, spans) pairs where each span is (cell_index, top, bottom)
+    in montage pixel rows. Empty cells are left out.
+    """
+    batches: List[List[Tuple[int, np.ndarray]]] = []
+    batch: List[Tuple[int, np.ndarray]] = []
+    height = MONTAGE_GAP
+    for idx, cell in enumerate(cells):
+        if cell.size == 0:
+            continue
+        th = _binarize_for_ocr(cell)
+        if batch and height + th.shape[0] + MONTAGE_GAP > MONTAGE_MAX_HEIGHT:
+            batches.append(batch)
+            batch, height = [], MONTAGE_GAP
+        batch.append((idx, th))
+        height += th.shape[0] + MONTAGE_GAP
+    if batch:
+        batches.append(batch)
+
+    montages = []
+    for batch in batches:
+        width = max(th.shape[1] for _, th in batch) + 2 * MONTAGE_GAP
+        total = MONTAGE_GAP + sum(th.shape[0] + MONTAGE_GAP for _, th in batch)
+        montage = np.full((total, width), 255, dtype=np.uint8)
+        spans = []
+        top = MONTAGE_GAP
+        for idx, th in batch:
+            h, w = th.shape
+            montage[top:top + h, MONTAGE_GAP:MONTAGE_GAP + w] = th
+            spans.append((idx, top, top + h))
+            top += h + MONTAGE_GAP
+        montages.append((montage, spans))
+    return montages
+
+
+def _ocr_montage(montage: np.ndarray, spans: List[Tuple[int, int, int]], config: str) -> Optional[Dict[int, str]]:
+    """One Tesseract TSV pass over a montage; returns text per cell index, or None if OCR failed."""
+    try:
+        data = pytesseract.image_to_data(Image.fromarray(montage), config=config,
+                                         output_type=pytesseract.Output.DICT)
+    except Exception as exc:
+        logger.exception(f"OCR failed: {exc}")
+        return None
+    tops = np.array([top for _, top, _ in spans])
+    words: Dict[int, List[str]] = {}
+    for i, word in enumerate(data.get("text", [])):
+        word = str(word).strip()
+        if not word:
+            continue
+        # Assign the word to the cell whose band contains its vertical centre
+        y_center = data["top"][i] + data["height"][i] / 2.0
+        j = int(np.searchsorted(tops, y_center, side="right")) - 1
+        if j < 0:
+            continue
+        idx, _top, bottom = spans[j]
+        if y_center <= bottom + MONTAGE_GAP / 2.0:
+            words.setdefault(idx, []).append(word)
+    return {idx: " ".join(" ".join(ws).split()) for idx, ws in words.items()}
+
+
+def ocr_cells_to_text(cells: List[np.ndarray], psm: int = 6, dpi: int = 300, whitelist: Optional[str] = None,
+                      max_workers: Optional[int] = None, use_cache: bool = True) -> List[str]:
+    """OCR many cell images with a handful of Tesseract calls.
+
+    Equivalent to calling ocr_image_to_text on each cell, but cells are
+    batched into montages (see _build_montages) and the montages are read
+    concurrently on a bounded thread pool. Cells seen before with the same
+    settings come from the OCR cache. Returns one string per cell, in order.
+    """
+    return _ocr_cells(cells, psm, dpi, whitelist, max_workers, use_cache)[0]
+
+
+def _ocr_cells(cells: List[np.ndarray], psm: int, dpi: int, whitelist: Optional[str],
+               max_workers: Optional[int], use_cache: bool) -> Tuple[List[str], bool]:
+    """ocr_cells_to_text, also reporting whether every Tesseract pass succeeded."""
+    t0 = time.perf_counter()
+    texts = [""] * len(cells)
+    cache = get_ocr_cache() if use_cache else None
+    keys: List[Optional[str]] = [None] * len(cells)
+    cached: Dict[str, str] = {}
+    if cache is not None:
+        keys = [image_key(cell, op="cell", engine="tesseract", psm=psm, dpi=dpi, whitelist=whitelist)
+                if cell.size else None for cell in cells]
+        cached = cache.get_many(k for k in keys if k)
+    pending = [i for i, cell in enumerate(cells) if cell.size and keys[i] not in cached]
+    for i, key in enumerate(keys):
+        if key in cached:
+            texts[i] = cached[key]
+
+    montages = _build_montages([cells[i] for i in pending])
+    # A montage holds many cells, so single-line/word modes become a uniform block;
+    # the white gaps already keep each cell on lines of its own
+    config = _tesseract_config(6 if psm in (7, 8, 13) else psm, dpi, whitelist)
+    workers = max(1, min(len(montages), max_workers or OCR_BATCH_WORKERS))
+    complete = True
+    fresh: List[Tuple[str, str]] = []
+    if montages:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(lambda m: _ocr_montage(m[0], m[1], config), montages)
+            for (_montage, spans), result in zip(montages, results):
+                if result is None:
+                    # Leave these cells blank and uncached so a later run retries them
+                    complete = False
+                    continue
+                for local_idx, _top, _bottom in spans:
+                    idx = pending[local_idx]
+                    texts[idx] = result.get(local_idx, "")
+                    if keys[idx] is not None:
+                        fresh.append((keys[idx], texts[idx]))
+    if cache is not None and fresh:
+        cache.put_many(fresh)
+    dt_ms = (time.perf_counter() - t0) * 1000
+    logger.debug(
+        f"OCR of {len(cells)} cells ({len(cells) - len(pending)} cached) in {len(montages)} montages "
+        f"({workers} workers), {dt_ms:.1f} ms"
+    )
+    return texts, complete
+
+
+def extract_table(image_bgr: np.ndarray, enhanced: bool = False, use_cache: bool = True) -> List[List[str]]:
     """High-level table extraction pipeline.
 
-    Returns a list of rows, each a list of strings.
+    Accepts a BGR or grayscale image array, so callers that already hold
+    pixels (e.g. a rendered PDF page) need not round-trip through a file.
+    An image extracted before with the same settings is served from the OCR
+    cache. Returns a list of rows, each a list of strings.
     """
     logger.info("Starting high-level table extraction pipeline")
     t0 = time.perf_counter()
+    cache = get_ocr_cache() if use_cache else None
+    table_key = image_key(image_bgr, op="table", engine="tesseract", enhanced=enhanced) if cache else None
+    if cache is not None:
+        cached = cache.get(table_key)
+        if cached is not None:
+            logger.info(f"Table served from OCR cache: {len(cached)} rows")
+            return cached
     if enhanced:
         _, _, inv, angle = preprocess_for_grid_enhanced(image_bgr)
         logger.info(f"Enhanced preprocess used (deskew angle={angle:.2f}°)")
@@ -346,14 +506,19 @@ def extract_table(image_bgr: np.ndarray, enhanced: bool = False) -> List[List[st
         )
         result = extract_table_tesseract_tsv(image_bgr)
         logger.info(f"Fallback extraction produced {len(result)} rows")
+        if cache is not None and result:
+            cache.put(table_key, result)
         return result
 
+    # OCR every cell in batches, then map the texts back onto the grid
+    cell_imgs = [crop_cell(image_bgr, box) for row in rows for box in row]
+    cell_texts, complete = _ocr_cells(cell_imgs, (7 if enhanced else 6), 300, None, None, use_cache)
+    texts = iter(cell_texts)
     extracted: List[List[str]] = []
     for r_idx, row in enumerate(rows):
         values: List[str] = []
-        for c_idx, box in enumerate(row):
-            cell_img = crop_cell(image_bgr, box)
-            txt = ocr_image_to_text(cell_img, psm=(7 if enhanced else 6), dpi=300)
+        for c_idx, _box in enumerate(row):
+            txt = next(texts)
             logger.debug(f"OCR cell r{r_idx}c{c_idx}: '{txt[:30] + ('…' if len(txt) > 30 else '')}'")
             values.append(txt)
         extracted.append(values)
@@ -361,6 +526,8 @@ def extract_table(image_bgr: np.ndarray, enhanced: bool = False) -> List[List[st
     logger.info(
         f"Grid-based extraction produced {len(extracted)} rows x {max((len(r) for r in extracted), default=0)} cols in {dt_ms:.1f} ms"
     )
+    if cache is not None and complete:
+        cache.put(table_key, extracted)
     return extracted
 
 
@@ -372,7 +539,7 @@ def extract_table_tesseract_tsv(image_bgr: np.ndarray) -> List[List[str]]:
     """
     logger.info("Using Tesseract TSV fallback extraction")
     t0 = time.perf_counter()
-    gray = cv2.cvtColor(image_bgr, cv2.COLOR_BGR2GRAY)
+    gray = to_gray(image_bgr)
     scale = 2
     resized = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC)
     _, th = cv2.threshold(resized, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
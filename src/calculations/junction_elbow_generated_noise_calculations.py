@@ -24,18 +24,16 @@ Author: HVAC Acoustics Calculator
 Date: 2024
 """
 
-import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from typing import Tuple, Dict, List, Optional, Union
+from typing import Tuple, Dict, List, Optional, Union, TYPE_CHECKING
 import warnings
 import os
 from enum import Enum
+from .plotting_support import get_pandas, get_pyplot
+
+if TYPE_CHECKING:
+    import pandas as pd
 
-# Set up plotting style
-plt.style.use('seaborn-v0_8')
-sns.set_palette("husl")
 
 class JunctionType(Enum):
     """Enumeration of junction types."""
@@ -405,7 +403,7 @@ class JunctionElbowNoiseCalculator:
             }
         }
     
-    def create_noise_spectrum_dataframe(self, noise_spectrum: Dict[str, Dict[str, float]]) -> pd.DataFrame:
+    def create_noise_spectrum_dataframe(self, noise_spectrum: Dict[str, Dict[str, float]]) -> 'pd.DataFrame':
         """
         Create a pandas DataFrame from noise spectrum results.
         
@@ -415,6 +413,7 @@ class JunctionElbowNoiseCalculator:
         Returns:
             DataFrame with frequency bands and sound power levels
         """
+        pd = get_pandas()
         data = []
         for frequency in self.octave_bands:
             freq_key = f"{frequency}Hz"
@@ -437,6 +436,7 @@ class JunctionElbowNoiseCalculator:
             title: Plot title
             save_path: Optional path to save the plot
         """
+        plt = get_pyplot()
         df = self.create_noise_spectrum_dataframe(noise_spectrum)
         
         plt.figure(figsize=(12, 8))
@@ -472,7 +472,7 @@ class JunctionElbowNoiseCalculator:
                              branch_duct_shape: DuctShape = DuctShape.RECTANGULAR,
                              main_duct_shape: DuctShape = DuctShape.RECTANGULAR,
                              radius: float = 0.0,
-                             turbulence_present: bool = False) -> pd.DataFrame:
+                             turbulence_present: bool = False) -> 'pd.DataFrame':
         """
         Compare noise generation across different junction types.
         
@@ -489,6 +489,7 @@ class JunctionElbowNoiseCalculator:
         Returns:
             DataFrame comparing junction types
         """
+        pd = get_pandas()
         results = []
         
         for junction_type in JunctionType:
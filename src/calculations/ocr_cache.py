@@ -0,0 +1,198 @@
+"""
+OCR Result Cache
+----------------
+Content-addressed cache of OCR results shared by the schedule import tools.
+
+Keys hash the pixels of the (cropped) image region together with the engine
+and the parameters that change its output (psm, whitelist, enhanced flag...),
+so re-running an import on the same PDF or image, e.g. after changing a
+column mapping, skips OCR entirely while any change to the region or the
+settings misses.
+
+Results are stored as JSON in a small SQLite file under the user data
+directory (override with ACOUSTIC_OCR_CACHE_DIR). The file is bounded in
+size: once it grows past max_bytes the least recently used entries are
+evicted. Worker processes of the PDF importer open the same file; SQLite
+serializes their writes. Cache errors never fail an OCR call, they only
+turn into misses.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+OCR_CACHE_DIR_ENV = "ACOUSTIC_OCR_CACHE_DIR"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# Bump when OCR preprocessing changes in a way that invalidates stored results
+CACHE_FORMAT_VERSION = 1
+# Evict down to this fraction of max_bytes so eviction does not run on every put
+_EVICT_TO_FRACTION = 0.9
+
+
+def image_key(image: np.ndarray, **params: Any) -> str:
+    """Cache key for an image region and the OCR parameters applied to it."""
+    image = np.ascontiguousarray(image)
+    digest = hashlib.sha256()
+    digest.update(f"{CACHE_FORMAT_VERSION}|{image.shape}|{image.dtype.str}|".encode("utf-8"))
+    digest.update(json.dumps(params, sort_keys=True, default=str).encode("utf-8"))
+    digest.update(memoryview(image).cast("B"))
+    return digest.hexdigest()
+
+
+class OCRCache:
+    """Size-bounded, persistent key -> JSON value store"""
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=10.0, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS ocr_results ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_ocr_results_last_used ON ocr_results(last_used)")
+        self._approx_bytes = self._total_bytes()
+
+    def get(self, key: str) -> Optional[Any]:
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Stored values for the keys that are cached; marks them recently used."""
+        keys = list(dict.fromkeys(keys))
+        found: Dict[str, Any] = {}
+        if not keys:
+            return found
+        try:
+            with self._lock:
+                for start in range(0, len(keys), 500):
+                    chunk = keys[start:start + 500]
+                    rows = self._conn.execute(
+                        f"SELECT key, value FROM ocr_results WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                    ).fetchall()
+                    for key, value in rows:
+                        found[key] = json.loads(value)
+                if found:
+                    now = time.time()
+                    self._conn.executemany("UPDATE ocr_results SET last_used = ? WHERE key = ?",
+                                           [(now, key) for key in found])
+        except (sqlite3.Error, ValueError) as e:
+            logger.debug(f"OCR cache read failed: {e}")
+            found = {}
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put(self, key: str, value: Any):
+        self.put_many([(key, value)])
+
+    def put_many(self, items: Iterable[Tuple[str, Any]]):
+        now = time.time()
+        rows = []
+        for key, value in items:
+            encoded = json.dumps(value)
+            rows.append((key, encoded, len(encoded) + len(key), now))
+        if not rows:
+            return
+        try:
+            with self._lock:
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO ocr_results (key, value, size, last_used) VALUES (?, ?, ?, ?)", rows
+                    )
+                    self._conn.execute("COMMIT")
+                except Exception:
+                    self._conn.execute("ROLLBACK")
+                    raise
+                self._approx_bytes += sum(row[2] for row in rows)
+                if self._approx_bytes > self.max_bytes:
+                    self._evict()
+        except sqlite3.Error as e:
+            logger.debug(f"OCR cache write failed: {e}")
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM ocr_results")
+            self._approx_bytes = 0
+
+    def entry_count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM ocr_results").fetchone()[0]
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._total_bytes()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _total_bytes(self) -> int:
+        return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM ocr_results").fetchone()[0]
+
+    def _evict(self):
+        """Drop least recently used entries down to the target size (caller holds the lock)."""
+        # Other processes write to the same file, so recount before deciding
+        total = self._total_bytes()
+        target = int(self.max_bytes * _EVICT_TO_FRACTION)
+        if total > self.max_bytes:
+            excess = total - target
+            cutoff = self._conn.execute(
+                "SELECT last_used FROM (SELECT last_used, SUM(size) OVER (ORDER BY last_used, key) AS running "
+                "FROM ocr_results) WHERE running >= ? ORDER BY last_used LIMIT 1", (excess,)
+            ).fetchone()
+            if cutoff is not None:
+                self._conn.execute("DELETE FROM ocr_results WHERE last_used <= ?", (cutoff[0],))
+            total = self._total_bytes()
+            logger.debug(f"OCR cache evicted down to {total} bytes")
+        self._approx_bytes = total
+
+
+_caches: Dict[str, OCRCache] = {}
+_caches_lock = threading.Lock()
+
+
+def _default_cache_dir() -> str:
+    override = os.environ.get(OCR_CACHE_DIR_ENV)
+    if override:
+        return override
+    try:
+        from utils import ensure_user_data_directory
+    except ImportError:
+        from src.utils import ensure_user_data_directory
+    return os.path.join(ensure_user_data_directory(), "ocr_cache")
+
+
+def get_ocr_cache() -> Optional[OCRCache]:
+    """The process-wide cache for the configured directory, or None if it cannot be opened."""
+    try:
+        path = os.path.join(_default_cache_dir(), "ocr_results.sqlite3")
+    except Exception as e:
+        logger.debug(f"OCR cache disabled: {e}")
+        return None
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            try:
+                cache = _caches[path] = OCRCache(path)
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"OCR cache unavailable at {path}: {e}")
+                return None
+        return cache
@@ -0,0 +1,137 @@
+"""
+OCR Engine Registry
+-------------------
+Process-wide registry of the heavy OCR and table-detection backends
+(PaddleOCR, EasyOCR, the Table Transformer model) and of the Tesseract
+availability check.
+
+Each backend is loaded at most once per process, lazily on first use, no
+matter how many EnhancedOCR or TableDetector instances ask for it or from
+which threads. A backend that fails to load (package not installed, model
+download failed) is remembered as unavailable instead of being retried on
+every call; reset() forgets it. Every loaded engine carries a lock that
+callers hold while running inference, since none of these backends promise
+thread-safe inference on one instance.
+
+warm_up() loads backends on a daemon thread so first use does not wait for
+model loading. The schedule import wizard warms only SCHEDULE_ENGINES; set
+ACOUSTIC_OCR_WARMUP=0 to disable that warm-up.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+OCR_WARMUP_ENV = "ACOUSTIC_OCR_WARMUP"
+
+# Backends the mechanical schedule import wizard warms on open. Its detection
+# and extraction steps do not run PaddleOCR or the Table Transformer yet, so
+# those load lazily on first use instead; add them here once a step calls them.
+SCHEDULE_ENGINES = ("tesseract",)
+
+
+@dataclass
+class LoadedEngine:
+    """A loaded backend and the lock to hold while running inference on it"""
+    name: str
+    engine: Any
+    lock: threading.RLock = field(default_factory=threading.RLock)
+
+
+class EngineRegistry:
+    """Loads each registered backend once and shares it across the process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._engines: Dict[str, LoadedEngine] = {}
+        self._failures: Dict[str, str] = {}
+        self.load_counts: Dict[str, int] = {}
+
+    def register(self, name: str, loader: Callable[[], Any]):
+        """Register the loader of a backend; the loader raises if the backend is unavailable."""
+        with self._lock:
+            if self._loaders.get(name) is loader:
+                return
+            self._loaders[name] = loader
+            self._load_locks.setdefault(name, threading.Lock())
+            self._engines.pop(name, None)
+            self._failures.pop(name, None)
+
+    def get(self, name: str) -> Optional[LoadedEngine]:
+        """The loaded backend, loading it on first use; None if it is unavailable."""
+        engine = self._engines.get(name)
+        if engine is not None:
+            return engine
+        with self._lock:
+            loader = self._loaders.get(name)
+            load_lock = self._load_locks.get(name)
+        if loader is None:
+            logger.warning(f"No OCR engine registered as '{name}'")
+            return None
+        with load_lock:
+            # Another thread may have finished loading while we waited
+            if name in self._engines or name in self._failures:
+                return self._engines.get(name)
+            self.load_counts[name] = self.load_counts.get(name, 0) + 1
+            try:
+                engine = LoadedEngine(name, loader())
+            except Exception as e:
+                self._failures[name] = str(e)
+                logger.warning(f"OCR engine '{name}' unavailable: {e}")
+                return None
+            self._engines[name] = engine
+            return engine
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._engines
+
+    def failure(self, name: str) -> Optional[str]:
+        """Why a backend failed to load, if it did."""
+        return self._failures.get(name)
+
+    def reset(self, name: Optional[str] = None):
+        """Drop loaded backends and remembered failures (all, or one) so they load again."""
+        with self._lock:
+            names = [name] if name is not None else list(self._loaders)
+            for n in names:
+                self._engines.pop(n, None)
+                self._failures.pop(n, None)
+
+    def warm_up(self, names: Iterable[str], background: bool = True) -> Optional[threading.Thread]:
+        """Load backends ahead of first use, on a daemon thread unless background is False."""
+        names = [n for n in names if n not in self._engines and n not in self._failures]
+        if not names:
+            return None
+
+        def load_all():
+            for n in names:
+                self.get(n)
+
+        if not background:
+            load_all()
+            return None
+        thread = threading.Thread(target=load_all, name="ocr-engine-warmup", daemon=True)
+        thread.start()
+        return thread
+
+
+engine_registry = EngineRegistry()
+
+
+def warmup_enabled() -> bool:
+    return os.environ.get(OCR_WARMUP_ENV, "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def warm_up_schedule_engines(background: bool = True) -> Optional[threading.Thread]:
+    """Start loading the backends the schedule import wizard uses."""
+    # Importing the engine modules registers their loaders
+    from . import enhanced_ocr, table_detection  # noqa: F401
+    return engine_registry.warm_up(SCHEDULE_ENGINES, background=background)
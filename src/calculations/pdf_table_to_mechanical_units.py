@@ -1,8 +1,13 @@
 """
 PDF Mechanical Schedule Importer (PyMuPDF)
- - Extracts words with coordinates and reconstructs lines using block/line ids
+ - Extracts words with coordinates and rebuilds table rows geometrically: PDF
+   lines sharing a baseline are merged into one row, and columns are found
+   from the whitespace gutters between words (NumPy)
  - Detects header row by keywords (MARK & NUMBER, or NAME/TAG & TYPE/UNIT)
  - Parses subsequent lines into unit records, capturing frequency bands when present
+ - Only regions without vector text are rasterized: images with no text over
+   them are OCR'd clip by clip, and pages with no text or images at all go to
+   pdfplumber, then to OCR of the whole page; OCR runs in a process pool
  - Emits verbose debug logs to stdout to aid troubleshooting
 """
 
@@ -10,7 +15,8 @@ from __future__ import annotations
 
 import os
 import json
-from typing import List, Dict, Any
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Iterable, Optional, Tuple
 
 import fitz  # PyMuPDF
 import json
@@ -29,7 +35,7 @@ except Exception as e:  # pragma: no cover
     cv2 = None  # type: ignore
 try:
     # Try package-relative import
-    from .image_table_to_csv import extract_table  # type: ignore
+    from . import image_table_to_csv as table_ocr  # type: ignore
 except Exception:
     try:
         # Fallback to same-folder absolute import when run as a script
@@ -37,13 +43,13 @@ except Exception:
         here = pathlib.Path(__file__).resolve().parent
         sys.path.insert(0, str(here))
         spec = importlib.util.spec_from_file_location("image_table_to_csv", str(here / "image_table_to_csv.py"))
-        module = importlib.util.module_from_spec(spec)  # type: ignore
+        table_ocr = importlib.util.module_from_spec(spec)  # type: ignore
         assert spec and spec.loader
-        spec.loader.exec_module(module)  # type: ignore
-        extract_table = module.extract_table  # type: ignore
+        spec.loader.exec_module(table_ocr)  # type: ignore
     except Exception as e:  # pragma: no cover
         print(f"[DEBUG] image_table_to_csv import failed: {e}\n{traceback.format_exc()}")
-        extract_table = None  # type: ignore
+        table_ocr = None  # type: ignore
+extract_table = table_ocr.extract_table if table_ocr is not None else None  # type: ignore
 
 # Optional pdfplumber fallback
 try:
@@ -53,8 +59,8 @@ except Exception as e:  # pragma: no cover
     pdfplumber = None  # type: ignore
 
 
-def _lines_from_words(words: List[tuple]) -> List[List[str]]:
-    """Group PyMuPDF words into lines by (block, line) and return token lists."""
+def _word_lines(words: List[tuple]) -> List[List[tuple]]:
+    """Group PyMuPDF words into lines by (block, line); each line is its words sorted by x."""
     # word tuple: (x0, y0, x1, y1, text, block_no, line_no, word_no)
     from collections import defaultdict
     grouped = defaultdict(list)
@@ -66,16 +72,109 @@ def _lines_from_words(words: List[tuple]) -> List[List[str]]:
             line = int(round(y0))
         else:
             x0, y0, x1, y1, text, blk, line, wno = w
-        grouped[(blk, line)].append((x0, text))
+        grouped[(blk, line)].append((x0, y0, x1, y1, text))
     # Sort lines by approximate y (line id preserves order per block), then x
     keys_sorted = sorted(grouped.keys(), key=lambda k: (k[0], k[1]))
-    lines: List[List[str]] = []
-    for key in keys_sorted:
-        items = sorted(grouped[key], key=lambda it: it[0])
-        tokens = [t for _x, t in items]
-        if tokens:
-            lines.append(tokens)
-    return lines
+    return [sorted(grouped[key], key=lambda it: it[0]) for key in keys_sorted if grouped[key]]
+
+
+def _lines_from_words(words: List[tuple]) -> List[List[str]]:
+    """Group PyMuPDF words into lines by (block, line) and return token lists."""
+    return [[w[4] for w in line] for line in _word_lines(words)]
+
+
+# Lines whose vertical centres are within this fraction of the median word height share a row
+ROW_TOLERANCE = 0.5
+# Horizontal gap, in median word heights, that separates two table columns (a space is ~0.25)
+COLUMN_GAP = 0.6
+
+
+def _rows_from_words(words: List[tuple]) -> List[List[tuple]]:
+    """Rebuild the visual rows of a table from word geometry.
+
+    Table PDFs usually emit every cell as its own block, so the (block, line)
+    lines of _lines_from_words are single cells; lines whose vertical centres
+    fall within ROW_TOLERANCE of a row's first line are merged into that row.
+    """
+    lines = _word_lines(words)
+    if not lines:
+        return []
+    extents = np.array([(min(w[1] for w in line), max(w[3] for w in line)) for line in lines])
+    centres = extents.mean(axis=1)
+    tol = ROW_TOLERANCE * float(np.median(extents[:, 1] - extents[:, 0]))
+    rows: List[List[tuple]] = []
+    row_centre = None
+    for li in np.argsort(centres, kind="stable"):
+        if rows and centres[li] - row_centre <= tol:
+            rows[-1].extend(lines[li])
+        else:
+            rows.append(list(lines[li]))
+            row_centre = centres[li]
+    return [sorted(row, key=lambda w: w[0]) for row in rows]
+
+
+def _column_boundaries(rows: List[List[tuple]]) -> "np.ndarray":
+    """x positions separating table columns: midpoints of the gutters between words.
+
+    Gutters come from the densest rows only, so a title or a header spanning
+    several band columns does not bridge them.
+    """
+    counts = np.array([len(r) for r in rows])
+    dense = [w for r, n in zip(rows, counts) if n >= 0.5 * counts.max() for w in r]
+    boxes = np.array([(w[0], w[1], w[2], w[3]) for w in dense])
+    order = np.argsort(boxes[:, 0], kind="stable")
+    x0, x1 = boxes[order, 0], boxes[order, 2]
+    reach = np.maximum.accumulate(x1)
+    gap = COLUMN_GAP * float(np.median(boxes[:, 3] - boxes[:, 1]))
+    starts = np.flatnonzero(x0[1:] > reach[:-1] + gap) + 1
+    return (reach[starts - 1] + x0[starts]) / 2.0
+
+
+def _table_rows_from_words(words: List[tuple]) -> List[List[str]]:
+    """Rectangular table rows (one string per column, "" for empty cells) from vector words."""
+    rows = _rows_from_words(words)
+    if not rows:
+        return []
+    boundaries = _column_boundaries(rows)
+    table: List[List[str]] = []
+    for row in rows:
+        cells: List[List[str]] = [[] for _ in range(len(boundaries) + 1)]
+        centres = np.array([(w[0] + w[2]) / 2.0 for w in row])
+        for w, col in zip(row, np.searchsorted(boundaries, centres)):
+            cells[col].append(w[4])
+        table.append([" ".join(c) for c in cells])
+    return table
+
+
+def _words_in(words: List[tuple], clip: fitz.Rect) -> List[tuple]:
+    """Words whose centre lies inside clip."""
+    return [w for w in words if clip.x0 <= (w[0] + w[2]) / 2 <= clip.x1 and clip.y0 <= (w[1] + w[3]) / 2 <= clip.y1]
+
+
+# Images smaller than this (points) are logos or stamps, not schedules
+MIN_RASTER_REGION = (72.0, 36.0)
+
+
+def _raster_regions(page: fitz.Page, words: List[tuple]) -> List[fitz.Rect]:
+    """Areas of a page that only exist as pixels: images with no vector text over them.
+
+    Image bounding boxes come from get_image_info, which unlike
+    get_text("dict") does not decode the image data. Touching images (scans
+    are often stored as strips) are merged into one region.
+    """
+    rects = []
+    for info in page.get_image_info():
+        rect = fitz.Rect(info["bbox"]) & page.rect
+        if rect.width >= MIN_RASTER_REGION[0] and rect.height >= MIN_RASTER_REGION[1]:
+            rects.append(rect)
+    merged: List[fitz.Rect] = []
+    for rect in rects:
+        rect = fitz.Rect(rect)
+        for other in [m for m in merged if (m + (-1, -1, 1, 1)).intersects(rect)]:
+            merged.remove(other)
+            rect |= other
+        merged.append(rect)
+    return sorted((r for r in merged if not _words_in(words, r)), key=lambda r: (r.y0, r.x0))
 
 
 def _parse_rows_to_units(rows: List[List[str]], debug: bool = False) -> List[Dict[str, Any]]:
@@ -125,53 +224,149 @@ def _parse_rows_to_units(rows: List[List[str]], debug: bool = False) -> List[Dic
     return units
 
 
-def _ocr_page_to_units(page: fitz.Page, debug: bool = False) -> List[Dict[str, Any]]:
-    """Render page to PNG and call the existing image extractor as a subprocess,
-    then parse the resulting CSV.
+# Scanned pages are OCR'd in worker processes; leave one core for the UI
+OCR_MAX_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+OCR_DPI = 300
+
+
+def render_page_gray(page: fitz.Page, dpi: int = OCR_DPI, clip: Optional[fitz.Rect] = None) -> "np.ndarray":
+    """Render a page (or a clip of it) to a grayscale array without touching disk.
+
+    OCR works on gray, which is 1/3 the memory of RGB.
     """
-    import tempfile, os, subprocess, sys, csv as csvmod
-    # Render to 300 DPI PNG
-    zoom = 300.0 / 72.0
-    mat = fitz.Matrix(zoom, zoom)
-    pix = page.get_pixmap(matrix=mat, alpha=False)
-    with tempfile.TemporaryDirectory() as td:
-        img_path = os.path.join(td, "page.png")
-        csv_path = os.path.join(td, "table.csv")
-        pix.save(img_path)
-        # Call image_table_to_csv.py CLI
-        script_path = os.path.join(os.path.dirname(__file__), "image_table_to_csv.py")
-        cmd = [sys.executable, script_path, "--image", img_path, "--output", csv_path]
-        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-        if debug:
-            print(f"[DEBUG] OCR subprocess rc={result.returncode}")
-            if result.stdout:
-                print(f"[DEBUG] OCR stdout: {result.stdout[:1000]}")
-            if result.stderr:
-                print(f"[DEBUG] OCR stderr: {result.stderr[:1000]}")
-        if result.returncode != 0 or not os.path.exists(csv_path):
-            return []
-        rows: List[List[str]] = []
-        with open(csv_path, newline='', encoding='utf-8') as f:
-            reader = csvmod.reader(f)
-            for row in reader:
-                rows.append(row)
+    zoom = dpi / 72.0
+    pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), clip=clip, colorspace=fitz.csGRAY, alpha=False)
+    # Rows may be padded past the pixel width; copy so the pixmap can be freed
+    return np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.stride)[:, :pix.width].copy()
+
+
+def ocr_page_rows(page: fitz.Page, clip: Optional[fitz.Rect] = None, enhanced: bool = False) -> List[List[str]]:
+    """OCR a page (or a clip of it) in-process into rectangular table rows."""
+    if table_ocr is None or np is None:
+        raise RuntimeError("OCR dependencies (opencv, numpy, pytesseract) are not available")
+    table_ocr.configure_tesseract_executable(None)
+    rows = table_ocr.extract_table(render_page_gray(page, clip=clip), enhanced=enhanced)
+    return table_ocr.normalize_rows_to_rectangular(rows)
+
+
+def vector_region_rows(page: fitz.Page, clip: Optional[fitz.Rect] = None) -> List[List[str]]:
+    """Table rows rebuilt from the vector text of a page (or a clip of it); [] when there is none."""
+    words = page.get_text("words") or []
+    if clip is not None:
+        words = _words_in(words, fitz.Rect(clip))
+    return _table_rows_from_words(words)
+
+
+def page_region_rows(page: fitz.Page, clip: Optional[fitz.Rect] = None, enhanced: bool = False) -> List[List[str]]:
+    """Rectangular table rows of a page region: its vector text if it has any, else OCR of its pixels."""
+    rows = vector_region_rows(page, clip)
+    if rows:
+        return rows
+    return ocr_page_rows(page, clip=clip, enhanced=enhanced)
+
+
+def _ocr_page_to_units(page: fitz.Page, debug: bool = False) -> List[Dict[str, Any]]:
+    """OCR a rendered page in-process and parse the table rows into units."""
+    try:
+        rows = ocr_page_rows(page)
+    except Exception as e:
         if debug:
-            print(f"[DEBUG] OCR CSV rows: {len(rows)}")
-            if rows:
-                print(f"[DEBUG] OCR CSV first row: {rows[0]}")
-        return _parse_rows_to_units(rows, debug=debug)
+            print(f"[DEBUG] OCR failed: {e}")
+        return []
+    if debug:
+        print(f"[DEBUG] OCR rows: {len(rows)}")
+        if rows:
+            print(f"[DEBUG] OCR first row: {rows[0]}")
+    return _parse_rows_to_units(rows, debug=debug)
+
+
+def _init_ocr_worker() -> None:
+    # Tesseract's own OpenMP threads would oversubscribe the cores the pool already uses
+    os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+
+
+# An OCR job: (0-based page index, clip as (x0, y0, x1, y1) or None for the whole page)
+Region = Tuple[int, Optional[Tuple[float, float, float, float]]]
+
+
+def _ocr_pdf_region_rows(pdf_path: str, page_index: int,
+                         clip: Optional[Tuple[float, float, float, float]]) -> List[List[str]]:
+    """Process-pool task: OCR one page region of a PDF (documents are not picklable, so reopen it)."""
+    with fitz.open(pdf_path) as doc:
+        return ocr_page_rows(doc[page_index], clip=fitz.Rect(clip) if clip is not None else None)
+
+
+def ocr_pdf_regions(pdf_path: str, regions: Iterable[Region], debug: bool = False,
+                    max_workers: Optional[int] = None) -> Dict[Region, List[List[str]]]:
+    """OCR page regions of a PDF into table rows, keyed by region.
+
+    Regions are spread over a process pool when there is more than one; a
+    region that fails yields no rows. If the pool cannot start, regions are
+    OCR'd in-process one after another.
+    """
+    regions = list(dict.fromkeys(regions))
+    workers = min(len(regions), max_workers or OCR_MAX_WORKERS)
+    results: Dict[Region, List[List[str]]] = {}
+    if workers > 1:
+        try:
+            import multiprocessing
+            # spawn: forking a process that runs Qt is unsafe
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                     initializer=_init_ocr_worker) as pool:
+                futures = {region: pool.submit(_ocr_pdf_region_rows, pdf_path, *region) for region in regions}
+                for region, future in futures.items():
+                    try:
+                        results[region] = future.result()
+                    except Exception as e:
+                        if debug:
+                            print(f"[DEBUG] OCR page {region[0] + 1} region {region[1]} failed: {e}")
+                        results[region] = []
+            if debug:
+                print(f"[DEBUG] OCR'd {len(regions)} regions with {workers} workers")
+            return results
+        except Exception as e:
+            if debug:
+                print(f"[DEBUG] OCR process pool unavailable ({e}); continuing in-process")
+            results.clear()
+    with fitz.open(pdf_path) as doc:
+        for pi, clip in regions:
+            try:
+                results[(pi, clip)] = ocr_page_rows(doc[pi], clip=fitz.Rect(clip) if clip is not None else None)
+            except Exception as e:
+                if debug:
+                    print(f"[DEBUG] OCR page {pi + 1} region {clip} failed: {e}")
+                results[(pi, clip)] = []
+    return results
+
+
+def ocr_pdf_pages(pdf_path: str, page_indexes: Iterable[int], debug: bool = False,
+                  max_workers: Optional[int] = None) -> Dict[int, List[List[str]]]:
+    """OCR whole pages of a PDF into table rows, keyed by 0-based page index."""
+    rows = ocr_pdf_regions(pdf_path, [(pi, None) for pi in page_indexes], debug=debug, max_workers=max_workers)
+    return {pi: page_rows for (pi, _clip), page_rows in rows.items()}
 
 
 def _plumber_extract_units(pdf_path: str, debug: bool = False) -> List[Dict[str, Any]]:
     """Use pdfplumber to extract table cells into rows, then parse."""
+    by_page = _plumber_units_by_page(pdf_path, debug=debug)
+    return [u for pi in sorted(by_page) for u in by_page[pi]]
+
+
+def _plumber_units_by_page(pdf_path: str, pages: Optional[Iterable[int]] = None,
+                           debug: bool = False) -> Dict[int, List[Dict[str, Any]]]:
+    """pdfplumber table extraction for the given 1-based pages (default: all), keyed by page."""
     if pdfplumber is None:
         if debug:
             print("[DEBUG] pdfplumber not available")
-        return []
-    units: List[Dict[str, Any]] = []
+        return {}
+    wanted = set(pages) if pages is not None else None
+    by_page: Dict[int, List[Dict[str, Any]]] = {}
     try:
         with pdfplumber.open(pdf_path) as pdf:
             for pi, page in enumerate(pdf.pages, start=1):
+                if wanted is not None and pi not in wanted:
+                    continue
+                units = by_page.setdefault(pi, [])
                 # Try line-based table extraction first
                 settings = {
                     "vertical_strategy": "lines",
@@ -202,159 +397,200 @@ def _plumber_extract_units(pdf_path: str, debug: bool = False) -> List[Dict[str,
     except Exception as e:
         if debug:
             print(f"[DEBUG] pdfplumber error: {e}\n{traceback.format_exc()}")
+    return by_page
+
+
+def _fallback_units(pdf_path: str, pages: List[int], debug: bool = False,
+                    max_workers: Optional[int] = None) -> Dict[int, List[Dict[str, Any]]]:
+    """Units for pages without a parsable text layer: pdfplumber first, then OCR (1-based pages)."""
+    by_page = _plumber_units_by_page(pdf_path, pages, debug=debug)
+    ocr_pages = [pi for pi in pages if not by_page.get(pi)]
+    if ocr_pages:
+        if debug:
+            print(f"[DEBUG] pdfplumber found nothing on pages {ocr_pages}; invoking OCR fallback")
+        rows_by_index = ocr_pdf_pages(pdf_path, [pi - 1 for pi in ocr_pages], debug=debug, max_workers=max_workers)
+        for pi in ocr_pages:
+            rows = rows_by_index.get(pi - 1, [])
+            if debug:
+                print(f"[DEBUG] Page {pi}: OCR rows: {len(rows)}")
+            by_page[pi] = _parse_rows_to_units(rows, debug=debug)
+    return by_page
+
+
+def _parse_header_rows(lines: List[List[str]], pi: int, debug: bool = False) -> Optional[List[Dict[str, Any]]]:
+    """Parse text rows of a page that start with a schedule header; None if no header is found."""
+    # Find header by presence of key markers
+    header_idx = None
+    header: List[str] = []
+    for i, row in enumerate(lines[:200]):
+        lower = [t.lower() for t in row]
+        has_mark_number = ("mark" in lower and "number" in lower)
+        has_name_type = (any(x in lower for x in ["name", "tag"]) and any(x in lower for x in ["type", "unit", "unit type"]))
+        freq_hint = any(x in lower for x in ["63", "125", "250", "500", "1k", "1000"])  # hint only
+        if has_mark_number or has_name_type or freq_hint:
+            header_idx = i
+            header = row
+            break
+
+    if header_idx is None:
+        return None
+
+    data_rows = lines[header_idx + 1 :]
+    header_lower = [h.lower() for h in header]
+
+    def find_idx(keys: List[str]) -> int | None:
+        for key in keys:
+            if key in header_lower:
+                return header_lower.index(key)
+        return None
+
+    idx_name = find_idx(["name", "tag", "id"])  # typical naming column
+    idx_type = find_idx(["type", "unit", "unit type"]) 
+    idx_mark = find_idx(["mark"]) 
+    idx_number = find_idx(["number"]) 
+
+    # Frequency columns
+    idxs_freq = {
+        "63": find_idx(["63"]),
+        "125": find_idx(["125"]),
+        "250": find_idx(["250"]),
+        "500": find_idx(["500"]),
+        "1000": find_idx(["1k", "1000"]),
+        "2000": find_idx(["2k", "2000"]),
+        "4000": find_idx(["4k", "4000"]),
+        "8000": find_idx(["8k", "8000"]),
+    }
+
+    if debug:
+        print(f"[DEBUG] Page {pi}: header tokens = {header}")
+        print(f"[DEBUG] indices: name={idx_name}, type={idx_type}, mark={idx_mark}, number={idx_number}, freq={idxs_freq}")
+
+    units: List[Dict[str, Any]] = []
+    for li, row in enumerate(data_rows, start=header_idx + 2):
+        # Extract core name/type from available columns; otherwise synthesize from mark/number
+        name = row[idx_name] if idx_name is not None and idx_name < len(row) else ""
+        unit_type = row[idx_type] if idx_type is not None and idx_type < len(row) else ""
+
+        if not name and (idx_mark is not None or idx_number is not None):
+            mark = row[idx_mark] if idx_mark is not None and idx_mark < len(row) else ""
+            number = row[idx_number] if idx_number is not None and idx_number < len(row) else ""
+            mark_clean = "".join(ch for ch in mark if ch.isalnum() or ch in ("-", "_"))
+            number_clean = "".join(ch for ch in number if ch.isalnum() or ch in ("-", "_"))
+            if mark_clean and number_clean:
+                name = f"{mark_clean}-{number_clean}"
+                unit_type = mark_clean
+            elif mark_clean:
+                name = mark_clean
+                unit_type = mark_clean
+
+        # Heuristic: stop if line is clearly not data (too few tokens)
+        if not name and len(row) < 3:
+            continue
+        if not name:
+            # Try using the first token as a last resort
+            name = row[0] if row else ""
+        if not name:
+            continue
+
+        # Frequency preview across three sections if available
+        # Extract numeric tokens after mark/number to allow fallback within header-based mode
+        numeric_tokens = [t for t in row[2:] if any(ch.isdigit() for ch in t) and t.replace('.', '').replace('-', '').isdigit()]
+        if len(numeric_tokens) >= 24:
+            inlet_vals = numeric_tokens[:8]
+            radiated_vals = numeric_tokens[8:16]
+            outlet_vals = numeric_tokens[16:24]
+            inlet_json = json.dumps({k: v for k, v in zip(["63","125","250","500","1000","2000","4000","8000"], inlet_vals)})
+            radiated_json = json.dumps({k: v for k, v in zip(["63","125","250","500","1000","2000","4000","8000"], radiated_vals)})
+            outlet_json = json.dumps({k: v for k, v in zip(["63","125","250","500","1000","2000","4000","8000"], outlet_vals)})
+        else:
+            bands = {}
+            for band, col in idxs_freq.items():
+                if col is not None and col < len(row):
+                    bands[band] = row[col]
+            inlet_json = None
+            radiated_json = None
+            outlet_json = json.dumps(bands) if bands else None
+
+        # Extra columns
+        extras = {}
+        for i, cell in enumerate(row):
+            if i >= len(header):
+                continue
+            label = header[i]
+            base_keys = {"name","tag","id","type","unit","unit type","mark","number"}
+            if not label or label.lower() in base_keys or label in idxs_freq:
+                continue
+            if cell:
+                extras[label] = cell
+
+        units.append({
+            "name": name,
+            "unit_type": unit_type,
+            "inlet_levels_json": inlet_json,
+            "radiated_levels_json": radiated_json,
+            "outlet_levels_json": outlet_json,
+            "extra_json": json.dumps(extras) if extras else None,
+        })
+
+    if debug:
+        print(f"[DEBUG] Page {pi}: parsed {len(units)} rows")
     return units
 
 
-def extract_units_from_pdf(pdf_path: str, debug: bool = False) -> List[Dict[str, Any]]:
+def extract_units_from_pdf(pdf_path: str, debug: bool = False,
+                           max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
     doc = fitz.open(pdf_path)
-    units: List[Dict[str, Any]] = []
+    units_by_page: Dict[int, List[Dict[str, Any]]] = {}
+    fallback_pages: List[int] = []
+    raster_regions: List[Region] = []
 
     for pi, page in enumerate(doc, start=1):
         words = page.get_text("words") or []
+        regions = _raster_regions(page, words)
+        raster_regions.extend((pi - 1, tuple(r)) for r in regions)
+        if debug and regions:
+            print(f"[DEBUG] Page {pi}: {len(regions)} image regions without vector text")
+
+        if not words:
+            if not regions:
+                # Outlined text or line work only — try pdfplumber first, then OCR (after the text pass)
+                if debug:
+                    print(f"[DEBUG] Page {pi}: no text or images; trying pdfplumber")
+                fallback_pages.append(pi)
+            units_by_page[pi] = []
+            continue
+
+        # Geometric table first (cells aligned to columns), then the PDF's own lines
+        table = _table_rows_from_words(words)
         lines = _lines_from_words(words)
         if debug:
-            print(f"[DEBUG] Page {pi}: {len(words)} words, {len(lines)} lines")
+            print(f"[DEBUG] Page {pi}: {len(words)} words, {len(lines)} lines, "
+                  f"{len(table)}x{len(table[0]) if table else 0} table")
             for idx, row in enumerate(lines[:20]):
                 print(f"[DEBUG] L{idx:02d}: {' '.join(row)}")
 
-        if not lines:
-            # Likely a scanned/image-only PDF — try pdfplumber first, then OCR
+        units = _parse_header_rows(table, pi, debug=debug) or _parse_header_rows(lines, pi, debug=debug)
+        if not units:
             if debug:
-                print(f"[DEBUG] Page {pi}: no text lines; trying pdfplumber")
-            pl_units = _plumber_extract_units(pdf_path, debug=debug)
-            if pl_units:
-                units.extend(pl_units)
-            else:
-                if debug:
-                    print(f"[DEBUG] Page {pi}: pdfplumber found nothing; invoking OCR fallback")
-                units.extend(_ocr_page_to_units(page, debug=debug))
-            continue
-
-        # Find header by presence of key markers
-        header_idx = None
-        header: List[str] = []
-        for i, row in enumerate(lines[:200]):
-            lower = [t.lower() for t in row]
-            has_mark_number = ("mark" in lower and "number" in lower)
-            has_name_type = (any(x in lower for x in ["name", "tag"]) and any(x in lower for x in ["type", "unit", "unit type"]))
-            freq_hint = any(x in lower for x in ["63", "125", "250", "500", "1k", "1000"])  # hint only
-            if has_mark_number or has_name_type or freq_hint:
-                header_idx = i
-                header = row
-                break
-
-        if header_idx is None:
+                print(f"[DEBUG] Page {pi}: No header detected in text; parsing cells")
+            units = _parse_rows_to_units(table, debug=debug)
+        if not units and not regions:
             if debug:
-                print(f"[DEBUG] Page {pi}: No header detected in text; trying pdfplumber then OCR")
-            pl_units = _plumber_extract_units(pdf_path, debug=debug)
-            if pl_units:
-                units.extend(pl_units)
-            else:
-                units.extend(_ocr_page_to_units(page, debug=debug))
-            continue
-
-        data_rows = lines[header_idx + 1 :]
-        header_lower = [h.lower() for h in header]
-
-        def find_idx(keys: List[str]) -> int | None:
-            for key in keys:
-                if key in header_lower:
-                    return header_lower.index(key)
-            return None
-
-        idx_name = find_idx(["name", "tag", "id"])  # typical naming column
-        idx_type = find_idx(["type", "unit", "unit type"]) 
-        idx_mark = find_idx(["mark"]) 
-        idx_number = find_idx(["number"]) 
-
-        # Frequency columns
-        idxs_freq = {
-            "63": find_idx(["63"]),
-            "125": find_idx(["125"]),
-            "250": find_idx(["250"]),
-            "500": find_idx(["500"]),
-            "1000": find_idx(["1k", "1000"]),
-            "2000": find_idx(["2k", "2000"]),
-            "4000": find_idx(["4k", "4000"]),
-            "8000": find_idx(["8k", "8000"]),
-        }
-
-        if debug:
-            print(f"[DEBUG] Page {pi}: header tokens = {header}")
-            print(f"[DEBUG] indices: name={idx_name}, type={idx_type}, mark={idx_mark}, number={idx_number}, freq={idxs_freq}")
-
-        page_units_before = len(units)
-        for li, row in enumerate(data_rows, start=header_idx + 2):
-            # Extract core name/type from available columns; otherwise synthesize from mark/number
-            name = row[idx_name] if idx_name is not None and idx_name < len(row) else ""
-            unit_type = row[idx_type] if idx_type is not None and idx_type < len(row) else ""
-
-            if not name and (idx_mark is not None or idx_number is not None):
-                mark = row[idx_mark] if idx_mark is not None and idx_mark < len(row) else ""
-                number = row[idx_number] if idx_number is not None and idx_number < len(row) else ""
-                mark_clean = "".join(ch for ch in mark if ch.isalnum() or ch in ("-", "_"))
-                number_clean = "".join(ch for ch in number if ch.isalnum() or ch in ("-", "_"))
-                if mark_clean and number_clean:
-                    name = f"{mark_clean}-{number_clean}"
-                    unit_type = mark_clean
-                elif mark_clean:
-                    name = mark_clean
-                    unit_type = mark_clean
-
-            # Heuristic: stop if line is clearly not data (too few tokens)
-            if not name and len(row) < 3:
-                continue
-            if not name:
-                # Try using the first token as a last resort
-                name = row[0] if row else ""
-            if not name:
-                continue
-
-            # Frequency preview across three sections if available
-            # Extract numeric tokens after mark/number to allow fallback within header-based mode
-            numeric_tokens = [t for t in row[2:] if any(ch.isdigit() for ch in t) and t.replace('.', '').replace('-', '').isdigit()]
-            if len(numeric_tokens) >= 24:
-                inlet_vals = numeric_tokens[:8]
-                radiated_vals = numeric_tokens[8:16]
-                outlet_vals = numeric_tokens[16:24]
-                inlet_json = json.dumps({k: v for k, v in zip(["63","125","250","500","1000","2000","4000","8000"], inlet_vals)})
-                radiated_json = json.dumps({k: v for k, v in zip(["63","125","250","500","1000","2000","4000","8000"], radiated_vals)})
-                outlet_json = json.dumps({k: v for k, v in zip(["63","125","250","500","1000","2000","4000","8000"], outlet_vals)})
-            else:
-                bands = {}
-                for band, col in idxs_freq.items():
-                    if col is not None and col < len(row):
-                        bands[band] = row[col]
-                inlet_json = None
-                radiated_json = None
-                outlet_json = json.dumps(bands) if bands else None
-
-            # Extra columns
-            extras = {}
-            for i, cell in enumerate(row):
-                if i >= len(header):
-                    continue
-                label = header[i]
-                base_keys = {"name","tag","id","type","unit","unit type","mark","number"}
-                if label.lower() in base_keys or label in idxs_freq:
-                    continue
-                if cell:
-                    extras[label] = cell
-
-            units.append({
-                "name": name,
-                "unit_type": unit_type,
-                "inlet_levels_json": inlet_json,
-                "radiated_levels_json": radiated_json,
-                "outlet_levels_json": outlet_json,
-                "extra_json": json.dumps(extras) if extras else None,
-            })
-
-        if debug:
-            added = len(units) - page_units_before
-            print(f"[DEBUG] Page {pi}: parsed {added} rows")
-
-    return units
+                print(f"[DEBUG] Page {pi}: no units in vector text; trying pdfplumber then OCR")
+            fallback_pages.append(pi)
+        units_by_page[pi] = units
+
+    doc.close()
+    if fallback_pages:
+        units_by_page.update(_fallback_units(pdf_path, fallback_pages, debug=debug, max_workers=max_workers))
+    if raster_regions:
+        rows_by_region = ocr_pdf_regions(pdf_path, raster_regions, debug=debug, max_workers=max_workers)
+        for region in raster_regions:
+            rows = rows_by_region.get(region, [])
+            if debug:
+                print(f"[DEBUG] Page {region[0] + 1} region {region[1]}: OCR rows: {len(rows)}")
+            units_by_page[region[0] + 1].extend(_parse_rows_to_units(rows, debug=debug))
+    return [u for pi in sorted(units_by_page) for u in units_by_page[pi]]
 
 
 def main(pdf_path: str, output_json: str, debug: bool = False) -> None:
@@ -0,0 +1,36 @@
+"""
+Lazy loaders for the reporting and plotting stacks used by calculator modules
+
+The calculator cores (duct, elbow, junction and receiver-room calculations)
+only need numpy/scipy. pandas, matplotlib and seaborn are used exclusively by
+the ``create_*_dataframe``, ``compare_*`` and ``plot_*`` helpers, so they are
+imported on first use here instead of at module import time. This keeps
+``HVACNoiseEngine`` imports cheap for headless API workers and batch jobs.
+"""
+
+_plot_style_applied = False
+
+
+def get_pandas():
+    """Return the pandas module, importing it on first use."""
+    import pandas as pd
+    return pd
+
+
+def get_pyplot():
+    """Return ``matplotlib.pyplot`` with the calculator plotting style applied."""
+    global _plot_style_applied
+    import matplotlib.pyplot as plt
+    if not _plot_style_applied:
+        import seaborn as sns
+        plt.style.use('seaborn-v0_8')
+        sns.set_palette("husl")
+        _plot_style_applied = True
+    return plt
+
+
+def get_seaborn():
+    """Return the seaborn module (plotting style applied on first use)."""
+    get_pyplot()
+    import seaborn as sns
+    return sns
@@ -11,17 +11,15 @@ Author: HVAC Acoustics Calculator
 Date: 2024
 """
 
-import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from typing import Tuple, Dict, List, Optional, Union
+from typing import Tuple, Dict, List, Optional, Union, TYPE_CHECKING
 import warnings
 from scipy.interpolate import interp1d
+from .plotting_support import get_pandas, get_pyplot
+
+if TYPE_CHECKING:
+    import pandas as pd
 
-# Set up plotting style
-plt.style.use('seaborn-v0_8')
-sns.set_palette("husl")
 
 class ReceiverRoomSoundCorrection:
     """
@@ -396,7 +394,7 @@ class ReceiverRoomSoundCorrection:
         
     def create_comparison_dataframe(self, lw_spectrum: List[float], distance: float, 
                                   room_volume: float, ceiling_height: float = 10, 
-                                  floor_area_per_diffuser: float = 150) -> pd.DataFrame:
+                                  floor_area_per_diffuser: float = 150) -> 'pd.DataFrame':
         """
         Create a comparison dataframe showing different calculation methods.
         
@@ -410,6 +408,7 @@ class ReceiverRoomSoundCorrection:
         Returns:
             DataFrame with comparison of different calculation methods
         """
+        pd = get_pandas()
         results = []
         
         for i, freq in enumerate(self.frequencies):
@@ -455,6 +454,7 @@ class ReceiverRoomSoundCorrection:
             floor_area_per_diffuser: Floor area per diffuser in ft² (for distributed array)
             save_path: Optional path to save the plot
         """
+        plt = get_pyplot()
         df = self.create_comparison_dataframe(lw_spectrum, distance, room_volume, 
                                             ceiling_height, floor_area_per_diffuser)
         
@@ -11,17 +11,15 @@ Author: HVAC Acoustics Calculator
 Date: 2024
 """
 
-import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from typing import Tuple, Dict, List, Optional
+from typing import Tuple, Dict, List, Optional, TYPE_CHECKING
 import warnings
 from .acoustic_utilities import AcousticConstants
+from .plotting_support import get_pandas, get_pyplot
+
+if TYPE_CHECKING:
+    import pandas as pd
 
-# Set up plotting style
-plt.style.use('seaborn-v0_8')
-sns.set_palette("husl")
 
 class RectangularDuctCalculator:
     """
@@ -453,7 +451,7 @@ class RectangularDuctCalculator:
             raise ValueError("lining_type must be 'unlined', '1inch', or '2inch'")
     
     def create_attenuation_dataframe(self, duct_sizes: List[Tuple[float, float]], 
-                                   length: float = 1.0) -> pd.DataFrame:
+                                   length: float = 1.0) -> 'pd.DataFrame':
         """
         Create a pandas DataFrame with attenuation data for multiple duct sizes.
         
@@ -464,6 +462,7 @@ class RectangularDuctCalculator:
         Returns:
             DataFrame with attenuation data
         """
+        pd = get_pandas()
         data = []
         
         for width, height in duct_sizes:
@@ -506,6 +505,7 @@ class RectangularDuctCalculator:
             length: Duct length in feet
             save_path: Optional path to save the plot
         """
+        plt = get_pyplot()
         # Get data for all lining types
         unlined = self.get_unlined_attenuation(width, height, length)
         lining_1inch = self.get_1inch_lining_insertion_loss(width, height, length)
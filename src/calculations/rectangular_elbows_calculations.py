@@ -14,16 +14,14 @@ Author: HVAC Acoustics Calculator
 Date: 2024
 """
 
-import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from typing import Tuple, Dict, List, Optional, Union
+from typing import Tuple, Dict, List, Optional, Union, TYPE_CHECKING
 import warnings
+from .plotting_support import get_pandas, get_pyplot
+
+if TYPE_CHECKING:
+    import pandas as pd
 
-# Set up plotting style
-plt.style.use('seaborn-v0_8')
-sns.set_palette("husl")
 
 class RectangularElbowsCalculator:
     """
@@ -200,7 +198,7 @@ class RectangularElbowsCalculator:
             
         return results
         
-    def compare_elbow_types(self, width: float, lined: bool = False) -> pd.DataFrame:
+    def compare_elbow_types(self, width: float, lined: bool = False) -> 'pd.DataFrame':
         """
         Compare insertion loss across all elbow types for a given width.
         
@@ -211,6 +209,7 @@ class RectangularElbowsCalculator:
         Returns:
             DataFrame with comparison results
         """
+        pd = get_pandas()
         data = []
         
         for freq in self.octave_bands:
@@ -238,7 +237,7 @@ class RectangularElbowsCalculator:
         
     def create_insertion_loss_dataframe(self, widths: List[float], 
                                       elbow_type: str = 'square_no_vanes', 
-                                      lined: bool = False) -> pd.DataFrame:
+                                      lined: bool = False) -> 'pd.DataFrame':
         """
         Create a DataFrame with insertion loss values for multiple widths.
         
@@ -250,6 +249,7 @@ class RectangularElbowsCalculator:
         Returns:
             DataFrame with insertion loss values
         """
+        pd = get_pandas()
         data = []
         
         for width in widths:
@@ -269,6 +269,7 @@ class RectangularElbowsCalculator:
             width: Width of the elbow in inches
             save_path: Optional path to save the plot
         """
+        plt = get_pyplot()
         df = self.compare_elbow_types(width)
         
         plt.figure(figsize=(12, 8))
@@ -309,6 +310,7 @@ class RectangularElbowsCalculator:
             lined: True for lined elbows (only applies to square elbows)
             save_path: Optional path to save the plot
         """
+        plt = get_pyplot()
         df = self.create_insertion_loss_dataframe(widths, elbow_type, lined)
         
         plt.figure(figsize=(12, 8))
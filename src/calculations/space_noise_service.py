@@ -99,11 +99,11 @@ class SpaceNoiseService:
         Returns:
             List of 8 octave band levels, or None if calculation fails
         """
-        from models import get_session
+        from models import get_read_session
         from sqlalchemy.orm import selectinload
         from models.hvac import HVACPath, HVACSegment
 
-        session = get_session()
+        session = get_read_session()
         try:
             # Eager-load all required relationships
             db_path = (
@@ -2,19 +2,23 @@
 Table Detection using Table Transformer
 ---------------------------------------
 Uses Microsoft's Table Transformer model for detecting table regions
-in documents with high accuracy.
+in documents with high accuracy. The model is loaded once per process
+through the engine registry (see ocr_engines) and shared by all detectors.
 """
 
 from __future__ import annotations
 
 import logging
-from typing import List, Tuple, Optional
+import threading
+from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 
 import numpy as np
 import cv2
 from PIL import Image
 
+from .ocr_engines import engine_registry
+
 logger = logging.getLogger(__name__)
 
 
@@ -39,6 +43,39 @@ class DetectedTable:
         return (x + w // 2, y + h // 2)
 
 
+def _load_table_transformer() -> Tuple[object, object, str]:
+    """Load the Table Transformer; returns (image processor, model, device)"""
+    try:
+        from transformers import AutoModelForObjectDetection, AutoImageProcessor
+        import torch
+    except ImportError as e:
+        raise ImportError(f"Required packages not installed: {e}. "
+                          "Install with: pip install transformers torch torchvision timm") from e
+    
+    # Check for GPU
+    if torch.cuda.is_available():
+        device = "cuda"
+        logger.info("GPU detected, using CUDA for table detection")
+    else:
+        device = "cpu"
+        logger.info("Using CPU for table detection")
+    
+    # Load pre-trained Table Transformer model
+    model_name = "microsoft/table-transformer-detection"
+    
+    logger.info(f"Loading Table Transformer model: {model_name}")
+    feature_extractor = AutoImageProcessor.from_pretrained(model_name)
+    model = AutoModelForObjectDetection.from_pretrained(model_name)
+    model.to(device)
+    model.eval()
+    
+    logger.info("Table Transformer model loaded successfully")
+    return feature_extractor, model, device
+
+
+engine_registry.register("table_transformer", _load_table_transformer)
+
+
 class TableDetector:
     """
     Table detection using Table Transformer model from Hugging Face
@@ -49,42 +86,19 @@ class TableDetector:
         self.model = None
         self.feature_extractor = None
         self.device = "cpu"  # Will auto-detect GPU if available
+        self._model_lock = threading.RLock()
         
     def _init_model(self) -> bool:
-        """Initialize the Table Transformer model"""
+        """Attach the shared Table Transformer model, loading it on first use"""
         if self.model is not None:
             return True
         
-        try:
-            from transformers import AutoModelForObjectDetection, AutoImageProcessor
-            import torch
-            
-            # Check for GPU
-            if torch.cuda.is_available():
-                self.device = "cuda"
-                logger.info("GPU detected, using CUDA for table detection")
-            else:
-                logger.info("Using CPU for table detection")
-            
-            # Load pre-trained Table Transformer model
-            model_name = "microsoft/table-transformer-detection"
-            
-            logger.info(f"Loading Table Transformer model: {model_name}")
-            self.feature_extractor = AutoImageProcessor.from_pretrained(model_name)
-            self.model = AutoModelForObjectDetection.from_pretrained(model_name)
-            self.model.to(self.device)
-            self.model.eval()
-            
-            logger.info("Table Transformer model loaded successfully")
-            return True
-            
-        except ImportError as e:
-            logger.error(f"Required packages not installed: {e}")
-            logger.error("Install with: pip install transformers torch torchvision timm")
-            return False
-        except Exception as e:
-            logger.error(f"Failed to initialize Table Transformer: {e}")
+        loaded = engine_registry.get("table_transformer")
+        if loaded is None:
             return False
+        self.feature_extractor, self.model, self.device = loaded.engine
+        self._model_lock = loaded.lock
+        return True
     
     def detect_tables(self, image: np.ndarray, min_confidence: Optional[float] = None) -> List[DetectedTable]:
         """
@@ -113,22 +127,25 @@ class TableDetector:
             # Convert to PIL Image
             pil_image = Image.fromarray(image_rgb)
             
-            # Prepare image for model
-            inputs = self.feature_extractor(images=pil_image, return_tensors="pt")
-            inputs = {k: v.to(self.device) for k, v in inputs.items()}
-            
-            # Run detection
-            with torch.no_grad():
-                outputs = self.model(**inputs)
-            
-            # Post-process results
             threshold = min_confidence if min_confidence is not None else self.confidence_threshold
             target_sizes = torch.tensor([pil_image.size[::-1]])  # height, width
-            results = self.feature_extractor.post_process_object_detection(
-                outputs,
-                threshold=threshold,
-                target_sizes=target_sizes
-            )[0]
+            
+            # The model is shared by every detector in the process
+            with self._model_lock:
+                # Prepare image for model
+                inputs = self.feature_extractor(images=pil_image, return_tensors="pt")
+                inputs = {k: v.to(self.device) for k, v in inputs.items()}
+                
+                # Run detection
+                with torch.no_grad():
+                    outputs = self.model(**inputs)
+                
+                # Post-process results
+                results = self.feature_extractor.post_process_object_detection(
+                    outputs,
+                    threshold=threshold,
+                    target_sizes=target_sizes
+                )[0]
             
             # Extract detected tables
             detected_tables = []
@@ -283,18 +300,18 @@ class TableDetector:
         return vis_image
 
 
-# Global instance for convenience
-_global_detector: Optional[TableDetector] = None
+# Shared instances for convenience, one per threshold (all of them share one model)
+_detectors: Dict[float, TableDetector] = {}
+_detectors_lock = threading.Lock()
 
 
 def get_table_detector(confidence_threshold: float = 0.5) -> TableDetector:
-    """Get or create global table detector instance"""
-    global _global_detector
-    
-    if _global_detector is None:
-        _global_detector = TableDetector(confidence_threshold=confidence_threshold)
-    
-    return _global_detector
+    """Get or create the shared table detector for a confidence threshold"""
+    with _detectors_lock:
+        detector = _detectors.get(confidence_threshold)
+        if detector is None:
+            detector = _detectors[confidence_threshold] = TableDetector(confidence_threshold=confidence_threshold)
+        return detector
 
 
 def detect_tables_in_image(image: np.ndarray, min_confidence: float = 0.5) -> List[DetectedTable]:
@@ -4,11 +4,25 @@ Material Search Engine - Advanced material searching with frequency-specific ana
 
 import sqlite3
 import os
+from contextlib import closing
 from typing import Dict, List, Optional, Tuple, Any
 import math
 from .materials import get_database_path, STANDARD_MATERIALS, categorize_material
 
 
+def readonly_connection(db_path: str):
+    """Pooled read-only connection to the materials database.
+
+    Falls back to a plain sqlite3 connection when the models package is not
+    importable (e.g. when this module is imported as src.data.material_search).
+    """
+    try:
+        from models.connection_pool import readonly_connection as pooled_connection
+    except ImportError:
+        return closing(sqlite3.connect(db_path))
+    return pooled_connection(db_path)
+
+
 class MaterialSearchEngine:
     """Advanced search engine for acoustic materials with frequency-specific analysis"""
     
@@ -33,9 +47,6 @@ class MaterialSearchEngine:
             return self._search_fallback_materials(query, category, limit)
             
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             sql = """
                 SELECT name, coeff_125, coeff_250, coeff_500, coeff_1000, coeff_2000, coeff_4000, nrc
                 FROM acoustic_materials
@@ -55,9 +66,8 @@ class MaterialSearchEngine:
             sql += " ORDER BY nrc DESC LIMIT ?"
             params.append(limit)
             
-            cursor.execute(sql, params)
-            rows = cursor.fetchall()
-            conn.close()
+            with readonly_connection(self.db_path) as conn:
+                rows = conn.execute(sql, params).fetchall()
             
             return self._format_search_results(rows)
             
@@ -88,9 +98,6 @@ class MaterialSearchEngine:
             return self._search_fallback_by_frequency(frequency, min_absorption, max_absorption, category, limit)
             
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             freq_column = f"coeff_{frequency}"
             sql = f"""
                 SELECT name, coeff_125, coeff_250, coeff_500, coeff_1000, coeff_2000, coeff_4000, nrc
@@ -100,9 +107,8 @@ class MaterialSearchEngine:
                 LIMIT ?
             """
             
-            cursor.execute(sql, [min_absorption, max_absorption, limit])
-            rows = cursor.fetchall()
-            conn.close()
+            with readonly_connection(self.db_path) as conn:
+                rows = conn.execute(sql, [min_absorption, max_absorption, limit]).fetchall()
             
             results = self._format_search_results(rows)
             
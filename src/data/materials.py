@@ -274,7 +274,13 @@ def get_all_materials() -> Dict[str, Dict]:
     return load_materials_from_database()
 
 # Initialize materials on module import
-STANDARD_MATERIALS = get_all_materials()
+try:
+    from utils.startup_profiler import get_startup_profiler
+except ImportError:
+    from src.utils.startup_profiler import get_startup_profiler
+
+with get_startup_profiler().phase("Standard materials load", category="materials"):
+    STANDARD_MATERIALS = get_all_materials()
 
 # Room type defaults for quick setup - materials should be None to remain unassigned
 ROOM_TYPE_DEFAULTS = {
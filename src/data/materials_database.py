@@ -18,6 +18,11 @@ except ImportError:
         from materials import STANDARD_MATERIALS, load_materials_from_database, get_materials_by_category, categorize_material
         from enhanced_materials import ENHANCED_MATERIALS
 
+try:
+    from utils.startup_profiler import get_startup_profiler
+except ImportError:
+    from src.utils.startup_profiler import get_startup_profiler
+
 
 class MaterialsDatabase:
     """Centralized interface for accessing all acoustic materials"""
@@ -112,19 +117,20 @@ class MaterialsDatabase:
         """
         all_materials = {}
         
-        # Start with standard SQLite materials (lowest priority)
-        all_materials.update(self.standard_materials)
-        
-        # Add enhanced materials (medium priority - can override standard)
-        for key, material in self.enhanced_materials.items():
-            # Convert enhanced material format to standard format
-            standardized = self._standardize_enhanced_material(key, material)
-            all_materials[key] = standardized
-        
-        # Add SQLAlchemy Component Library materials (highest priority - can override both)
-        sqlalchemy_materials = self.load_materials_from_sqlalchemy()
-        for key, material in sqlalchemy_materials.items():
-            all_materials[key] = material
+        with get_startup_profiler().phase("Materials catalog build", category="materials"):
+            # Start with standard SQLite materials (lowest priority)
+            all_materials.update(self.standard_materials)
+            
+            # Add enhanced materials (medium priority - can override standard)
+            for key, material in self.enhanced_materials.items():
+                # Convert enhanced material format to standard format
+                standardized = self._standardize_enhanced_material(key, material)
+                all_materials[key] = standardized
+            
+            # Add SQLAlchemy Component Library materials (highest priority - can override both)
+            sqlalchemy_materials = self.load_materials_from_sqlalchemy()
+            for key, material in sqlalchemy_materials.items():
+                all_materials[key] = material
             
         return all_materials
         
@@ -4,7 +4,7 @@ Silencer product database management and filtering system
 
 from typing import List, Dict, Optional, Any
 from sqlalchemy import and_, or_
-from models import get_session
+from models import get_session, read_session
 from models.hvac import SilencerProduct
 from data.silencer_library import get_silencer_catalog, to_silencer_product_dict
 
@@ -186,9 +186,6 @@ class SilencerDatabaseManager:
 class SilencerFilterEngine:
     """Engine for filtering and ranking silencer products based on requirements"""
     
-    def __init__(self):
-        self.session = get_session()
-    
     def filter_products(self, requirements: Dict[str, Any]) -> List[SilencerProduct]:
         """
         Filter products based on requirements
@@ -199,8 +196,13 @@ class SilencerFilterEngine:
         Returns:
             List of filtered SilencerProduct objects
         """
-        query = self.session.query(SilencerProduct)
-        
+        # Read-only query on the reader pool; the connection goes back to the
+        # pool as soon as the rows are loaded
+        with read_session() as session:
+            return self._apply_filters(session.query(SilencerProduct), requirements).all()
+    
+    def _apply_filters(self, query, requirements: Dict[str, Any]):
+        """Add the filtering criteria in requirements to a SilencerProduct query"""
         # Filter by silencer type
         if requirements.get('silencer_type'):
             query = query.filter(SilencerProduct.silencer_type == requirements['silencer_type'])
@@ -263,7 +265,7 @@ class SilencerFilterEngine:
                 )
             )
         
-        return query.all()
+        return query
     
     def calculate_match_score(self, product: SilencerProduct, requirements: Dict[str, Any]) -> float:
         """
@@ -381,8 +383,8 @@ class SilencerFilterEngine:
         return ranked_products
     
     def close(self):
-        """Close the database session"""
-        self.session.close()
+        """Kept for callers; each query opens and closes its own session"""
+        pass
 
 
 # Convenience functions
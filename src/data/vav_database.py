@@ -57,7 +57,7 @@ from typing import List, Dict, Optional, Any, Tuple
 
 try:
     from sqlalchemy import and_, or_
-    from models import get_session
+    from models import read_session, write_session
     from models.vav import VAVTerminalUnit
     _DB_AVAILABLE = True
 except ImportError:
@@ -708,7 +708,8 @@ class VAVDatabaseManager:
                 "SQLAlchemy models not importable. "
                 "Run this module from within the project src/ directory."
             )
-        self.session = get_session()
+        # Each query borrows a reader-pool session for its own duration;
+        # seeding goes through the writer
 
     # ── Helpers ───────────────────────────────────────────────────────────────
 
@@ -759,7 +760,8 @@ class VAVDatabaseManager:
         Seed the vav_terminal_units table with manufacturer catalog data.
         No-op if data already exists.
         """
-        count = self.session.query(VAVTerminalUnit).count()
+        with read_session() as session:
+            count = session.query(VAVTerminalUnit).count()
         if count > 0:
             print(f"VAV database already contains {count} products — skipping seed.")
             return
@@ -851,14 +853,11 @@ class VAVDatabaseManager:
             ))
 
         # ── Insert all ────────────────────────────────────────────────────────
-        for p in all_products:
-            self.session.add(VAVTerminalUnit(**p))
-
         try:
-            self.session.commit()
+            with write_session() as session:
+                session.add_all([VAVTerminalUnit(**p) for p in all_products])
             print(f"Successfully added {len(all_products)} VAV terminal unit products to database.")
         except Exception as e:
-            self.session.rollback()
             raise RuntimeError(f"Database commit failed: {e}") from e
 
     # ── Queries ───────────────────────────────────────────────────────────────
@@ -872,24 +871,26 @@ class VAVDatabaseManager:
         max_flow_cfm: Optional[float] = None,
     ) -> list:
         """Filter products by any combination of criteria."""
-        q = self.session.query(VAVTerminalUnit)
-        if unit_type:
-            q = q.filter(VAVTerminalUnit.unit_type == unit_type)
-        if min_size is not None:
-            q = q.filter(VAVTerminalUnit.inlet_size_in >= min_size)
-        if max_size is not None:
-            q = q.filter(VAVTerminalUnit.inlet_size_in <= max_size)
-        if manufacturer:
-            q = q.filter(VAVTerminalUnit.manufacturer.ilike(f'%{manufacturer}%'))
-        if max_flow_cfm is not None:
-            q = q.filter(VAVTerminalUnit.flow_max_cfm <= max_flow_cfm)
-        return q.all()
+        with read_session() as session:
+            q = session.query(VAVTerminalUnit)
+            if unit_type:
+                q = q.filter(VAVTerminalUnit.unit_type == unit_type)
+            if min_size is not None:
+                q = q.filter(VAVTerminalUnit.inlet_size_in >= min_size)
+            if max_size is not None:
+                q = q.filter(VAVTerminalUnit.inlet_size_in <= max_size)
+            if manufacturer:
+                q = q.filter(VAVTerminalUnit.manufacturer.ilike(f'%{manufacturer}%'))
+            if max_flow_cfm is not None:
+                q = q.filter(VAVTerminalUnit.flow_max_cfm <= max_flow_cfm)
+            return q.all()
 
     def get_by_model(self, model_number: str) -> Optional[object]:
         """Exact model number lookup."""
-        return self.session.query(VAVTerminalUnit).filter(
-            VAVTerminalUnit.model_number == model_number
-        ).first()
+        with read_session() as session:
+            return session.query(VAVTerminalUnit).filter(
+                VAVTerminalUnit.model_number == model_number
+            ).first()
 
     # ── 1/3 Octave Conversion ─────────────────────────────────────────────────
 
@@ -982,7 +983,8 @@ class VAVDatabaseManager:
         return nc, spl
 
     def close(self):
-        self.session.close()
+        # Nothing to release; each query closes its own session
+        pass
 
 
 # ─────────────────────────────────────────────────────────────────────────────
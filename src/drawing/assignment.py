@@ -0,0 +1,76 @@
+"""
+Sparse one-to-one assignment
+
+Solves minimum-cost matching between two element sets when only a few
+(row, column) pairs are plausible. The bipartite graph of candidate pairs
+is split into connected components and each component is solved with the
+Hungarian algorithm, so cost stays proportional to the size of each
+cluster rather than the product of the set sizes. Results are
+deterministic for a given set of pairs.
+"""
+
+from typing import Dict, Hashable, List, Tuple
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+# Stand-in for "no pair" inside a component's dense cost matrix
+_NO_PAIR_COST = 1e9
+
+
+def solve_sparse_assignment(
+    costs: Dict[Tuple[Hashable, Hashable], float],
+    unmatched_cost: float = 0.0
+) -> Dict[Hashable, Hashable]:
+    """
+    Minimum-cost one-to-one assignment over sparse candidate pairs.
+
+    Args:
+        costs: Cost of each plausible (row, column) pair
+        unmatched_cost: Cost of leaving a row unassigned; pairs costing more
+            than this are never chosen
+
+    Returns:
+        Mapping of assigned row -> column
+    """
+    if not costs:
+        return {}
+
+    pairs = list(costs)
+    row_ids = {row: i for i, row in enumerate(dict.fromkeys(row for row, _col in pairs))}
+    col_ids = {col: i for i, col in enumerate(dict.fromkeys(col for _row, col in pairs))}
+    rows = [row_ids[row] for row, _col in pairs]
+    cols = [len(row_ids) + col_ids[col] for _row, col in pairs]
+    size = len(row_ids) + len(col_ids)
+    graph = coo_matrix((np.ones(len(pairs)), (rows, cols)), shape=(size, size))
+    _count, labels = connected_components(graph, directed=False)
+
+    groups: Dict[int, Tuple[List[Hashable], List[Hashable]]] = {}
+    for row, i in row_ids.items():
+        groups.setdefault(int(labels[i]), ([], []))[0].append(row)
+    for col, j in col_ids.items():
+        groups.setdefault(int(labels[len(row_ids) + j]), ([], []))[1].append(col)
+
+    assignment: Dict[Hashable, Hashable] = {}
+    for group_rows, group_cols in groups.values():
+        if len(group_rows) == 1 and len(group_cols) == 1:
+            row, col = group_rows[0], group_cols[0]
+            if costs[(row, col)] <= unmatched_cost:
+                assignment[row] = col
+            continue
+
+        # Each row also gets a private "unmatched" column
+        matrix = np.full((len(group_rows), len(group_cols) + len(group_rows)), _NO_PAIR_COST)
+        matrix[:, len(group_cols):][np.diag_indices(len(group_rows))] = unmatched_cost
+        for i, row in enumerate(group_rows):
+            for j, col in enumerate(group_cols):
+                cost = costs.get((row, col))
+                if cost is not None:
+                    matrix[i, j] = cost
+
+        for i, j in zip(*linear_sum_assignment(matrix)):
+            if j < len(group_cols):
+                assignment[group_rows[i]] = group_cols[j]
+    return assignment
@@ -0,0 +1,372 @@
+"""
+Write-behind persistence of drawing edits with a crash-safe journal.
+
+Overlay edits are not written to the database on the GUI thread. The drawing
+interface records them as operations on a DrawingAutosaveQueue:
+- ``page``: a snapshot of one page's overlay elements. A newer snapshot of
+  the same page replaces the older one, and DrawingElementManager diffs it
+  against the stored rows, so a flush is a small delta write;
+- ``drawing``: changed Drawing columns (scale, page size, file path). These
+  merge field by field.
+
+A worker thread appends each operation to a JSON-lines journal as soon as it
+is queued, then writes the coalesced operations to the database in one
+transaction on the dedicated writer connection. The write happens once edits
+have been idle for ``idle_delay`` seconds, or at the latest ``max_delay``
+seconds after the first unsaved edit. The journal is truncated once
+everything queued has been written. A journal left behind by a crash is
+replayed the next time the drawing is opened.
+
+The journal location defaults to <user data dir>/autosave_journal and can be
+overridden with the ACOUSTIC_AUTOSAVE_JOURNAL_DIR environment variable.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from PySide6.QtCore import QObject, QPoint, QRect, Signal
+
+logger = logging.getLogger(__name__)
+
+AUTOSAVE_JOURNAL_DIR_ENV = "ACOUSTIC_AUTOSAVE_JOURNAL_DIR"
+DEFAULT_IDLE_DELAY_S = 1.0
+DEFAULT_MAX_DELAY_S = 10.0
+RETRY_DELAY_S = 5.0
+
+# Drawing columns the drawing interface edits and the queue persists
+DRAWING_FIELDS = ('file_path', 'scale_ratio', 'scale_string', 'width_pixels', 'height_pixels')
+
+# Segment endpoint references are stored by id only (see DrawingElement.from_overlay_data)
+_ENDPOINT_KEYS = ('from_component', 'to_component')
+_ENDPOINT_ID_FIELDS = ('_element_id', 'db_component_id', 'hvac_component_id')
+
+
+def _default_journal_dir() -> str:
+    override = os.environ.get(AUTOSAVE_JOURNAL_DIR_ENV)
+    if override:
+        return override
+    try:
+        from utils import ensure_user_data_directory
+    except ImportError:
+        from src.utils import ensure_user_data_directory
+    return os.path.join(ensure_user_data_directory(), "autosave_journal")
+
+
+def journal_path_for(database_path: str, drawing_id: int, journal_dir: Optional[str] = None) -> str:
+    """Journal file of one drawing, keyed by database so projects never share one."""
+    database_key = hashlib.sha256(os.path.abspath(database_path).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(journal_dir or _default_journal_dir(), f"{database_key}_drawing_{drawing_id}.jsonl")
+
+
+def _json_safe(value):
+    """Copy of an overlay value holding only JSON types (Qt geometry becomes dicts)"""
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    if isinstance(value, dict):
+        return {str(key): _json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(item) for item in value]
+    if isinstance(value, QRect):
+        return {'x': value.x(), 'y': value.y(), 'width': value.width(), 'height': value.height()}
+    if isinstance(value, QPoint):
+        return {'x': value.x(), 'y': value.y()}
+    return None
+
+
+def snapshot_elements(overlay_data: Dict[str, list]) -> Tuple[Dict[str, list], List[dict]]:
+    """JSON-safe copy of overlay element lists, plus the live dicts in copy order.
+
+    Taken on the GUI thread so the worker never reads dicts the overlay is
+    still editing.
+    """
+    from models.drawing_elements import OVERLAY_ELEMENT_TYPES
+
+    elements: Dict[str, list] = {}
+    live: List[dict] = []
+    for kind in OVERLAY_ELEMENT_TYPES:
+        copies = []
+        for element in overlay_data.get(kind) or []:
+            copy = {}
+            for key, value in element.items():
+                if key in _ENDPOINT_KEYS and isinstance(value, dict):
+                    value = {field: value.get(field) for field in _ENDPOINT_ID_FIELDS}
+                copy[key] = _json_safe(value)
+            copies.append(copy)
+            live.append(element)
+        elements[kind] = copies
+    return elements, live
+
+
+def _operation_key(operation: dict) -> tuple:
+    if operation['op'] == 'page':
+        return ('page', operation['drawing_id'], operation['page_number'])
+    return ('drawing', operation['drawing_id'])
+
+
+class DrawingAutosaveQueue(QObject):
+    """Coalescing write-behind queue that persists drawing edits off the GUI thread"""
+
+    flushed = Signal(object)       # Summary dict: pages, elements
+    flush_failed = Signal(str)     # Error message; the operations stay queued
+    _row_ids_assigned = Signal(object)  # [(live element dict, row id)], applied on the GUI thread
+
+    def __init__(self, element_manager, journal_path: str, write_session=None,
+                 idle_delay: float = DEFAULT_IDLE_DELAY_S, max_delay: float = DEFAULT_MAX_DELAY_S,
+                 parent=None):
+        super().__init__(parent)
+        self.element_manager = element_manager
+        self.journal_path = journal_path
+        self.idle_delay = idle_delay
+        self.max_delay = max_delay
+        if write_session is None:
+            from models.database import write_session
+        self._write_session = write_session
+        self._cond = threading.Condition()
+        self._pending: "OrderedDict[tuple, dict]" = OrderedDict()
+        self._writing: set = set()  # Keys of the batch being written
+        self._live: Dict[tuple, List[dict]] = {}
+        self._unjournaled: List[dict] = []
+        self._first_pending_at: Optional[float] = None
+        self._last_enqueue_at = 0.0
+        self._retry_at = 0.0
+        self._flush_requested = False
+        self._flushing = False
+        self._stopping = False
+        self.flush_count = 0
+        self._row_ids_assigned.connect(self._apply_row_ids)
+
+        os.makedirs(os.path.dirname(journal_path) or '.', exist_ok=True)
+        self.recovered_count = self._load_journal()
+        if self.recovered_count:
+            self._flush_requested = True
+        self._thread = threading.Thread(target=self._run, name="drawing-autosave", daemon=True)
+        self._thread.start()
+
+    # ── Recording ────────────────────────────────────────────────────────────
+
+    def enqueue_page(self, drawing_id: int, project_id: int, page_number: int, overlay_data: Dict[str, list]):
+        """Queue a snapshot of one page's overlay elements."""
+        elements, live = snapshot_elements(overlay_data)
+        self._enqueue({'op': 'page', 'drawing_id': drawing_id, 'project_id': project_id,
+                       'page_number': page_number, 'elements': elements}, live)
+
+    def enqueue_drawing(self, drawing_id: int, fields: Dict[str, object]):
+        """Queue changed Drawing columns."""
+        fields = {name: _json_safe(value) for name, value in fields.items() if name in DRAWING_FIELDS}
+        if fields:
+            self._enqueue({'op': 'drawing', 'drawing_id': drawing_id, 'fields': fields})
+
+    def _enqueue(self, operation: dict, live: Optional[List[dict]] = None):
+        key = _operation_key(operation)
+        with self._cond:
+            self._merge(key, operation)
+            if live is not None:
+                self._live[key] = live
+            self._unjournaled.append(operation)
+            now = time.monotonic()
+            self._last_enqueue_at = now
+            if self._first_pending_at is None:
+                self._first_pending_at = now
+            self._cond.notify_all()
+
+    def _merge(self, key: tuple, operation: dict):
+        """Coalesce into the pending operations (caller holds the lock)."""
+        previous = self._pending.pop(key, None)
+        if previous is not None and operation['op'] == 'drawing':
+            operation = {**operation, 'fields': {**previous['fields'], **operation['fields']}}
+        self._pending[key] = operation
+
+    # ── Control ──────────────────────────────────────────────────────────────
+
+    def pending_count(self) -> int:
+        with self._cond:
+            return len(self._pending) + (1 if self._flushing else 0)
+
+    def page_pending(self, drawing_id: int, page_number: int) -> bool:
+        """Whether edits of one page are queued or being written."""
+        key = ('page', drawing_id, page_number)
+        with self._cond:
+            return key in self._pending or key in self._writing
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Write everything queued now and wait for it; False on timeout or a failed write."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            self._flush_requested = True
+            self._retry_at = 0.0
+            self._cond.notify_all()
+            while self._pending or self._flushing:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                if not self._flushing and self._retry_at:
+                    return False  # The last write failed; the operations stay queued
+                self._cond.wait(remaining)
+            return True
+
+    def shutdown(self, timeout: float = 10.0) -> bool:
+        """Flush what is queued and stop the worker thread."""
+        flushed = self.flush(timeout)
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        return flushed
+
+    # ── Journal ──────────────────────────────────────────────────────────────
+
+    def _load_journal(self) -> int:
+        """Queue operations left in the journal by a previous session."""
+        if not os.path.exists(self.journal_path):
+            return 0
+        recovered = 0
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    operation = json.loads(line)
+                    key = _operation_key(operation)
+                except (ValueError, KeyError, TypeError):
+                    # A torn final record from a crash mid-append
+                    logger.warning(f"Ignoring unreadable autosave journal record in {self.journal_path}")
+                    break
+                self._merge(key, operation)
+                recovered += 1
+        if self._pending:
+            self._first_pending_at = time.monotonic()
+            logger.info(f"Recovered {len(self._pending)} unsaved drawing edits from {self.journal_path}")
+        return recovered
+
+    def _append_journal(self, operations: List[dict]):
+        with open(self.journal_path, 'a', encoding='utf-8') as f:
+            for operation in operations:
+                f.write(json.dumps(operation, separators=(',', ':')))
+                f.write('\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _truncate_journal(self):
+        try:
+            with open(self.journal_path, 'w', encoding='utf-8') as f:
+                f.flush()
+                os.fsync(f.fileno())
+        except OSError as e:
+            logger.warning(f"Could not truncate autosave journal {self.journal_path}: {e}")
+
+    # ── Worker ───────────────────────────────────────────────────────────────
+
+    def _due_in(self, now: float) -> Optional[float]:
+        """Seconds until the pending operations should be written (caller holds the lock)."""
+        if not self._pending:
+            return None
+        if self._stopping and self._retry_at:
+            return None
+        if self._retry_at and not self._flush_requested:
+            return max(0.0, self._retry_at - now)
+        if self._flush_requested or self._stopping:
+            return 0.0
+        idle_due = self._last_enqueue_at + self.idle_delay
+        max_due = (self._first_pending_at or now) + self.max_delay
+        return max(0.0, min(idle_due, max_due) - now)
+
+    def _run(self):
+        while True:
+            records, batch, live = None, None, None
+            with self._cond:
+                while True:
+                    if self._unjournaled:
+                        records, self._unjournaled = self._unjournaled, []
+                        break
+                    due = self._due_in(time.monotonic())
+                    if due == 0.0:
+                        batch, self._pending = self._pending, OrderedDict()
+                        live, self._live = self._live, {}
+                        self._writing = set(batch)
+                        self._first_pending_at = None
+                        self._flush_requested = False
+                        self._flushing = True
+                        break
+                    if self._stopping:
+                        # Anything still pending failed to write and stays in the journal
+                        return
+                    self._cond.wait(due)
+
+            if records is not None:
+                try:
+                    self._append_journal(records)
+                except OSError as e:
+                    logger.warning(f"Could not write autosave journal {self.journal_path}: {e}")
+                continue
+
+            try:
+                summary, row_ids = self._write(batch, live)
+            except Exception as e:
+                logger.warning(f"Autosave of drawing edits failed: {e}")
+                with self._cond:
+                    # Newer edits queued during the write take precedence
+                    newer, self._pending = self._pending, batch
+                    for key, operation in newer.items():
+                        self._merge(key, operation)
+                    self._live = {**live, **self._live}
+                    self._first_pending_at = self._first_pending_at or time.monotonic()
+                    self._retry_at = time.monotonic() + RETRY_DELAY_S
+                    self._writing = set()
+                    self._flushing = False
+                    self._cond.notify_all()
+                self._emit(self.flush_failed, str(e))
+                continue
+
+            with self._cond:
+                self._writing = set()
+                self._flushing = False
+                self._retry_at = 0.0
+                self.flush_count += 1
+                if not self._pending and not self._unjournaled:
+                    self._truncate_journal()
+                self._cond.notify_all()
+            if row_ids:
+                self._emit(self._row_ids_assigned, row_ids)
+            self._emit(self.flushed, summary)
+
+    def _write(self, batch: "OrderedDict[tuple, dict]", live: Dict[tuple, List[dict]]):
+        """Apply coalesced operations in one transaction on the writer connection."""
+        from sqlalchemy import update
+        from models.drawing import Drawing
+
+        summary = {'pages': 0, 'elements': 0}
+        row_ids = []
+        with self._write_session() as session:
+            for key, operation in batch.items():
+                if operation['op'] == 'drawing':
+                    session.execute(
+                        update(Drawing).where(Drawing.id == operation['drawing_id']).values(**operation['fields'])
+                    )
+                    continue
+                elements = operation['elements']
+                summary['elements'] += self.element_manager.write_page_elements(
+                    session, operation['drawing_id'], operation['project_id'], elements,
+                    operation['page_number']
+                )
+                summary['pages'] += 1
+                copies = [copy for kind_copies in elements.values() for copy in kind_copies]
+                for element, copy in zip(live.get(key, ()), copies):
+                    row_id = copy.get('drawing_element_id')
+                    if row_id is not None and element.get('drawing_element_id') != row_id:
+                        row_ids.append((element, row_id))
+        return summary, row_ids
+
+    def _emit(self, signal, payload):
+        try:
+            signal.emit(payload)
+        except RuntimeError:
+            # The owning interface was destroyed without shutting us down
+            pass
+
+    def _apply_row_ids(self, row_ids):
+        for element, row_id in row_ids:
+            element['drawing_element_id'] = row_id
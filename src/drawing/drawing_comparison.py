@@ -4,10 +4,15 @@ Drawing comparison engine for detecting changes between drawing sets
 
 import json
 import math
-from typing import List, Dict
+from bisect import bisect_left, bisect_right
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
 from datetime import datetime
 from dataclasses import dataclass
 
+import numpy as np
+from scipy.spatial import cKDTree
+from sqlalchemy import insert
+
 from models import (
     get_session,
     DrawingSet,
@@ -18,6 +23,18 @@ from models import (
 from models.hvac import HVACComponent, HVACPath
 from models.drawing import Drawing
 from calculations import RT60Calculator, NoiseCalculator
+from drawing.assignment import solve_sparse_assignment
+
+# Weights of the space similarity score (see _calculate_space_similarity)
+SPACE_NAME_WEIGHT = 0.3
+SPACE_AREA_WEIGHT = 0.5
+SPACE_HEIGHT_WEIGHT = 0.2
+
+# Change items written (and reported to the progress callback) per transaction
+CHANGE_ITEM_CHUNK_SIZE = 500
+
+# progress_callback(percent, message, committed change rows)
+ProgressCallback = Callable[[int, str, List[dict]], None]
 
 
 @dataclass
@@ -41,11 +58,21 @@ class DrawingComparisonEngine:
         self.AREA_TOLERANCE = 0.1  # 10% area difference
         self.SIMILARITY_THRESHOLD = 0.7  # Minimum similarity for matching
     
-    def compare_drawing_sets(self, base_set_id: int, compare_set_id: int) -> DrawingComparison:
+    def compare_drawing_sets(self, base_set_id: int, compare_set_id: int,
+                             progress_callback: Optional[ProgressCallback] = None,
+                             chunk_size: int = CHANGE_ITEM_CHUNK_SIZE) -> DrawingComparison:
         """
         Compare two drawing sets and return detailed comparison
+        
+        Change items are bulk-inserted and committed in chunks as each stage
+        finishes, so partial results are readable while the comparison runs.
+        progress_callback(percent, message, rows) receives each committed chunk
+        as plain row dicts (with their new IDs); it is called with rows=[] for
+        stage-only updates.
         """
+        report = progress_callback or (lambda percent, message, rows: None)
         session = get_session()
+        comparison_id = None
         try:
             base_set = session.query(DrawingSet).filter(DrawingSet.id == base_set_id).first()
             compare_set = session.query(DrawingSet).filter(DrawingSet.id == compare_set_id).first()
@@ -61,88 +88,136 @@ class DrawingComparisonEngine:
                 comparison_date=datetime.utcnow(),
             )
             session.add(comparison)
-            session.flush()  # Get ID
+            session.commit()  # Readers can find the comparison while changes stream in
+            comparison_id = comparison.id
+            
+            # Running summary instead of keeping every change in memory
+            totals = {'total_changes': 0, 'space_changes': 0, 'hvac_changes': 0,
+                      'path_changes': 0, 'critical_changes': 0, 'impact': 0.0}
+            report(5, "Initializing comparison...", [])
             
-            # Collect all changes
-            all_changes: List[Dict] = []
+            # Sheets are paired across sets by drawing name and page
+            page_keys = self._get_page_keys(session, [base_set_id, compare_set_id])
             
             # 1. Compare spaces
+            report(10, "Analyzing spaces...", [])
             base_spaces = self._get_spaces_for_set(session, base_set_id)
             compare_spaces = self._get_spaces_for_set(session, compare_set_id)
-            space_changes = self.detect_space_changes(base_spaces, compare_spaces)
-            all_changes.extend(space_changes)
+            space_changes = self.detect_space_changes(base_spaces, compare_spaces, page_keys)
+            del base_spaces, compare_spaces
+            self._persist_changes(session, comparison_id, space_changes, totals, chunk_size,
+                                  report, (20, 35), "Saving space changes")
+            del space_changes
             
             # 2. Compare HVAC components
+            report(40, "Detecting HVAC changes...", [])
             base_hvac = self._get_hvac_components_for_set(session, base_set_id)
             compare_hvac = self._get_hvac_components_for_set(session, compare_set_id)
-            hvac_changes = self.detect_hvac_changes(base_hvac, compare_hvac)
-            all_changes.extend(hvac_changes)
+            hvac_changes = self.detect_hvac_changes(base_hvac, compare_hvac, page_keys)
+            del base_hvac, compare_hvac
+            self._persist_changes(session, comparison_id, hvac_changes, totals, chunk_size,
+                                  report, (50, 70), "Saving HVAC changes")
+            del hvac_changes
             
             # 3. Compare HVAC paths
+            report(75, "Comparing HVAC paths...", [])
             base_paths = self._get_hvac_paths_for_set(session, base_set_id)
             compare_paths = self._get_hvac_paths_for_set(session, compare_set_id)
             path_changes = self.detect_path_changes(base_paths, compare_paths)
-            all_changes.extend(path_changes)
-            
-            # Create change items and analyze acoustic impact
-            critical_changes = 0
-            total_acoustic_impact = 0.0
-            
-            for change_data in all_changes:
-                change_item = ChangeItem(
-                    comparison_id=comparison.id,
-                    element_type=change_data['element_type'],
-                    change_type=change_data['change_type'],
-                    base_element_id=change_data.get('base_element_id'),
-                    compare_element_id=change_data.get('compare_element_id'),
-                    change_details=json.dumps(change_data['details']),
-                    drawing_id=change_data.get('drawing_id'),
-                    x_position=change_data.get('x_position'),
-                    y_position=change_data.get('y_position'),
-                    area_change=change_data.get('area_change'),
-                    position_delta=change_data.get('position_delta'),
-                )
-                
-                # Analyze acoustic impact
-                acoustic_impact = self.analyze_acoustic_impact(change_data)
-                change_item.acoustic_impact = json.dumps(acoustic_impact)
-                change_item.severity = acoustic_impact.get('severity', 'medium')
-                
-                if change_item.severity == 'critical':
-                    critical_changes += 1
-                
-                session.add(change_item)
-                total_acoustic_impact += acoustic_impact.get('impact_score', 0)
+            self._persist_changes(session, comparison_id, path_changes, totals, chunk_size,
+                                  report, (80, 95), "Saving path changes")
             
             # Update comparison summary
-            comparison.total_changes = len(all_changes)
-            comparison.critical_changes = critical_changes
-            comparison.acoustic_impact_score = total_acoustic_impact / max(len(all_changes), 1)
+            total = totals['total_changes']
+            comparison.total_changes = total
+            comparison.critical_changes = totals['critical_changes']
+            comparison.acoustic_impact_score = totals['impact'] / max(total, 1)
             comparison.comparison_results = json.dumps({
                 'summary': {
-                    'total_changes': len(all_changes),
-                    'space_changes': len([c for c in all_changes if c['element_type'] == 'space']),
-                    'hvac_changes': len([c for c in all_changes if c['element_type'] == 'hvac_component']),
-                    'path_changes': len([c for c in all_changes if c['element_type'] == 'hvac_path']),
-                    'critical_changes': critical_changes,
+                    'total_changes': total,
+                    'space_changes': totals['space_changes'],
+                    'hvac_changes': totals['hvac_changes'],
+                    'path_changes': totals['path_changes'],
+                    'critical_changes': totals['critical_changes'],
                 }
             })
             
             session.commit()
+            report(100, "Comparison complete!", [])
             return comparison
             
         except Exception:
             session.rollback()
+            # Chunks are already committed; remove the partial comparison
+            if comparison_id is not None:
+                try:
+                    session.query(ChangeItem).filter(ChangeItem.comparison_id == comparison_id).delete()
+                    session.query(DrawingComparison).filter(DrawingComparison.id == comparison_id).delete()
+                    session.commit()
+                except Exception:
+                    session.rollback()
             raise
         finally:
             session.close()
     
-    def detect_space_changes(self, base_spaces: List[Space], compare_spaces: List[Space]) -> List[dict]:
-        """Detect changes in room layouts and spaces"""
+    def _persist_changes(self, session, comparison_id: int, changes: List[dict], totals: dict,
+                         chunk_size: int, report: ProgressCallback, progress_range: Tuple[int, int],
+                         message: str):
+        """Bulk-insert change rows in committed chunks and update the running summary"""
+        start, end = progress_range
+        chunk_size = max(1, chunk_size)
+        summary_keys = {'space': 'space_changes', 'hvac_component': 'hvac_changes', 'hvac_path': 'path_changes'}
+        
+        for offset in range(0, len(changes), chunk_size):
+            rows = []
+            for change_data in changes[offset:offset + chunk_size]:
+                # Analyze acoustic impact
+                acoustic_impact = self.analyze_acoustic_impact(change_data)
+                severity = acoustic_impact.get('severity', 'medium')
+                rows.append({
+                    'comparison_id': comparison_id,
+                    'element_type': change_data['element_type'],
+                    'change_type': change_data['change_type'],
+                    'base_element_id': change_data.get('base_element_id'),
+                    'compare_element_id': change_data.get('compare_element_id'),
+                    'change_details': json.dumps(change_data['details']),
+                    'acoustic_impact': json.dumps(acoustic_impact),
+                    'severity': severity,
+                    'drawing_id': change_data.get('drawing_id'),
+                    'x_position': change_data.get('x_position'),
+                    'y_position': change_data.get('y_position'),
+                    'area_change': change_data.get('area_change'),
+                    'position_delta': change_data.get('position_delta'),
+                })
+                
+                totals['total_changes'] += 1
+                summary_key = summary_keys.get(change_data['element_type'])
+                if summary_key:
+                    totals[summary_key] += 1
+                if severity == 'critical':
+                    totals['critical_changes'] += 1
+                totals['impact'] += acoustic_impact.get('impact_score', 0)
+            
+            ids = session.scalars(insert(ChangeItem).returning(ChangeItem.id, sort_by_parameter_order=True), rows).all()
+            session.commit()
+            for row, change_id in zip(rows, ids):
+                row['id'] = change_id
+            
+            done = min(offset + chunk_size, len(changes))
+            percent = start + int((end - start) * done / len(changes))
+            report(percent, f"{message} ({done}/{len(changes)})...", rows)
+    
+    def detect_space_changes(self, base_spaces: List[Space], compare_spaces: List[Space],
+                             page_keys: Optional[Dict[int, Hashable]] = None) -> List[dict]:
+        """Detect changes in room layouts and spaces
+        
+        page_keys maps drawing IDs to a sheet key shared across sets; when given,
+        spaces are only matched against spaces on the same sheet.
+        """
         changes: List[dict] = []
         
         # Match spaces using geometric similarity
-        matches = self._match_spaces_by_geometry(base_spaces, compare_spaces)
+        matches = self._match_spaces_by_geometry(base_spaces, compare_spaces, page_keys)
         
         # Track which spaces have been matched
         matched_base = set()
@@ -206,12 +281,17 @@ class DrawingComparisonEngine:
         
         return changes
     
-    def detect_hvac_changes(self, base_components: List[HVACComponent], compare_components: List[HVACComponent]) -> List[dict]:
-        """Detect changes in HVAC components"""
+    def detect_hvac_changes(self, base_components: List[HVACComponent], compare_components: List[HVACComponent],
+                            page_keys: Optional[Dict[int, Hashable]] = None) -> List[dict]:
+        """Detect changes in HVAC components
+        
+        page_keys maps drawing IDs to a sheet key shared across sets; when given,
+        components are only matched against components on the same sheet and page.
+        """
         changes: List[dict] = []
         
         # Match HVAC components by position and type
-        matches = self._match_hvac_by_position(base_components, compare_components)
+        matches = self._match_hvac_by_position(base_components, compare_components, page_keys)
         
         matched_base = set()
         matched_compare = set()
@@ -285,7 +365,7 @@ class DrawingComparisonEngine:
         compare_path_names = {path.name: path for path in compare_paths if getattr(path, 'name', None)}
         
         # Find modifications
-        for name in base_path_names.keys() & compare_path_names.keys():
+        for name in sorted(base_path_names.keys() & compare_path_names.keys()):
             base_path = base_path_names[name]
             compare_path = compare_path_names[name]
             
@@ -318,7 +398,7 @@ class DrawingComparisonEngine:
                 })
         
         # Additions
-        for name in compare_path_names.keys() - base_path_names.keys():
+        for name in sorted(compare_path_names.keys() - base_path_names.keys()):
             path = compare_path_names[name]
             changes.append({
                 'element_type': 'hvac_path',
@@ -332,7 +412,7 @@ class DrawingComparisonEngine:
             })
         
         # Removals
-        for name in base_path_names.keys() - compare_path_names.keys():
+        for name in sorted(base_path_names.keys() - compare_path_names.keys()):
             path = base_path_names[name]
             changes.append({
                 'element_type': 'hvac_path',
@@ -403,56 +483,157 @@ class DrawingComparisonEngine:
         project_id = session.query(DrawingSet.project_id).filter(DrawingSet.id == set_id).scalar()
         return session.query(HVACPath).filter(HVACPath.project_id == project_id).all()
     
-    def _match_spaces_by_geometry(self, base_spaces: List[Space], compare_spaces: List[Space]) -> List[GeometricMatch]:
-        """Match spaces between sets using simple similarity"""
-        matches: List[GeometricMatch] = []
-        
-        for base_space in base_spaces:
-            best_match = None
-            best_score = 0.0
-            
-            for compare_space in compare_spaces:
-                score = self._calculate_space_similarity(base_space, compare_space)
-                if score > best_score:
-                    best_score = score
-                    best_match = compare_space
-            
-            if best_match and best_score > 0:
-                geometric_changes = self._detect_space_geometric_changes(base_space, best_match)
-                matches.append(GeometricMatch(
-                    base_element=base_space,
-                    compare_element=best_match,
-                    similarity_score=best_score,
-                    geometric_changes=geometric_changes,
-                ))
+    def _get_page_keys(self, session, set_ids: List[int]) -> Dict[int, Hashable]:
+        """Map drawing IDs in the given sets to a (name, page) key shared by revisions of a sheet"""
+        drawings = (
+            session.query(Drawing.id, Drawing.name, Drawing.page_number)
+            .filter(Drawing.drawing_set_id.in_(set_ids))
+            .all()
+        )
+        return {
+            drawing_id: ((name or '').strip().lower(), page_number or 1)
+            for drawing_id, name, page_number in drawings
+        }
+    
+    def _group_by_page(self, base_elements: list, compare_elements: list,
+                       page_key: Callable[[object], Hashable]) -> List[Tuple[List[int], List[int]]]:
+        """Split element indexes into per-sheet groups to match independently
         
-        return matches
+        Sheets present in only one set (renamed or unpaired drawings) share a
+        single fallback group so their elements can still match each other.
+        """
+        base_groups: Dict[Hashable, List[int]] = {}
+        compare_groups: Dict[Hashable, List[int]] = {}
+        for i, element in enumerate(base_elements):
+            base_groups.setdefault(page_key(element), []).append(i)
+        for j, element in enumerate(compare_elements):
+            compare_groups.setdefault(page_key(element), []).append(j)
+        
+        groups: List[Tuple[List[int], List[int]]] = []
+        unpaired_base: List[int] = []
+        unpaired_compare: List[int] = []
+        for key, indexes in base_groups.items():
+            if key is not None and key in compare_groups:
+                groups.append((indexes, compare_groups[key]))
+            else:
+                unpaired_base.extend(indexes)
+        for key, indexes in compare_groups.items():
+            if key is None or key not in base_groups:
+                unpaired_compare.extend(indexes)
+        if unpaired_base and unpaired_compare:
+            groups.append((sorted(unpaired_base), sorted(unpaired_compare)))
+        return groups
     
-    def _match_hvac_by_position(self, base_components: List[HVACComponent], compare_components: List[HVACComponent]) -> List[GeometricMatch]:
-        """Match HVAC components by position and type"""
+    def _assign_matches(self, base_elements: list, compare_elements: list,
+                        scores: Dict[Tuple[int, int], float], detect_changes) -> List[GeometricMatch]:
+        """One-to-one matches maximizing total similarity over the scored pairs"""
+        assignment = solve_sparse_assignment({pair: -score for pair, score in scores.items()})
         matches: List[GeometricMatch] = []
+        for i, j in sorted(assignment.items()):
+            base_element, compare_element = base_elements[i], compare_elements[j]
+            matches.append(GeometricMatch(
+                base_element=base_element,
+                compare_element=compare_element,
+                similarity_score=scores[(i, j)],
+                geometric_changes=detect_changes(base_element, compare_element),
+            ))
+        return matches
+    
+    def _match_spaces_by_geometry(self, base_spaces: List[Space], compare_spaces: List[Space],
+                                  page_keys: Optional[Dict[int, Hashable]] = None) -> List[GeometricMatch]:
+        """Match spaces one-to-one within each sheet
         
-        for base_comp in base_components:
-            best_match = None
-            best_score = 0.0
+        A pair can only reach SIMILARITY_THRESHOLD if its area ratio is high
+        enough given whether the names agree, so candidates come from a sorted
+        area window plus a same-name bucket instead of every compare space.
+        """
+        page_key = (lambda space: page_keys.get(space.drawing_id)) if page_keys else (lambda space: None)
+        threshold = self.SIMILARITY_THRESHOLD
+        # Minimum min/max area ratio a pair needs, assuming full height similarity
+        ratio_other_name = (threshold - SPACE_HEIGHT_WEIGHT) / SPACE_AREA_WEIGHT
+        ratio_same_name = (threshold - SPACE_HEIGHT_WEIGHT - SPACE_NAME_WEIGHT) / SPACE_AREA_WEIGHT
+        
+        scores: Dict[Tuple[int, int], float] = {}
+        for base_indexes, compare_indexes in self._group_by_page(base_spaces, compare_spaces, page_key):
+            by_area = sorted((compare_spaces[j].floor_area, j) for j in compare_indexes if compare_spaces[j].floor_area)
+            areas = [area for area, _j in by_area]
+            by_name: Dict[str, List[int]] = {}
+            for j in compare_indexes:
+                if compare_spaces[j].name:
+                    by_name.setdefault(compare_spaces[j].name.lower(), []).append(j)
             
-            for compare_comp in compare_components:
-                if base_comp.component_type == compare_comp.component_type:
-                    score = self._calculate_component_similarity(base_comp, compare_comp)
-                    if score > best_score:
-                        best_score = score
-                        best_match = compare_comp
+            for i in base_indexes:
+                base_space = base_spaces[i]
+                if ratio_other_name <= 0:
+                    candidates = set(compare_indexes)
+                else:
+                    candidates = set()
+                    area = base_space.floor_area
+                    if area:
+                        lo = bisect_left(areas, area * ratio_other_name * (1 - 1e-9))
+                        hi = bisect_right(areas, area / ratio_other_name * (1 + 1e-9))
+                        candidates.update(j for _area, j in by_area[lo:hi])
+                    if base_space.name:
+                        same_name = by_name.get(base_space.name.lower(), [])
+                        if ratio_same_name <= 0:
+                            candidates.update(same_name)
+                        elif area:
+                            candidates.update(
+                                j for j in same_name
+                                if compare_spaces[j].floor_area and
+                                min(area, compare_spaces[j].floor_area) / max(area, compare_spaces[j].floor_area)
+                                >= ratio_same_name * (1 - 1e-9)
+                            )
+                for j in candidates:
+                    score = self._calculate_space_similarity(base_space, compare_spaces[j])
+                    if score >= threshold:
+                        scores[(i, j)] = score
+        
+        return self._assign_matches(base_spaces, compare_spaces, scores, self._detect_space_geometric_changes)
+    
+    def _match_hvac_by_position(self, base_components: List[HVACComponent], compare_components: List[HVACComponent],
+                                page_keys: Optional[Dict[int, Hashable]] = None) -> List[GeometricMatch]:
+        """Match HVAC components one-to-one by position within each sheet, page and type"""
+        def page_key(comp):
+            if not page_keys or comp.drawing_id not in page_keys:
+                return None
+            return (page_keys[comp.drawing_id], getattr(comp, 'page_number', None) or 1)
+        
+        threshold = self.SIMILARITY_THRESHOLD
+        # Similarity falls linearly with distance, so only this radius can reach the threshold
+        radius = (1.0 - threshold) * self.POSITION_TOLERANCE
+        
+        def positioned(comp) -> bool:
+            return comp.x_position is not None and comp.y_position is not None
+        
+        scores: Dict[Tuple[int, int], float] = {}
+        for base_indexes, compare_indexes in self._group_by_page(base_components, compare_components, page_key):
+            compare_by_type: Dict[str, List[int]] = {}
+            for j in compare_indexes:
+                if positioned(compare_components[j]):
+                    compare_by_type.setdefault(compare_components[j].component_type, []).append(j)
+            base_by_type: Dict[str, List[int]] = {}
+            for i in base_indexes:
+                if positioned(base_components[i]):
+                    base_by_type.setdefault(base_components[i].component_type, []).append(i)
             
-            if best_match and best_score > 0:
-                geometric_changes = self._detect_component_geometric_changes(base_comp, best_match)
-                matches.append(GeometricMatch(
-                    base_element=base_comp,
-                    compare_element=best_match,
-                    similarity_score=best_score,
-                    geometric_changes=geometric_changes,
-                ))
-        
-        return matches
+            for component_type, type_base in base_by_type.items():
+                type_compare = compare_by_type.get(component_type)
+                if not type_compare:
+                    continue
+                tree = cKDTree(np.array([(compare_components[j].x_position, compare_components[j].y_position)
+                                         for j in type_compare], dtype=float))
+                points = np.array([(base_components[i].x_position, base_components[i].y_position)
+                                   for i in type_base], dtype=float)
+                for i, hits in zip(type_base, tree.query_ball_point(points, radius * (1 + 1e-9) + 1e-9)):
+                    for hit in hits:
+                        j = type_compare[hit]
+                        score = self._calculate_component_similarity(base_components[i], compare_components[j])
+                        if score >= threshold:
+                            scores[(i, j)] = score
+        
+        return self._assign_matches(base_components, compare_components, scores,
+                                    self._detect_component_geometric_changes)
     
     def _calculate_space_similarity(self, space1: Space, space2: Space) -> float:
         """Calculate similarity score between two spaces (0-1)"""
@@ -461,20 +642,20 @@ class DrawingComparisonEngine:
         # Name similarity (30% weight)
         if space1.name and space2.name:
             name_score = 1.0 if space1.name.lower() == space2.name.lower() else 0.0
-            score += 0.3 * name_score
+            score += SPACE_NAME_WEIGHT * name_score
         
         # Area similarity (50% weight)
         if space1.floor_area and space2.floor_area:
             area_diff = abs(space1.floor_area - space2.floor_area)
             max_area = max(space1.floor_area, space2.floor_area)
             area_score = max(0.0, 1.0 - (area_diff / max_area))
-            score += 0.5 * area_score
+            score += SPACE_AREA_WEIGHT * area_score
         
         # Height similarity (20% weight)
         if space1.ceiling_height and space2.ceiling_height:
             height_diff = abs(space1.ceiling_height - space2.ceiling_height)
             height_score = max(0.0, 1.0 - (height_diff / 20.0))  # 20ft max difference
-            score += 0.2 * height_score
+            score += SPACE_HEIGHT_WEIGHT * height_score
         
         return score
     
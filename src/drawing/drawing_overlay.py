@@ -1,9 +1,20 @@
 from typing import Union, Optional
 from PySide6.QtWidgets import QWidget
 from PySide6.QtCore import Qt, QPoint, Signal, QRect, QTimer
-from PySide6.QtGui import QPainter, QPen, QBrush, QColor, QFont
+from PySide6.QtGui import QPainter, QPen, QBrush, QColor, QFont, QFontMetrics, QPicture, QRegion
 from drawing.drawing_tools import DrawingToolManager, ToolType
 from drawing.scale_manager import ScaleManager
+from drawing.overlay_geometry import OverlayGeometry
+from drawing.spatial_index import (DEFAULT_CELL_SIZE, GridIndex, PathMembershipIndex,
+                                   component_bounds, segment_bounds, rectangle_bounds, polygon_bounds)
+
+# Element list attribute for each spatially indexed element kind
+_INDEXED_LISTS = {
+    'component': 'components',
+    'segment': 'segments',
+    'rectangle': 'rectangles',
+    'polygon': 'polygons',
+}
 
 
 class DrawingOverlay(QWidget):
@@ -11,6 +22,7 @@ class DrawingOverlay(QWidget):
     
     # Signals
     element_created = Signal(dict)            # New drawing element created
+    elements_changed = Signal()               # Saved elements were added, moved or removed
     coordinates_clicked = Signal(float, float)  # Raw coordinates clicked
     measurement_taken = Signal(float, str)    # Measurement in real units
     element_double_clicked = Signal(dict)     # Emitted on double-click of an element
@@ -37,11 +49,7 @@ class DrawingOverlay(QWidget):
 
         # Zoom/base caches
         self._current_zoom_factor = 1.0
-        self._base_rectangles: list[dict] = []
-        self._base_polygons: list[dict] = []
-        self._base_components: list[dict] = []
-        self._base_segments: list[dict] = []
-        self._base_measurements: list[dict] = []
+        self._base_geometry = OverlayGeometry()
         self._base_dirty = True
         
         # Elements
@@ -53,6 +61,31 @@ class DrawingOverlay(QWidget):
         self.visible_paths: dict[int, bool] = {}
         self.hidden_paths: set[int] = set()  # Paths explicitly hidden by user
         self.path_element_mapping: dict[int, dict] = {}
+
+        # Grid indexes over on-screen bounds for hit-testing and rubber-band selection
+        self._spatial_indexes: dict[str, GridIndex] = {
+            'component': GridIndex(component_bounds),
+            'segment': GridIndex(segment_bounds),
+            'rectangle': GridIndex(rectangle_bounds),
+            'polygon': GridIndex(polygon_bounds),
+        }
+        # Membership of elements in the visible paths, rebuilt when paths,
+        # registrations or element geometry change (see _visible_path_membership)
+        self._path_membership: Optional[PathMembershipIndex] = None
+        self._path_membership_key = None
+        self._geometry_version = 0
+
+        # Layered painting: saved elements are recorded once into a QPicture and
+        # replayed; selection, tool previews and highlights are painted on top
+        # and repainted through dirty regions (see _refresh_dynamic_layer)
+        self._static_layer: Optional[QPicture] = None
+        self._static_layer_key = None
+        self._static_version = 0
+        self._dynamic_region = QRegion()
+        self._analysis_targets_cache = None
+        self._label_font = QFont("Arial", 8)
+        self._title_font = QFont("Arial", 9, QFont.Bold)
+        self._label_metrics = QFontMetrics(self._label_font)
         
         # Protection flag to prevent clearing during save operations
         self._clearing_disabled = False
@@ -81,6 +114,12 @@ class DrawingOverlay(QWidget):
         # {'type': 'segment'|'component', 'ref': dict, 'endpoint': 'start'|'end'|None}
         self._hit_target: Optional[dict] = None
         self._select_modifiers = Qt.NoModifier
+        # Elements moved by the current drag are painted on the dynamic layer and
+        # left out of the static one, which keeps the geometry key it was recorded
+        # with until release (see _begin_drag_layer)
+        self._drag_components: list[dict] = []
+        self._drag_segments: list[dict] = []
+        self._drag_geometry_key = None
         # Snapping threshold in pixels
         self._snap_threshold_px: int = 20
 
@@ -125,9 +164,10 @@ class DrawingOverlay(QWidget):
         """Provide visible components to snapping logic."""
         # In path_only_mode, filter to only components in visible paths
         if self.path_only_mode:
+            membership = self._visible_path_membership()
             visible_components = [
                 c for c in self.components
-                if self._is_component_in_visible_path(c)
+                if membership.contains_component(c)
             ]
             self.tool_manager.set_available_components(visible_components)
         else:
@@ -154,6 +194,14 @@ class DrawingOverlay(QWidget):
         except Exception as e:
             print(f"DEBUG: Error setting up component tool duplicate checker: {e}")
 
+    @staticmethod
+    def _element_base_zoom(kind: str, element: dict, default_zoom: float) -> float:
+        """Zoom an element's current coordinates were drawn at."""
+        # Components and segments carry the zoom they were drawn or saved at
+        if kind in ('component', 'segment'):
+            return element.get('saved_zoom') or default_zoom
+        return default_zoom
+
     def set_zoom_factor(self, zoom_factor: float):
         """Recompute on-screen coordinates from base geometry at given zoom."""
         try:
@@ -161,194 +209,18 @@ class DrawingOverlay(QWidget):
                 return
             z = zoom_factor
 
-            # Build base caches when dirty/empty
-            if self._base_dirty or not (self._base_rectangles or self._base_polygons or self._base_components or self._base_segments or self._base_measurements):
+            # Re-capture base geometry when elements were added, removed or edited;
+            # unchanged elements keep their exact (unrounded) base coordinates
+            if self._base_dirty or self._base_geometry.is_stale(self):
                 cur_z = self._current_zoom_factor or 1.0
-                self._base_rectangles = []
-                self._base_polygons = []
-                self._base_components = []
-                self._base_segments = []
-                self._base_measurements = []
-
-                # Rectangles - FIX: Use round() instead of int() to minimize cumulative truncation drift
-                for r in self.rectangles:
-                    b = r.get('bounds')
-                    if isinstance(b, dict):
-                        base_bounds = {
-                            'x': round(b.get('x', 0) / cur_z),
-                            'y': round(b.get('y', 0) / cur_z),
-                            'width': round(b.get('width', 0) / cur_z),
-                            'height': round(b.get('height', 0) / cur_z),
-                        }
-                    elif isinstance(b, QRect):
-                        base_bounds = {
-                            'x': round(b.x() / cur_z),
-                            'y': round(b.y() / cur_z),
-                            'width': round(b.width() / cur_z),
-                            'height': round(b.height() / cur_z),
-                        }
-                    else:
-                        base_bounds = None
-
-                    self._base_rectangles.append({
-                        **r,
-                        'x': round(r.get('x', 0) / cur_z),
-                        'y': round(r.get('y', 0) / cur_z),
-                        'width': round(r.get('width', 0) / cur_z),
-                        'height': round(r.get('height', 0) / cur_z),
-                        'bounds': base_bounds or r.get('bounds')
-                    })
-
-                # Components - use saved_zoom if available, else cur_z
-                for c in self.components:
-                    elem_z = c.get('saved_zoom') or cur_z
-                    if elem_z <= 0:
-                        elem_z = 1.0  # Prevent division by zero or negative
-                    bc = c.copy()
-                    # FIX: Use round() instead of int() to minimize cumulative truncation drift
-                    bc['x'] = round(c.get('x', 0) / elem_z)
-                    bc['y'] = round(c.get('y', 0) / elem_z)
-                    if isinstance(c.get('position'), dict):
-                        bc['position'] = {
-                            'x': round(c['position'].get('x', 0) / elem_z),
-                            'y': round(c['position'].get('y', 0) / elem_z),
-                        }
-                    self._base_components.append(bc)
-
-                # Segments - use saved_zoom if available, else cur_z
-                for s in self.segments:
-                    elem_z = s.get('saved_zoom') or cur_z
-                    bs = s.copy()
-                    # FIX: Use round() instead of int() to minimize cumulative truncation drift
-                    bs['start_x'] = round(s.get('start_x', 0) / elem_z)
-                    bs['start_y'] = round(s.get('start_y', 0) / elem_z)
-                    bs['end_x'] = round(s.get('end_x', 0) / elem_z)
-                    bs['end_y'] = round(s.get('end_y', 0) / elem_z)
-                    lp = s.get('length_pixels', None)
-                    bs['length_pixels'] = (lp if lp is not None else 0) / elem_z
-                    self._base_segments.append(bs)
-
-                # Measurements - FIX: Use round() instead of int() to minimize cumulative truncation drift
-                for m in self.measurements:
-                    bm = m.copy()
-                    bm['start_x'] = round(m.get('start_x', 0) / cur_z)
-                    bm['start_y'] = round(m.get('start_y', 0) / cur_z)
-                    bm['end_x'] = round(m.get('end_x', 0) / cur_z)
-                    bm['end_y'] = round(m.get('end_y', 0) / cur_z)
-                    lp = m.get('length_pixels', None)
-                    bm['length_pixels'] = (lp if lp is not None else 0) / cur_z
-                    self._base_measurements.append(bm)
-
-                # Polygons - FIX: Use round() instead of int() to minimize cumulative truncation drift
-                for poly in self.polygons:
-                    bp = poly.copy()
-                    pts = []
-                    for p in poly.get('points', []) or []:
-                        pts.append({'x': round(p.get('x', 0) / cur_z), 'y': round(p.get('y', 0) / cur_z)})
-                    bp['points'] = pts
-                    b = poly.get('bounds')
-                    if isinstance(b, dict):
-                        bp['bounds'] = {
-                            'x': round(b.get('x', 0) / cur_z),
-                            'y': round(b.get('y', 0) / cur_z),
-                            'width': round(b.get('width', 0) / cur_z),
-                            'height': round(b.get('height', 0) / cur_z),
-                        }
-                    self._base_polygons.append(bp)
-
-            # Helper distance
-            def _len_px(x1, y1, x2, y2) -> float:
-                dx, dy = x2 - x1, y2 - y1
-                return (dx * dx + dy * dy) ** 0.5
-
-            # Project base → current - FIX: Use round() instead of int() to minimize cumulative truncation drift
-            for i, br in enumerate(self._base_rectangles):
-                if i < len(self.rectangles):
-                    r = self.rectangles[i]
-                    r['x'] = round(br.get('x', 0) * z)
-                    r['y'] = round(br.get('y', 0) * z)
-                    r['width'] = round(br.get('width', 0) * z)
-                    r['height'] = round(br.get('height', 0) * z)
-                    b = br.get('bounds')
-                    if isinstance(b, dict):
-                        from PySide6.QtCore import QRect as _QRect
-                        r['bounds'] = _QRect(
-                            round(b.get('x', 0) * z),
-                            round(b.get('y', 0) * z),
-                            round(b.get('width', 0) * z),
-                            round(b.get('height', 0) * z),
-                        )
-
-            for i, bc in enumerate(self._base_components):
-                if i < len(self.components):
-                    c = self.components[i]
-                    # Use round() instead of int() to minimize cumulative truncation drift
-                    c['x'] = round(bc.get('x', 0) * z)
-                    c['y'] = round(bc.get('y', 0) * z)
-                    # Update saved_zoom to match current zoom after scaling
-                    # This ensures base cache rebuilds use correct divisor
-                    c['saved_zoom'] = z
-                    if isinstance(c.get('position'), dict) and isinstance(bc.get('position'), dict):
-                        c['position']['x'] = round(bc['position'].get('x', 0) * z)
-                        c['position']['y'] = round(bc['position'].get('y', 0) * z)
-
-            for i, bs in enumerate(self._base_segments):
-                if i < len(self.segments):
-                    s = self.segments[i]
-                    # FIX: Use round() instead of int() to minimize cumulative truncation drift
-                    s['start_x'] = round(bs.get('start_x', 0) * z)
-                    s['start_y'] = round(bs.get('start_y', 0) * z)
-                    s['end_x'] = round(bs.get('end_x', 0) * z)
-                    s['end_y'] = round(bs.get('end_y', 0) * z)
-                    # FIX H4: Update saved_zoom to match current zoom after scaling
-                    s['saved_zoom'] = z
-                    lp = _len_px(s['start_x'], s['start_y'], s['end_x'], s['end_y'])
-                    s['length_pixels'] = lp
-                    try:
-                        lr = self.scale_manager.pixels_to_real(lp)
-                        s['length_real'] = lr
-                        s['length_formatted'] = self.scale_manager.format_distance(lr)
-                    except Exception:
-                        pass
-
-            for i, bm in enumerate(self._base_measurements):
-                if i < len(self.measurements):
-                    m = self.measurements[i]
-                    # FIX: Use round() instead of int() to minimize cumulative truncation drift
-                    m['start_x'] = round(bm.get('start_x', 0) * z)
-                    m['start_y'] = round(bm.get('start_y', 0) * z)
-                    m['end_x'] = round(bm.get('end_x', 0) * z)
-                    m['end_y'] = round(bm.get('end_y', 0) * z)
-                    # FIX H4: Update saved_zoom to match current zoom after scaling
-                    m['saved_zoom'] = z
-                    lp = _len_px(m['start_x'], m['start_y'], m['end_x'], m['end_y'])
-                    m['length_pixels'] = lp
-                    try:
-                        lr = self.scale_manager.pixels_to_real(lp)
-                        m['length_real'] = lr
-                        m['length_formatted'] = self.scale_manager.format_distance(lr)
-                    except Exception:
-                        pass
+                self._base_geometry.capture_all(self, lambda kind, e: self._element_base_zoom(kind, e, cur_z))
+                self._base_dirty = False
 
-            # Polygons - FIX: Use round() instead of int() to minimize cumulative truncation drift
-            for i, bp in enumerate(self._base_polygons):
-                if i < len(self.polygons):
-                    p = self.polygons[i]
-                    b = bp.get('bounds')
-                    if isinstance(b, dict):
-                        from PySide6.QtCore import QRect as _QRect
-                        p['bounds'] = _QRect(
-                            round(b.get('x', 0) * z),
-                            round(b.get('y', 0) * z),
-                            round(b.get('width', 0) * z),
-                            round(b.get('height', 0) * z),
-                        )
-                    scaled_pts = []
-                    for pt in bp.get('points', []) or []:
-                        scaled_pts.append({'x': round(pt.get('x', 0) * z), 'y': round(pt.get('y', 0) * z)})
-                    p['points'] = scaled_pts
+            # Project base → current as one multiply-and-round per element kind
+            self._base_geometry.apply_zoom(z, self.scale_manager)
 
             self._current_zoom_factor = zoom_factor
+            self._invalidate_spatial_indexes()
             # Pass zoom factor to tools for coordinate tracking (e.g., ComponentTool saved_zoom)
             if hasattr(self, 'tool_manager') and self.tool_manager:
                 self.tool_manager.set_zoom_factor(zoom_factor)
@@ -384,7 +256,7 @@ class DrawingOverlay(QWidget):
     
     def set_highlighted_path(self, path_id: Optional[int]) -> None:
         self._highlighted_path_id = path_id
-        self.update()
+        self._refresh_dynamic_layer()
     
     # ---------------------- Element Highlighting (Analysis Panel) ----------------------
     
@@ -397,13 +269,13 @@ class DrawingOverlay(QWidget):
         """
         self._highlighted_element_id = element_id
         self._highlighted_element_type = element_type
-        self.update()
+        self._refresh_dynamic_layer()
     
     def clear_highlighted_element(self) -> None:
         """Clear the highlighted element."""
         self._highlighted_element_id = None
         self._highlighted_element_type = None
-        self.update()
+        self._refresh_dynamic_layer()
     
     def set_selected_element(self, element_id: object, element_type: str) -> None:
         """Select a specific element for analysis panel integration.
@@ -414,13 +286,13 @@ class DrawingOverlay(QWidget):
         """
         self._selected_analysis_element_id = element_id
         self._selected_analysis_element_type = element_type
-        self.update()
+        self._refresh_dynamic_layer()
     
     def clear_selected_element(self) -> None:
         """Clear the selected analysis element."""
         self._selected_analysis_element_id = None
         self._selected_analysis_element_type = None
-        self.update()
+        self._refresh_dynamic_layer()
     
     def _is_element_highlighted(self, element: dict, element_type: str) -> bool:
         """Check if an element should be drawn with highlight styling."""
@@ -453,7 +325,7 @@ class DrawingOverlay(QWidget):
             # Intercept for silencer placement mode
             if self._silencer_placement_mode:
                 self._handle_silencer_press(point)
-                self.update()
+                self._refresh_dynamic_layer()
                 return
 
             self.coordinates_clicked.emit(event.x(), event.y())
@@ -464,7 +336,7 @@ class DrawingOverlay(QWidget):
                 if space_hit:
                     # Emit signal for space selection
                     self.space_clicked.emit(space_hit['data'])
-                    self.update()
+                    self._refresh_dynamic_layer()
                     return
                 
                 self._select_modifiers = event.modifiers()
@@ -481,7 +353,7 @@ class DrawingOverlay(QWidget):
                             pass
                 else:
                     self.tool_manager.start_tool(point)
-            self.update()
+            self._refresh_dynamic_layer()
             
     def mouseMoveEvent(self, event):
         point = QPoint(event.x(), event.y())
@@ -490,7 +362,7 @@ class DrawingOverlay(QWidget):
         if self._silencer_placement_mode:
             if event.buttons() & Qt.LeftButton:
                 self._handle_silencer_drag(point)
-            self.update()
+            self._refresh_dynamic_layer()
             return
 
         # Handle hover detection for analysis panel integration
@@ -502,7 +374,7 @@ class DrawingOverlay(QWidget):
                 self._handle_select_move(point)
             else:
                 self.tool_manager.update_tool(point)
-            self.update()
+            self._refresh_dynamic_layer()
     
     def _handle_hover_detection(self, point: QPoint):
         """Detect which element is being hovered and emit signals for analysis panel."""
@@ -534,7 +406,7 @@ class DrawingOverlay(QWidget):
             # Intercept for silencer placement mode
             if self._silencer_placement_mode:
                 self._handle_silencer_release(point)
-                self.update()
+                self._refresh_dynamic_layer()
                 return
 
             if self.tool_manager.current_tool_type == ToolType.SELECT:
@@ -547,7 +419,7 @@ class DrawingOverlay(QWidget):
                 self.tool_manager.finish_tool(point)
             if self.tool_manager.current_tool_type != ToolType.POLYGON:
                 self.tool_manager.cancel_tool()
-            self.update()
+            self._refresh_dynamic_layer()
 
     def mouseDoubleClickEvent(self, event):
         try:
@@ -584,7 +456,7 @@ class DrawingOverlay(QWidget):
             self.tool_manager.cancel_tool()
             if self.tool_manager.current_tool_type == ToolType.SELECT:
                 self._clear_selection()
-            self.update()
+            self._refresh_dynamic_layer()
             
     # ---------------------- Element lifecycle ----------------------
     def _warn_if_scale_uncalibrated(self):
@@ -618,6 +490,7 @@ class DrawingOverlay(QWidget):
                 'area_formatted': self.scale_manager.format_area(area_real)
             })
             self.rectangles.append(element_data)
+            self._index_element('rectangle', element_data)
             self._base_dirty = True
 
         elif element_type == 'polygon':
@@ -638,6 +511,7 @@ class DrawingOverlay(QWidget):
             except Exception as e:
                 print(f"DEBUG: polygon metrics error: {e}")
             self.polygons.append(element_data)
+            self._index_element('polygon', element_data)
             self._base_dirty = True
             
         elif element_type == 'component':
@@ -681,6 +555,7 @@ class DrawingOverlay(QWidget):
             if 'saved_zoom' not in element_data or element_data.get('saved_zoom') is None:
                 element_data['saved_zoom'] = self._current_zoom_factor
             self.components.append(element_data)
+            self._index_element('component', element_data)
             self.update_segment_tool_components()
             try:
                 self.attach_component_to_nearby_segments(element_data, threshold_px=20)
@@ -718,6 +593,7 @@ class DrawingOverlay(QWidget):
             except Exception:
                 pass
             self.segments.append(element_data)
+            self._index_element('segment', element_data)
             self._base_dirty = True
             print(f"DEBUG: Created segment with ID {element_data['_element_id']} from ({element_data.get('start_x')}, {element_data.get('start_y')}) to ({element_data.get('end_x')}, {element_data.get('end_y')})")
             
@@ -736,43 +612,182 @@ class DrawingOverlay(QWidget):
                 pass
             
         self.element_created.emit(element_data)
+        self.elements_changed.emit()
         self.update()
         
     # ---------------------- Painting ----------------------
+    def update(self, *args):
+        """Schedule a repaint.
+
+        A bare update() also re-records the cached element layer, because
+        callers use it after editing element dicts in place. Pass a rect or
+        region to repaint part of the widget from the cache.
+        """
+        if not args:
+            self._static_version += 1
+        super().update(*args)
+
     def paintEvent(self, event):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
         try:
-            self.draw_rectangles(painter)
-            self.draw_polygons(painter)
-            self.draw_components(painter)
-            self.draw_segments(painter)
-            if self.show_measurements:
-                self.draw_measurements(painter)
-            if self.show_grid:
-                self.draw_grid(painter)
-            # Draw silencer placement mode elements
-            if self._silencer_placement_mode:
-                self._draw_silencer_placement(painter)
-                self._draw_silencer_status(painter)
-            current_tool = self.tool_manager.get_current_tool()
-            if current_tool and current_tool.active:
-                current_tool.draw_preview(painter)
-            self._draw_selection(painter)
-            if self._highlighted_path_id is not None and self._highlighted_path_id in self.path_element_mapping:
-                try:
-                    mapping = self.path_element_mapping[self._highlighted_path_id]
-                    pen = QPen(QColor(255, 215, 0))
-                    pen.setWidth(3)
-                    painter.setPen(pen)
-                    for seg in mapping.get('segments', []):
-                        painter.drawLine(int(seg.get('start_x', 0)), int(seg.get('start_y', 0)), int(seg.get('end_x', 0)), int(seg.get('end_y', 0)))
-                    # Do not draw components here to avoid intercepting double-click hit tests visually
-                except Exception:
-                    pass
+            painter.drawPicture(0, 0, self._get_static_layer())
+            self._draw_dynamic_layer(painter)
         except Exception as e:
             print(f"Error drawing overlay: {e}")
-            
+        finally:
+            painter.end()
+
+    def _static_layer_geometry_key(self):
+        membership_key = None
+        if self.path_only_mode:
+            self._visible_path_membership()
+            membership_key = self._path_membership_key
+        return self._geometry_version, membership_key
+
+    def _static_layer_cache_key(self):
+        if self._drag_geometry_key is not None:
+            geometry_version, membership_key = self._drag_geometry_key
+        else:
+            geometry_version, membership_key = self._static_layer_geometry_key()
+        element_lists = tuple((id(elements), len(elements)) for elements in (
+            self.rectangles, self.polygons, self.components, self.segments, self.measurements))
+        return (self._static_version, geometry_version, self._current_zoom_factor,
+                self.current_page, self.path_only_mode, membership_key, frozenset(self.hidden_paths),
+                self.show_measurements, (self.width(), self.height()) if self.show_grid else None,
+                element_lists)
+
+    def _get_static_layer(self) -> QPicture:
+        """Saved elements recorded as a QPicture, re-recorded only when they change."""
+        key = self._static_layer_cache_key()
+        if self._static_layer is None or key != self._static_layer_key:
+            picture = QPicture()
+            painter = QPainter(picture)
+            painter.setRenderHint(QPainter.Antialiasing)
+            try:
+                self.draw_rectangles(painter)
+                self.draw_polygons(painter)
+                self.draw_components(painter)
+                self.draw_segments(painter)
+                if self.show_measurements:
+                    self.draw_measurements(painter)
+                if self.show_grid:
+                    self.draw_grid(painter)
+            finally:
+                painter.end()
+            self._static_layer = picture
+            self._static_layer_key = key
+        return self._static_layer
+
+    def _draw_dynamic_layer(self, painter):
+        """Silencer placement, tool preview, selection and highlights over the static layer."""
+        # Draw silencer placement mode elements
+        if self._silencer_placement_mode:
+            self._draw_silencer_placement(painter)
+            self._draw_silencer_status(painter)
+        current_tool = self.tool_manager.get_current_tool()
+        if current_tool and current_tool.active:
+            current_tool.draw_preview(painter)
+        if self._drag_components or self._drag_segments:
+            membership = self._visible_path_membership() if self.path_only_mode else None
+            for comp in self._drag_components:
+                if self._component_is_drawn(comp, membership):
+                    self._draw_component(painter, comp)
+            for seg in self._drag_segments:
+                if self._segment_is_drawn(seg, membership):
+                    self._draw_segment(painter, seg)
+        self._draw_selection(painter)
+        for kind, element, is_highlighted, is_selected in self._analysis_targets():
+            if kind == 'component':
+                self._draw_component(painter, element, is_highlighted, is_selected)
+            else:
+                self._draw_segment(painter, element, is_highlighted, is_selected)
+        if self._highlighted_path_id is not None and self._highlighted_path_id in self.path_element_mapping:
+            try:
+                mapping = self.path_element_mapping[self._highlighted_path_id]
+                pen = QPen(QColor(255, 215, 0))
+                pen.setWidth(3)
+                painter.setPen(pen)
+                for seg in mapping.get('segments', []):
+                    painter.drawLine(int(seg.get('start_x', 0)), int(seg.get('start_y', 0)), int(seg.get('end_x', 0)), int(seg.get('end_y', 0)))
+                # Do not draw components here to avoid intercepting double-click hit tests visually
+            except Exception:
+                pass
+
+    def _analysis_targets(self) -> list:
+        """Visible (kind, element, is_highlighted, is_selected) for the analysis-panel highlight/selection."""
+        if self._highlighted_element_id is None and self._selected_analysis_element_id is None:
+            return []
+        key = (self._static_layer_cache_key(),
+               self._highlighted_element_id, self._highlighted_element_type,
+               self._selected_analysis_element_id, self._selected_analysis_element_type)
+        if self._analysis_targets_cache is not None and self._analysis_targets_cache[0] == key:
+            return self._analysis_targets_cache[1]
+        membership = self._visible_path_membership() if self.path_only_mode else None
+        targets = []
+        for kind, elements, is_visible in (('component', self.components, self._component_is_drawn),
+                                           ('segment', self.segments, self._segment_is_drawn)):
+            for element in elements:
+                is_highlighted = self._is_element_highlighted(element, kind)
+                is_selected = self._is_element_selected(element, kind)
+                if (is_highlighted or is_selected) and is_visible(element, membership):
+                    targets.append((kind, element, is_highlighted, is_selected))
+        self._analysis_targets_cache = (key, targets)
+        return targets
+
+    def _text_rect(self, x: int, y: int, text: str) -> QRect:
+        metrics = self._label_metrics
+        return QRect(x, y - metrics.ascent(), metrics.horizontalAdvance(text) + 2, metrics.height())
+
+    def _dynamic_layer_region(self) -> Optional[QRegion]:
+        """Area covered by the dynamic layer, or None when it spans the widget."""
+        if self._silencer_placement_mode:
+            return None
+        region = QRegion()
+        current_tool = self.tool_manager.get_current_tool()
+        if current_tool and current_tool.active:
+            region += current_tool.preview_bounds()
+        if self._selection_rect:
+            region += self._selection_rect.normalized().adjusted(-2, -2, 2, 2)
+        for comp in self._selected_components:
+            x, y = int(comp.get('x', 0)), int(comp.get('y', 0))
+            region += QRect(x - 14, y - 14, 28, 28)
+        segments = list(self._selected_segments)
+        if self._highlighted_path_id is not None:
+            segments += self.path_element_mapping.get(self._highlighted_path_id, {}).get('segments', [])
+        for seg in segments:
+            region += self._segment_rect(seg, 4)
+        for comp in self._drag_components:
+            region += self._element_region('component', comp)
+        for seg in self._drag_segments:
+            region += self._element_region('segment', seg)
+        for kind, element, _is_highlighted, _is_selected in self._analysis_targets():
+            region += self._element_region(kind, element)
+        return region
+
+    def _element_region(self, kind: str, element: dict) -> QRegion:
+        """Area a component or segment covers when drawn, label included."""
+        if kind == 'component':
+            x, y = int(element.get('x', 0)), int(element.get('y', 0))
+            return (QRegion(QRect(x - 20, y - 20, 40, 40))
+                    + self._text_rect(x - 15, y + 25, self._component_label(element)))
+        mid_x, mid_y = self._segment_midpoint(element)
+        return (QRegion(self._segment_rect(element, 6))
+                + self._text_rect(mid_x - 15, mid_y - 5, self._segment_length_text(element)))
+
+    def _refresh_dynamic_layer(self) -> None:
+        """Repaint only where the dynamic layer was or now is (the static layer is reused)."""
+        try:
+            region = self._dynamic_layer_region()
+        except Exception:
+            region = None
+        previous = self._dynamic_region
+        self._dynamic_region = region
+        if region is None or previous is None:
+            QWidget.update(self)
+        elif not region.isEmpty() or not previous.isEmpty():
+            QWidget.update(self, region.united(previous))
+
     def draw_rectangles(self, painter):
         for rect_data in self.rectangles:
             bounds = rect_data['bounds']
@@ -796,9 +811,9 @@ class DrawingOverlay(QWidget):
                 space_name = rect_data.get('space_name', 'Space')
                 area_text = rect_data.get('area_formatted', f"{rect_data.get('area_real', 0):.0f} sf")
                 painter.setPen(QPen(Qt.black))
-                painter.setFont(QFont("Arial", 9, QFont.Bold))
+                painter.setFont(self._title_font)
                 painter.drawText(center_x - 40, center_y - 8, space_name)
-                painter.setFont(QFont("Arial", 8))
+                painter.setFont(self._label_font)
                 painter.drawText(center_x - 30, center_y + 8, area_text)
 
     def draw_polygons(self, painter):
@@ -832,13 +847,13 @@ class DrawingOverlay(QWidget):
             if is_space:
                 space_name = poly.get('space_name', 'Space')
                 painter.setPen(QPen(Qt.black))
-                painter.setFont(QFont("Arial", 9, QFont.Bold))
+                painter.setFont(self._title_font)
                 painter.drawText(cx - 40, cy - 8, space_name)
-                painter.setFont(QFont("Arial", 8))
+                painter.setFont(self._label_font)
                 painter.drawText(cx - 30, cy + 8, area_text)
             else:
                 painter.setPen(QPen(Qt.black))
-                painter.setFont(QFont("Arial", 8))
+                painter.setFont(self._label_font)
                 painter.drawText(cx - 30, cy + 8, area_text)
         
     def get_elements_summary(self):
@@ -866,11 +881,7 @@ class DrawingOverlay(QWidget):
         
     def load_elements_data(self, data):
         # Reset base caches
-        self._base_rectangles = []
-        self._base_polygons = []
-        self._base_components = []
-        self._base_segments = []
-        self._base_measurements = []
+        self._base_geometry.clear()
         
         # Mark base cache as dirty so coordinates are properly recalculated
         # when elements are loaded at a different zoom than they were saved at
@@ -882,40 +893,10 @@ class DrawingOverlay(QWidget):
             bounds = rect_data.get('bounds')
             if isinstance(bounds, dict):
                 rect_data['bounds'] = QRect(bounds['x'], bounds['y'], bounds['width'], bounds['height'])
-            try:
-                z = rect_data.get('saved_zoom') or 1.0
-                self._base_rectangles.append({
-                    **rect_data,
-                    'x': int(rect_data.get('x', 0) / z),
-                    'y': int(rect_data.get('y', 0) / z),
-                    'width': int(rect_data.get('width', 0) / z),
-                    'height': int(rect_data.get('height', 0) / z),
-                })
-            except Exception:
-                pass
         self.rectangles = rectangles
 
         # Polygons
         self.polygons = data.get('polygons', [])
-        try:
-            for poly in self.polygons:
-                z = poly.get('saved_zoom') or 1.0
-                bp = poly.copy()
-                pts = []
-                for p in poly.get('points', []) or []:
-                    pts.append({'x': int(p.get('x', 0) / z), 'y': int(p.get('y', 0) / z)})
-                bp['points'] = pts
-                b = poly.get('bounds')
-                if isinstance(b, dict):
-                    bp['bounds'] = {
-                        'x': int(b.get('x', 0) / z),
-                        'y': int(b.get('y', 0) / z),
-                        'width': int(b.get('width', 0) / z),
-                        'height': int(b.get('height', 0) / z),
-                    }
-                self._base_polygons.append(bp)
-        except Exception:
-            pass
 
         # Components/segments/measurements
         self.components = data.get('components', [])
@@ -1173,65 +1154,10 @@ class DrawingOverlay(QWidget):
 
         print("\n=== ELEMENT MATCHING DEBUG: Building Base Element Cache ===\n")
         try:
-            # Build base components cache with zoom normalization
-            print(f"DEBUG: Processing {len(self.components)} components for base cache")
-            for i, comp in enumerate(self.components):
-                if not isinstance(comp, dict):
-                    print(f"DEBUG: Base cache - Component {i} not dict, skipping")
-                    continue
-
-                z = comp.get('saved_zoom') or 1.0
-                bc = comp.copy()
-                orig_x, orig_y = comp.get('x', 0), comp.get('y', 0)
-                bc['x'] = int(orig_x / z)
-                bc['y'] = int(orig_y / z)
-                self._base_components.append(bc)
-
-                comp_type = comp.get('component_type', 'unknown')
-                elem_id = comp.get('_element_id', 'none')
-                print(f"DEBUG: Base cache - Component {i} [{comp_type}] elem_id:{elem_id} zoom:{z} coords:({orig_x},{orig_y})->({bc['x']},{bc['y']})")
-
-            # Build base segments cache with zoom normalization
-            print(f"DEBUG: Processing {len(self.segments)} segments for base cache")
-            for i, seg in enumerate(self.segments):
-                if not isinstance(seg, dict):
-                    print(f"DEBUG: Base cache - Segment {i} not dict, skipping")
-                    continue
-
-                z = seg.get('saved_zoom') or 1.0
-                bs = seg.copy()
-                orig_coords = (seg.get('start_x', 0), seg.get('start_y', 0), seg.get('end_x', 0), seg.get('end_y', 0))
-                bs['start_x'] = int(orig_coords[0] / z)
-                bs['start_y'] = int(orig_coords[1] / z)
-                bs['end_x'] = int(orig_coords[2] / z)
-                bs['end_y'] = int(orig_coords[3] / z)
-                self._base_segments.append(bs)
-
-                elem_id = seg.get('_element_id', 'none')
-                new_coords = (bs['start_x'], bs['start_y'], bs['end_x'], bs['end_y'])
-                print(f"DEBUG: Base cache - Segment {i} elem_id:{elem_id} zoom:{z} coords:{orig_coords}->{new_coords}")
-
-            # Build base measurements cache with zoom normalization
-            print(f"DEBUG: Processing {len(self.measurements)} measurements for base cache")
-            for i, meas in enumerate(self.measurements):
-                if not isinstance(meas, dict):
-                    print(f"DEBUG: Base cache - Measurement {i} not dict, skipping")
-                    continue
-
-                z = meas.get('saved_zoom') or 1.0
-                bm = meas.copy()
-                orig_coords = (meas.get('start_x', 0), meas.get('start_y', 0), meas.get('end_x', 0), meas.get('end_y', 0))
-                bm['start_x'] = int(orig_coords[0] / z)
-                bm['start_y'] = int(orig_coords[1] / z)
-                bm['end_x'] = int(orig_coords[2] / z)
-                bm['end_y'] = int(orig_coords[3] / z)
-                self._base_measurements.append(bm)
-
-                elem_id = meas.get('_element_id', 'none')
-                new_coords = (bm['start_x'], bm['start_y'], bm['end_x'], bm['end_y'])
-                print(f"DEBUG: Base cache - Measurement {i} elem_id:{elem_id} zoom:{z} coords:{orig_coords}->{new_coords}")
-
-            print(f"DEBUG: Base cache built - {len(self._base_components)} components, {len(self._base_segments)} segments, {len(self._base_measurements)} measurements")
+            # Elements are stored at the zoom they were saved at
+            self._base_geometry.capture_all(self, lambda kind, e: e.get('saved_zoom') or 1.0)
+            counts = {kind: self._base_geometry.count(kind) for kind in ('component', 'segment', 'measurement')}
+            print(f"DEBUG: Base cache built - {counts['component']} components, {counts['segment']} segments, {counts['measurement']} measurements")
 
             base_cache_time = time.time()
             print(f"DEBUG: PERFORMANCE - Base cache construction took {(base_cache_time - segment_processing_time)*1000:.1f}ms")
@@ -1269,6 +1195,7 @@ class DrawingOverlay(QWidget):
             self.relink_all_segment_endpoints(threshold_px=20)
         except Exception:
             pass
+        self._rebuild_spatial_indexes()
         
         self.update()
     
@@ -1279,15 +1206,12 @@ class DrawingOverlay(QWidget):
         self.components.clear()
         self.segments.clear()
         self.measurements.clear()
-        self._base_rectangles.clear()
-        self._base_polygons.clear()
-        self._base_components.clear()
-        self._base_segments.clear()
-        self._base_measurements.clear()
+        self._base_geometry.clear()
         # Clear path element mapping to avoid stale references after page changes.
         # Callers (page change, orphan cleanup) re-register paths after reloading elements.
         self.path_element_mapping.clear()
         self._base_dirty = True
+        self._rebuild_spatial_indexes()
         self.update()
     
     def clear_unsaved_elements(self):
@@ -1369,11 +1293,12 @@ class DrawingOverlay(QWidget):
             # lifecycle management through the Space/Room system.
             # Use clear_all_elements() or clear individual element types if full clearing is needed.
             # Measurements also have their own dedicated clear_measurements() method.
-            self._base_components.clear()
-            self._base_segments.clear()
+            # Surviving elements keep their base coordinates on the next re-capture
             self._base_dirty = True
+            self._rebuild_spatial_indexes('component', 'segment')
             self.update_segment_tool_components()
             self.update()
+            self.elements_changed.emit()
         except Exception as e:
             print(f"ERROR in clear_unsaved_elements: {e}")
             # Fallback: keep state as-is to avoid losing data on error
@@ -1386,156 +1311,162 @@ class DrawingOverlay(QWidget):
         self._drag_active = False
         self._drag_last_point = None
         self._hit_target = None
-        self.update()
+        self._end_drag_layer()
+        self._refresh_dynamic_layer()
     
     # ---------------------- Drawing primitives ----------------------
+    def _component_is_drawn(self, comp, membership=None) -> bool:
+        # Skip components that belong to a different page
+        comp_page = comp.get('page_number')
+        if comp_page is not None and comp_page != self.current_page:
+            return False
+        # Visibility rules:
+        # - path_only_mode: ONLY show components in visible paths (strict filtering)
+        # - normal mode: show all EXCEPT components in hidden_paths
+        if self.path_only_mode:
+            return (membership or self._visible_path_membership()).contains_component(comp)
+        if self.hidden_paths:
+            # ONLY filter components that are EXPLICITLY registered to a hidden path
+            # (have hvac_path_id or db_path_id). New components without path registration
+            # should ALWAYS render, even if near a hidden path component.
+            comp_path_id = comp.get('hvac_path_id') or comp.get('db_path_id')
+            if comp_path_id and comp_path_id in self.hidden_paths:
+                return False
+        return True
+
+    def _segment_is_drawn(self, seg, membership=None) -> bool:
+        # Skip segments that belong to a different page
+        seg_page = seg.get('page_number')
+        if seg_page is not None and seg_page != self.current_page:
+            return False
+        # Visibility rules (same as components)
+        if self.path_only_mode:
+            return (membership or self._visible_path_membership()).contains_segment(seg)
+        if self.hidden_paths:
+            seg_path_id = seg.get('hvac_path_id') or seg.get('db_path_id')
+            if seg_path_id and seg_path_id in self.hidden_paths:
+                return False
+        return True
+
     def draw_components(self, painter):
-        drawn_count = 0
-        skipped_count = 0
-        page_skipped = 0
+        """Draw visible components in their normal style (highlights are on the dynamic layer)."""
+        membership = self._visible_path_membership() if self.path_only_mode else None
+        dragged = {id(comp) for comp in self._drag_components}
         for comp in self.components:
-            # Skip components that belong to a different page
-            comp_page = comp.get('page_number')
-            if comp_page is not None and comp_page != self.current_page:
-                page_skipped += 1
-                continue
-            # Visibility rules:
-            # - path_only_mode: ONLY show components in visible paths (strict filtering)
-            # - normal mode: show all EXCEPT components in hidden_paths
-            if self.path_only_mode:
-                if not self._is_component_in_visible_path(comp):
-                    skipped_count += 1
-                    continue
-            elif self.hidden_paths:
-                # ONLY filter components that are EXPLICITLY registered to a hidden path
-                # (have hvac_path_id or db_path_id). New components without path registration
-                # should ALWAYS render, even if near a hidden path component.
-                comp_path_id = comp.get('hvac_path_id') or comp.get('db_path_id')
-                if comp_path_id and comp_path_id in self.hidden_paths:
-                    skipped_count += 1
-                    continue
-            # Show the component
-            drawn_count += 1
-            x = comp.get('x', 0)
-            y = comp.get('y', 0)
-            comp_type = comp.get('component_type', 'unknown')
-
-            # Check for highlighting from analysis panel
-            is_highlighted = self._is_element_highlighted(comp, 'component')
-            is_selected = self._is_element_selected(comp, 'component')
-            
-            # Determine base color
-            if comp_type == 'fan':
-                color = QColor(255, 100, 100)
-            elif comp_type == 'grille':
-                color = QColor(100, 255, 100)
-            elif comp_type == 'branch':
-                color = QColor(100, 100, 255)
-            elif comp_type == 'elbow':
-                color = QColor(255, 255, 100)
-            else:
-                color = QColor(150, 150, 150)
-            
-            # Apply highlighting/selection styling
-            if is_selected:
-                # Selected: larger, with bright cyan outline
-                pen = QPen(QColor(0, 188, 212), 4)
-                brush = QBrush(color)
-                size = 14
-            elif is_highlighted:
-                # Highlighted: pulsing effect with bright outline
-                pen = QPen(QColor(33, 150, 243), 3)
-                brush = QBrush(color.lighter(120))
-                size = 12
-            else:
-                pen = QPen(color, 2)
-                brush = QBrush(color)
-                size = 8
-            
-            painter.setPen(pen)
-            painter.setBrush(brush)
-            painter.drawEllipse(x - size, y - size, size * 2, size * 2)
-            
-            # Draw text - use custom_type_label when component_type is 'custom'
-            if comp_type == 'custom':
-                label = comp.get('custom_type_label') or comp_type
-            else:
-                label = comp_type
-            painter.setPen(QPen(Qt.black))
-            painter.setFont(QFont("Arial", 8))
-            painter.drawText(x - 15, y + 25, label)
-            
-            # Draw highlight ring for selected elements
-            if is_selected:
-                painter.setPen(QPen(QColor(0, 188, 212, 128), 2, Qt.DashLine))
-                painter.setBrush(Qt.NoBrush)
-                painter.drawEllipse(x - size - 4, y - size - 4, (size + 4) * 2, (size + 4) * 2)
+            if id(comp) not in dragged and self._component_is_drawn(comp, membership):
+                self._draw_component(painter, comp)
+
+    @staticmethod
+    def _component_label(comp) -> str:
+        # Use custom_type_label when component_type is 'custom'
+        comp_type = comp.get('component_type', 'unknown')
+        if comp_type == 'custom':
+            return comp.get('custom_type_label') or comp_type
+        return comp_type
+
+    def _draw_component(self, painter, comp, is_highlighted=False, is_selected=False):
+        x = comp.get('x', 0)
+        y = comp.get('y', 0)
+        comp_type = comp.get('component_type', 'unknown')
+
+        # Determine base color
+        if comp_type == 'fan':
+            color = QColor(255, 100, 100)
+        elif comp_type == 'grille':
+            color = QColor(100, 255, 100)
+        elif comp_type == 'branch':
+            color = QColor(100, 100, 255)
+        elif comp_type == 'elbow':
+            color = QColor(255, 255, 100)
+        else:
+            color = QColor(150, 150, 150)
+        
+        # Apply highlighting/selection styling
+        if is_selected:
+            # Selected: larger, with bright cyan outline
+            pen = QPen(QColor(0, 188, 212), 4)
+            brush = QBrush(color)
+            size = 14
+        elif is_highlighted:
+            # Highlighted: pulsing effect with bright outline
+            pen = QPen(QColor(33, 150, 243), 3)
+            brush = QBrush(color.lighter(120))
+            size = 12
+        else:
+            pen = QPen(color, 2)
+            brush = QBrush(color)
+            size = 8
+        
+        painter.setPen(pen)
+        painter.setBrush(brush)
+        painter.drawEllipse(x - size, y - size, size * 2, size * 2)
+        
+        painter.setPen(QPen(Qt.black))
+        painter.setFont(self._label_font)
+        painter.drawText(x - 15, y + 25, self._component_label(comp))
+        
+        # Draw highlight ring for selected elements
+        if is_selected:
+            painter.setPen(QPen(QColor(0, 188, 212, 128), 2, Qt.DashLine))
+            painter.setBrush(Qt.NoBrush)
+            painter.drawEllipse(x - size - 4, y - size - 4, (size + 4) * 2, (size + 4) * 2)
 
     def draw_segments(self, painter):
-        drawn_count = 0
-        skipped_count = 0
-        page_skipped = 0
+        """Draw visible segments in their normal style (highlights are on the dynamic layer)."""
+        membership = self._visible_path_membership() if self.path_only_mode else None
+        dragged = {id(seg) for seg in self._drag_segments}
         for seg in self.segments:
-            # Skip segments that belong to a different page
-            seg_page = seg.get('page_number')
-            if seg_page is not None and seg_page != self.current_page:
-                page_skipped += 1
-                continue
-            # Visibility rules (same as components):
-            # - path_only_mode: ONLY show segments in visible paths (strict filtering)
-            # - normal mode: show all EXCEPT segments in hidden_paths
-            if self.path_only_mode:
-                if not self._is_segment_in_visible_path(seg):
-                    skipped_count += 1
-                    continue
-            elif self.hidden_paths:
-                # ONLY filter segments that are EXPLICITLY registered to a hidden path
-                # (have hvac_path_id or db_path_id). New segments without path registration
-                # should ALWAYS render, even if near a hidden path segment.
-                seg_path_id = seg.get('hvac_path_id') or seg.get('db_path_id')
-                if seg_path_id and seg_path_id in self.hidden_paths:
-                    skipped_count += 1
-                    continue
-            # Show the segment
-            drawn_count += 1
-            start_x = seg.get('start_x', 0)
-            start_y = seg.get('start_y', 0)
-            end_x = seg.get('end_x', 0)
-            end_y = seg.get('end_y', 0)
-            
-            # Check for highlighting from analysis panel
-            is_highlighted = self._is_element_highlighted(seg, 'segment')
-            is_selected = self._is_element_selected(seg, 'segment')
-            
-            # Apply styling based on state
-            if is_selected:
-                # Selected: thick cyan line
-                pen = QPen(QColor(0, 188, 212), 6)
-            elif is_highlighted:
-                # Highlighted: bright blue, slightly thicker
-                pen = QPen(QColor(33, 150, 243), 5)
-            else:
-                # Default orange
-                pen = QPen(QColor(255, 165, 0), 3)
-            
-            painter.setPen(pen)
-            painter.drawLine(start_x, start_y, end_x, end_y)
-            
-            # Draw midpoint marker for highlighted/selected segments
-            mid_x = (start_x + end_x) // 2
-            mid_y = (start_y + end_y) // 2
-            
-            if is_highlighted or is_selected:
-                marker_color = QColor(0, 188, 212) if is_selected else QColor(33, 150, 243)
-                painter.setPen(QPen(marker_color, 2))
-                painter.setBrush(QBrush(marker_color))
-                painter.drawEllipse(mid_x - 4, mid_y - 4, 8, 8)
-            
-            # Draw length text
-            length_text = seg.get('length_formatted', f"{seg.get('length_real', 0):.1f} ft")
-            painter.setPen(QPen(Qt.black))
-            painter.setFont(QFont("Arial", 8))
-            painter.drawText(mid_x - 15, mid_y - 5, length_text)
+            if id(seg) not in dragged and self._segment_is_drawn(seg, membership):
+                self._draw_segment(painter, seg)
+
+    @staticmethod
+    def _segment_midpoint(seg) -> tuple:
+        return ((seg.get('start_x', 0) + seg.get('end_x', 0)) // 2,
+                (seg.get('start_y', 0) + seg.get('end_y', 0)) // 2)
+
+    @staticmethod
+    def _segment_length_text(seg) -> str:
+        return seg.get('length_formatted', f"{seg.get('length_real', 0):.1f} ft")
+
+    @staticmethod
+    def _segment_rect(seg, margin: int) -> QRect:
+        start = QPoint(int(seg.get('start_x', 0)), int(seg.get('start_y', 0)))
+        end = QPoint(int(seg.get('end_x', 0)), int(seg.get('end_y', 0)))
+        return QRect(start, end).normalized().adjusted(-margin, -margin, margin, margin)
+
+    def _draw_segment(self, painter, seg, is_highlighted=False, is_selected=False):
+        start_x = seg.get('start_x', 0)
+        start_y = seg.get('start_y', 0)
+        end_x = seg.get('end_x', 0)
+        end_y = seg.get('end_y', 0)
+        
+        # Apply styling based on state
+        if is_selected:
+            # Selected: thick cyan line
+            pen = QPen(QColor(0, 188, 212), 6)
+        elif is_highlighted:
+            # Highlighted: bright blue, slightly thicker
+            pen = QPen(QColor(33, 150, 243), 5)
+        else:
+            # Default orange
+            pen = QPen(QColor(255, 165, 0), 3)
+        
+        painter.setPen(pen)
+        painter.drawLine(start_x, start_y, end_x, end_y)
+        
+        # Draw midpoint marker for highlighted/selected segments
+        mid_x, mid_y = self._segment_midpoint(seg)
+        
+        if is_highlighted or is_selected:
+            marker_color = QColor(0, 188, 212) if is_selected else QColor(33, 150, 243)
+            painter.setPen(QPen(marker_color, 2))
+            painter.setBrush(QBrush(marker_color))
+            painter.drawEllipse(mid_x - 4, mid_y - 4, 8, 8)
+        
+        # Draw length text
+        painter.setPen(QPen(Qt.black))
+        painter.setFont(self._label_font)
+        painter.drawText(mid_x - 15, mid_y - 5, self._segment_length_text(seg))
 
     def draw_measurements(self, painter):
         for meas in self.measurements:
@@ -1550,9 +1481,35 @@ class DrawingOverlay(QWidget):
             mid_y = (start_y + end_y) // 2
             length_text = meas.get('length_formatted', f"{meas.get('length_real', 0):.1f} ft")
             painter.setPen(QPen(Qt.black))
-            painter.setFont(QFont("Arial", 8))
+            painter.setFont(self._label_font)
             painter.drawText(mid_x - 15, mid_y - 5, length_text)
 
+    def _visible_path_membership(self) -> PathMembershipIndex:
+        """Membership index over the elements registered to visible paths.
+
+        Rebuilt only when the visible paths, their registrations or element
+        geometry change, so paint-time checks are set lookups instead of
+        comparing every element against every registered element.
+        """
+        key = (self._geometry_version, tuple(
+            (path_id,
+             id(mapping.get('components')), len(mapping.get('components') or []),
+             id(mapping.get('segments')), len(mapping.get('segments') or []))
+            for path_id in self.visible_paths
+            for mapping in (self.path_element_mapping.get(path_id, {}),)
+        ))
+        if self._path_membership is None or key != self._path_membership_key:
+            membership = PathMembershipIndex()
+            for path_id in self.visible_paths:
+                mapping = self.path_element_mapping.get(path_id, {})
+                for registered_comp in mapping.get('components', []):
+                    membership.add_component(registered_comp)
+                for registered_seg in mapping.get('segments', []):
+                    membership.add_segment(registered_seg)
+            self._path_membership = membership
+            self._path_membership_key = key
+        return self._path_membership
+
     def _is_component_in_visible_path(self, comp):
         """Check if component is in a visible path using ID or coordinate matching.
         
@@ -1561,25 +1518,7 @@ class DrawingOverlay(QWidget):
         2. Element ID (reliable for session-created elements)
         3. Coordinate/type matching (fallback for reloaded elements)
         """
-        comp_db_id = comp.get('db_component_id') or comp.get('hvac_component_id')
-        comp_elem_id = comp.get('_element_id')
-        
-        for path_id in self.visible_paths:
-            mapping = self.path_element_mapping.get(path_id, {})
-            for registered_comp in mapping.get('components', []):
-                # Priority 1: DB component ID match (survives reload)
-                reg_db_id = registered_comp.get('db_component_id') or registered_comp.get('hvac_component_id')
-                if comp_db_id and reg_db_id and comp_db_id == reg_db_id:
-                    return True
-                
-                # Priority 2: Element ID match (session-stable)
-                if comp_elem_id and registered_comp.get('_element_id') == comp_elem_id:
-                    return True
-                
-                # Priority 3: Coordinate/type matching (works after reload)
-                if self._components_match(comp, registered_comp):
-                    return True
-        return False
+        return self._visible_path_membership().contains_component(comp)
     
     def _is_segment_in_visible_path(self, seg):
         """Check if segment is in a visible path using ID or coordinate matching.
@@ -1589,25 +1528,7 @@ class DrawingOverlay(QWidget):
         2. Element ID (reliable for session-created elements)
         3. Coordinate matching (fallback for reloaded elements)
         """
-        seg_db_id = seg.get('db_segment_id') or seg.get('hvac_segment_id')
-        seg_elem_id = seg.get('_element_id')
-        
-        for path_id in self.visible_paths:
-            mapping = self.path_element_mapping.get(path_id, {})
-            for registered_seg in mapping.get('segments', []):
-                # Priority 1: DB segment ID match (survives reload)
-                reg_db_id = registered_seg.get('db_segment_id') or registered_seg.get('hvac_segment_id')
-                if seg_db_id and reg_db_id and seg_db_id == reg_db_id:
-                    return True
-                
-                # Priority 2: Element ID match (session-stable)
-                if seg_elem_id and registered_seg.get('_element_id') == seg_elem_id:
-                    return True
-                
-                # Priority 3: Coordinate matching (works after reload)
-                if self._segments_match(seg, registered_seg):
-                    return True
-        return False
+        return self._visible_path_membership().contains_segment(seg)
 
     def _is_component_in_hidden_path(self, comp):
         """Check if component should be hidden due to hidden paths.
@@ -1891,6 +1812,12 @@ class DrawingOverlay(QWidget):
             dx = point.x() - self._drag_last_point.x()
             dy = point.y() - self._drag_last_point.y()
             self._drag_last_point = point
+            if not (dx or dy):
+                return
+            starting = not (self._drag_components or self._drag_segments)
+            if starting:
+                # Segment coordinates before the first step, to find the segments it moves
+                segment_coords = {id(seg): self._segment_coords(seg) for seg in self.segments}
             if self._hit_target and self._hit_target.get('type') == 'component':
                 for comp in (self._selected_components or [self._hit_target.get('ref')]):
                     if not isinstance(comp, dict):
@@ -1901,6 +1828,7 @@ class DrawingOverlay(QWidget):
                     if isinstance(pos, dict):
                         pos['x'] = int(pos.get('x', 0)) + dx
                         pos['y'] = int(pos.get('y', 0)) + dy
+                    self._index_element('component', comp)
                     self._update_segments_for_component_move(comp)
                     # Immediately update base coordinates for moved component
                     self._update_component_base_coordinates(comp)
@@ -1922,33 +1850,109 @@ class DrawingOverlay(QWidget):
                         self._recompute_segment_length(seg)
                     except Exception:
                         pass
+                    self._index_element('segment', seg)
                     # Update base coordinates for moved segment
                     self._update_segment_base_coordinates(seg)
-            self.update()
+            if starting:
+                self._begin_drag_layer(segment_coords)
+
+    @staticmethod
+    def _segment_coords(seg) -> tuple:
+        return seg.get('start_x'), seg.get('start_y'), seg.get('end_x'), seg.get('end_y')
+
+    def _begin_drag_layer(self, segment_coords: dict) -> None:
+        """Move the elements this drag carries from the static layer to the dynamic one.
+
+        The static layer is re-recorded once without them and then kept for
+        the rest of the drag, so each mouse move only repaints the dirty
+        region around the dragged elements. _end_drag_layer restores it.
+        """
+        if self._hit_target.get('type') == 'component':
+            self._drag_components = [comp for comp in (self._selected_components or [self._hit_target.get('ref')])
+                                     if isinstance(comp, dict)]
+        self._drag_segments = [seg for seg in self.segments
+                               if segment_coords.get(id(seg)) != self._segment_coords(seg)]
+        hit_segment = self._hit_target.get('ref') if self._hit_target.get('type') == 'segment' else None
+        if isinstance(hit_segment, dict) and not any(seg is hit_segment for seg in self._drag_segments):
+            self._drag_segments.append(hit_segment)
+        self._drag_geometry_key = self._static_layer_geometry_key()
+        self.update()
+
+    def _end_drag_layer(self) -> None:
+        """Return dragged elements to the static layer (re-recorded on the next paint)."""
+        if self._drag_components or self._drag_segments:
+            self._drag_components = []
+            self._drag_segments = []
+            self._drag_geometry_key = None
+            self._static_version += 1
 
     def _handle_select_release(self, point):
         if self._selection_rect:
             rect = self._selection_rect.normalized()
-            for comp in self.components:
+            area = (rect.left(), rect.top(), rect.right(), rect.bottom())
+            for comp in self._spatial_index('component').query_rect(*area):
                 comp_point = QPoint(comp.get('x', 0), comp.get('y', 0))
                 if rect.contains(comp_point):
                     if comp not in self._selected_components:
                         self._selected_components.append(comp)
-            for seg in self.segments:
+            for seg in self._spatial_index('segment').query_rect(*area):
                 start_point = QPoint(seg.get('start_x', 0), seg.get('start_y', 0))
                 end_point = QPoint(seg.get('end_x', 0), seg.get('end_y', 0))
                 if rect.contains(start_point) or rect.contains(end_point):
                     if seg not in self._selected_segments:
                         self._selected_segments.append(seg)
             self._selection_rect = None
+        dragged = self._drag_active and self._hit_target is not None
         self._drag_active = False
         self._drag_last_point = None
         self._hit_target = None
+        self._end_drag_layer()
         self._base_dirty = True
         self.update()
+        if dragged:
+            self.elements_changed.emit()
+
+    # ---------------------- Spatial index ----------------------
+    def _spatial_index(self, kind: str) -> GridIndex:
+        """Grid index for one element kind, rebuilt first if its list changed behind our back."""
+        index = self._spatial_indexes[kind]
+        elements = getattr(self, _INDEXED_LISTS[kind])
+        if index.is_stale(elements):
+            index.rebuild(elements)
+        return index
+
+    def _rebuild_spatial_indexes(self, *kinds: str) -> None:
+        """Re-index element kinds (all by default) after coordinates changed in bulk."""
+        self._geometry_version += 1
+        for kind in kinds or _INDEXED_LISTS:
+            self._spatial_indexes[kind].rebuild(getattr(self, _INDEXED_LISTS[kind]))
+
+    def _invalidate_spatial_indexes(self) -> None:
+        """Drop all indexes after a zoom; each is rebuilt by its first query.
+
+        Cells scale with the zoom so an element spans the same number of
+        cells at every zoom level.
+        """
+        self._geometry_version += 1
+        cell_size = max(16, round(DEFAULT_CELL_SIZE * (self._current_zoom_factor or 1.0)))
+        for index in self._spatial_indexes.values():
+            index.clear()
+            index.cell_size = cell_size
+
+    def _index_element(self, kind: str, element: dict) -> None:
+        """Add a just-appended element to its index, or refresh it after it moved."""
+        self._geometry_version += 1
+        index = self._spatial_indexes[kind]
+        elements = getattr(self, _INDEXED_LISTS[kind])
+        if element in index and not index.is_stale(elements):
+            index.update(element)
+        elif elements and elements[-1] is element:
+            index.insert_appended(elements)
+        else:
+            index.rebuild(elements)
 
     def _hit_test_component(self, point):
-        for comp in self.components:
+        for comp in self._spatial_index('component').query_point(point.x(), point.y(), 16):
             comp_x = comp.get('x', 0)
             comp_y = comp.get('y', 0)
             if abs(point.x() - comp_x) <= 16 and abs(point.y() - comp_y) <= 16:
@@ -1956,7 +1960,7 @@ class DrawingOverlay(QWidget):
         return None
 
     def _hit_test_segment(self, point):
-        for seg in self.segments:
+        for seg in self._spatial_index('segment').query_point(point.x(), point.y(), 8):
             start_x = seg.get('start_x', 0)
             start_y = seg.get('start_y', 0)
             end_x = seg.get('end_x', 0)
@@ -1975,7 +1979,7 @@ class DrawingOverlay(QWidget):
     def _hit_test_space(self, point):
         """Test if point hits a saved space (rectangle or polygon with converted_to_space=True)"""
         # Check rectangles first
-        for rect in self.rectangles:
+        for rect in self._spatial_index('rectangle').query_point(point.x(), point.y()):
             if rect.get('converted_to_space'):
                 bounds = rect.get('bounds')
                 if isinstance(bounds, QRect) and bounds.contains(point):
@@ -1990,7 +1994,7 @@ class DrawingOverlay(QWidget):
                         return {'type': 'rectangle', 'data': rect}
         
         # Check polygons
-        for poly in self.polygons:
+        for poly in self._spatial_index('polygon').query_point(point.x(), point.y()):
             if poly.get('converted_to_space'):
                 points = poly.get('points', [])
                 if self._point_in_polygon(point, points):
@@ -2115,6 +2119,7 @@ class DrawingOverlay(QWidget):
                 except Exception:
                     pass
                 if changed:
+                    self._index_element('segment', seg)
                     updated_count += 1
             print(f"DEBUG: _update_segments_for_component_move updated {updated_count} segment(s) for component move")
         except Exception as e:
@@ -2127,7 +2132,7 @@ class DrawingOverlay(QWidget):
     def _find_nearest_component(self, x: int, y: int, threshold: int) -> dict | None:
         best = None
         best_d2 = threshold * threshold
-        for comp in self.components:
+        for comp in self._spatial_index('component').query_point(int(x), int(y), threshold):
             cx, cy = int(comp.get('x', 0)), int(comp.get('y', 0))
             dx, dy = cx - int(x), cy - int(y)
             d2 = dx * dx + dy * dy
@@ -2177,79 +2182,24 @@ class DrawingOverlay(QWidget):
     def _update_component_base_coordinates(self, component: dict) -> None:
         """Update base coordinates for a specific component to maintain zoom consistency.
         
-        Uses element ID for matching when available, falling back to object identity
-        and coordinate-based matching.
+        The component's row in the base geometry is found by object identity; a
+        component not captured yet is picked up by the next re-capture instead.
         """
         try:
-            cur_z = self._current_zoom_factor or 1.0
-            elem_id = component.get('_element_id')  # Use element ID if available
-            obj_id = id(component)  # Fallback to object identity
-            
-            # Find and update the component in base cache
-            for i, bc in enumerate(self._base_components):
-                matched = False
-                # Try element ID match first
-                if elem_id and bc.get('_element_id') == elem_id:
-                    matched = True
-                # Fall back to object identity
-                elif id(bc) == obj_id:
-                    matched = True
-                # Fall back to coordinate/type match
-                elif self._components_match(bc, component):
-                    matched = True
-                
-                if matched:
-                    # FIX: Use round() instead of int() to minimize cumulative truncation drift
-                    self._base_components[i]['x'] = round(component.get('x', 0) / cur_z)
-                    self._base_components[i]['y'] = round(component.get('y', 0) / cur_z)
-                    # Propagate element ID to base cache if not already present
-                    if elem_id and '_element_id' not in self._base_components[i]:
-                        self._base_components[i]['_element_id'] = elem_id
-                    if isinstance(component.get('position'), dict):
-                        self._base_components[i]['position'] = {
-                            'x': round(component['position'].get('x', 0) / cur_z),
-                            'y': round(component['position'].get('y', 0) / cur_z),
-                        }
-                    break
+            if not self._base_geometry.update_element('component', component, self._current_zoom_factor or 1.0):
+                self._base_dirty = True
         except Exception as e:
             print(f"DEBUG: Failed to update component base coordinates: {e}")
 
     def _update_segment_base_coordinates(self, segment: dict) -> None:
         """Update base coordinates for a specific segment to maintain zoom consistency.
         
-        Uses element ID for matching when available, falling back to object identity
-        and coordinate-based matching.
+        The segment's row in the base geometry is found by object identity; a
+        segment not captured yet is picked up by the next re-capture instead.
         """
         try:
-            cur_z = self._current_zoom_factor or 1.0
-            elem_id = segment.get('_element_id')  # Use element ID if available
-            obj_id = id(segment)  # Fallback to object identity
-            
-            # Find and update the segment in base cache
-            for i, bs in enumerate(self._base_segments):
-                matched = False
-                # Try element ID match first
-                if elem_id and bs.get('_element_id') == elem_id:
-                    matched = True
-                # Fall back to object identity
-                elif id(bs) == obj_id:
-                    matched = True
-                # Fall back to coordinate match
-                elif self._segments_match(bs, segment):
-                    matched = True
-                
-                if matched:
-                    # FIX: Use round() instead of int() to minimize cumulative truncation drift
-                    self._base_segments[i]['start_x'] = round(segment.get('start_x', 0) / cur_z)
-                    self._base_segments[i]['start_y'] = round(segment.get('start_y', 0) / cur_z)
-                    self._base_segments[i]['end_x'] = round(segment.get('end_x', 0) / cur_z)
-                    self._base_segments[i]['end_y'] = round(segment.get('end_y', 0) / cur_z)
-                    lp = segment.get('length_pixels', 0)
-                    self._base_segments[i]['length_pixels'] = lp / cur_z if lp else 0
-                    # Propagate element ID to base cache if not already present
-                    if elem_id and '_element_id' not in self._base_segments[i]:
-                        self._base_segments[i]['_element_id'] = elem_id
-                    break
+            if not self._base_geometry.update_element('segment', segment, self._current_zoom_factor or 1.0):
+                self._base_dirty = True
         except Exception as e:
             print(f"DEBUG: Failed to update segment base coordinates: {e}")
 
@@ -2367,10 +2317,12 @@ class DrawingOverlay(QWidget):
         print(f"DEBUG: Validating base cache consistency...")
         cache_issues = []
 
-        if len(self._base_components) != len(self.components):
-            cache_issues.append(f"Base components cache size mismatch: {len(self._base_components)} vs {len(self.components)}")
-        if len(self._base_segments) != len(self.segments):
-            cache_issues.append(f"Base segments cache size mismatch: {len(self._base_segments)} vs {len(self.segments)}")
+        base_components = self._base_geometry.count('component')
+        base_segments = self._base_geometry.count('segment')
+        if base_components != len(self.components):
+            cache_issues.append(f"Base components cache size mismatch: {base_components} vs {len(self.components)}")
+        if base_segments != len(self.segments):
+            cache_issues.append(f"Base segments cache size mismatch: {base_segments} vs {len(self.segments)}")
 
         # Check path mapping consistency
         print(f"DEBUG: Validating path element mappings...")
@@ -2608,6 +2560,7 @@ class DrawingOverlay(QWidget):
                     # Snap endpoint to component center
                     seg['start_x'] = int(nearest_comp.get('x', start_x))
                     seg['start_y'] = int(nearest_comp.get('y', start_y))
+                    self._index_element('segment', seg)
                     relinked_count += 1
             
             # Check end endpoint
@@ -2622,6 +2575,7 @@ class DrawingOverlay(QWidget):
                     # Snap endpoint to component center
                     seg['end_x'] = int(nearest_comp.get('x', end_x))
                     seg['end_y'] = int(nearest_comp.get('y', end_y))
+                    self._index_element('segment', seg)
                     relinked_count += 1
             
             # Recompute length if any endpoint was relinked
@@ -2645,7 +2599,7 @@ class DrawingOverlay(QWidget):
         comp_db_id = component.get('db_component_id') or component.get('hvac_component_id')
         attached_count = 0
         
-        for seg in self.segments:
+        for seg in self._spatial_index('segment').query_point(comp_x, comp_y, threshold_px):
             start_x = seg.get('start_x', 0)
             start_y = seg.get('start_y', 0)
             end_x = seg.get('end_x', 0)
@@ -2660,6 +2614,7 @@ class DrawingOverlay(QWidget):
                 # Also snap the segment endpoint to the component center
                 seg['start_x'] = comp_x
                 seg['start_y'] = comp_y
+                self._index_element('segment', seg)
                 attached_count += 1
                 try:
                     self._recompute_segment_length(seg)
@@ -2676,6 +2631,7 @@ class DrawingOverlay(QWidget):
                 # Also snap the segment endpoint to the component center
                 seg['end_x'] = comp_x
                 seg['end_y'] = comp_y
+                self._index_element('segment', seg)
                 attached_count += 1
                 try:
                     self._recompute_segment_length(seg)
@@ -2859,6 +2815,7 @@ class DrawingOverlay(QWidget):
         # Store the registered elements
         self.path_element_mapping[path_id]['components'] = registered_components
         self.path_element_mapping[path_id]['segments'] = registered_segments
+        self._path_membership = None
 
         print(f"\n--- Registration Summary ---")
         print(f"DEBUG: Path {path_id} registration complete:")
@@ -2910,6 +2867,7 @@ class DrawingOverlay(QWidget):
 
     def set_visible_paths(self, visible_path_ids):
         self.visible_paths = {pid: True for pid in visible_path_ids}
+        self._path_membership = None
         self.update()
 
     def clear_path_registrations(self):
@@ -2927,9 +2885,10 @@ class DrawingOverlay(QWidget):
 
     def clear_measurements(self):
         self.measurements.clear()
-        self._base_measurements.clear()
+        self._base_geometry.clear('measurement')
         self._base_dirty = True
         self.update()
+        self.elements_changed.emit()
 
     # ---------------------- Silencer Placement Mode ----------------------
 
@@ -3061,7 +3020,7 @@ class DrawingOverlay(QWidget):
         if self._silencer_recalc_timer:
             self._silencer_recalc_timer.start()
 
-        self.update()
+        self._refresh_dynamic_layer()
 
     def _handle_silencer_release(self, point: QPoint):
         """Handle mouse release during silencer placement mode"""
@@ -8,6 +8,9 @@ from PySide6.QtGui import QPen, QBrush, QColor, QPainter
 from PySide6.QtWidgets import QWidget
 import math
 
+# Pixels around a tool's points that its preview (labels, snap circles) may cover
+PREVIEW_MARGIN = 60
+
 
 class ToolType(Enum):
     """Available drawing tools"""
@@ -66,6 +69,21 @@ class DrawingTool(QObject):
         """Draw preview of current tool operation"""
         pass
 
+    def preview_bounds(self) -> QRect:
+        """Widget area that draw_preview can paint into (for partial repaints)"""
+        points = [p for p in (self.start_point, self.current_point) if p is not None]
+        points.extend(getattr(self, 'vertices', None) or [])
+        for comp in (getattr(self, 'from_component', None), getattr(self, 'to_component', None)):
+            if isinstance(comp, dict):
+                points.append(QPoint(int(comp.get('x', 0)), int(comp.get('y', 0))))
+        if not points:
+            return QRect()
+        xs = [p.x() for p in points]
+        ys = [p.y() for p in points]
+        # Margin covers snap radii, connection markers and text labels around the points
+        margin = PREVIEW_MARGIN + getattr(self, 'component_size', 0)
+        return QRect(QPoint(min(xs), min(ys)), QPoint(max(xs), max(ys))).adjusted(-margin, -margin, margin, margin)
+
 
 class RectangleTool(DrawingTool):
     """Tool for drawing rectangles (room boundaries)"""
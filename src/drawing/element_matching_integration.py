@@ -319,9 +319,9 @@ class LegacyElementMatcher:
         available_elements: List[Dict[str, Any]],
         context_name: str
     ) -> ElementLinkResult:
-        """Match multiple elements using batch processing"""
+        """Match multiple elements one-to-one in a single assignment pass"""
         try:
-            results = self.matching_service.batch_match_elements(
+            results = self.matching_service.assign_elements(
                 target_elements, available_elements
             )
 
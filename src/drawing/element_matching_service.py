@@ -11,10 +11,21 @@ from enum import Enum
 from dataclasses import dataclass, field
 import time
 
-from .coordinate_normalizer import CoordinateNormalizer
+import numpy as np
+from scipy.spatial import cKDTree
+
+from .assignment import solve_sparse_assignment
+from .coordinate_normalizer import CoordinateNormalizer, NormalizedCoordinates
 
 logger = logging.getLogger(__name__)
 
+# Assignment costs: ID hints always beat proximity-only pairs, and any pair within
+# tolerance beats leaving a target unmatched
+ASSIGNMENT_ID_COST = 0.0
+ASSIGNMENT_COORDINATE_COST = 1.0
+ASSIGNMENT_TYPE_MISMATCH_COST = 0.3
+ASSIGNMENT_UNMATCHED_COST = 3.0
+
 
 class MatchingStrategy(Enum):
     """Available element matching strategies"""
@@ -35,6 +46,41 @@ class MatchingResult:
     debug_info: Dict[str, Any] = field(default_factory=dict)
 
 
+class CoordinateIndex:
+    """
+    KD-tree over the normalized coordinates of a candidate list.
+
+    Candidates are normalized once when the index is built, so each target
+    costs one radius search instead of a pass over every candidate.
+    """
+
+    def __init__(self, elements: List[Dict[str, Any]], normalizer: CoordinateNormalizer):
+        self.elements = elements
+        self.coordinates: List[NormalizedCoordinates] = [
+            normalizer.normalize_element_coordinates(element) for element in elements
+        ]
+        valid = [i for i, coords in enumerate(self.coordinates) if coords.is_valid]
+        points = np.array(
+            [(self.coordinates[i].x, self.coordinates[i].y) for i in valid], dtype=float
+        ).reshape(-1, 2)
+        finite = np.isfinite(points).all(axis=1)
+        # Positions (into elements) of candidates with usable coordinates
+        self._positions = np.array(valid, dtype=np.int64)[finite]
+        points = points[finite]
+        self._tree = cKDTree(points) if len(points) else None
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def query_radius(self, coords: NormalizedCoordinates, radius: float) -> List[int]:
+        """Positions of candidates within ``radius`` of ``coords``, in list order."""
+        if self._tree is None or not coords.is_valid or radius < 0:
+            return []
+        # Slightly widened so callers' own ``distance <= radius`` check decides the boundary
+        hits = self._tree.query_ball_point((coords.x, coords.y), radius * (1 + 1e-9) + 1e-9)
+        return sorted(int(self._positions[hit]) for hit in hits)
+
+
 @dataclass
 class MatchingContext:
     """Context information for element matching"""
@@ -43,6 +89,13 @@ class MatchingContext:
     coordinate_tolerance: float = 10.0
     zoom_tolerance: float = 0.1
     performance_mode: bool = False
+    coordinate_index: Optional[CoordinateIndex] = None
+
+    def get_coordinate_index(self, normalizer: CoordinateNormalizer) -> CoordinateIndex:
+        """Coordinate index over available_elements, built on first use"""
+        if self.coordinate_index is None or self.coordinate_index.elements is not self.available_elements:
+            self.coordinate_index = CoordinateIndex(self.available_elements, normalizer)
+        return self.coordinate_index
 
 
 class ElementMatchingStrategy(Protocol):
@@ -222,11 +275,11 @@ class CoordinateBasedMatcher(ElementMatchingStrategy):
                     debug_info={'strategy': 'coordinate_based', 'invalid_coords': True}
                 )
 
-            # Search through available elements
-            for candidate in context.available_elements:
-                candidate_coords = self.normalizer.normalize_element_coordinates(candidate)
-                if not candidate_coords.is_valid:
-                    continue
+            # Search only the candidates within tolerance
+            index = context.get_coordinate_index(self.normalizer)
+            for position in index.query_radius(target_coords, context.coordinate_tolerance):
+                candidate = index.elements[position]
+                candidate_coords = index.coordinates[position]
 
                 # Calculate distance
                 distance = self._calculate_distance(target_coords, candidate_coords)
@@ -304,9 +357,14 @@ class HybridFuzzyMatcher(ElementMatchingStrategy):
             target_type = target_element.get('type', '')
             target_coords = self.normalizer.normalize_element_coordinates(target_element)
 
-            for candidate in context.available_elements:
+            # Type and dimensions alone score at most 0.5, so only candidates within
+            # coordinate tolerance can clear the threshold
+            index = context.get_coordinate_index(self.normalizer)
+            for position in index.query_radius(target_coords, context.coordinate_tolerance):
+                candidate = index.elements[position]
                 score = self._calculate_fuzzy_score(
-                    target_element, candidate, target_coords, target_type, context
+                    target_element, candidate, target_coords, target_type, context,
+                    candidate_coords=index.coordinates[position]
                 )
 
                 if score > best_score and score > 0.6:  # Minimum threshold
@@ -353,7 +411,8 @@ class HybridFuzzyMatcher(ElementMatchingStrategy):
         candidate: Dict[str, Any],
         target_coords,
         target_type: str,
-        context: MatchingContext
+        context: MatchingContext,
+        candidate_coords: Optional[NormalizedCoordinates] = None
     ) -> float:
         """Calculate fuzzy matching score"""
         try:
@@ -365,7 +424,8 @@ class HybridFuzzyMatcher(ElementMatchingStrategy):
 
             # Coordinate proximity (50% weight)
             if target_coords.is_valid:
-                candidate_coords = self.normalizer.normalize_element_coordinates(candidate)
+                if candidate_coords is None:
+                    candidate_coords = self.normalizer.normalize_element_coordinates(candidate)
                 if candidate_coords.is_valid:
                     distance = ((target_coords.x - candidate_coords.x) ** 2 +
                               (target_coords.y - candidate_coords.y) ** 2) ** 0.5
@@ -506,6 +566,78 @@ class ElementMatchingService:
 
         return results
 
+    def assign_elements(
+        self,
+        target_elements: List[Dict[str, Any]],
+        available_elements: List[Dict[str, Any]],
+        context_overrides: Optional[Dict[str, Any]] = None
+    ) -> List[MatchingResult]:
+        """
+        Match targets to candidates one-to-one as a minimum-cost assignment.
+
+        Unlike batch_match_elements, no two targets can claim the same candidate.
+        Candidate pairs come from ID hints and the coordinate index and are solved
+        with solve_sparse_assignment, so the result is deterministic and globally
+        optimal.
+
+        Args:
+            target_elements: Elements to find matches for
+            available_elements: Candidate elements
+            context_overrides: Optional context overrides
+
+        Returns:
+            List of MatchingResult objects, one per target
+        """
+        start_time = time.time()
+        results = [
+            MatchingResult(
+                success=False,
+                error_message="No unclaimed candidate within tolerance",
+                debug_info={'strategy': 'assignment'}
+            )
+            for _ in target_elements
+        ]
+        self._match_stats['total_matches'] += len(target_elements)
+
+        try:
+            context = self._build_matching_context(available_elements, context_overrides)
+            edges = self._assignment_edges(target_elements, context)
+            if not edges:
+                return results
+
+            assignment = solve_sparse_assignment(
+                {pair: edge[0] for pair, edge in edges.items()}, ASSIGNMENT_UNMATCHED_COST
+            )
+            for t, c in sorted(assignment.items()):
+                cost, confidence, strategy = edges[(t, c)]
+                results[t] = MatchingResult(
+                    success=True,
+                    matched_element=context.available_elements[c],
+                    strategy_used=strategy,
+                    confidence=confidence,
+                    debug_info={
+                        'strategy': 'assignment',
+                        'edge_strategy': strategy.value,
+                        'cost': cost
+                    }
+                )
+                self._update_success_stats(strategy)
+
+            elapsed_ms = (time.time() - start_time) * 1000
+            logger.debug(f"Assigned {len(assignment)}/{len(target_elements)} targets in {elapsed_ms:.1f}ms")
+            return results
+
+        except Exception as e:
+            logger.error(f"Element assignment failed: {e}")
+            return [
+                MatchingResult(
+                    success=False,
+                    error_message=f"Assignment error: {str(e)}",
+                    debug_info={'strategy': 'assignment', 'exception': str(e)}
+                )
+                for _ in target_elements
+            ]
+
     def get_matching_statistics(self) -> Dict[str, Any]:
         """Get matching performance statistics"""
         success_rate = (
@@ -573,7 +705,65 @@ class ElementMatchingService:
         if overrides:
             context_params.update(overrides)
 
-        return MatchingContext(**context_params)
+        context = MatchingContext(**context_params)
+        # Normalize candidates once for every target matched against this context
+        context.get_coordinate_index(self.normalizer)
+        return context
+
+    def _assignment_edges(
+        self,
+        target_elements: List[Dict[str, Any]],
+        context: MatchingContext
+    ) -> Dict[Tuple[int, int], Tuple[float, float, MatchingStrategy]]:
+        """Candidate pairs for assign_elements: (target, candidate) -> (cost, confidence, strategy)"""
+        candidates = context.available_elements
+        index = context.get_coordinate_index(self.normalizer)
+        tolerance = context.coordinate_tolerance
+
+        # ID hints may be shared by several candidates; keep all of them
+        by_db_id: Dict[Any, List[int]] = {}
+        by_element_id: Dict[Any, List[int]] = {}
+        for position, candidate in enumerate(candidates):
+            if candidate.get('db_id'):
+                by_db_id.setdefault(candidate['db_id'], []).append(position)
+            if candidate.get('id'):
+                by_element_id.setdefault(candidate['id'], []).append(position)
+
+        edges: Dict[Tuple[int, int], Tuple[float, float, MatchingStrategy]] = {}
+
+        def add(t: int, c: int, cost: float, confidence: float, strategy: MatchingStrategy):
+            target_type = target_elements[t].get('type')
+            candidate_type = candidates[c].get('type')
+            if target_type and candidate_type and target_type != candidate_type:
+                cost += ASSIGNMENT_TYPE_MISMATCH_COST
+            existing = edges.get((t, c))
+            if existing is None or cost < existing[0]:
+                edges[(t, c)] = (cost, confidence, strategy)
+
+        for t, target in enumerate(target_elements):
+            try:
+                # Same confidences as DatabaseIdMatcher and ElementIdMatcher
+                for c in by_db_id.get(target.get('db_id') or None, []):
+                    coord_match = self.normalizer.coordinates_match(target, candidates[c], tolerance)
+                    confidence = 0.95 if coord_match else 0.80
+                    add(t, c, ASSIGNMENT_ID_COST + 1.0 - confidence, confidence, MatchingStrategy.DATABASE_ID)
+                for c in by_element_id.get(target.get('id') or None, []):
+                    if self.normalizer.coordinates_match(target, candidates[c], tolerance):
+                        add(t, c, ASSIGNMENT_ID_COST + 0.15, 0.85, MatchingStrategy.ELEMENT_ID)
+
+                # Proximity pairs, scored like CoordinateBasedMatcher
+                target_coords = self.normalizer.normalize_element_coordinates(target)
+                for c in index.query_radius(target_coords, tolerance):
+                    coords = index.coordinates[c]
+                    distance = ((target_coords.x - coords.x) ** 2 + (target_coords.y - coords.y) ** 2) ** 0.5
+                    if distance <= tolerance:
+                        confidence = max(0.1, 1.0 - (distance / tolerance)) if tolerance > 0 else 1.0
+                        add(t, c, ASSIGNMENT_COORDINATE_COST + 1.0 - confidence, confidence,
+                            MatchingStrategy.COORDINATE_BASED)
+            except Exception as e:
+                logger.error(f"Building assignment pairs failed for element: {e}")
+
+        return edges
 
     def _match_single_with_context(
         self,
@@ -0,0 +1,279 @@
+"""
+Zoom-independent base geometry for DrawingOverlay, stored as NumPy arrays.
+
+The overlay's elements stay plain dicts (every consumer reads and edits them
+directly), but their base coordinates - the on-screen coordinates at zoom
+1.0 - are kept here as one float array per element kind (structure of
+arrays; polygon vertices are flattened with per-polygon offsets). A zoom
+change is one multiply-and-round per kind, written back into the dicts.
+
+Base coordinates are never re-derived from the rounded on-screen values of
+unchanged elements, so repeated zooming does not drift. capture() compares
+each element's current coordinates with what project() last wrote and only
+re-derives base coordinates for elements that were edited or are new.
+"""
+
+import math
+from typing import Callable, Dict, List
+
+import numpy as np
+from PySide6.QtCore import QRect
+
+# Per-kind coordinate fields, in array column order
+COMPONENT_FIELDS = ('x', 'y', 'position.x', 'position.y')
+LINE_FIELDS = ('start_x', 'start_y', 'end_x', 'end_y')
+RECTANGLE_FIELDS = ('x', 'y', 'width', 'height',
+                    'bounds.x', 'bounds.y', 'bounds.width', 'bounds.height')
+POLYGON_BOUNDS_FIELDS = ('bounds.x', 'bounds.y', 'bounds.width', 'bounds.height')
+
+# Element list attribute on the overlay for each kind
+KIND_LISTS = {
+    'rectangle': 'rectangles',
+    'polygon': 'polygons',
+    'component': 'components',
+    'segment': 'segments',
+    'measurement': 'measurements',
+}
+
+ZoomFunc = Callable[[str, dict], float]
+
+
+def _number(value) -> float:
+    if value is None or isinstance(value, bool):
+        return math.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _field(element: dict, name: str) -> float:
+    """Numeric value of a (possibly nested 'parent.child') field; NaN if absent."""
+    if '.' not in name:
+        return _number(element.get(name, 0))
+    parent, child = name.split('.', 1)
+    container = element.get(parent)
+    if isinstance(container, dict):
+        return _number(container.get(child, 0))
+    if parent == 'bounds' and isinstance(container, QRect):
+        return float(getattr(container, child)())
+    return math.nan
+
+
+def _extract(elements: List[dict], fields) -> np.ndarray:
+    if not elements:
+        return np.empty((0, len(fields)))
+    return np.array([[_field(e, f) for f in fields] for e in elements], dtype=float)
+
+
+def _same(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Row-wise equality treating NaN == NaN."""
+    return np.all((a == b) | (np.isnan(a) & np.isnan(b)), axis=1)
+
+
+def _project(base: np.ndarray, zoom: float) -> np.ndarray:
+    # np.rint rounds half to even, like the built-in round() used before
+    return np.rint(base * zoom)
+
+
+class _KindGeometry:
+    """Base coordinates for one fixed-width element kind"""
+
+    def __init__(self, fields):
+        self.fields = fields
+        self.elements: List[dict] = []
+        self.base = np.empty((0, len(fields)))
+        # On-screen coordinates as last captured or written by project()
+        self.shown = np.empty((0, len(fields)))
+        self._rows: Dict[int, int] = {}
+
+    def capture(self, elements: List[dict], zooms: np.ndarray):
+        current = _extract(elements, self.fields)
+        base = current / zooms[:, None] if len(elements) else current.copy()
+        previous = [self._rows.get(id(e)) for e in elements]
+        matched = np.array([row is not None for row in previous], dtype=bool)
+        if matched.any():
+            new_rows = np.nonzero(matched)[0]
+            old_rows = np.array([row for row in previous if row is not None])
+            unchanged = _same(current[new_rows], self.shown[old_rows])
+            base[new_rows[unchanged]] = self.base[old_rows[unchanged]]
+        self.elements = list(elements)
+        self.base = base
+        self.shown = current
+        self._rows = {id(e): i for i, e in enumerate(self.elements)}
+
+    def update(self, element: dict, zoom: float) -> bool:
+        row = self._rows.get(id(element))
+        if row is None:
+            return False
+        current = _extract([element], self.fields)[0]
+        self.base[row] = current / zoom
+        self.shown[row] = current
+        return True
+
+    def project(self, zoom: float) -> np.ndarray:
+        self.shown = _project(self.base, zoom)
+        return self.shown
+
+    def clear(self):
+        self.capture([], np.empty(0))
+
+
+class _PolygonGeometry:
+    """Base coordinates for polygons: flattened vertices plus optional bounds"""
+
+    def __init__(self):
+        self.elements: List[dict] = []
+        self.offsets = np.zeros(1, dtype=np.int64)
+        self.vertices = np.empty((0, 2))
+        self.shown_vertices = np.empty((0, 2))
+        self.bounds = _KindGeometry(POLYGON_BOUNDS_FIELDS)
+        self._rows: Dict[int, int] = {}
+
+    @staticmethod
+    def _vertices(poly: dict) -> List[List[float]]:
+        return [[_number(p.get('x', 0)), _number(p.get('y', 0))] for p in (poly.get('points') or [])]
+
+    def capture(self, polygons: List[dict], zooms: np.ndarray):
+        per_polygon = [self._vertices(p) for p in polygons]
+        counts = np.array([len(v) for v in per_polygon], dtype=np.int64)
+        offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+        current = (np.array([xy for v in per_polygon for xy in v], dtype=float)
+                   if offsets[-1] else np.empty((0, 2)))
+        base = current / np.repeat(zooms, counts)[:, None] if len(current) else current.copy()
+        for i, poly in enumerate(polygons):
+            row = self._rows.get(id(poly))
+            if row is None:
+                continue
+            start, end = offsets[i], offsets[i + 1]
+            old_start, old_end = self.offsets[row], self.offsets[row + 1]
+            if end - start == old_end - old_start and \
+                    _same(current[start:end], self.shown_vertices[old_start:old_end]).all():
+                base[start:end] = self.vertices[old_start:old_end]
+        self.elements = list(polygons)
+        self.offsets = offsets
+        self.vertices = base
+        self.shown_vertices = current
+        self.bounds.capture(polygons, zooms)
+        self._rows = {id(p): i for i, p in enumerate(self.elements)}
+
+    def project(self, zoom: float):
+        self.shown_vertices = _project(self.vertices, zoom)
+        return self.shown_vertices, self.bounds.project(zoom)
+
+    def clear(self):
+        self.capture([], np.empty(0))
+
+
+class OverlayGeometry:
+    """Structure-of-arrays base geometry for all of an overlay's element kinds"""
+
+    def __init__(self):
+        self.components = _KindGeometry(COMPONENT_FIELDS)
+        self.segments = _KindGeometry(LINE_FIELDS)
+        self.measurements = _KindGeometry(LINE_FIELDS)
+        self.rectangles = _KindGeometry(RECTANGLE_FIELDS)
+        self.polygons = _PolygonGeometry()
+
+    def _kind(self, kind: str):
+        return getattr(self, KIND_LISTS[kind])
+
+    def capture(self, kind: str, elements: List[dict], zoom_of: ZoomFunc):
+        """Record base coordinates for a kind; unchanged elements keep their old base."""
+        zooms = np.array([zoom_of(kind, e) for e in elements], dtype=float)
+        zooms[~(zooms > 0)] = 1.0
+        self._kind(kind).capture(elements, zooms)
+
+    def capture_all(self, overlay, zoom_of: ZoomFunc):
+        for kind, attribute in KIND_LISTS.items():
+            self.capture(kind, getattr(overlay, attribute), zoom_of)
+
+    def is_stale(self, overlay) -> bool:
+        """True if any element list was replaced, grown or shrunk since the last capture."""
+        for kind, attribute in KIND_LISTS.items():
+            captured = self._kind(kind).elements
+            elements = getattr(overlay, attribute)
+            if len(captured) != len(elements):
+                return True
+            if elements and (captured[0] is not elements[0] or captured[-1] is not elements[-1]):
+                return True
+        return False
+
+    def update_element(self, kind: str, element: dict, zoom: float) -> bool:
+        """Re-derive one edited element's base coordinates (e.g. after a drag)."""
+        if zoom <= 0:
+            return False
+        return self._kind(kind).update(element, zoom)
+
+    def count(self, kind: str) -> int:
+        return len(self._kind(kind).elements)
+
+    def clear(self, *kinds: str):
+        for kind in kinds or KIND_LISTS:
+            self._kind(kind).clear()
+
+    # ── Projection ───────────────────────────────────────────────────────────
+
+    def apply_zoom(self, zoom: float, scale_manager=None):
+        """Write coordinates for ``zoom`` back into every captured element dict."""
+        self._apply_rectangles(zoom)
+        self._apply_components(zoom)
+        self._apply_lines(self.segments, zoom, scale_manager)
+        self._apply_lines(self.measurements, zoom, scale_manager)
+        self._apply_polygons(zoom)
+
+    @staticmethod
+    def _rows(geometry, values: np.ndarray, columns: slice):
+        """(element, [int, ...]) for rows whose selected columns are all known."""
+        block = values[:, columns]
+        valid = ~np.isnan(block).any(axis=1)
+        ints = np.where(np.isnan(block), 0, block).astype(np.int64).tolist()
+        for element, ok, row in zip(geometry.elements, valid.tolist(), ints):
+            if ok:
+                yield element, row
+
+    def _apply_rectangles(self, zoom: float):
+        values = self.rectangles.project(zoom)
+        for rect, (x, y, w, h) in self._rows(self.rectangles, values, slice(0, 4)):
+            rect['x'], rect['y'], rect['width'], rect['height'] = x, y, w, h
+        for rect, (x, y, w, h) in self._rows(self.rectangles, values, slice(4, 8)):
+            rect['bounds'] = QRect(x, y, w, h)
+
+    def _apply_components(self, zoom: float):
+        values = self.components.project(zoom)
+        for comp, (x, y) in self._rows(self.components, values, slice(0, 2)):
+            comp['x'], comp['y'] = x, y
+            # Keep saved_zoom in step with the coordinates it describes
+            comp['saved_zoom'] = zoom
+        for comp, (x, y) in self._rows(self.components, values, slice(2, 4)):
+            comp['position']['x'], comp['position']['y'] = x, y
+
+    @staticmethod
+    def _apply_lines(geometry: _KindGeometry, zoom: float, scale_manager):
+        values = geometry.project(zoom)
+        for line, coords in OverlayGeometry._rows(geometry, values, slice(0, 4)):
+            start_x, start_y, end_x, end_y = coords
+            line['start_x'], line['start_y'], line['end_x'], line['end_y'] = coords
+            line['saved_zoom'] = zoom
+            length = math.hypot(end_x - start_x, end_y - start_y)
+            line['length_pixels'] = length
+            if scale_manager is not None:
+                try:
+                    length_real = scale_manager.pixels_to_real(length)
+                    line['length_real'] = length_real
+                    line['length_formatted'] = scale_manager.format_distance(length_real)
+                except Exception:
+                    pass
+
+    def _apply_polygons(self, zoom: float):
+        vertices, bounds = self.polygons.project(zoom)
+        offsets = self.polygons.offsets.tolist()
+        valid = ~np.isnan(vertices).any(axis=1)
+        points = np.where(np.isnan(vertices), 0, vertices).astype(np.int64).tolist()
+        valid = valid.tolist()
+        for i, poly in enumerate(self.polygons.elements):
+            start, end = offsets[i], offsets[i + 1]
+            if all(valid[start:end]):
+                poly['points'] = [{'x': x, 'y': y} for x, y in points[start:end]]
+        for poly, (x, y, w, h) in self._rows(self.polygons.bounds, bounds, slice(0, 4)):
+            poly['bounds'] = QRect(x, y, w, h)
@@ -0,0 +1,144 @@
+"""
+Per-page cache of stored drawing elements with background prefetch.
+
+The drawing interface loads one (drawing, page) at a time through
+DrawingElementManager.load_page: a single query that returns the page's
+plain overlay elements and its HVAC-path-linked elements. Loaded pages are
+kept in a small LRU cache. While the user works on one page, a worker
+thread prefetches the others, nearest pages first, on reader connections.
+
+Each cache entry records the page's signature: the row count, the highest
+row id and the latest modified date. A lookup re-checks it with one
+aggregate query, so rows written by the autosave queue, path dialogs or any
+other writer are never served stale. Callers get deep copies, because the
+overlay edits element dicts in place.
+"""
+
+import copy
+import logging
+import threading
+from collections import OrderedDict, deque
+from typing import Dict, Iterable, Optional
+
+from PySide6.QtCore import QObject, Signal
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHED_PAGES = 12
+
+
+class DrawingPageCache(QObject):
+    """LRU cache of one drawing's pages, validated against the database on every lookup"""
+
+    page_loaded = Signal(int)  # Page number prefetched into the cache
+
+    def __init__(self, element_manager, drawing_id: int, read_session=None,
+                 max_pages: int = DEFAULT_CACHED_PAGES, parent=None):
+        super().__init__(parent)
+        self.element_manager = element_manager
+        self.drawing_id = drawing_id
+        self.max_pages = max_pages
+        if read_session is None:
+            from models.database import read_session
+        self._read_session = read_session
+        self._cond = threading.Condition()
+        self._pages: "OrderedDict[int, Dict]" = OrderedDict()
+        self._pending: "deque[int]" = deque()
+        self._stopping = False
+        self.hits = 0
+        self.misses = 0
+        self._thread = threading.Thread(target=self._run, name=f"drawing-page-prefetch-{drawing_id}", daemon=True)
+        self._thread.start()
+
+    def get(self, page_number: int) -> Dict:
+        """Elements stored for a page (see DrawingElementManager.load_page), as a private copy."""
+        return copy.deepcopy(self._current(page_number))
+
+    def get_path_elements(self, page_number: int, path_id: int) -> Dict:
+        """One HVAC path's linked elements on a page, as a private copy."""
+        path_elements = self._current(page_number)['path_elements']
+        return copy.deepcopy(path_elements.get(path_id) or {'components': [], 'segments': []})
+
+    def _current(self, page_number: int) -> Dict:
+        """The cached page if its signature still matches the database, else a fresh load."""
+        with self._read_session() as session:
+            with self._cond:
+                cached = self._pages.get(page_number)
+            if cached is not None and cached['signature'] == self.element_manager.page_signature(
+                    session, self.drawing_id, page_number):
+                with self._cond:
+                    if page_number in self._pages:
+                        self._pages.move_to_end(page_number)
+                    self.hits += 1
+                return cached
+            page = self.element_manager.load_page(self.drawing_id, page_number, session=session)
+        with self._cond:
+            self.misses += 1
+            self._store(page_number, page)
+        return page
+
+    def prefetch(self, page_numbers: Iterable[int]):
+        """Replace pending prefetch work with these pages (highest priority first)."""
+        with self._cond:
+            self._pending = deque(p for p in dict.fromkeys(page_numbers) if p not in self._pages)
+            self._cond.notify_all()
+
+    def prefetch_around(self, current_page: int, page_count: int):
+        """Prefetch the other pages of the drawing, nearest to current_page first."""
+        others = sorted((p for p in range(1, page_count + 1) if p != current_page),
+                        key=lambda p: (abs(p - current_page), p))
+        self.prefetch(others[:max(0, self.max_pages - 1)])
+
+    def cached_pages(self):
+        with self._cond:
+            return list(self._pages)
+
+    def invalidate(self, page_number: Optional[int] = None):
+        with self._cond:
+            if page_number is None:
+                self._pages.clear()
+            else:
+                self._pages.pop(page_number, None)
+
+    def shutdown(self, timeout: float = 2.0):
+        with self._cond:
+            self._stopping = True
+            self._pending.clear()
+            self._cond.notify_all()
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def _store(self, page_number: int, page: Dict):
+        """Insert a loaded page, evicting the least recently used (caller holds the lock)."""
+        self._pages[page_number] = page
+        self._pages.move_to_end(page_number)
+        while len(self._pages) > self.max_pages:
+            self._pages.popitem(last=False)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._stopping:
+                    self._cond.wait()
+                if self._stopping:
+                    return
+                page_number = self._pending.popleft()
+                if page_number in self._pages:
+                    continue
+            try:
+                with self._read_session() as session:
+                    page = self.element_manager.load_page(self.drawing_id, page_number, session=session)
+            except Exception as e:
+                logger.debug(f"Could not prefetch page {page_number} of drawing {self.drawing_id}: {e}")
+                continue
+            with self._cond:
+                if self._stopping:
+                    return
+                # A foreground load of the same page may have landed first; keep the newer one
+                if page_number not in self._pages:
+                    self._store(page_number, page)
+            try:
+                self.page_loaded.emit(page_number)
+            except RuntimeError:
+                # The owning interface was destroyed without shutting us down
+                return
@@ -0,0 +1,402 @@
+"""
+Tiled PDF page rendering with a memory-bounded LRU tile cache.
+
+Large drawing sheets are rasterized as fixed-size tiles at a small set of
+zoom "buckets" instead of as one full-page pixmap per zoom change. Only the
+tiles intersecting the viewport are rendered. Each tile is keyed by
+(page, bucket, column, row), so panning and returning to a zoom level reuse
+cached tiles. Tiles from other buckets of the same page are drawn scaled as
+placeholders while the sharp tiles render.
+
+Each page's content is parsed once into a PyMuPDF DisplayList and every tile
+is rasterized from it, so a tile does not re-interpret the whole page.
+
+Rasterization is queued to TileRenderService, one worker thread with its
+own fitz document. A new request replaces all pending work, so tiles of
+stale zoom levels or pages are never started; finished tiles are delivered
+through the tile_ready signal.
+
+The worker does not make rendering concurrent with the GUI: PyMuPDF holds
+the GIL for the whole of a render, so the GUI thread stalls for as long as
+each render takes. What keeps the UI usable is that renders are short
+(TILE_SIZE tiles, one at a time, only the visible ones) and that the event
+loop runs between them. PyMuPDF does not support concurrent use from
+several threads, so the fitz users that run off the GUI thread (this
+worker, preview generation) hold fitz_lock while they call into fitz, and
+so does the viewer when it opens or closes a document or reads page
+geometry. Other GUI-thread fitz calls cannot overlap a render either,
+because the render holds the GIL.
+"""
+
+import logging
+import math
+import threading
+from collections import OrderedDict, deque, namedtuple
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import fitz  # PyMuPDF
+from PySide6.QtCore import QObject, Signal
+from PySide6.QtGui import QImage
+
+logger = logging.getLogger(__name__)
+
+
+TILE_SIZE = 512                              # Tile edge in device pixels
+ZOOM_BUCKET_STEP = 0.25                      # Tiles are rendered at multiples of 25%
+MIN_ZOOM_BUCKET = 0.25
+DEFAULT_TILE_CACHE_BYTES = 256 * 1024 * 1024
+PREVIEW_MAX_DIMENSION = 1024                 # Long side of the whole-page placeholder
+DISPLAY_LIST_CACHE_PAGES = 4
+# More threads would not render in parallel (see module docstring) and fitz must not be used concurrently
+DEFAULT_RENDER_THREADS = 1
+
+# Bucket used to mark the whole-page preview entry of a page
+PREVIEW_COLUMN = -1
+
+TileKey = namedtuple('TileKey', ['page', 'bucket', 'col', 'row'])
+
+# Serializes fitz calls across threads (PyMuPDF is not thread-safe)
+fitz_lock = threading.RLock()
+
+
+def zoom_bucket(zoom: float) -> float:
+    """Render resolution for a display zoom: the next ZOOM_BUCKET_STEP multiple at or above it.
+
+    Rendering at or slightly above the display zoom keeps tiles sharp while
+    letting nearby zoom levels (slider drags, fit-width) share cached tiles.
+    """
+    steps = math.ceil(zoom / ZOOM_BUCKET_STEP - 1e-6)
+    return max(MIN_ZOOM_BUCKET, steps * ZOOM_BUCKET_STEP)
+
+
+def page_pixel_size(page_rect, zoom: float) -> Tuple[int, int]:
+    """Pixel size of a page rendered at zoom (matches page.get_pixmap)."""
+    irect = (fitz.Rect(page_rect) * fitz.Matrix(zoom, zoom)).irect
+    return irect.width, irect.height
+
+
+def tile_grid(page_rect, bucket: float, tile_size: int = TILE_SIZE) -> Tuple[int, int]:
+    """Number of (columns, rows) of tiles covering a page at a bucket."""
+    width, height = page_pixel_size(page_rect, bucket)
+    return max(1, math.ceil(width / tile_size)), max(1, math.ceil(height / tile_size))
+
+
+def tiles_in_rect(x0: float, y0: float, x1: float, y1: float, page_rect, bucket: float,
+                  tile_size: int = TILE_SIZE) -> List[Tuple[int, int]]:
+    """(col, row) of the tiles at bucket intersecting a rectangle in bucket pixels."""
+    cols, rows = tile_grid(page_rect, bucket, tile_size)
+    c0 = max(0, int(x0 // tile_size))
+    r0 = max(0, int(y0 // tile_size))
+    c1 = min(cols - 1, int(max(x1 - 1, x0) // tile_size))
+    r1 = min(rows - 1, int(max(y1 - 1, y0) // tile_size))
+    return [(c, r) for r in range(r0, r1 + 1) for c in range(c0, c1 + 1)]
+
+
+def tile_pixel_rect(col: int, row: int, page_rect, bucket: float,
+                    tile_size: int = TILE_SIZE) -> Tuple[int, int, int, int]:
+    """(x, y, width, height) of a tile in bucket pixels, clipped to the page."""
+    width, height = page_pixel_size(page_rect, bucket)
+    x = col * tile_size
+    y = row * tile_size
+    return x, y, max(0, min(tile_size, width - x)), max(0, min(tile_size, height - y))
+
+
+def preview_bucket(page_rect, max_dimension: int = PREVIEW_MAX_DIMENSION) -> float:
+    """Zoom at which the whole page fits within max_dimension pixels."""
+    rect = fitz.Rect(page_rect)
+    longest = max(rect.width, rect.height, 1.0)
+    return min(1.0, max_dimension / longest)
+
+
+# QImage formats matching PyMuPDF sample layouts, keyed by (components, has_alpha).
+# MuPDF pixmaps with alpha are premultiplied.
+_QIMAGE_FORMATS = {
+    (1, False): QImage.Format_Grayscale8,
+    (3, False): QImage.Format_RGB888,
+    (4, True): QImage.Format_RGBA8888_Premultiplied,
+}
+
+
+class PixmapImage(QImage):
+    """QImage viewing a fitz.Pixmap's samples in place (no copy)
+
+    Holds a reference to the Pixmap so its buffer outlives the image. Qt
+    copies the pixels only if the image is modified or converted.
+    """
+
+    def __init__(self, pix):
+        image_format = _QIMAGE_FORMATS.get((pix.n, bool(pix.alpha)))
+        if image_format is None:
+            # e.g. gray+alpha or CMYK: convert once to RGB
+            pix = fitz.Pixmap(fitz.csRGB, pix, 0)
+            image_format = QImage.Format_RGB888
+        super().__init__(pix.samples_mv, pix.width, pix.height, pix.stride, image_format)
+        self.fitz_pixmap = pix
+
+
+def pixmap_to_qimage(pix) -> QImage:
+    """Wrap a PyMuPDF Pixmap as a QImage without copying the raster."""
+    return PixmapImage(pix)
+
+
+class PageRenderSource:
+    """Renders tiles of a document's pages from cached PyMuPDF display lists"""
+
+    def __init__(self, document, max_pages: int = DISPLAY_LIST_CACHE_PAGES):
+        self.document = document
+        self.max_pages = max_pages
+        self._display_lists: "OrderedDict[int, object]" = OrderedDict()
+        self._page_rects: Dict[int, fitz.Rect] = {}
+
+    def page_rect(self, page_index: int) -> fitz.Rect:
+        rect = self._page_rects.get(page_index)
+        if rect is None:
+            rect = self._page_rects[page_index] = fitz.Rect(self.document[page_index].rect)
+        return rect
+
+    def display_list(self, page_index: int):
+        """Parsed page content, cached for the most recently used pages."""
+        dl = self._display_lists.get(page_index)
+        if dl is None:
+            dl = self.document[page_index].get_displaylist()
+            self._display_lists[page_index] = dl
+            while len(self._display_lists) > self.max_pages:
+                self._display_lists.popitem(last=False)
+        else:
+            self._display_lists.move_to_end(page_index)
+        return dl
+
+    def render_region(self, page_index: int, zoom: float, x: int, y: int,
+                      width: int, height: int) -> QImage:
+        """Rasterize a rectangle given in pixels at zoom."""
+        rect = self.page_rect(page_index)
+        clip = fitz.Rect(
+            rect.x0 + x / zoom, rect.y0 + y / zoom,
+            rect.x0 + (x + width) / zoom, rect.y0 + (y + height) / zoom,
+        )
+        pix = self.display_list(page_index).get_pixmap(
+            matrix=fitz.Matrix(zoom, zoom), clip=clip, alpha=False
+        )
+        return pixmap_to_qimage(pix)
+
+    def render_tile(self, key: TileKey, tile_size: int = TILE_SIZE) -> QImage:
+        """Rasterize one tile."""
+        rect = self.page_rect(key.page)
+        if key.col == PREVIEW_COLUMN:
+            width, height = page_pixel_size(rect, key.bucket)
+            return self.render_region(key.page, key.bucket, 0, 0, width, height)
+        x, y, width, height = tile_pixel_rect(key.col, key.row, rect, key.bucket, tile_size)
+        return self.render_region(key.page, key.bucket, x, y, width, height)
+
+
+class TileRenderService(QObject):
+    """Renders tiles on a worker thread, one short render at a time, with request coalescing and cancellation"""
+
+    tile_ready = Signal(object, object)  # TileKey, QImage
+
+    def __init__(self, pdf_path: str, thread_count: int = DEFAULT_RENDER_THREADS,
+                 tile_size: int = TILE_SIZE, preview_cache=None, parent=None):
+        super().__init__(parent)
+        self.pdf_path = pdf_path
+        self.tile_size = tile_size
+        # Optional PreviewCache that whole-page previews are written through to
+        self.preview_cache = preview_cache
+        self._cond = threading.Condition()
+        self._pending: "deque[TileKey]" = deque()
+        self._in_flight = set()
+        self._stopping = False
+        self.rendered_count = 0
+        self._threads = [
+            threading.Thread(target=self._run, name=f"pdf-tile-render-{i}", daemon=True)
+            for i in range(max(1, thread_count))
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def request(self, keys: Sequence[TileKey]):
+        """Replace all pending work with keys (highest priority first).
+
+        Tiles already being rendered are not requested again; anything not yet
+        started from earlier requests is dropped.
+        """
+        with self._cond:
+            self._pending = deque(k for k in dict.fromkeys(keys) if k not in self._in_flight)
+            self._cond.notify_all()
+
+    def cancel(self):
+        """Drop all pending (not yet started) tiles."""
+        with self._cond:
+            self._pending.clear()
+
+    def pending_count(self) -> int:
+        with self._cond:
+            return len(self._pending) + len(self._in_flight)
+
+    def shutdown(self, timeout: float = 2.0):
+        """Stop the worker threads after their current tile."""
+        with self._cond:
+            self._stopping = True
+            self._pending.clear()
+            self._cond.notify_all()
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout)
+
+    def _run(self):
+        try:
+            with fitz_lock:
+                document = fitz.open(self.pdf_path)
+        except Exception as e:
+            logger.warning(f"Tile render thread could not open {self.pdf_path}: {e}")
+            return
+        source = PageRenderSource(document)
+        try:
+            while True:
+                with self._cond:
+                    while not self._pending and not self._stopping:
+                        self._cond.wait()
+                    if self._stopping:
+                        return
+                    key = self._pending.popleft()
+                    self._in_flight.add(key)
+                try:
+                    with fitz_lock:
+                        image = source.render_tile(key, self.tile_size)
+                except Exception as e:
+                    logger.debug(f"Failed to render tile {key}: {e}")
+                    image = None
+                if image is not None and key.col == PREVIEW_COLUMN and self.preview_cache is not None:
+                    try:
+                        # Takes fitz_lock itself, only around the PNG encoding
+                        self.preview_cache.store_preview(self.pdf_path, key.page, key.bucket,
+                                                         image.fitz_pixmap)
+                    except Exception as e:
+                        logger.debug(f"Could not cache preview for page {key.page}: {e}")
+                with self._cond:
+                    self._in_flight.discard(key)
+                    stopping = self._stopping
+                    if image is not None:
+                        self.rendered_count += 1
+                if image is not None and not stopping:
+                    try:
+                        self.tile_ready.emit(key, image)
+                    except RuntimeError:
+                        # The owning widget was destroyed without shutting us down
+                        return
+        finally:
+            with fitz_lock:
+                document.close()
+
+
+class TileCache:
+    """LRU cache of rendered tiles bounded by total pixel memory"""
+
+    def __init__(self, max_bytes: int = DEFAULT_TILE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._tiles: "OrderedDict[TileKey, object]" = OrderedDict()
+        self._costs: Dict[TileKey, int] = {}
+        self._buckets: Dict[int, Dict[float, int]] = {}   # page -> bucket -> tile count
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def tile_cost(tile) -> int:
+        try:
+            return tile.sizeInBytes()
+        except AttributeError:
+            pass
+        try:
+            return tile.width() * tile.height() * 4
+        except Exception:
+            return 0
+
+    def __contains__(self, key: TileKey) -> bool:
+        return key in self._tiles
+
+    def __len__(self) -> int:
+        return len(self._tiles)
+
+    def get(self, key: TileKey):
+        tile = self._tiles.get(key)
+        if tile is None:
+            self.misses += 1
+            return None
+        self._tiles.move_to_end(key)
+        self.hits += 1
+        return tile
+
+    def peek(self, key: TileKey):
+        """Return a cached tile without touching LRU order or statistics."""
+        return self._tiles.get(key)
+
+    def put(self, key: TileKey, tile):
+        if key in self._tiles:
+            self._remove(key)
+        cost = self.tile_cost(tile)
+        self._tiles[key] = tile
+        self._costs[key] = cost
+        self.total_bytes += cost
+        page_buckets = self._buckets.setdefault(key.page, {})
+        page_buckets[key.bucket] = page_buckets.get(key.bucket, 0) + 1
+        self._evict(protect=key)
+
+    def _remove(self, key: TileKey):
+        self._tiles.pop(key, None)
+        self.total_bytes -= self._costs.pop(key, 0)
+        page_buckets = self._buckets.get(key.page)
+        if page_buckets and key.bucket in page_buckets:
+            page_buckets[key.bucket] -= 1
+            if page_buckets[key.bucket] <= 0:
+                del page_buckets[key.bucket]
+            if not page_buckets:
+                del self._buckets[key.page]
+
+    def _evict(self, protect: Optional[TileKey] = None):
+        while self.total_bytes > self.max_bytes and len(self._tiles) > 1:
+            oldest = next(iter(self._tiles))
+            if oldest == protect:
+                break
+            self._remove(oldest)
+            self.evictions += 1
+
+    def buckets_for_page(self, page: int) -> List[float]:
+        """Buckets that have cached tiles for a page."""
+        return sorted(self._buckets.get(page, {}))
+
+    def placeholder_tiles(self, page: int, bucket: float, x0: float, y0: float,
+                          x1: float, y1: float, page_rect,
+                          tile_size: int = TILE_SIZE) -> Iterable[Tuple[TileKey, object]]:
+        """Cached tiles of other buckets covering a rectangle given in bucket pixels.
+
+        Coarser buckets come first, then finer ones, each ordered so the bucket
+        closest to the requested one is last; a caller painting them in order
+        ends with the best available detail on top.
+        """
+        others = [b for b in self.buckets_for_page(page) if b != bucket]
+        others.sort(key=lambda b: (b > bucket, b if b < bucket else -b))
+        for other in others:
+            scale = other / bucket
+            for col, row in tiles_in_rect(x0 * scale, y0 * scale, x1 * scale, y1 * scale,
+                                          page_rect, other, tile_size):
+                key = TileKey(page, other, col, row)
+                tile = self._tiles.get(key)
+                if tile is not None:
+                    yield key, tile
+
+    def clear(self):
+        self._tiles.clear()
+        self._costs.clear()
+        self._buckets.clear()
+        self.total_bytes = 0
+
+    def stats(self) -> Dict:
+        return {
+            'tiles': len(self._tiles),
+            'bytes': self.total_bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
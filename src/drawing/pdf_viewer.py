@@ -6,10 +6,213 @@ import fitz  # PyMuPDF
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                              QScrollArea, QPushButton, QSlider, QComboBox,
                              QMessageBox, QSizePolicy, QRubberBand)
-from PySide6.QtCore import Qt, Signal, QRect, QPoint, QSize, QTimer
-from PySide6.QtGui import QPixmap, QImage, QPainter, QPen, QColor
+from PySide6.QtCore import Qt, Signal, QRect, QRectF, QPoint, QSize, QTimer
+from PySide6.QtGui import QPainter, QPen, QColor
 import os
 
+from .page_tiles import (PREVIEW_COLUMN, DEFAULT_TILE_CACHE_BYTES, TileKey, TileCache, fitz_lock,
+                         TileRenderService, zoom_bucket, page_pixel_size, preview_bucket,
+                         tiles_in_rect, tile_pixel_rect)
+from .preview_cache import get_preview_cache, preview_tag
+
+
+class PDFPageCanvas(QWidget):
+    """Page surface that paints only the tiles visible in the viewport
+
+    Tiles are rasterized by a TileRenderService worker, one short render at a time. Each paint
+    that finds visible tiles missing schedules one coalesced request for the
+    currently visible set (replacing any stale request); until the tiles
+    arrive the area shows the whole-page preview and any cached tiles from
+    other zoom buckets, scaled to the current zoom. Whole-page previews are
+    read from and written to the persistent PreviewCache, so reopening a sheet
+    shows it immediately.
+    """
+
+    def __init__(self, parent=None, cache_bytes=DEFAULT_TILE_CACHE_BYTES):
+        super().__init__(parent)
+        self.tile_cache = TileCache(cache_bytes)
+        self.document = None
+        self.pdf_path = None
+        self.render_service = None
+        self.preview_cache = None
+        self.page_index = 0
+        self.zoom_factor = 1.0
+        self._page_rects = {}
+        self._page_size = QSize(0, 0)
+        self._message = "No PDF loaded"
+        # Coalesces the requests of several paint events into one per event-loop pass
+        self._request_timer = QTimer(self)
+        self._request_timer.setSingleShot(True)
+        self._request_timer.setInterval(0)
+        self._request_timer.timeout.connect(self._request_visible_tiles)
+        self.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
+
+    def set_document(self, document, pdf_path=None):
+        """Use a new PyMuPDF document; drops all cached tiles and stops the old workers."""
+        self._request_timer.stop()
+        if self.render_service is not None:
+            self.render_service.tile_ready.disconnect(self._on_tile_ready)
+            self.render_service.shutdown()
+            self.render_service = None
+        self.tile_cache.clear()
+        self._page_rects = {}
+        self.document = document
+        self.pdf_path = (pdf_path or document.name) if document is not None else None
+        if document is not None:
+            self.preview_cache = get_preview_cache()
+            self.render_service = TileRenderService(self.pdf_path, preview_cache=self.preview_cache,
+                                                    parent=self)
+            self.render_service.tile_ready.connect(self._on_tile_ready)
+
+    def set_page(self, page_index, zoom_factor):
+        """Show a page at a zoom factor."""
+        if self.document is None:
+            return
+        if page_index != self.page_index or zoom_bucket(zoom_factor) != zoom_bucket(self.zoom_factor):
+            # Work queued for the previous page or zoom bucket is stale
+            self.render_service.cancel()
+        self.page_index = page_index
+        self.zoom_factor = zoom_factor
+        width, height = page_pixel_size(self._page_rect(page_index), zoom_factor)
+        self._page_size = QSize(width, height)
+        self.setFixedSize(self._page_size)
+        self._load_cached_preview()
+        self.update()
+
+    def clear_page(self, message="No PDF loaded"):
+        """Forget the document and show a message instead of a page."""
+        self.set_document(None)
+        self._page_size = QSize(0, 0)
+        self._message = message
+        self.setMinimumSize(0, 0)
+        self.setMaximumSize(16777215, 16777215)
+        self.update()
+
+    def has_page(self):
+        return self.document is not None and not self._page_size.isEmpty()
+
+    def page_size(self):
+        """Size of the page in widget pixels at the current zoom."""
+        return QSize(self._page_size)
+
+    def sizeHint(self):
+        return self._page_size if self.has_page() else super().sizeHint()
+
+    def _page_rect(self, page_index):
+        rect = self._page_rects.get(page_index)
+        if rect is None:
+            with fitz_lock:
+                rect = self._page_rects[page_index] = fitz.Rect(self.document[page_index].rect)
+        return rect
+
+    def _bucket(self):
+        return zoom_bucket(self.zoom_factor)
+
+    def _preview_key(self):
+        page_rect = self._page_rect(self.page_index)
+        return TileKey(self.page_index, preview_bucket(page_rect), PREVIEW_COLUMN, 0)
+
+    def _load_cached_preview(self):
+        """Seed the tile cache with the page preview from disk, if one was stored earlier."""
+        key = self._preview_key()
+        if self.preview_cache is None or key in self.tile_cache:
+            return
+        try:
+            image = self.preview_cache.load_image(self.pdf_path, key.page, preview_tag(key.bucket))
+        except Exception:
+            image = None
+        if image is not None:
+            self.tile_cache.put(key, image)
+
+    def _tile_widget_rect(self, key):
+        """Widget-space rectangle covered by a tile."""
+        if key.col == PREVIEW_COLUMN:
+            return QRectF(0, 0, self._page_size.width(), self._page_size.height())
+        page_rect = self._page_rect(key.page)
+        x, y, w, h = tile_pixel_rect(key.col, key.row, page_rect, key.bucket)
+        scale = self.zoom_factor / key.bucket
+        return QRectF(x * scale, y * scale, w * scale, h * scale)
+
+    def _visible_tiles(self, rect):
+        """Tile keys at the current bucket intersecting a widget rectangle."""
+        bucket = self._bucket()
+        scale = bucket / self.zoom_factor
+        page_rect = self._page_rect(self.page_index)
+        return [
+            TileKey(self.page_index, bucket, col, row)
+            for col, row in tiles_in_rect(rect.left() * scale, rect.top() * scale,
+                                          (rect.right() + 1) * scale, (rect.bottom() + 1) * scale,
+                                          page_rect, bucket)
+        ]
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        rect = event.rect()
+        if not self.has_page():
+            painter.fillRect(rect, QColor("#1e1e1e"))
+            painter.setPen(QColor("#7f8c8d"))
+            painter.drawText(self.rect(), Qt.AlignCenter, self._message)
+            painter.end()
+            return
+
+        painter.setRenderHint(QPainter.SmoothPixmapTransform, True)
+        painter.fillRect(rect, Qt.white)
+
+        preview = self.tile_cache.peek(self._preview_key())
+        missing = preview is None
+        if preview is not None:
+            scale = preview.width() / max(self._page_size.width(), 1)
+            source_rect = QRectF(rect.x() * scale, rect.y() * scale,
+                                 rect.width() * scale, rect.height() * scale)
+            painter.drawImage(QRectF(rect), preview, source_rect)
+
+        page_rect = self._page_rect(self.page_index)
+        for key in self._visible_tiles(rect):
+            target = self._tile_widget_rect(key)
+            tile = self.tile_cache.get(key)
+            if tile is not None:
+                painter.drawImage(target, tile)
+                continue
+            missing = True
+            # Scale cached tiles of other buckets into the gap until this tile arrives
+            x, y, w, h = tile_pixel_rect(key.col, key.row, page_rect, key.bucket)
+            painter.save()
+            painter.setClipRect(target)
+            for other_key, other_tile in self.tile_cache.placeholder_tiles(
+                    key.page, key.bucket, x, y, x + w, y + h, page_rect):
+                painter.drawImage(self._tile_widget_rect(other_key), other_tile)
+            painter.restore()
+        painter.end()
+
+        if missing and not self._request_timer.isActive():
+            self._request_timer.start()
+
+    def _request_visible_tiles(self):
+        """Ask the render service for the uncached visible tiles, nearest the viewport centre first."""
+        if not self.has_page() or self.render_service is None:
+            return
+        visible = self.visibleRegion().boundingRect()
+        if visible.isEmpty():
+            return
+        center = QRectF(visible).center()
+
+        def distance(key):
+            c = self._tile_widget_rect(key).center()
+            return (c.x() - center.x()) ** 2 + (c.y() - center.y()) ** 2
+
+        keys = sorted((k for k in self._visible_tiles(visible) if k not in self.tile_cache),
+                      key=distance)
+        preview_key = self._preview_key()
+        if preview_key not in self.tile_cache:
+            keys.insert(0, preview_key)
+        self.render_service.request(keys)
+
+    def _on_tile_ready(self, key, image):
+        """Cache a finished tile and repaint the area it covers on the current page."""
+        self.tile_cache.put(key, image)
+        if key.page == self.page_index and self.has_page():
+            self.update(self._tile_widget_rect(key).toAlignedRect())
+
 
 class PDFViewer(QWidget):
     """PDF viewer widget with zoom and page navigation"""
@@ -30,7 +233,6 @@ class PDFViewer(QWidget):
         # Page properties
         self.page_width = 0
         self.page_height = 0
-        self.pixmap = None
         # Selection state
         self._rubber_band = None
         self._origin = QPoint()
@@ -52,15 +254,11 @@ class PDFViewer(QWidget):
         self.scroll_area.setWidgetResizable(True)
         self.scroll_area.setAlignment(Qt.AlignCenter)
         
-        # PDF display label
-        self.pdf_label = QLabel()
-        self.pdf_label.setAlignment(Qt.AlignCenter)
-        # Dark-friendly canvas border; keep PDF rendering neutral
-        self.pdf_label.setStyleSheet("border: 1px solid #3a3a3a; background-color: #1e1e1e;")
+        # Tiled PDF page surface (only visible tiles are rendered)
+        self.pdf_label = PDFPageCanvas()
         self.pdf_label.mousePressEvent = self.mouse_press_event
         self.pdf_label.mouseMoveEvent = self.mouse_move_event
         self.pdf_label.mouseReleaseEvent = self.mouse_release_event
-        self.pdf_label.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
         
         self.scroll_area.setWidget(self.pdf_label)
         layout.addWidget(self.scroll_area)
@@ -134,9 +332,11 @@ class PDFViewer(QWidget):
             if not os.path.exists(pdf_path):
                 raise FileNotFoundError(f"PDF file not found: {pdf_path}")
                 
-            self.pdf_document = fitz.open(pdf_path)
+            with fitz_lock:
+                self.pdf_document = fitz.open(pdf_path)
             self.pdf_path = pdf_path
             self.current_page = 0
+            self.pdf_label.set_document(self.pdf_document, pdf_path)
             
             # Update UI
             self.update_page_navigation()
@@ -154,32 +354,16 @@ class PDFViewer(QWidget):
             return False
             
     def render_page(self):
-        """Render the current PDF page"""
+        """Show the current PDF page at the current zoom (tiles render on demand)"""
         if not self.pdf_document or self.current_page >= len(self.pdf_document):
             return
             
         try:
-            # Get the page
-            page = self.pdf_document[self.current_page]
-            
-            # Create transformation matrix for zoom
-            mat = fitz.Matrix(self.zoom_factor, self.zoom_factor)
-            
-            # Render page to pixmap
-            pix = page.get_pixmap(matrix=mat)
-            
             # Store page dimensions at current zoom
-            self.page_width = pix.width
-            self.page_height = pix.height
-            
-            # Convert to QImage
-            img_data = pix.tobytes("ppm")
-            qimg = QImage.fromData(img_data)
+            page = self.pdf_document[self.current_page]
+            self.page_width, self.page_height = page_pixel_size(page.rect, self.zoom_factor)
             
-            # Convert to QPixmap and display
-            self.pixmap = QPixmap.fromImage(qimg)
-            self.pdf_label.setPixmap(self.pixmap)
-            self.pdf_label.resize(self.pixmap.size())
+            self.pdf_label.set_page(self.current_page, self.zoom_factor)
             
             # Update status
             zoom_percent = int(self.zoom_factor * 100)
@@ -311,7 +495,7 @@ class PDFViewer(QWidget):
         
     def mouse_press_event(self, event):
         """Handle mouse press on PDF"""
-        if event.button() == Qt.LeftButton and self.pixmap:
+        if event.button() == Qt.LeftButton and self.pdf_label.has_page():
             # Get click position relative to PDF image (screen pixel coordinates)
             screen_x = event.x()
             screen_y = event.y()
@@ -332,13 +516,13 @@ class PDFViewer(QWidget):
             self._rubber_band.show()
             
     def mouse_move_event(self, event):
-        if self._rubber_band and self.pixmap:
+        if self._rubber_band and self.pdf_label.has_page():
             current = QPoint(event.x(), event.y())
             rect = QRect(self._origin, current).normalized()
             self._rubber_band.setGeometry(rect)
 
     def mouse_release_event(self, event):
-        if self._rubber_band and self.pixmap:
+        if self._rubber_band and self.pdf_label.has_page():
             rect = self._rubber_band.geometry()
             # Convert to PDF coords (normalize by zoom)
             x0 = rect.left() / self.zoom_factor
@@ -387,6 +571,12 @@ class PDFViewer(QWidget):
         except Exception:
             pass
 
+    def get_page_pixel_size(self):
+        """Get the displayed page size in screen pixels at the current zoom (None if no page)"""
+        if not self.pdf_label.has_page():
+            return None
+        return self.pdf_label.page_size()
+
     def get_page_dimensions(self):
         """Get current page dimensions in PDF units"""
         if not self.pdf_document:
@@ -399,12 +589,12 @@ class PDFViewer(QWidget):
     def close_pdf(self):
         """Close the current PDF"""
         if self.pdf_document:
-            self.pdf_document.close()
+            with fitz_lock:
+                self.pdf_document.close()
             self.pdf_document = None
             self.pdf_path = None
             self.current_page = 0
-            self.pdf_label.clear()
-            self.pdf_label.setText("No PDF loaded")
+            self.pdf_label.clear_page("No PDF loaded")
             self.status_label.setText("No PDF loaded")
             self.update_page_navigation()
          
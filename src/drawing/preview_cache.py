@@ -0,0 +1,310 @@
+"""
+Persistent on-disk cache of low-resolution drawing previews and thumbnails.
+
+Entries are content-addressed: the key is the SHA-256 of the PDF file plus
+the page number and a size tag, so a renamed or moved sheet reuses its
+previews and an edited sheet gets new ones. File hashes are remembered in
+an index keyed by (path, size, mtime), so a lookup does not re-read the PDF.
+
+Two kinds of entries are stored as PNG files:
+- thumbnails (``t<px>``): the page fitted into THUMBNAIL_MAX_DIMENSION, for
+  the drawings lists;
+- page previews (``z<bucket>``): the whole page at the PDFViewer preview
+  bucket, painted while full-resolution tiles render.
+
+The cache is bounded by total size; least recently used entries (by file
+mtime, refreshed on every hit) are evicted first. The location defaults to
+<user data dir>/preview_cache and can be overridden with the
+ACOUSTIC_PREVIEW_CACHE_DIR environment variable.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import fitz  # PyMuPDF
+from PySide6.QtCore import QThread, Signal
+from PySide6.QtGui import QImage
+
+from .page_tiles import fitz_lock, preview_bucket
+
+logger = logging.getLogger(__name__)
+
+PREVIEW_CACHE_DIR_ENV = "ACOUSTIC_PREVIEW_CACHE_DIR"
+DEFAULT_PREVIEW_CACHE_BYTES = 200 * 1024 * 1024
+THUMBNAIL_MAX_DIMENSION = 256
+INDEX_FILE = "index.json"
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def thumbnail_tag(max_dimension: int = THUMBNAIL_MAX_DIMENSION) -> str:
+    return f"t{max_dimension}"
+
+
+def preview_tag(bucket: float) -> str:
+    return f"z{bucket:.4f}"
+
+
+def _default_cache_dir() -> str:
+    override = os.environ.get(PREVIEW_CACHE_DIR_ENV)
+    if override:
+        return override
+    try:
+        from utils import ensure_user_data_directory
+    except ImportError:
+        from src.utils import ensure_user_data_directory
+    return os.path.join(ensure_user_data_directory(), "preview_cache")
+
+
+class PreviewCache:
+    """Content-addressed PNG cache of page previews with an LRU size limit"""
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = DEFAULT_PREVIEW_CACHE_BYTES):
+        self.cache_dir = cache_dir or _default_cache_dir()
+        self.max_bytes = max_bytes
+        self._lock = threading.RLock()
+        self._index: Optional[Dict[str, List]] = None   # abspath -> [size, mtime_ns, sha256]
+        self._total_bytes: Optional[int] = None
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    # ── File hashing ─────────────────────────────────────────────────────────
+
+    def _index_path(self) -> str:
+        return os.path.join(self.cache_dir, INDEX_FILE)
+
+    def _load_index(self) -> Dict[str, List]:
+        if self._index is None:
+            try:
+                with open(self._index_path(), 'r', encoding='utf-8') as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError):
+                self._index = {}
+        return self._index
+
+    def _save_index(self):
+        tmp_path = self._index_path() + ".tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._index, f)
+            os.replace(tmp_path, self._index_path())
+        except OSError as e:
+            logger.debug(f"Could not save preview cache index: {e}")
+
+    def file_hash(self, pdf_path: str, compute: bool = True) -> Optional[str]:
+        """SHA-256 of a file, memoized by (path, size, mtime).
+
+        With compute=False only the index is consulted, so the call never
+        reads the PDF; returns None if the file is unknown or has changed.
+        """
+        abs_path = os.path.abspath(pdf_path)
+        try:
+            stat = os.stat(abs_path)
+        except OSError:
+            return None
+        with self._lock:
+            entry = self._load_index().get(abs_path)
+            if entry and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+                return entry[2]
+        if not compute:
+            return None
+
+        digest = hashlib.sha256()
+        with open(abs_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                digest.update(chunk)
+        file_hash = digest.hexdigest()
+        with self._lock:
+            self._load_index()[abs_path] = [stat.st_size, stat.st_mtime_ns, file_hash]
+            self._save_index()
+        return file_hash
+
+    # ── Entries ──────────────────────────────────────────────────────────────
+
+    def entry_path(self, file_hash: str, page: int, tag: str) -> str:
+        return os.path.join(self.cache_dir, file_hash[:2], f"{file_hash}_p{page}_{tag}.png")
+
+    def get_path(self, pdf_path: str, page: int, tag: str) -> Optional[str]:
+        """Path of a cached entry (marked as recently used), or None."""
+        file_hash = self.file_hash(pdf_path, compute=False)
+        if file_hash is None:
+            return None
+        path = self.entry_path(file_hash, page, tag)
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+
+    def load_image(self, pdf_path: str, page: int, tag: str) -> Optional[QImage]:
+        """Cached entry decoded as a QImage, or None."""
+        path = self.get_path(pdf_path, page, tag)
+        if path is None:
+            return None
+        image = QImage(path)
+        return None if image.isNull() else image
+
+    def put(self, file_hash: str, page: int, tag: str, png_data: bytes) -> str:
+        """Store an entry and evict least recently used entries over the size limit."""
+        path = self.entry_path(file_hash, page, tag)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(png_data)
+        with self._lock:
+            previous = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp_path, path)
+            self._total_bytes = self.total_bytes() - previous + len(png_data)
+            self._enforce_limit()
+        return path
+
+    def _entries(self) -> Iterable[Tuple[str, os.stat_result]]:
+        for root, _dirs, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith('.png'):
+                    path = os.path.join(root, name)
+                    try:
+                        yield path, os.stat(path)
+                    except OSError:
+                        continue
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(st.st_size for _, st in self._entries())
+            return self._total_bytes
+
+    def _enforce_limit(self):
+        if self._total_bytes <= self.max_bytes:
+            return
+        entries = sorted(self._entries(), key=lambda e: e[1].st_mtime_ns)
+        total = sum(st.st_size for _, st in entries)
+        for path, st in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= st.st_size
+            except OSError:
+                continue
+        self._total_bytes = total
+
+    def has_thumbnail(self, pdf_path: str, page: int = 0) -> bool:
+        return self.get_path(pdf_path, page, thumbnail_tag()) is not None
+
+    # ── Generation ───────────────────────────────────────────────────────────
+
+    def generate(self, pdf_path: str, pages: Optional[Iterable[int]] = None,
+                 thumbnails: bool = True, previews: bool = True,
+                 cancelled: Optional[Callable[[], bool]] = None) -> int:
+        """Render and store missing thumbnails/page previews for a PDF.
+
+        cancelled is polled before each page render; generation stops as
+        soon as it returns True. Returns the number of entries written.
+        """
+        file_hash = self.file_hash(pdf_path)
+        if file_hash is None:
+            return 0
+        written = 0
+        # fitz_lock is taken per call, so the viewer's tile renders interleave with generation
+        with fitz_lock:
+            document = fitz.open(pdf_path)
+        try:
+            with fitz_lock:
+                page_numbers = range(len(document)) if pages is None else pages
+            for page_number in page_numbers:
+                with fitz_lock:
+                    page = document[page_number]
+                    page_rect = page.rect
+                wanted = []
+                if thumbnails:
+                    wanted.append((thumbnail_tag(), preview_bucket(page_rect, THUMBNAIL_MAX_DIMENSION)))
+                if previews:
+                    bucket = preview_bucket(page_rect)
+                    wanted.append((preview_tag(bucket), bucket))
+                for tag, zoom in wanted:
+                    if cancelled is not None and cancelled():
+                        return written
+                    if os.path.exists(self.entry_path(file_hash, page_number, tag)):
+                        continue
+                    with fitz_lock:
+                        png_data = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False).tobytes("png")
+                    self.put(file_hash, page_number, tag, png_data)
+                    written += 1
+        finally:
+            with fitz_lock:
+                document.close()
+        return written
+
+    def store_preview(self, pdf_path: str, page: int, bucket: float, pix) -> None:
+        """Persist an already rendered page preview (fitz.Pixmap).
+
+        Only the PNG encoding holds fitz_lock; hashing the PDF and writing
+        the entry do not, so they never hold up fitz calls on the GUI thread.
+        Callers must not hold fitz_lock.
+        """
+        file_hash = self.file_hash(pdf_path)
+        if file_hash is None:
+            return
+        if os.path.exists(self.entry_path(file_hash, page, preview_tag(bucket))):
+            return
+        with fitz_lock:
+            png_data = pix.tobytes("png")
+        self.put(file_hash, page, preview_tag(bucket), png_data)
+
+    def clear(self):
+        with self._lock:
+            for path, _ in list(self._entries()):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._total_bytes = 0
+
+
+class PreviewGenerationWorker(QThread):
+    """Generates thumbnails and page previews for PDFs in the background"""
+
+    preview_ready = Signal(str)   # PDF path whose previews are now cached
+    error_occurred = Signal(str, str)  # PDF path, error message
+
+    def __init__(self, pdf_paths: Iterable[str], cache: Optional['PreviewCache'] = None,
+                 parent=None):
+        super().__init__(parent)
+        self.pdf_paths = list(dict.fromkeys(p for p in pdf_paths if p))
+        self.cache = cache
+
+    def run(self):
+        cache = self.cache or get_preview_cache()
+        if cache is None:
+            return
+        for pdf_path in self.pdf_paths:
+            if self.isInterruptionRequested():
+                return
+            try:
+                cache.generate(pdf_path, cancelled=self.isInterruptionRequested)
+                if self.isInterruptionRequested():
+                    return
+                self.preview_ready.emit(pdf_path)
+            except Exception as e:
+                logger.debug(f"Preview generation failed for {pdf_path}: {e}")
+                self.error_occurred.emit(pdf_path, str(e))
+
+
+_preview_cache: Optional[PreviewCache] = None
+_preview_cache_lock = threading.Lock()
+
+
+def get_preview_cache() -> Optional[PreviewCache]:
+    """Shared PreviewCache instance (None if the cache directory is unusable)."""
+    global _preview_cache
+    with _preview_cache_lock:
+        if _preview_cache is None:
+            try:
+                _preview_cache = PreviewCache()
+            except OSError as e:
+                logger.warning(f"Preview cache disabled: {e}")
+                return None
+        return _preview_cache
@@ -0,0 +1,332 @@
+"""
+Uniform-grid spatial index for on-screen drawing elements.
+
+DrawingOverlay keeps its elements as plain dicts in lists and used to
+answer every hit test (including hover detection on each mouse move) by
+scanning those lists. GridIndex buckets each element's on-screen bounding
+box into fixed-size grid cells so point and rectangle queries only look at
+the elements in the touched cells.
+
+Elements are keyed by identity, so the same dict objects the overlay draws
+are indexed directly. Query results are returned in insertion order (the
+order of the overlay's lists), which keeps "first match wins" hit-testing
+identical to the linear scans it replaces. Callers apply their exact hit
+test to the returned candidates.
+
+PathMembershipIndex answers "is this element part of one of these paths?"
+for path-only rendering with set lookups: registered DB IDs, element IDs
+and a quantized base-coordinate hash for the coordinate-matching fallback.
+"""
+
+import math
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+DEFAULT_CELL_SIZE = 64
+# Elements whose bounds span more cells than this (long duct runs, whole-floor
+# rooms) are kept in a small list that every query checks, instead of being
+# written into hundreds of cells.
+MAX_CELLS_PER_ELEMENT = 256
+
+# Base-coordinate distance (strictly less than) at which registered path
+# elements match overlay elements; see DrawingOverlay._components_match
+MATCH_TOLERANCE = 5.0
+
+Bounds = Tuple[float, float, float, float]   # (min_x, min_y, max_x, max_y), inclusive
+
+
+def component_bounds(comp: dict) -> Optional[Bounds]:
+    x, y = float(comp.get('x', 0)), float(comp.get('y', 0))
+    return (x, y, x, y)
+
+
+def segment_bounds(seg: dict) -> Optional[Bounds]:
+    sx, sy = float(seg.get('start_x', 0)), float(seg.get('start_y', 0))
+    ex, ey = float(seg.get('end_x', 0)), float(seg.get('end_y', 0))
+    return (min(sx, ex), min(sy, ey), max(sx, ex), max(sy, ey))
+
+
+def rectangle_bounds(rect: dict) -> Optional[Bounds]:
+    bounds = rect.get('bounds')
+    if isinstance(bounds, dict):
+        x, y = float(bounds.get('x', 0)), float(bounds.get('y', 0))
+        return (x, y, x + float(bounds.get('width', 0)), y + float(bounds.get('height', 0)))
+    if bounds is not None and hasattr(bounds, 'left'):
+        return (bounds.left(), bounds.top(), bounds.right(), bounds.bottom())
+    return None
+
+
+def polygon_bounds(poly: dict) -> Optional[Bounds]:
+    points = poly.get('points') or []
+    if not points:
+        return None
+    xs = [float(p.get('x', 0)) for p in points]
+    ys = [float(p.get('y', 0)) for p in points]
+    return (min(xs), min(ys), max(xs), max(ys))
+
+
+class GridIndex:
+    """Uniform grid over element bounding boxes with incremental updates"""
+
+    def __init__(self, bounds_func: Callable[[dict], Optional[Bounds]],
+                 cell_size: int = DEFAULT_CELL_SIZE):
+        self.bounds_func = bounds_func
+        self.cell_size = cell_size
+        self._cells: Dict[Tuple[int, int], Set[int]] = {}
+        # id(element) -> (element, insertion order, bounds, cells or None if kept in _wide)
+        self._entries: Dict[int, Tuple[dict, int, Optional[Bounds], Optional[List[Tuple[int, int]]]]] = {}
+        # Elements too large for the grid or without usable bounds; checked by every query
+        self._wide: Set[int] = set()
+        self._next_order = 0
+        self._source: Optional[list] = None
+        self._source_len = 0
+        self._source_last: Optional[int] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, element) -> bool:
+        return id(element) in self._entries
+
+    # ── Maintenance ──────────────────────────────────────────────────────────
+
+    def _cell_range(self, bounds: Bounds) -> Tuple[int, int, int, int]:
+        size = self.cell_size
+        return (int(bounds[0] // size), int(bounds[1] // size),
+                int(bounds[2] // size), int(bounds[3] // size))
+
+    def _bounds_of(self, element: dict) -> Optional[Bounds]:
+        try:
+            return self.bounds_func(element)
+        except (TypeError, ValueError, AttributeError):
+            return None
+
+    def insert(self, element: dict, order: Optional[int] = None):
+        """Add an element, or re-bucket it if it is already indexed."""
+        key = id(element)
+        existing = self._entries.get(key)
+        if existing is not None:
+            order = existing[1]
+            self._unlink(key)
+        elif order is None:
+            order = self._next_order
+        self._next_order = max(self._next_order, order + 1)
+
+        bounds = self._bounds_of(element)
+        cells = None
+        if bounds is not None:
+            x0, y0, x1, y1 = self._cell_range(bounds)
+            if (x1 - x0 + 1) * (y1 - y0 + 1) <= MAX_CELLS_PER_ELEMENT:
+                cells = [(cx, cy) for cx in range(x0, x1 + 1) for cy in range(y0, y1 + 1)]
+        if cells is None:
+            self._wide.add(key)
+        else:
+            for cell in cells:
+                self._cells.setdefault(cell, set()).add(key)
+        self._entries[key] = (element, order, bounds, cells)
+
+    # An indexed element's geometry changed (drag, snap, endpoint relink)
+    update = insert
+
+    def _unlink(self, key: int):
+        _element, _order, _bounds, cells = self._entries.pop(key)
+        if cells is None:
+            self._wide.discard(key)
+            return
+        for cell in cells:
+            bucket = self._cells.get(cell)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._cells[cell]
+
+    def remove(self, element: dict):
+        key = id(element)
+        if key in self._entries:
+            self._unlink(key)
+
+    def clear(self):
+        self._cells.clear()
+        self._entries.clear()
+        self._wide.clear()
+        self._next_order = 0
+        self._source = None
+        self._source_len = 0
+        self._source_last = None
+
+    def rebuild(self, elements: Iterable[dict]):
+        """Re-index a whole element list (after zoom, load or bulk edits)."""
+        self.clear()
+        elements = elements if isinstance(elements, list) else list(elements)
+        for order, element in enumerate(elements):
+            self.insert(element, order)
+        self.track(elements)
+
+    def insert_appended(self, elements: list):
+        """Index the element just appended to the mirrored list.
+
+        Falls back to a full rebuild if the list changed in any other way.
+        """
+        if elements is self._source and elements and len(elements) == self._source_len + 1:
+            self.insert(elements[-1])
+            self.track(elements)
+        else:
+            self.rebuild(elements)
+
+    def track(self, elements: list):
+        """Remember which list this index mirrors (see is_stale)."""
+        self._source = elements
+        self._source_len = len(elements)
+        self._source_last = id(elements[-1]) if elements else None
+
+    def is_stale(self, elements: list) -> bool:
+        """True if the list was replaced or changed length since it was indexed.
+
+        Catches elements added or removed by code that edits the overlay's lists
+        directly instead of going through the overlay.
+        """
+        if elements is not self._source or len(elements) != self._source_len:
+            return True
+        return (id(elements[-1]) if elements else None) != self._source_last
+
+    # ── Queries ──────────────────────────────────────────────────────────────
+
+    def _collect(self, keys: Iterable[int], x0: float, y0: float, x1: float, y1: float) -> List[dict]:
+        hits = []
+        for key in keys:
+            element, order, bounds, _cells = self._entries[key]
+            if bounds is None or (bounds[0] <= x1 and bounds[2] >= x0 and bounds[1] <= y1 and bounds[3] >= y0):
+                hits.append((order, element))
+        hits.sort(key=lambda item: item[0])
+        return [element for _order, element in hits]
+
+    def query_rect(self, x0: float, y0: float, x1: float, y1: float) -> List[dict]:
+        """Elements whose bounds intersect the rectangle, in insertion order."""
+        cx0, cy0, cx1, cy1 = self._cell_range((x0, y0, x1, y1))
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > len(self._cells):
+            # Query covers more cells than are occupied: walk the occupied ones
+            keys = set(self._wide)
+            for (cx, cy), bucket in self._cells.items():
+                if cx0 <= cx <= cx1 and cy0 <= cy <= cy1:
+                    keys.update(bucket)
+        else:
+            keys = set(self._wide)
+            for cx in range(cx0, cx1 + 1):
+                for cy in range(cy0, cy1 + 1):
+                    bucket = self._cells.get((cx, cy))
+                    if bucket:
+                        keys.update(bucket)
+        return self._collect(keys, x0, y0, x1, y1)
+
+    def query_point(self, x: float, y: float, radius: float = 0) -> List[dict]:
+        """Elements whose bounds come within ``radius`` of a point, in insertion order."""
+        return self.query_rect(x - radius, y - radius, x + radius, y + radius)
+
+
+def _base_coords(element: dict, *keys: str) -> Optional[Tuple[float, ...]]:
+    """Coordinates normalized to zoom 1.0 by the element's saved_zoom."""
+    try:
+        zoom = element.get('saved_zoom') or 1.0
+        return tuple(element.get(key, 0) / zoom for key in keys)
+    except (TypeError, ZeroDivisionError):
+        return None
+
+
+class PathMembershipIndex:
+    """Set-based membership test for components/segments registered to paths.
+
+    Mirrors the priority order of DrawingOverlay's visible-path checks:
+    DB ID, then element ID, then base coordinates within MATCH_TOLERANCE
+    (components must also share component_type).
+    """
+
+    def __init__(self, components: Iterable[dict] = (), segments: Iterable[dict] = (),
+                 tolerance: float = MATCH_TOLERANCE):
+        self.tolerance = tolerance
+        self._component_refs: Set[int] = set()
+        self._component_db_ids: Set = set()
+        self._component_elem_ids: Set = set()
+        self._component_cells: Dict[Tuple, List[Tuple[float, float]]] = {}
+        self._segment_refs: Set[int] = set()
+        self._segment_db_ids: Set = set()
+        self._segment_elem_ids: Set = set()
+        self._segment_cells: Dict[Tuple, List[Tuple[float, float, float, float]]] = {}
+        # Keeps registered elements alive so their ids stay unique while indexed
+        self._elements: List[dict] = []
+        for comp in components:
+            self.add_component(comp)
+        for seg in segments:
+            self.add_segment(seg)
+
+    def _cell(self, x: float, y: float) -> Tuple[int, int]:
+        return (math.floor(x / self.tolerance), math.floor(y / self.tolerance))
+
+    def _neighbour_cells(self, x: float, y: float):
+        cx, cy = self._cell(x, y)
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                yield (cx + dx, cy + dy)
+
+    def add_component(self, comp: dict):
+        self._elements.append(comp)
+        self._component_refs.add(id(comp))
+        db_id = comp.get('db_component_id') or comp.get('hvac_component_id')
+        if db_id:
+            self._component_db_ids.add(db_id)
+        if comp.get('_element_id'):
+            self._component_elem_ids.add(comp.get('_element_id'))
+        base = _base_coords(comp, 'x', 'y')
+        if base is not None:
+            comp_type = comp.get('component_type', 'unknown')
+            self._component_cells.setdefault((comp_type,) + self._cell(*base), []).append(base)
+
+    def add_segment(self, seg: dict):
+        self._elements.append(seg)
+        self._segment_refs.add(id(seg))
+        db_id = seg.get('db_segment_id') or seg.get('hvac_segment_id')
+        if db_id:
+            self._segment_db_ids.add(db_id)
+        if seg.get('_element_id'):
+            self._segment_elem_ids.add(seg.get('_element_id'))
+        base = _base_coords(seg, 'start_x', 'start_y', 'end_x', 'end_y')
+        if base is not None:
+            self._segment_cells.setdefault(self._cell(base[0], base[1]), []).append(base)
+
+    def contains_component(self, comp: dict) -> bool:
+        if id(comp) in self._component_refs:
+            return True
+        db_id = comp.get('db_component_id') or comp.get('hvac_component_id')
+        if db_id and db_id in self._component_db_ids:
+            return True
+        elem_id = comp.get('_element_id')
+        if elem_id and elem_id in self._component_elem_ids:
+            return True
+        base = _base_coords(comp, 'x', 'y')
+        if base is None:
+            return False
+        x, y = base
+        comp_type = comp.get('component_type', 'unknown')
+        tol = self.tolerance
+        for cell in self._neighbour_cells(x, y):
+            for rx, ry in self._component_cells.get((comp_type,) + cell, ()):
+                if abs(x - rx) < tol and abs(y - ry) < tol:
+                    return True
+        return False
+
+    def contains_segment(self, seg: dict) -> bool:
+        if id(seg) in self._segment_refs:
+            return True
+        db_id = seg.get('db_segment_id') or seg.get('hvac_segment_id')
+        if db_id and db_id in self._segment_db_ids:
+            return True
+        elem_id = seg.get('_element_id')
+        if elem_id and elem_id in self._segment_elem_ids:
+            return True
+        base = _base_coords(seg, 'start_x', 'start_y', 'end_x', 'end_y')
+        if base is None:
+            return False
+        tol = self.tolerance
+        for cell in self._neighbour_cells(base[0], base[1]):
+            for registered in self._segment_cells.get(cell, ()):
+                if all(abs(a - b) < tol for a, b in zip(base, registered)):
+                    return True
+        return False
@@ -4,15 +4,27 @@ Acoustic Analysis Tool - Main Application Entry Point
 Desktop application for LEED acoustic certification analysis
 """
 
+import multiprocessing
 import sys
 import os
-from PySide6.QtWidgets import QApplication, QStyleFactory
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QIcon, QScreen
 
 # Add src directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+# Startup profiling must be set up before the heavy imports below so that
+# their import times are captured (ACOUSTIC_STARTUP_PROFILE=1 or --profile-startup)
+from utils.startup_profiler import STARTUP_PROFILE_FLAG, enable_startup_profiling, get_startup_profiler
+
+if STARTUP_PROFILE_FLAG in sys.argv:
+    sys.argv.remove(STARTUP_PROFILE_FLAG)
+    enable_startup_profiling()
+else:
+    get_startup_profiler().install_import_hook()
+
+from PySide6.QtWidgets import QApplication, QStyleFactory
+from PySide6.QtCore import Qt, QObject, QEvent
+from PySide6.QtGui import QIcon, QScreen
+
 from ui.splash_screen import SplashScreen
 
 
@@ -30,6 +42,23 @@ def get_dpi_scale_factor(app: QApplication) -> float:
     return 1.0
 
 
+class FirstPaintWatcher(QObject):
+    """Records the first paint of a window in the startup profile and writes the report"""
+
+    def __init__(self, widget):
+        super().__init__(widget)
+        self._widget = widget
+        widget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if obj is self._widget and event.type() == QEvent.Paint:
+            self._widget.removeEventFilter(self)
+            profiler = get_startup_profiler()
+            profiler.mark('first_window_paint')
+            profiler.finish(entry_point='main')
+        return False
+
+
 class AcousticAnalysisApp(QApplication):
     """Main application class"""
 
@@ -77,8 +106,13 @@ class AcousticAnalysisApp(QApplication):
 
     def start(self):
         """Start the application"""
+        profiler = get_startup_profiler()
+
         # Create and show splash screen
-        self.splash_screen = SplashScreen()
+        with profiler.phase("Splash screen construction", category="ui"):
+            self.splash_screen = SplashScreen()
+        if profiler.enabled:
+            FirstPaintWatcher(self.splash_screen)
         self.splash_screen.show()
 
         return self.exec()
@@ -86,9 +120,12 @@ class AcousticAnalysisApp(QApplication):
 
 def main():
     """Application entry point"""
-    app = AcousticAnalysisApp(sys.argv)
+    with get_startup_profiler().phase("QApplication construction", category="ui"):
+        app = AcousticAnalysisApp(sys.argv)
     return app.start()
 
 
 if __name__ == '__main__':
+    # Frozen builds: let spawned OCR workers run their task instead of another copy of the app
+    multiprocessing.freeze_support()
     sys.exit(main())
\ No newline at end of file
@@ -2,7 +2,8 @@
 Database models for the Acoustic Analysis Tool
 """
 
-from .database import Base, initialize_database, get_session, close_database
+from .database import (Base, initialize_database, get_session, close_database,
+                       get_read_session, read_session, write_session, get_pool_stats)
 # Backward compatibility alias used by some tests
 init_database = initialize_database
 
@@ -26,6 +27,10 @@ __all__ = [
 	'initialize_database',
 	'init_database',
 	'get_session',
+	'get_read_session',
+	'read_session',
+	'write_session',
+	'get_pool_stats',
 	'close_database',
 	'Project',
 	'Drawing',
@@ -0,0 +1,272 @@
+"""
+Managed connection pools for the project database.
+
+Separates the project database's connections into:
+- a dedicated writer: a single pooled connection. In-process write
+  transactions queue on it instead of racing each other for SQLite's write
+  lock, so they do not fail with "database is locked".
+- a reader pool: several connections with ``PRAGMA query_only=ON``. With the
+  WAL journal (see sqlite_performance) readers never block the writer, so
+  background calculation threads can read while the UI thread writes.
+
+All connections are opened with ``check_same_thread=False`` so a session can
+be used from worker threads. Use one session per thread.
+
+Usage:
+    from models.database import read_session, write_session
+
+    with read_session() as session:
+        paths = session.query(HVACPath).all()
+
+    with write_session() as session:
+        session.add(project)     # committed on exit, rolled back on error
+
+Raw sqlite3 read connections to auxiliary databases (e.g. the acoustic
+materials library) are pooled with ``readonly_connection(path)``.
+"""
+
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+
+from .sqlite_performance import SQLitePerformanceProfile, apply_sqlite_pragmas, get_engine_options
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_READER_POOL_SIZE = 4
+DEFAULT_READER_MAX_OVERFLOW = 4
+DEFAULT_WRITER_TIMEOUT_S = 30.0
+DEFAULT_BUSY_TIMEOUT_MS = 10000
+
+
+@dataclass
+class PoolStats:
+    """Usage counters for one connection pool"""
+    name: str
+    pool_size: int
+    max_overflow: int
+    checked_out: int = 0
+    peak_checked_out: int = 0
+    total_checkouts: int = 0
+    connections_created: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+def _install_pool_instrumentation(engine, stats: PoolStats, lock: threading.Lock):
+    """Track checkouts, concurrency and connection creation on an engine's pool."""
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        with lock:
+            stats.connections_created += 1
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        with lock:
+            stats.checked_out += 1
+            stats.total_checkouts += 1
+            stats.peak_checked_out = max(stats.peak_checked_out, stats.checked_out)
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        with lock:
+            stats.checked_out = max(stats.checked_out - 1, 0)
+
+
+class ConnectionPoolManager:
+    """Dedicated writer connection plus a pool of read-only connections for one database"""
+
+    def __init__(self, db_path: str, profile: SQLitePerformanceProfile,
+                 reader_pool_size: int = DEFAULT_READER_POOL_SIZE,
+                 reader_max_overflow: int = DEFAULT_READER_MAX_OVERFLOW,
+                 writer_timeout: float = DEFAULT_WRITER_TIMEOUT_S):
+        self.db_path = db_path
+        self.profile = profile
+        self._stats_lock = threading.Lock()
+        self._local = threading.local()
+
+        url = f'sqlite:///{db_path}'
+        options = get_engine_options(profile)
+        connect_args = dict(options.pop("connect_args"))
+        connect_args["check_same_thread"] = False
+
+        self.writer_engine = create_engine(
+            url, poolclass=QueuePool, pool_size=1, max_overflow=0,
+            pool_timeout=writer_timeout, connect_args=connect_args, **options
+        )
+        self.reader_engine = create_engine(
+            url, poolclass=QueuePool, pool_size=reader_pool_size,
+            max_overflow=reader_max_overflow, pool_timeout=writer_timeout,
+            connect_args=connect_args, **options
+        )
+
+        @event.listens_for(self.writer_engine, "connect")
+        def _configure_writer(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA foreign_keys=ON")
+            cursor.execute(f"PRAGMA busy_timeout={DEFAULT_BUSY_TIMEOUT_MS}")
+            cursor.close()
+            apply_sqlite_pragmas(dbapi_connection, profile)
+
+        @event.listens_for(self.reader_engine, "connect")
+        def _configure_reader(dbapi_connection, connection_record):
+            apply_sqlite_pragmas(dbapi_connection, profile)
+            cursor = dbapi_connection.cursor()
+            cursor.execute(f"PRAGMA busy_timeout={DEFAULT_BUSY_TIMEOUT_MS}")
+            cursor.execute("PRAGMA query_only=ON")
+            cursor.close()
+
+        self._writer_stats = PoolStats("writer", pool_size=1, max_overflow=0)
+        self._reader_stats = PoolStats("reader", pool_size=reader_pool_size,
+                                       max_overflow=reader_max_overflow)
+        _install_pool_instrumentation(self.writer_engine, self._writer_stats, self._stats_lock)
+        _install_pool_instrumentation(self.reader_engine, self._reader_stats, self._stats_lock)
+
+        session_options = dict(autocommit=False, autoflush=False, expire_on_commit=False)
+        self.WriterSession = sessionmaker(bind=self.writer_engine, **session_options)
+        self.ReaderSession = sessionmaker(bind=self.reader_engine, **session_options)
+
+    def _record_wait(self, stats: PoolStats, waited: float):
+        with self._stats_lock:
+            stats.total_wait_seconds += waited
+            stats.max_wait_seconds = max(stats.max_wait_seconds, waited)
+
+    @contextmanager
+    def write_session(self):
+        """Session on the dedicated writer connection; commits on success.
+
+        Nested use on the same thread joins the outer session instead of
+        waiting for the (single) writer connection.
+        """
+        outer = getattr(self._local, 'writer_session', None)
+        if outer is not None:
+            yield outer
+            return
+
+        session = self.WriterSession()
+        self._local.writer_session = session
+        try:
+            start = time.perf_counter()
+            session.connection()  # acquire the writer connection up front
+            self._record_wait(self._writer_stats, time.perf_counter() - start)
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            self._local.writer_session = None
+            session.close()
+
+    def get_read_session(self):
+        """New read-only session from the reader pool (caller must close it)."""
+        return self.ReaderSession()
+
+    @contextmanager
+    def read_session(self):
+        """Read-only session from the reader pool, closed on exit."""
+        session = self.ReaderSession()
+        try:
+            start = time.perf_counter()
+            session.connection()
+            self._record_wait(self._reader_stats, time.perf_counter() - start)
+            yield session
+        finally:
+            session.close()
+
+    def stats(self) -> Dict[str, Dict]:
+        """Current usage statistics for the writer and reader pools."""
+        with self._stats_lock:
+            result = {
+                'writer': self._writer_stats.to_dict(),
+                'reader': self._reader_stats.to_dict(),
+            }
+        result['writer']['status'] = self.writer_engine.pool.status()
+        result['reader']['status'] = self.reader_engine.pool.status()
+        return result
+
+    def dispose(self):
+        """Close all pooled connections."""
+        self.writer_engine.dispose()
+        self.reader_engine.dispose()
+
+
+class ReadOnlyConnectionPool:
+    """Small pool of raw read-only sqlite3 connections to one database file"""
+
+    def __init__(self, db_path: str, max_size: int = DEFAULT_READER_POOL_SIZE):
+        self.db_path = db_path
+        self.max_size = max_size
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=max_size)
+        self._lock = threading.Lock()
+        self.stats = PoolStats(f"readonly:{db_path}", pool_size=max_size, max_overflow=0)
+
+    def _connect(self) -> sqlite3.Connection:
+        uri = Path(self.db_path).resolve().as_uri() + "?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        with self._lock:
+            self.stats.connections_created += 1
+        return conn
+
+    @contextmanager
+    def connection(self):
+        """Borrow a read-only connection; it returns to the pool on exit."""
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        with self._lock:
+            self.stats.checked_out += 1
+            self.stats.total_checkouts += 1
+            self.stats.peak_checked_out = max(self.stats.peak_checked_out, self.stats.checked_out)
+        try:
+            yield conn
+        finally:
+            with self._lock:
+                self.stats.checked_out = max(self.stats.checked_out - 1, 0)
+            try:
+                self._idle.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+_readonly_pools: Dict[str, ReadOnlyConnectionPool] = {}
+_readonly_pools_lock = threading.Lock()
+
+
+@contextmanager
+def readonly_connection(db_path: str):
+    """Borrow a pooled read-only sqlite3 connection to an auxiliary database file."""
+    with _readonly_pools_lock:
+        pool = _readonly_pools.get(db_path)
+        if pool is None:
+            pool = _readonly_pools[db_path] = ReadOnlyConnectionPool(db_path)
+    with pool.connection() as conn:
+        yield conn
+
+
+def get_readonly_pool_stats() -> Dict[str, Dict]:
+    """Usage statistics for the raw read-only sqlite3 pools."""
+    with _readonly_pools_lock:
+        return {path: pool.stats.to_dict() for path, pool in _readonly_pools.items()}
@@ -9,6 +9,7 @@ from sqlalchemy.orm import sessionmaker
 import os
 import sys
 import logging
+import importlib
 from contextlib import contextmanager
 
 # Configure module logger
@@ -31,6 +32,11 @@ except ImportError:
     def log_environment_info():
         logger.info(f"Database initialization - Bundled: {is_bundled_executable()}")
 
+try:
+    from utils.startup_profiler import get_startup_profiler
+except ImportError:
+    from src.utils.startup_profiler import get_startup_profiler
+
 # Create base class for declarative models
 Base = declarative_base()
 
@@ -38,15 +44,38 @@ Base = declarative_base()
 SessionLocal = None
 engine = None
 
+# Dedicated writer + read-only pool (see connection_pool)
+connection_pool = None
+
+
+def _load_performance_profile():
+	"""Resolve the SQLite performance profile configured in SettingsManager"""
+	from .sqlite_performance import get_performance_profile
+	try:
+		from utils.settings_manager import get_settings_manager
+		settings_manager = get_settings_manager()
+		return get_performance_profile(
+			settings_manager.get_database_performance_profile(),
+			settings_manager.get_database_performance_overrides(),
+		)
+	except Exception as e:
+		logger.debug(f"Using default database performance profile: {e}")
+		return get_performance_profile()
 
-def initialize_database(db_path=None):
+
+def initialize_database(db_path=None, performance_profile=None):
 	"""Initialize the database connection and create tables
 	
 	Handles both development and bundled deployment scenarios.
 	User project data is always stored in Documents/AcousticAnalysis
 	regardless of deployment type.
+	
+	Args:
+		db_path: Database file path (defaults to the settings/user data path)
+		performance_profile: Optional SQLitePerformanceProfile; defaults to the
+			profile configured in SettingsManager
 	"""
-	global engine, SessionLocal
+	global engine, SessionLocal, connection_pool
 	
 	# Log environment info for debugging
 	if os.environ.get('DEBUG'):
@@ -126,15 +155,22 @@ def initialize_database(db_path=None):
 				f"You can delete the placeholder file to start fresh."
 			)
 
+	from .sqlite_performance import apply_sqlite_pragmas, get_engine_options
+	from .connection_pool import ConnectionPoolManager
+	if performance_profile is None:
+		performance_profile = _load_performance_profile()
+	logger.debug(f"Database performance profile: {performance_profile.to_dict()}")
+	
 	# Create engine
-	engine = create_engine(f'sqlite:///{db_path}', echo=False)
+	engine = create_engine(f'sqlite:///{db_path}', echo=False, **get_engine_options(performance_profile))
 	
-	# Enable foreign key constraints for SQLite
+	# Enable foreign key constraints and apply the performance profile for SQLite
 	@event.listens_for(engine, "connect")
 	def set_sqlite_pragma(dbapi_connection, connection_record):
 		cursor = dbapi_connection.cursor()
 		cursor.execute("PRAGMA foreign_keys=ON")
 		cursor.close()
+		apply_sqlite_pragmas(dbapi_connection, performance_profile)
 	
 	# Create session factory
 	# expire_on_commit=False prevents ORM instances used by the UI from
@@ -147,84 +183,81 @@ def initialize_database(db_path=None):
 		bind=engine,
 	)
 	
+	# Reader/writer pools for background readers and serialized writes
+	if connection_pool is not None:
+		connection_pool.dispose()
+	connection_pool = ConnectionPoolManager(db_path, performance_profile)
+	
+	profiler = get_startup_profiler()
+
 	# Import all models to ensure they're registered
 	from . import project, drawing, space, hvac, rt60_models, mechanical, drawing_sets, partition
+	from . import drawing_elements, drawing_location, material_schedule, wall_type
+	from .schema_migrations import (
+		BASE_SCHEMA_ID, BASE_SCHEMA_VERSION, metadata_fingerprint, get_applied_migrations,
+		is_base_schema_current, get_pending_migrations, record_migration
+	)
+	
+	# A fully migrated database opens with a single schema_migrations query;
+	# create_all and the idempotent migrations only run when something is pending
+	fingerprint = metadata_fingerprint(Base.metadata)
+	with profiler.phase("Schema version check", category="database"):
+		with engine.connect() as conn:
+			applied = get_applied_migrations(conn)
+	base_current = is_base_schema_current(applied, fingerprint)
+	pending = get_pending_migrations(applied)
+	if base_current and not pending:
+		logger.debug("Database schema is up to date; skipping migrations")
+		return db_path
 	
 	# Create all tables
-	Base.metadata.create_all(bind=engine)
+	if not base_current:
+		with profiler.phase("create_all", category="database"):
+			Base.metadata.create_all(bind=engine)
+		with engine.begin() as conn:
+			record_migration(conn, BASE_SCHEMA_ID, BASE_SCHEMA_VERSION, fingerprint)
 	
 	# Run idempotent schema migrations for legacy DBs
 	# Each migration should be idempotent (safe to run multiple times)
 	migration_errors = []
 
 	def run_migration(name, migration_func, *args):
-		"""Run a migration and log any errors without crashing."""
+		"""Run a migration and log any errors without crashing.
+		
+		Returns True if the migration completed (did not raise or report failure).
+		"""
 		try:
-			migration_func(*args)
+			with profiler.phase(name, category="migration"):
+				result = migration_func(*args)
+			if result is False:
+				migration_errors.append((name, "migration reported failure"))
+				logger.warning(f"Migration '{name}' reported failure")
+				return False
 			logger.debug(f"Migration '{name}' completed successfully")
+			return True
 		except Exception as e:
 			migration_errors.append((name, str(e)))
 			logger.warning(f"Migration '{name}' failed: {e}")
+			return False
 
-	# HVAC schema
-	try:
-		from .migrate_hvac_schema import ensure_hvac_schema
-		run_migration("HVAC schema", ensure_hvac_schema)
-	except ImportError:
-		pass
-
-	# Drawing sets schema
-	try:
-		from .migrate_drawing_sets import ensure_drawing_sets_schema
-		run_migration("Drawing sets schema", ensure_drawing_sets_schema)
-	except ImportError:
-		pass
-
-	# HVAC drawing sets association
-	try:
-		from .migrate_hvac_drawing_sets import ensure_hvac_drawing_sets_schema
-		run_migration("HVAC drawing sets schema", ensure_hvac_drawing_sets_schema)
-	except ImportError:
-		pass
-
-	# Spaces drawing set association
-	try:
-		from .migrate_space_drawing_sets import ensure_space_drawing_sets_schema
-		run_migration("Space drawing sets schema", ensure_space_drawing_sets_schema)
-	except ImportError:
-		pass
-
-	# Space polygon column
-	try:
-		from .migrate_space_polygon_schema import ensure_space_polygon_schema
-		run_migration("Space polygon schema", ensure_space_polygon_schema)
-	except ImportError:
-		pass
-
-	# Drawing element HVAC linkage
-	try:
-		from .migrate_drawing_element_hvac import ensure_drawing_element_hvac_schema
-		run_migration("Drawing element HVAC schema", ensure_drawing_element_hvac_schema)
-	except ImportError:
-		pass
-
-	# Partition isolation schema
-	try:
-		from .migrate_partition_schema import ensure_partition_schema
-		run_migration("Partition schema", ensure_partition_schema)
-	except ImportError:
-		pass
-
-	# Path element sequence column
-	try:
-		from .migrate_path_element_sequence import migrate_path_element_sequence_schema
-		session = SessionLocal()
+	for migration in pending:
 		try:
-			run_migration("Path element sequence schema", migrate_path_element_sequence_schema, session)
-		finally:
-			session.close()
-	except ImportError:
-		pass
+			module = importlib.import_module(f".{migration.module}", __package__)
+		except ImportError:
+			continue
+		migration_func = getattr(module, migration.function)
+		if migration.needs_session:
+			session = SessionLocal()
+			try:
+				succeeded = run_migration(migration.name, migration_func, session)
+			finally:
+				session.close()
+		else:
+			succeeded = run_migration(migration.name, migration_func)
+		# Failed migrations are not recorded so they are retried on next open
+		if succeeded:
+			with engine.begin() as conn:
+				record_migration(conn, migration.migration_id, migration.version)
 
 	# Log summary of migration issues
 	if migration_errors:
@@ -236,12 +269,53 @@ def initialize_database(db_path=None):
 
 
 def get_session():
-	"""Get a new database session"""
+	"""Get a new database session on the main engine
+	
+	Callers own the session's transaction. Prefer write_session() (or
+	get_hvac_session()) for writes so they go through the writer connection.
+	"""
 	if SessionLocal is None:
 		raise RuntimeError("Database not initialized. Call initialize_database() first.")
 	return SessionLocal()
 
 
+def _get_connection_pool():
+	if connection_pool is None:
+		raise RuntimeError("Database not initialized. Call initialize_database() first.")
+	return connection_pool
+
+
+def get_read_session():
+	"""Get a new read-only session from the reader pool (caller must close it)"""
+	return _get_connection_pool().get_read_session()
+
+
+def read_session():
+	"""Context manager for a read-only session from the reader pool
+	
+	Safe to use from worker threads; readers do not block the writer.
+	
+	Usage:
+		with read_session() as session:
+			spaces = session.query(Space).all()
+	"""
+	return _get_connection_pool().read_session()
+
+
+def write_session():
+	"""Context manager for a session on the dedicated writer connection
+	
+	Writes from all threads are serialized on a single connection; the
+	session commits on exit and rolls back on error.
+	"""
+	return _get_connection_pool().write_session()
+
+
+def get_pool_stats():
+	"""Usage statistics for the writer and reader connection pools"""
+	return _get_connection_pool().stats()
+
+
 @contextmanager
 def get_hvac_session():
 	"""Context manager for HVAC operations with proper cleanup and error handling
@@ -249,29 +323,29 @@ def get_hvac_session():
 	This should be used for all HVAC-related database operations to ensure
 	consistent session handling and proper cleanup.
 	
+	The session runs on the dedicated writer connection (see write_session),
+	so HVAC saves from every thread are serialized there. Nested use on the
+	same thread joins the outer session and commits with it.
+	
 	Usage:
 		with get_hvac_session() as session:
 			# All DB operations
 			pass
 	"""
-	session = get_session()
 	try:
-		yield session
-		session.commit()
+		with write_session() as session:
+			yield session
 	except Exception as e:
-		session.rollback()
 		logger.debug(f"HVAC session rolled back due to error: {e}")
 		raise
-	finally:
-		try:
-			session.close()
-		except Exception as cleanup_error:
-			logger.debug(f"Session cleanup error: {cleanup_error}")
 
 
 def close_database():
 	"""Close the database connection"""
-	global engine
+	global engine, connection_pool
+	if connection_pool:
+		connection_pool.dispose()
+		connection_pool = None
 	if engine:
 		engine.dispose()
 		engine = None
\ No newline at end of file
@@ -2,11 +2,32 @@
 Drawing Elements - Models for storing drawn elements from the overlay system
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Float, JSON
+import json
+
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Float, JSON, select, insert, update, delete
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from .database import Base
 
+# Overlay list key -> stored element_type for elements persisted per page
+OVERLAY_ELEMENT_TYPES = {
+	'rectangles': 'rectangle',
+	'polygons': 'polygon',
+	'components': 'component',
+	'segments': 'segment',
+	'measurements': 'measurement',
+}
+
+# Columns written by DrawingElementManager.save_elements and compared when diffing a page
+SAVED_COLUMNS = (
+	'element_type', 'element_name', 'x_position', 'y_position', 'width', 'height',
+	'end_x_position', 'end_y_position', 'area_real', 'length_real',
+	'hvac_path_id', 'hvac_segment_id', 'hvac_component_id', 'properties',
+)
+
+# Rows per IN (...) list when deleting, well under SQLite's bound-parameter limit
+DELETE_CHUNK_SIZE = 500
+
 
 class DrawingElement(Base):
 	"""Base model for storing drawing elements from the overlay"""
@@ -62,6 +83,7 @@ class DrawingElement(Base):
 		"""Convert to dictionary for overlay reconstruction"""
 		data = {
 			'id': self.id,
+			'drawing_element_id': self.id,  # Stable row identity used by save_elements
 			'type': self.element_type,
 			'name': self.element_name,
 			'page_number': self.page_number,
@@ -230,6 +252,13 @@ class DrawingElement(Base):
 		
 		return element
 
+	def saved_values(self):
+		"""Column values written by a page save, with properties in their stored JSON form"""
+		values = {name: getattr(self, name) for name in SAVED_COLUMNS}
+		if values['properties'] is not None:
+			values['properties'] = json.loads(json.dumps(values['properties']))
+		return values
+
 
 class DrawingElementManager:
 	"""Manager class for saving/loading drawing elements"""
@@ -238,52 +267,135 @@ class DrawingElementManager:
 		self.get_session = session_factory
 		
 	def save_elements(self, drawing_id, project_id, overlay_data, page_number=1):
-		"""Save all drawing elements from overlay data for a specific page"""
+		"""Save all drawing elements from overlay data for a specific page.
+		
+		See write_page_elements for how the page is diffed against its stored rows.
+		
+		Returns:
+			Number of elements stored for the page
+		"""
+		session = None
 		try:
 			session = self.get_session()
-			
-			# Clear existing elements for this drawing and page
-			session.query(DrawingElement).filter(
-				DrawingElement.drawing_id == drawing_id,
-				DrawingElement.page_number == page_number
-			).delete()
-			
-			# Save new elements
-			elements_saved = 0
-			
-			for element_type, elements_list in overlay_data.items():
-				if element_type in ['rectangles', 'polygons', 'components', 'segments', 'measurements']:
-					for element_data in elements_list:
-						# Skip measurements if they're temporary
-						if element_type == 'measurements' and not element_data.get('persistent', True):
-							continue
-						
-						# Skip segments without path linkage - they are work-in-progress
-						# and should not be persisted until part of an HVAC path
-						if element_type == 'segments':
-							has_path = (element_data.get('hvac_path_id') or 
-							            element_data.get('db_path_id'))
-							if not has_path:
-								print(f"DEBUG: Skipping segment save - no path linkage")
-								continue
-							
-						# Create drawing element
-						drawing_element = DrawingElement.from_overlay_data(
-							drawing_id, project_id, element_data, page_number
-						)
-						
-						session.add(drawing_element)
-						elements_saved += 1
-			
+			elements_saved = self.write_page_elements(session, drawing_id, project_id, overlay_data, page_number)
 			session.commit()
 			session.close()
 			
 			return elements_saved
 			
 		except Exception as e:
-			session.rollback()
-			session.close()
+			if session is not None:
+				session.rollback()
+				session.close()
 			raise e
+	
+	def write_page_elements(self, session, drawing_id, project_id, overlay_data, page_number=1):
+		"""Write a page's overlay elements in an open session without committing.
+		
+		The page is diffed against its stored rows rather than rewritten: elements
+		that carry a ``drawing_element_id`` (or ``id``) from a previous load or save
+		keep their row, changed values are updated in place, new elements are
+		inserted and rows no longer on the overlay are deleted. Each kind of change
+		is applied as a single executemany statement. Newly inserted rows have
+		their id written back to the overlay dict as ``drawing_element_id`` so the
+		next save of the same page is a small delta.
+		
+		Returns:
+			Number of elements stored for the page
+		"""
+		stored = {}
+		for row in session.execute(
+			select(DrawingElement.id, *[getattr(DrawingElement, name) for name in SAVED_COLUMNS]).where(
+				DrawingElement.drawing_id == drawing_id,
+				DrawingElement.page_number == page_number
+			)
+		):
+			stored[row.id] = {name: getattr(row, name) for name in SAVED_COLUMNS}
+		
+		claimed = set()
+		inserts, insert_targets, updates, pending = [], [], [], []
+		
+		for element_data, values in self._iter_saved_elements(drawing_id, project_id, overlay_data, page_number):
+			element_id = element_data.get('drawing_element_id') or element_data.get('id')
+			current = stored.get(element_id)
+			if current is None or element_id in claimed or current['element_type'] != values['element_type']:
+				pending.append((element_data, values))
+				continue
+			claimed.add(element_id)
+			if current != values:
+				updates.append({'id': element_id, 'modified_date': datetime.utcnow(), **values})
+		
+		# Unclaimed stored rows by content, for elements that have no row id yet
+		by_content = {}
+		if pending:
+			for element_id, values in stored.items():
+				if element_id not in claimed:
+					by_content.setdefault(self._content_key(values), []).append(element_id)
+		
+		for element_data, values in pending:
+			candidates = [i for i in by_content.get(self._content_key(values), ()) if i not in claimed]
+			if candidates:
+				claimed.add(candidates[0])
+				element_data['drawing_element_id'] = candidates[0]
+				continue
+			inserts.append({'drawing_id': drawing_id, 'project_id': project_id,
+							'page_number': page_number, **values})
+			insert_targets.append(element_data)
+		
+		removed = [element_id for element_id in stored if element_id not in claimed]
+		for start in range(0, len(removed), DELETE_CHUNK_SIZE):
+			session.execute(
+				delete(DrawingElement).where(DrawingElement.id.in_(removed[start:start + DELETE_CHUNK_SIZE]))
+			)
+		if updates:
+			session.execute(update(DrawingElement), updates)
+		if inserts:
+			new_ids = session.scalars(
+				insert(DrawingElement).returning(DrawingElement.id, sort_by_parameter_order=True),
+				inserts
+			).all()
+			for element_data, element_id in zip(insert_targets, new_ids):
+				element_data['drawing_element_id'] = element_id
+		
+		return len(claimed) + len(inserts)
+	
+	@staticmethod
+	def _iter_saved_elements(drawing_id, project_id, overlay_data, page_number):
+		"""Yield (element_data, column values) for every overlay element a page save persists"""
+		for element_type in OVERLAY_ELEMENT_TYPES:
+			for element_data in overlay_data.get(element_type) or []:
+				# Skip measurements if they're temporary
+				if element_type == 'measurements' and not element_data.get('persistent', True):
+					continue
+				
+				# Skip segments without path linkage - they are work-in-progress
+				# and should not be persisted until part of an HVAC path
+				if element_type == 'segments':
+					has_path = (element_data.get('hvac_path_id') or 
+					            element_data.get('db_path_id'))
+					if not has_path:
+						print(f"DEBUG: Skipping segment save - no path linkage")
+						continue
+				
+				drawing_element = DrawingElement.from_overlay_data(
+					drawing_id, project_id, element_data, page_number
+				)
+				yield element_data, drawing_element.saved_values()
+	
+	@classmethod
+	def _content_key(cls, values):
+		"""Hashable identity of a row's saved values; 10 and 10.0 compare equal as they do in a dict"""
+		return json.dumps(cls._as_floats(values), sort_keys=True, default=str)
+	
+	@classmethod
+	def _as_floats(cls, value):
+		if isinstance(value, dict):
+			return {key: cls._as_floats(item) for key, item in value.items()}
+		if isinstance(value, (list, tuple)):
+			return [cls._as_floats(item) for item in value]
+		if isinstance(value, int) and not isinstance(value, bool):
+			return float(value)
+		return value
 			
 	def load_elements(self, drawing_id, page_number=1):
 		"""Load drawing elements for overlay reconstruction for a specific page.
@@ -292,13 +404,46 @@ class DrawingElementManager:
 		because they are already managed through HVAC path registration. Loading them
 		here would create duplicates that don't respond to path visibility controls.
 		"""
+		return self.load_page(drawing_id, page_number)['elements']
+	
+	@staticmethod
+	def page_signature(session, drawing_id, page_number=1):
+		"""Cheap fingerprint of a page's stored rows: changes on any insert, update or delete"""
+		from sqlalchemy import func
+		
+		row = session.execute(
+			select(func.count(DrawingElement.id), func.max(DrawingElement.id),
+				   func.max(DrawingElement.modified_date)).where(
+				DrawingElement.drawing_id == drawing_id,
+				DrawingElement.page_number == page_number
+			)
+		).one()
+		return (row[0], row[1], row[2].isoformat() if row[2] else None)
+	
+	def load_page(self, drawing_id, page_number=1, session=None):
+		"""Load everything stored for one drawing page with a single element query.
+		
+		Args:
+			drawing_id: ID of the drawing
+			page_number: PDF page number
+			session: Optional open session (e.g. a reader session on a worker
+				thread); a new one is opened and closed otherwise
+			
+		Returns:
+			Dict with 'elements' (overlay data as returned by load_elements),
+			'path_elements' (HVAC path id -> {'components', 'segments'} as returned
+			by load_elements_for_path) and 'signature' (see page_signature)
+		"""
+		own_session = session is None
 		try:
-			session = self.get_session()
+			if own_session:
+				session = self.get_session()
 			
+			signature = self.page_signature(session, drawing_id, page_number)
 			elements = session.query(DrawingElement).filter(
 				DrawingElement.drawing_id == drawing_id,
 				DrawingElement.page_number == page_number
-			).order_by(DrawingElement.created_date).all()
+			).order_by(DrawingElement.created_date, DrawingElement.id).all()
 			
 			# Group elements by type for overlay
 			overlay_data = {
@@ -308,6 +453,7 @@ class DrawingElementManager:
 				'segments': [],
 				'measurements': []
 			}
+			path_elements = {}
 			
 			for element in elements:
 				element_dict = element.to_dict()
@@ -316,25 +462,25 @@ class DrawingElementManager:
 					overlay_data['rectangles'].append(element_dict)
 				elif element.element_type == 'polygon':
 					overlay_data['polygons'].append(element_dict)
-				elif element.element_type == 'component':
-					# Skip components that have hvac_path_id - they are managed by path registration
-					# Loading them here would create duplicates that don't respond to visibility controls
+				elif element.element_type in ('component', 'segment'):
+					# Components and segments with hvac_path_id are managed by path registration;
+					# loading them as plain elements would create duplicates that don't respond
+					# to visibility controls
 					if element.hvac_path_id is not None:
+						path_data = path_elements.setdefault(element.hvac_path_id, {'components': [], 'segments': []})
+						path_data[element.element_type + 's'].append(element_dict)
 						continue
-					overlay_data['components'].append(element_dict)
-				elif element.element_type == 'segment':
-					# Skip segments that have hvac_path_id - they are managed by path registration
-					if element.hvac_path_id is not None:
-						continue
-					overlay_data['segments'].append(element_dict)
+					overlay_data[element.element_type + 's'].append(element_dict)
 				elif element.element_type == 'measurement':
 					overlay_data['measurements'].append(element_dict)
-					
-			session.close()
-			return overlay_data
+			
+			if own_session:
+				session.close()
+			return {'elements': overlay_data, 'path_elements': path_elements, 'signature': signature}
 			
 		except Exception as e:
-			session.close()
+			if own_session and session is not None:
+				session.close()
 			raise e
 			
 	def delete_element(self, element_id):
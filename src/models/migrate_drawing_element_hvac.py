@@ -192,6 +192,10 @@ def ensure_drawing_element_hvac_schema():
                 CREATE INDEX IF NOT EXISTS idx_drawing_elements_hvac_component 
                 ON drawing_elements(hvac_component_id)
             """))
+            session.execute(text("""
+                CREATE INDEX IF NOT EXISTS idx_drawing_elements_drawing_page 
+                ON drawing_elements(drawing_id, page_number)
+            """))
             session.commit()
         except Exception as e:
             print(f"Index creation skipped or already exists: {e}")
@@ -209,4 +213,5 @@ def ensure_drawing_element_hvac_schema():
             session.close()
         except:
             pass
+        return False
 
@@ -123,4 +123,5 @@ def ensure_hvac_drawing_sets_schema():
             session.close()
         except:
             pass
+        return False
 
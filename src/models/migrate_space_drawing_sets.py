@@ -119,4 +119,5 @@ def ensure_space_drawing_sets_schema():
             session.close()
         except:
             pass
+        return False
 
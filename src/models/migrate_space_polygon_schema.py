@@ -23,3 +23,4 @@ def ensure_space_polygon_schema():
 		pass
 	except Exception as e:
 		print(f"Warning: ensure_space_polygon_schema failed: {e}")
+		return False
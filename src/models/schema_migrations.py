@@ -0,0 +1,132 @@
+"""
+Schema version tracking for project databases.
+
+Records which idempotent schema migrations have been applied to a database
+(and at which version) in a ``schema_migrations`` table. Opening a fully
+migrated database then only needs a single query instead of re-running
+``create_all`` and the PRAGMA-based ``ensure_*_schema`` checks.
+
+When a migration function changes, bump its version in SCHEMA_MIGRATIONS so
+existing databases run it once more.
+"""
+
+import hashlib
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_MIGRATIONS_TABLE = "schema_migrations"
+
+# Pseudo-migration recording that Base.metadata.create_all has run for the
+# current set of model tables (its checksum is the metadata fingerprint)
+BASE_SCHEMA_ID = "base_tables"
+BASE_SCHEMA_VERSION = 1
+
+
+@dataclass(frozen=True)
+class SchemaMigration:
+    """An idempotent schema migration run by initialize_database"""
+    migration_id: str
+    version: int
+    name: str
+    module: str
+    function: str
+    needs_session: bool = False
+
+
+# Registered migrations, in the order they must run
+SCHEMA_MIGRATIONS: List[SchemaMigration] = [
+    SchemaMigration("hvac_schema", 1, "HVAC schema",
+                    "migrate_hvac_schema", "ensure_hvac_schema"),
+    SchemaMigration("drawing_sets_schema", 1, "Drawing sets schema",
+                    "migrate_drawing_sets", "ensure_drawing_sets_schema"),
+    SchemaMigration("hvac_drawing_sets_schema", 1, "HVAC drawing sets schema",
+                    "migrate_hvac_drawing_sets", "ensure_hvac_drawing_sets_schema"),
+    SchemaMigration("space_drawing_sets_schema", 1, "Space drawing sets schema",
+                    "migrate_space_drawing_sets", "ensure_space_drawing_sets_schema"),
+    SchemaMigration("space_polygon_schema", 1, "Space polygon schema",
+                    "migrate_space_polygon_schema", "ensure_space_polygon_schema"),
+    SchemaMigration("drawing_element_hvac_schema", 2, "Drawing element HVAC schema",
+                    "migrate_drawing_element_hvac", "ensure_drawing_element_hvac_schema"),
+    SchemaMigration("partition_schema", 1, "Partition schema",
+                    "migrate_partition_schema", "ensure_partition_schema"),
+    SchemaMigration("path_element_sequence_schema", 1, "Path element sequence schema",
+                    "migrate_path_element_sequence", "migrate_path_element_sequence_schema",
+                    needs_session=True),
+]
+
+
+def metadata_fingerprint(metadata) -> str:
+    """Stable checksum of the tables and columns declared on the ORM metadata."""
+    parts = []
+    for table_name in sorted(metadata.tables):
+        columns = ",".join(sorted(c.name for c in metadata.tables[table_name].columns))
+        parts.append(f"{table_name}({columns})")
+    return hashlib.sha1(";".join(parts).encode("utf-8")).hexdigest()
+
+
+def get_applied_migrations(connection) -> Dict[str, Tuple[int, Optional[str]]]:
+    """Return {migration_id: (version, checksum)} for a database.
+
+    Returns an empty dict when the schema_migrations table does not exist yet.
+    """
+    try:
+        rows = connection.execute(text(
+            f"SELECT migration_id, version, checksum FROM {SCHEMA_MIGRATIONS_TABLE}"
+        )).fetchall()
+    except OperationalError:
+        return {}
+    return {row[0]: (row[1], row[2]) for row in rows}
+
+
+def ensure_schema_migrations_table(connection):
+    """Create the schema_migrations table if it does not exist."""
+    connection.execute(text(
+        f"""
+        CREATE TABLE IF NOT EXISTS {SCHEMA_MIGRATIONS_TABLE} (
+            migration_id TEXT PRIMARY KEY,
+            version INTEGER NOT NULL,
+            checksum TEXT,
+            applied_at TEXT NOT NULL
+        )
+        """
+    ))
+
+
+def record_migration(connection, migration_id: str, version: int, checksum: Optional[str] = None):
+    """Record (or update) an applied migration."""
+    ensure_schema_migrations_table(connection)
+    connection.execute(
+        text(
+            f"INSERT OR REPLACE INTO {SCHEMA_MIGRATIONS_TABLE} "
+            "(migration_id, version, checksum, applied_at) "
+            "VALUES (:migration_id, :version, :checksum, :applied_at)"
+        ),
+        {
+            "migration_id": migration_id,
+            "version": version,
+            "checksum": checksum,
+            "applied_at": datetime.now().isoformat(timespec="seconds"),
+        },
+    )
+
+
+def is_base_schema_current(applied: Dict[str, Tuple[int, Optional[str]]], fingerprint: str) -> bool:
+    """True if create_all has already run for the current model metadata."""
+    return applied.get(BASE_SCHEMA_ID) == (BASE_SCHEMA_VERSION, fingerprint)
+
+
+def get_pending_migrations(applied: Dict[str, Tuple[int, Optional[str]]]) -> List[SchemaMigration]:
+    """Registered migrations that have not been applied at their current version."""
+    pending = []
+    for migration in SCHEMA_MIGRATIONS:
+        applied_version = applied.get(migration.migration_id, (0, None))[0]
+        if applied_version < migration.version:
+            pending.append(migration)
+    return pending
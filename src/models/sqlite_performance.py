@@ -0,0 +1,119 @@
+"""
+SQLite performance profiles for project databases.
+
+A profile bundles the PRAGMAs applied to every new connection (journal mode,
+synchronous level, page cache, memory-mapped I/O, temp storage) together with
+the prepared-statement and compiled-query cache sizes used by the engine.
+
+Profiles:
+- performance: WAL journal, synchronous=NORMAL, 64 MB page cache, 256 MB mmap,
+  in-memory temp storage. Readers no longer block on writers and commits avoid
+  a full fsync. Default for local disks.
+- compatibility: SQLite defaults (rollback journal, synchronous=FULL). Use for
+  databases on network shares, where WAL's shared-memory index is unsafe.
+
+The active profile is selected through SettingsManager
+(``database/performance_profile``) with optional numeric overrides.
+"""
+
+from dataclasses import dataclass, replace, asdict
+from typing import Dict, Optional
+
+
+JOURNAL_MODES = ("DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF")
+SYNCHRONOUS_LEVELS = ("OFF", "NORMAL", "FULL", "EXTRA")
+TEMP_STORE_MODES = ("DEFAULT", "FILE", "MEMORY")
+
+
+@dataclass(frozen=True)
+class SQLitePerformanceProfile:
+    """Connection-level SQLite tuning options"""
+    name: str
+    journal_mode: str = "DELETE"
+    synchronous: str = "FULL"
+    cache_size_kb: int = 2000          # PRAGMA cache_size (applied as negative KiB)
+    mmap_size_mb: int = 0              # PRAGMA mmap_size (0 disables memory-mapped I/O)
+    temp_store: str = "DEFAULT"
+    statement_cache_size: int = 128    # sqlite3 prepared statement cache (cached_statements)
+    query_cache_size: int = 500        # SQLAlchemy compiled SQL cache
+
+    def __post_init__(self):
+        if self.journal_mode.upper() not in JOURNAL_MODES:
+            raise ValueError(f"Invalid journal_mode: {self.journal_mode}")
+        if self.synchronous.upper() not in SYNCHRONOUS_LEVELS:
+            raise ValueError(f"Invalid synchronous level: {self.synchronous}")
+        if self.temp_store.upper() not in TEMP_STORE_MODES:
+            raise ValueError(f"Invalid temp_store: {self.temp_store}")
+        for field_name in ("cache_size_kb", "mmap_size_mb", "statement_cache_size", "query_cache_size"):
+            if getattr(self, field_name) < 0:
+                raise ValueError(f"{field_name} must be non-negative")
+
+    def pragmas(self) -> Dict[str, str]:
+        """PRAGMA name -> value, in the order they should be applied."""
+        return {
+            "journal_mode": self.journal_mode.upper(),
+            "synchronous": self.synchronous.upper(),
+            "cache_size": str(-self.cache_size_kb),
+            "mmap_size": str(self.mmap_size_mb * 1024 * 1024),
+            "temp_store": self.temp_store.upper(),
+        }
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+PERFORMANCE_PROFILE = SQLitePerformanceProfile(
+    name="performance",
+    journal_mode="WAL",
+    synchronous="NORMAL",
+    cache_size_kb=64 * 1024,
+    mmap_size_mb=256,
+    temp_store="MEMORY",
+    statement_cache_size=256,
+    query_cache_size=1200,
+)
+
+COMPATIBILITY_PROFILE = SQLitePerformanceProfile(name="compatibility")
+
+PERFORMANCE_PROFILES: Dict[str, SQLitePerformanceProfile] = {
+    PERFORMANCE_PROFILE.name: PERFORMANCE_PROFILE,
+    COMPATIBILITY_PROFILE.name: COMPATIBILITY_PROFILE,
+}
+
+DEFAULT_PROFILE_NAME = PERFORMANCE_PROFILE.name
+
+# Profile fields that may be overridden from settings
+OVERRIDABLE_FIELDS = ("cache_size_kb", "mmap_size_mb", "statement_cache_size", "query_cache_size")
+
+
+def get_performance_profile(name: Optional[str] = None,
+                            overrides: Optional[Dict[str, int]] = None) -> SQLitePerformanceProfile:
+    """Resolve a named profile, applying optional numeric overrides.
+
+    Unknown profile names fall back to the default profile.
+    """
+    profile = PERFORMANCE_PROFILES.get((name or DEFAULT_PROFILE_NAME).lower(),
+                                       PERFORMANCE_PROFILES[DEFAULT_PROFILE_NAME])
+    if overrides:
+        valid = {k: int(v) for k, v in overrides.items() if k in OVERRIDABLE_FIELDS and v is not None}
+        if valid:
+            profile = replace(profile, **valid)
+    return profile
+
+
+def apply_sqlite_pragmas(dbapi_connection, profile: SQLitePerformanceProfile):
+    """Apply a profile's PRAGMAs to a raw DB-API sqlite3 connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma, value in profile.pragmas().items():
+            cursor.execute(f"PRAGMA {pragma}={value}")
+    finally:
+        cursor.close()
+
+
+def get_engine_options(profile: SQLitePerformanceProfile) -> Dict:
+    """Keyword arguments for sqlalchemy.create_engine matching a profile."""
+    return {
+        "query_cache_size": profile.query_cache_size,
+        "connect_args": {"cached_statements": profile.statement_cache_size},
+    }
@@ -13,8 +13,6 @@ Still needed:
 from __future__ import annotations
 
 import os
-import subprocess
-import sys
 import csv
 from typing import List, Union, Optional
 
@@ -673,33 +671,24 @@ class ComponentLibraryDialog(HelpMixin, QDialog):
             QMessageBox.information(self, "Silencer Row Import", "Drag to select a row region across 8 bands.")
             return
         try:
-            import tempfile, os, sys, re, csv as csvmod
+            import re
             import fitz
+            from calculations.pdf_table_to_mechanical_units import page_region_rows
             page = self.sil_preview_viewer.pdf_document[self.sil_preview_viewer.current_page]
             x0,y0,x1,y1 = sel
-            rect = fitz.Rect(x0,y0,x1,y1)
-            zoom = 300.0/72.0
-            pix = page.get_pixmap(matrix=fitz.Matrix(zoom,zoom), clip=rect)
-            with tempfile.TemporaryDirectory() as td:
-                img_path = os.path.join(td,'row.png'); csv_path = os.path.join(td,'row.csv'); pix.save(img_path)
-                script_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..','..','calculations','image_table_to_csv.py'))
-                res = subprocess.run([sys.executable, script_path, '--image', img_path, '--output', csv_path], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-                if res.returncode != 0:
-                    raise RuntimeError(res.stderr or 'OCR failed')
-                tokens = []
-                with open(csv_path, newline='', encoding='utf-8') as f:
-                    reader = csvmod.reader(f)
-                    for r in reader:
-                        tokens.extend([c.strip() for c in r if c and c.strip()])
-                nums = [t for t in tokens if re.fullmatch(r"[-+]?\d+(?:\.\d+)?", t)]
-                vals8 = nums[:8]
-                if not vals8:
-                    QMessageBox.information(self, 'Silencer Row Import', 'No numeric values detected.')
-                    return
-                for c, v in enumerate(vals8):
-                    if c < len(self.sil_band_order):
-                        self.sil_table.item(0, c).setText(v)
-                self._toggle_silencer_save(True)
+            rows = page_region_rows(page, clip=fitz.Rect(x0,y0,x1,y1))
+            tokens = []
+            for r in rows:
+                tokens.extend(t for c in r if c for t in c.split())
+            nums = [t for t in tokens if re.fullmatch(r"[-+]?\d+(?:\.\d+)?", t)]
+            vals8 = nums[:8]
+            if not vals8:
+                QMessageBox.information(self, 'Silencer Row Import', 'No numeric values detected.')
+                return
+            for c, v in enumerate(vals8):
+                if c < len(self.sil_band_order):
+                    self.sil_table.item(0, c).setText(v)
+            self._toggle_silencer_save(True)
         except Exception as e:
             QMessageBox.critical(self, "Silencer Row Import", f"Failed: {e}")
 
@@ -721,34 +710,25 @@ class ComponentLibraryDialog(HelpMixin, QDialog):
             return
         target_col = list(sorted(selected_cols))[0]
         try:
-            import tempfile, os, sys, re, csv as csvmod
+            import re
             import fitz
+            from calculations.pdf_table_to_mechanical_units import page_region_rows
             page = self.sil_preview_viewer.pdf_document[self.sil_preview_viewer.current_page]
             x0,y0,x1,y1 = sel
-            rect = fitz.Rect(x0,y0,x1,y1)
-            zoom = 300.0/72.0
-            pix = page.get_pixmap(matrix=fitz.Matrix(zoom,zoom), clip=rect)
-            with tempfile.TemporaryDirectory() as td:
-                img_path = os.path.join(td,'col.png'); csv_path = os.path.join(td,'col.csv'); pix.save(img_path)
-                script_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..','..','calculations','image_table_to_csv.py'))
-                res = subprocess.run([sys.executable, script_path, '--image', img_path, '--output', csv_path], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-                if res.returncode != 0:
-                    raise RuntimeError(res.stderr or 'OCR failed')
-                value = None
-                with open(csv_path, newline='', encoding='utf-8') as f:
-                    reader = csvmod.reader(f)
-                    for r in reader:
-                        for c in r:
-                            s = c.strip()
-                            if re.fullmatch(r"[-+]?\d+(?:\.\d+)?", s):
-                                value = s; break
-                        if value is not None:
-                            break
-                if value is None:
-                    QMessageBox.information(self, 'Silencer Column Import', 'No numeric value found in selection.')
-                    return
-                self.sil_table.item(0, target_col).setText(value)
-                self._toggle_silencer_save(True)
+            rows = page_region_rows(page, clip=fitz.Rect(x0,y0,x1,y1))
+            value = None
+            for r in rows:
+                for c in r:
+                    s = c.strip()
+                    if re.fullmatch(r"[-+]?\d+(?:\.\d+)?", s):
+                        value = s; break
+                if value is not None:
+                    break
+            if value is None:
+                QMessageBox.information(self, 'Silencer Column Import', 'No numeric value found in selection.')
+                return
+            self.sil_table.item(0, target_col).setText(value)
+            self._toggle_silencer_save(True)
         except Exception as e:
             QMessageBox.critical(self, "Silencer Column Import", f"Failed: {e}")
 
@@ -885,17 +865,14 @@ class ComponentLibraryDialog(HelpMixin, QDialog):
         if not csv_path:
             return
 
-        # Run the script as a module so it works in venv and packaged contexts
+        # Run the extractor in-process on the decoded image
         try:
-            script_path = os.path.abspath(os.path.join(
-                os.path.dirname(__file__), "..", "..", "calculations", "image_table_to_csv.py"
-            ))
-            python_exec = sys.executable
-            cmd = [python_exec, script_path, "--image", image_path, "--output", csv_path]
-            # Non-interactive run
-            result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-            if result.returncode != 0:
-                raise RuntimeError(result.stderr.strip() or "Image to CSV extraction failed")
+            from calculations import image_table_to_csv as table_ocr
+            table_ocr.configure_tesseract_executable(None)
+            rows = table_ocr.extract_table(table_ocr.read_image_bgr(image_path))
+            if not rows:
+                raise RuntimeError("Failed to extract any table data from the image.")
+            table_ocr.save_csv(rows, csv_path)
         except Exception as e:
             QMessageBox.critical(self, "Import Error", f"Failed to extract table:\n{e}")
             return
@@ -921,39 +898,24 @@ class ComponentLibraryDialog(HelpMixin, QDialog):
         if not pdf_path:
             return
 
-        # Extract to temporary JSON next to PDF
+        # Extract in-process; scanned pages are OCR'd in a worker pool
         try:
-            script_path = os.path.abspath(os.path.join(
-                os.path.dirname(__file__), "..", "..", "calculations", "pdf_table_to_mechanical_units.py"
-            ))
-            python_exec = sys.executable
-            output_json = os.path.splitext(pdf_path)[0] + "_units.json"
-            # Enable verbose debug to help diagnose empty results
-            cmd = [python_exec, script_path, "--pdf", pdf_path, "--output", output_json, "--debug"]
-            result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-            if result.returncode != 0:
-                raise RuntimeError(result.stderr.strip() or "PDF extraction failed")
+            import contextlib, io
+            from calculations.pdf_table_to_mechanical_units import extract_units_from_pdf
+            # Capture verbose debug to help diagnose empty results
+            debug_output = io.StringIO()
+            with contextlib.redirect_stdout(debug_output):
+                units = extract_units_from_pdf(pdf_path, debug=True)
             # If no units parsed, surface debug output
-            if os.path.exists(output_json):
-                try:
-                    import json
-                    with open(output_json, "r", encoding="utf-8") as f:
-                        parsed = json.load(f)
-                    if not parsed:
-                        dbg = (result.stdout or "")
-                        QMessageBox.information(self, "PDF Import Debug", f"No rows parsed. Debug output:\n\n{dbg[:2000]}")
-                except Exception:
-                    pass
+            if not units:
+                dbg = debug_output.getvalue()
+                QMessageBox.information(self, "PDF Import Debug", f"No rows parsed. Debug output:\n\n{dbg[:2000]}")
         except Exception as e:
             QMessageBox.critical(self, "Import Error", f"Failed to extract from PDF:\n{e}")
             return
 
-        # Load JSON and ingest
+        # Ingest
         try:
-            import json
-            with open(output_json, "r", encoding="utf-8") as f:
-                units = json.load(f)
-
             session = get_session()
             for rec in units:
                 unit = MechanicalUnit(
@@ -1066,82 +1028,66 @@ class ComponentLibraryDialog(HelpMixin, QDialog):
             QMessageBox.information(self, "Column Import", "Enter a column label (e.g., 'Inlet 500').")
             return
         try:
-            import tempfile, os, sys, json as _json
+            import json as _json
             import fitz
-            # Render just the selected rectangle region to a temp image
+            from calculations.pdf_table_to_mechanical_units import page_region_rows
+            # Read the selected rectangle's vector text, or OCR it when it has none
             page = self.preview_viewer.pdf_document[self.preview_viewer.current_page]
             x0, y0, x1, y1 = sel
-            rect = fitz.Rect(x0, y0, x1, y1)
-            zoom = 300.0 / 72.0
-            mat = fitz.Matrix(zoom, zoom)
-            clip_pix = page.get_pixmap(matrix=mat, clip=rect)
-            with tempfile.TemporaryDirectory() as td:
-                img_path = os.path.join(td, 'col.png')
-                csv_path = os.path.join(td, 'col.csv')
-                clip_pix.save(img_path)
-                # Run the image table extractor on the cropped column
-                script_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'calculations', 'image_table_to_csv.py'))
-                cmd = [sys.executable, script_path, '--image', img_path, '--output', csv_path]
-                import subprocess
-                res = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-                if res.returncode != 0:
-                    raise RuntimeError(res.stderr or 'OCR failed')
-                # Read rows and map into a single band column
-                import csv
-                with open(csv_path, newline='', encoding='utf-8') as f:
-                    reader = csv.reader(f)
-                    rows = [r for r in reader if any(c.strip() for c in r)]
-                if not rows:
-                    QMessageBox.information(self, 'Column Import', 'No text detected in selection.')
-                    return
-                # Apply to selected MechanicalUnit if any; else prompt to pick
-                current = self.mechanical_list.currentItem()
-                if not current:
-                    QMessageBox.information(self, 'Column Import', 'Select a Mechanical Unit to apply values to.')
-                    return
-                unit_id = current.data(Qt.UserRole)
-                session = get_session()
-                unit = session.query(MechanicalUnit).filter(MechanicalUnit.id == unit_id).first()
-                if not unit:
-                    session.close(); QMessageBox.information(self, 'Column Import', 'Unit not found.'); return
-                # Decide which column to fill based on label
-                lt = label_text.lower()
-                import re
-                band_keys = self.band_order
-                # Extract band name if present (63, 125, 250, 500, 1k/1000, 2k/2000, 4k/4000, 8k/8000)
-                def norm_band(s):
-                    s = s.lower().replace('hz','').strip()
-                    if s in {'63','125','250','500'}: return s
-                    if s in {'1k','1000'}: return '1000'
-                    if s in {'2k','2000'}: return '2000'
-                    if s in {'4k','4000'}: return '4000'
-                    if s in {'8k','8000'}: return '8000'
-                    return None
-                # Build map from rows sequentially
-                values = {}
-                for idx, r in enumerate(rows):
-                    # Use first non-empty cell per row as the value
-                    val = next((c for c in r if c.strip()), '')
-                    if not val:
-                        continue
-                    # Map rows to bands in order if explicit band not provided
-                    if idx < len(band_keys):
-                        values[band_keys[idx]] = val
-                # Assign to inlet/radiated/outlet based on label
-                target = None
-                if 'inlet' in lt:
-                    target = 'inlet_levels_json'
-                elif 'radiated' in lt:
-                    target = 'radiated_levels_json'
-                elif 'outlet' in lt:
-                    target = 'outlet_levels_json'
-                if not target:
-                    session.close(); QMessageBox.information(self, 'Column Import', 'Label must include Inlet, Radiated, or Outlet.'); return
-                setattr(unit, target, _json.dumps(values) if values else None)
-                session.commit(); session.close()
-                # Refresh display
-                self._on_mech_selection_changed()
-                QMessageBox.information(self, 'Column Import', f'Applied {len(values)} values to {label_text}.')
+            ocr_rows = page_region_rows(page, clip=fitz.Rect(x0, y0, x1, y1))
+            # Map rows into a single band column
+            rows = [r for r in ocr_rows if any(c.strip() for c in r)]
+            if not rows:
+                QMessageBox.information(self, 'Column Import', 'No text detected in selection.')
+                return
+            # Apply to selected MechanicalUnit if any; else prompt to pick
+            current = self.mechanical_list.currentItem()
+            if not current:
+                QMessageBox.information(self, 'Column Import', 'Select a Mechanical Unit to apply values to.')
+                return
+            unit_id = current.data(Qt.UserRole)
+            session = get_session()
+            unit = session.query(MechanicalUnit).filter(MechanicalUnit.id == unit_id).first()
+            if not unit:
+                session.close(); QMessageBox.information(self, 'Column Import', 'Unit not found.'); return
+            # Decide which column to fill based on label
+            lt = label_text.lower()
+            import re
+            band_keys = self.band_order
+            # Extract band name if present (63, 125, 250, 500, 1k/1000, 2k/2000, 4k/4000, 8k/8000)
+            def norm_band(s):
+                s = s.lower().replace('hz','').strip()
+                if s in {'63','125','250','500'}: return s
+                if s in {'1k','1000'}: return '1000'
+                if s in {'2k','2000'}: return '2000'
+                if s in {'4k','4000'}: return '4000'
+                if s in {'8k','8000'}: return '8000'
+                return None
+            # Build map from rows sequentially
+            values = {}
+            for idx, r in enumerate(rows):
+                # Use first non-empty cell per row as the value
+                val = next((c for c in r if c.strip()), '')
+                if not val:
+                    continue
+                # Map rows to bands in order if explicit band not provided
+                if idx < len(band_keys):
+                    values[band_keys[idx]] = val
+            # Assign to inlet/radiated/outlet based on label
+            target = None
+            if 'inlet' in lt:
+                target = 'inlet_levels_json'
+            elif 'radiated' in lt:
+                target = 'radiated_levels_json'
+            elif 'outlet' in lt:
+                target = 'outlet_levels_json'
+            if not target:
+                session.close(); QMessageBox.information(self, 'Column Import', 'Label must include Inlet, Radiated, or Outlet.'); return
+            setattr(unit, target, _json.dumps(values) if values else None)
+            session.commit(); session.close()
+            # Refresh display
+            self._on_mech_selection_changed()
+            QMessageBox.information(self, 'Column Import', f'Applied {len(values)} values to {label_text}.')
         except Exception as e:
             QMessageBox.critical(self, 'Column Import', f'Failed: {e}')
 
@@ -1171,53 +1117,39 @@ class ComponentLibraryDialog(HelpMixin, QDialog):
             QMessageBox.information(self, 'Row Import', 'Enter a label that includes Inlet, Radiated, or Outlet to specify the target row.')
             return
         try:
-            import tempfile, os, sys, json as _json, re, csv
+            import json as _json, re
             import fitz
+            from calculations.pdf_table_to_mechanical_units import page_region_rows
             page = self.preview_viewer.pdf_document[self.preview_viewer.current_page]
             x0, y0, x1, y1 = sel
-            rect = fitz.Rect(x0, y0, x1, y1)
-            zoom = 300.0 / 72.0
-            mat = fitz.Matrix(zoom, zoom)
-            pix = page.get_pixmap(matrix=mat, clip=rect)
-            with tempfile.TemporaryDirectory() as td:
-                img_path = os.path.join(td, 'row.png')
-                csv_path = os.path.join(td, 'row.csv')
-                pix.save(img_path)
-                script_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'calculations', 'image_table_to_csv.py'))
-                cmd = [sys.executable, script_path, '--image', img_path, '--output', csv_path]
-                import subprocess
-                res = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-                if res.returncode != 0:
-                    raise RuntimeError(res.stderr or 'OCR failed')
-                tokens = []
-                with open(csv_path, newline='', encoding='utf-8') as f:
-                    reader = csv.reader(f)
-                    for r in reader:
-                        tokens.extend([c.strip() for c in r if c and c.strip()])
-                if not tokens:
-                    QMessageBox.information(self, 'Row Import', 'No text detected in the selected row.')
-                    return
-                # Extract numeric tokens only
-                nums = [t for t in tokens if re.fullmatch(r"[-+]?\d+(?:\.\d+)?", t)]
-                if not nums:
-                    QMessageBox.information(self, 'Row Import', 'No numeric values detected in the selection.')
-                    return
-                # Expect exactly the first 8 bands for a single row
-                band_keys = self.band_order
-                vals8 = nums[:8]
-                if len(vals8) < 1:
-                    QMessageBox.information(self, 'Row Import', 'Could not detect the 8 band values in the selection.')
-                    return
-                values_map = {k: v for k, v in zip(band_keys, vals8)}
-                unit_id = current.data(Qt.UserRole)
-                session = get_session()
-                unit = session.query(MechanicalUnit).filter(MechanicalUnit.id == unit_id).first()
-                if not unit:
-                    session.close(); QMessageBox.information(self, 'Row Import', 'Selected unit not found.'); return
-                setattr(unit, target, _json.dumps(values_map))
-                session.commit(); session.close()
-                self._on_mech_selection_changed()
-                QMessageBox.information(self, 'Row Import', f'Imported {len(values_map)} band values into the {target.replace("_levels_json"," ")} row.')
+            ocr_rows = page_region_rows(page, clip=fitz.Rect(x0, y0, x1, y1))
+            tokens = []
+            for r in ocr_rows:
+                tokens.extend(t for c in r if c for t in c.split())
+            if not tokens:
+                QMessageBox.information(self, 'Row Import', 'No text detected in the selected row.')
+                return
+            # Extract numeric tokens only
+            nums = [t for t in tokens if re.fullmatch(r"[-+]?\d+(?:\.\d+)?", t)]
+            if not nums:
+                QMessageBox.information(self, 'Row Import', 'No numeric values detected in the selection.')
+                return
+            # Expect exactly the first 8 bands for a single row
+            band_keys = self.band_order
+            vals8 = nums[:8]
+            if len(vals8) < 1:
+                QMessageBox.information(self, 'Row Import', 'Could not detect the 8 band values in the selection.')
+                return
+            values_map = {k: v for k, v in zip(band_keys, vals8)}
+            unit_id = current.data(Qt.UserRole)
+            session = get_session()
+            unit = session.query(MechanicalUnit).filter(MechanicalUnit.id == unit_id).first()
+            if not unit:
+                session.close(); QMessageBox.information(self, 'Row Import', 'Selected unit not found.'); return
+            setattr(unit, target, _json.dumps(values_map))
+            session.commit(); session.close()
+            self._on_mech_selection_changed()
+            QMessageBox.information(self, 'Row Import', f'Imported {len(values_map)} band values into the {target.replace("_levels_json"," ")} row.')
         except Exception as e:
             QMessageBox.critical(self, 'Row Import', f'Failed: {e}')
 
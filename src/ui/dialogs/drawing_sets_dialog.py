@@ -10,9 +10,11 @@ from PySide6.QtWidgets import (
 	QTabWidget, QWidget, QTableWidget, QTableWidgetItem,
 	QHeaderView, QAbstractItemView
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QSize
+from PySide6.QtGui import QIcon, QPixmap
 
 from models import get_session, Drawing
+from drawing.preview_cache import get_preview_cache, thumbnail_tag
 from models.drawing_sets import DrawingSet
 from sqlalchemy.orm import selectinload
 
@@ -197,6 +199,7 @@ class DrawingSetsDialog(QDialog):
 		drawings_layout.addWidget(QLabel("All Drawings:"))
 		
 		self.assignment_drawings_list = QListWidget()
+		self.assignment_drawings_list.setIconSize(QSize(40, 40))
 		drawings_layout.addWidget(self.assignment_drawings_list)
 		
 		drawings_widget.setLayout(drawings_layout)
@@ -268,8 +271,22 @@ class DrawingSetsDialog(QDialog):
 					set_name = f"{parent_set.name} ({parent_set.phase_type})"
 			drawing_item = QListWidgetItem(f"📄 {drawing.name} - {set_name}")
 			drawing_item.setData(Qt.UserRole, {'type': 'drawing', 'id': drawing.id, 'set_id': drawing.drawing_set_id})
+			icon = self._drawing_thumbnail_icon(drawing)
+			if icon is not None:
+				drawing_item.setIcon(icon)
 			self.assignment_drawings_list.addItem(drawing_item)
 
+	def _drawing_thumbnail_icon(self, drawing):
+		"""Icon from the cached first-page thumbnail (generated by the dashboard), or None"""
+		cache = get_preview_cache()
+		if cache is None:
+			return None
+		try:
+			image = cache.load_image(drawing.get_absolute_file_path(), 0, thumbnail_tag())
+		except Exception:
+			return None
+		return QIcon(QPixmap.fromImage(image)) if image is not None else None
+
 	def _get_selected_set_id(self):
 		"""Return the currently selected drawing set id from the left list, or None."""
 		current_item = self.assignment_sets_list.currentItem() if hasattr(self, 'assignment_sets_list') else None
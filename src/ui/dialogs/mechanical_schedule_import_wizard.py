@@ -88,7 +88,7 @@ class MechanicalScheduleImportWizard(QDialog):
     # Signal emitted when import completes successfully
     import_completed = Signal(int)  # number of units imported
     
-    def __init__(self, parent=None, project_id: Optional[int] = None):
+    def __init__(self, parent=None, project_id: Optional[int] = None, warm_up_engines: bool = True):
         super().__init__(parent)
         self.project_id = project_id
         self.setWindowTitle("Mechanical Schedule Import Wizard")
@@ -108,6 +108,20 @@ class MechanicalScheduleImportWizard(QDialog):
         
         self._build_ui()
         self._update_navigation()
+        
+        # OCR engines load once per process; check the ones the steps use now so they are ready
+        self.warm_up_thread = None
+        if warm_up_engines:
+            self._start_engine_warm_up()
+    
+    def _start_engine_warm_up(self):
+        """Load the schedule OCR backends in the background (ACOUSTIC_OCR_WARMUP=0 disables)"""
+        try:
+            from calculations.ocr_engines import warm_up_schedule_engines, warmup_enabled
+            if warmup_enabled():
+                self.warm_up_thread = warm_up_schedule_engines()
+        except Exception as e:
+            print(f"DEBUG: OCR engine warm-up skipped: {e}")
     
     def _build_ui(self):
         """Build the wizard UI"""
@@ -264,8 +278,9 @@ class MechanicalScheduleImportWizard(QDialog):
         mat = fitz.Matrix(zoom, zoom)
         pix = page.get_pixmap(matrix=mat, alpha=False)
         
-        # Convert to QPixmap
-        img = QImage(pix.samples, pix.width, pix.height, pix.stride, QImage.Format_RGB888)
+        # Convert to QPixmap (the QImage wraps the samples without copying)
+        from drawing.page_tiles import pixmap_to_qimage
+        img = pixmap_to_qimage(pix)
         self.loaded_pixmap = QPixmap.fromImage(img)
         self._update_preview()
     
@@ -24,6 +24,7 @@ from models.partition import PartitionType, PartitionScheduleDocument
 # Try to import PDF rendering
 try:
     import fitz  # PyMuPDF
+    from drawing.page_tiles import pixmap_to_qimage
     HAS_PYMUPDF = True
 except ImportError:
     HAS_PYMUPDF = False
@@ -135,13 +136,10 @@ class PDFPreviewWidget(QWidget):
             mat = fitz.Matrix(self.zoom_level * 1.5, self.zoom_level * 1.5)
             
             # Render page to pixmap
-            pix = page.get_pixmap(matrix=mat)
+            pix = page.get_pixmap(matrix=mat, alpha=False)
             
-            # Convert to QImage
-            img = QImage(
-                pix.samples, pix.width, pix.height,
-                pix.stride, QImage.Format.Format_RGB888
-            )
+            # Wrap the samples as a QImage without copying
+            img = pixmap_to_qimage(pix)
             
             # Scale to fit label if needed
             label_size = self.pdf_label.size()
@@ -3,6 +3,7 @@ Drawing Comparison Interface - Side-by-side drawing comparison with change detec
 """
 
 import json
+from types import SimpleNamespace
 from PySide6.QtWidgets import (
 	QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
 	QSplitter, QLabel, QPushButton, QToolBar, QStatusBar,
@@ -17,10 +18,18 @@ from models.drawing_sets import DrawingSet, DrawingComparison, ChangeItem
 from drawing.drawing_comparison import DrawingComparisonEngine
 from sqlalchemy.orm import selectinload
 
+SEVERITY_COLORS = {
+	'critical': QColor(255, 99, 99),
+	'high': QColor(255, 165, 0),
+	'medium': QColor(255, 215, 0),
+	'low': QColor(144, 238, 144),
+}
+
 
 class ComparisonWorker(QThread):
 	"""Background worker for performing drawing comparison"""
 	progress_updated = Signal(int, str)  # percentage, status message
+	changes_streamed = Signal(list)  # committed change rows (dicts) as they are saved
 	comparison_completed = Signal(object)  # DrawingComparison object
 	error_occurred = Signal(str)  # error message
 	
@@ -32,15 +41,17 @@ class ComparisonWorker(QThread):
 	
 	def run(self):
 		try:
-			self.progress_updated.emit(10, "Initializing comparison...")
-			self.progress_updated.emit(30, "Analyzing spaces...")
-			self.progress_updated.emit(60, "Detecting HVAC changes...")
-			self.progress_updated.emit(80, "Calculating acoustic impact...")
-			comparison = self.comparison_engine.compare_drawing_sets(self.base_set_id, self.compare_set_id)
-			self.progress_updated.emit(100, "Comparison complete!")
+			comparison = self.comparison_engine.compare_drawing_sets(
+				self.base_set_id, self.compare_set_id, progress_callback=self._on_progress
+			)
 			self.comparison_completed.emit(comparison)
 		except Exception as e:
 			self.error_occurred.emit(str(e))
+	
+	def _on_progress(self, percentage: int, message: str, rows: list):
+		self.progress_updated.emit(percentage, message)
+		if rows:
+			self.changes_streamed.emit(rows)
 
 
 class DrawingComparisonInterface(QMainWindow):
@@ -144,6 +155,7 @@ class DrawingComparisonInterface(QMainWindow):
 		self.progress_bar.setValue(0)
 		self.comparison_worker = ComparisonWorker(self.base_set_id, self.compare_set_id)
 		self.comparison_worker.progress_updated.connect(self.update_progress)
+		self.comparison_worker.changes_streamed.connect(self.on_changes_streamed)
 		self.comparison_worker.comparison_completed.connect(self.on_comparison_completed)
 		self.comparison_worker.error_occurred.connect(self.on_comparison_error)
 		self.comparison_worker.start()
@@ -153,6 +165,12 @@ class DrawingComparisonInterface(QMainWindow):
 		self.progress_label.setText(message)
 		self.status_bar.showMessage(message)
 	
+	def on_changes_streamed(self, rows: list):
+		"""Show partial results as each chunk of changes is committed"""
+		for row in rows:
+			self._add_change_to_lists(SimpleNamespace(**row))
+		self.status_bar.showMessage(f"{self.changes_list.count()} changes found so far...")
+	
 	def on_comparison_completed(self, comparison: DrawingComparison):
 		self.comparison = comparison
 		session = get_session()
@@ -173,30 +191,28 @@ class DrawingComparisonInterface(QMainWindow):
 		self.critical_list.clear()
 		if not self.change_items:
 			return
-		severity_colors = {
-			'critical': QColor(255, 99, 99),
-			'high': QColor(255, 165, 0),
-			'medium': QColor(255, 215, 0),
-			'low': QColor(144, 238, 144),
-		}
 		sorted_changes = sorted(self.change_items, key=lambda x: {
 			'critical': 0, 'high': 1, 'medium': 2, 'low': 3
 		}.get(getattr(x, 'severity', 'low'), 4))
 		for change in sorted_changes:
-			change_details = json.loads(change.change_details) if change.change_details else {}
-			element_name = change_details.get('name', f"{change.element_type}_{change.id}")
-			icon = {'added': '➕', 'removed': '➖', 'modified': '📝', 'moved': '↔️'}.get(change.change_type, '❓')
-			item_text = f"{icon} {element_name} - {change.change_type} ({change.severity})"
-			item = QListWidgetItem(item_text)
-			item.setData(Qt.UserRole, change.id)
-			if change.severity in severity_colors:
-				item.setForeground(severity_colors[change.severity])
-			self.changes_list.addItem(item)
-			if change.severity == 'critical':
-				crit_item = QListWidgetItem(item_text)
-				crit_item.setData(Qt.UserRole, change.id)
-				crit_item.setForeground(severity_colors['critical'])
-				self.critical_list.addItem(crit_item)
+			self._add_change_to_lists(change)
+	
+	def _add_change_to_lists(self, change):
+		"""Append one change (ChangeItem or streamed row) to the change lists"""
+		change_details = json.loads(change.change_details) if change.change_details else {}
+		element_name = change_details.get('name', f"{change.element_type}_{change.id}")
+		icon = {'added': '➕', 'removed': '➖', 'modified': '📝', 'moved': '↔️'}.get(change.change_type, '❓')
+		item_text = f"{icon} {element_name} - {change.change_type} ({change.severity})"
+		item = QListWidgetItem(item_text)
+		item.setData(Qt.UserRole, change.id)
+		if change.severity in SEVERITY_COLORS:
+			item.setForeground(SEVERITY_COLORS[change.severity])
+		self.changes_list.addItem(item)
+		if change.severity == 'critical':
+			crit_item = QListWidgetItem(item_text)
+			crit_item.setData(Qt.UserRole, change.id)
+			crit_item.setForeground(SEVERITY_COLORS['critical'])
+			self.critical_list.addItem(crit_item)
 	
 	def set_sync_enabled(self, enabled: bool):
 		self.sync_enabled = enabled
\ No newline at end of file
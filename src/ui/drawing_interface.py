@@ -14,6 +14,8 @@ from PySide6.QtGui import QIcon, QFont, QAction
 
 from models import get_session, Drawing, Project, Space, RoomBoundary, DrawingElementManager
 from drawing import PDFViewer, DrawingOverlay, ScaleManager, ToolType
+from drawing.autosave import DrawingAutosaveQueue, DRAWING_FIELDS, journal_path_for
+from drawing.page_cache import DrawingPageCache
 from ui.dialogs.scale_dialog import ScaleDialog
 from ui.dialogs.room_properties import RoomPropertiesDialog
 from ui.dialogs.hvac_path_dialog import HVACPathDialog
@@ -28,6 +30,11 @@ from utils.settings_manager import get_settings_manager
 from ui.widgets.path_analysis_panel import PathAnalysisPanel
 from ui.widgets.drawing_spaces_panel import DrawingSpacesPanel
 
+# Quiet period after the last overlay edit before the page is queued for saving
+AUTOSAVE_IDLE_MS = 1500
+# Longest the GUI waits for queued edits before reading elements back
+AUTOSAVE_DRAIN_TIMEOUT_S = 30.0
+
 
 class DrawingInterface(HelpMixin, QMainWindow):
     """Drawing interface for PDF viewing and drawing tools"""
@@ -52,6 +59,16 @@ class DrawingInterface(HelpMixin, QMainWindow):
         self.hvac_path_calculator = HVACPathCalculator()
         self.element_manager = DrawingElementManager(get_session)
         
+        # Per-page element cache with background prefetch (see drawing.page_cache)
+        self.page_cache = None
+        
+        # Write-behind persistence of overlay edits (see drawing.autosave)
+        self.autosave_queue = None
+        self._autosave_timer = QTimer(self)
+        self._autosave_timer.setSingleShot(True)
+        self._autosave_timer.setInterval(AUTOSAVE_IDLE_MS)
+        self._autosave_timer.timeout.connect(self.autosave_now)
+        
         # Calibration mode flag
         self._calibration_mode = False
         
@@ -78,6 +95,8 @@ class DrawingInterface(HelpMixin, QMainWindow):
         self._base_scale_ratio = 1.0
         
         self.load_drawing_data()
+        self.init_autosave()
+        self.init_page_cache()
         self.init_ui()
         self.setup_connections()
         
@@ -103,6 +122,47 @@ class DrawingInterface(HelpMixin, QMainWindow):
             QMessageBox.critical(self, "Error", f"Failed to load drawing:\n{str(e)}")
             self.close()
             
+    def init_autosave(self):
+        """Start the autosave queue, first writing back edits a crash left in its journal"""
+        if not self.drawing:
+            return
+        try:
+            from models import database
+            journal_path = journal_path_for(database.engine.url.database, self.drawing.id)
+            self.autosave_queue = DrawingAutosaveQueue(self.element_manager, journal_path, parent=self)
+        except Exception as e:
+            print(f"Warning: Autosave disabled: {e}")
+            self.autosave_queue = None
+            return
+        self.autosave_queue.flushed.connect(self._on_autosave_flushed)
+        self.autosave_queue.flush_failed.connect(self._on_autosave_failed)
+        if self.autosave_queue.recovered_count:
+            if self.autosave_queue.flush(AUTOSAVE_DRAIN_TIMEOUT_S):
+                print(f"DEBUG: Restored {self.autosave_queue.recovered_count} unsaved edits from the autosave journal")
+                self.load_drawing_data()
+            
+    def init_page_cache(self):
+        """Start the per-page element cache that prefetches the drawing's other pages"""
+        if not self.drawing:
+            return
+        try:
+            self.page_cache = DrawingPageCache(self.element_manager, self.drawing.id, parent=self)
+        except Exception as e:
+            print(f"Warning: Page prefetch disabled: {e}")
+            
+    def _load_current_page(self):
+        """Stored elements of the current page (see DrawingElementManager.load_page)"""
+        self._drain_autosave(self.current_page_number)
+        if self.page_cache is not None:
+            return self.page_cache.get(self.current_page_number)
+        return self.element_manager.load_page(self.drawing.id, self.current_page_number)
+        
+    def _prefetch_other_pages(self):
+        """Load the pages around the current one in the background"""
+        if self.page_cache is None or not self.pdf_viewer or not self.pdf_viewer.pdf_document:
+            return
+        self.page_cache.prefetch_around(self.current_page_number, len(self.pdf_viewer.pdf_document))
+            
     def init_ui(self):
         """Initialize the user interface"""
         title = f"Drawing: {self.drawing.name}" if self.drawing else "Drawing Interface"
@@ -496,6 +556,7 @@ class DrawingInterface(HelpMixin, QMainWindow):
             
         if self.drawing_overlay:
             self.drawing_overlay.element_created.connect(self.element_created)
+            self.drawing_overlay.elements_changed.connect(self.schedule_autosave)
             self.drawing_overlay.measurement_taken.connect(self.measurement_taken)
             # Open edit dialogs on double-clicks in overlay
             self.drawing_overlay.element_double_clicked.connect(self.overlay_element_double_clicked)
@@ -641,18 +702,17 @@ class DrawingInterface(HelpMixin, QMainWindow):
                 
     def update_overlay_size(self):
         """Update overlay size to match PDF display"""
-        if self.pdf_viewer and self.pdf_viewer.pixmap and self.drawing_overlay:
+        pdf_size = self.pdf_viewer.get_page_pixel_size() if self.pdf_viewer else None
+        if pdf_size is not None and self.drawing_overlay:
             # Get PDF display size
-            pdf_size = self.pdf_viewer.pixmap.size()
             self.drawing_overlay.resize(pdf_size)
 
-            # Align overlay origin with the pixmap content origin inside the centered QLabel
+            # Align overlay origin with the page content origin inside the page canvas
             try:
                 label = self.pdf_viewer.pdf_label
-                pixmap = self.pdf_viewer.pixmap
-                if label and pixmap:
-                    offset_x = max((label.width() - pixmap.width()) // 2, 0)
-                    offset_y = max((label.height() - pixmap.height()) // 2, 0)
+                if label:
+                    offset_x = max((label.width() - pdf_size.width()) // 2, 0)
+                    offset_y = max((label.height() - pdf_size.height()) // 2, 0)
                     self.drawing_overlay.move(offset_x, offset_y)
                 else:
                     self.drawing_overlay.move(0, 0)
@@ -779,14 +839,14 @@ class DrawingInterface(HelpMixin, QMainWindow):
         
     def page_changed(self, page_number):
         """Handle PDF page change - save current page elements and load new page elements"""
-        # Save current page elements before changing
+        # Queue current page elements before changing
         if self.drawing_overlay and hasattr(self, 'current_page_number'):
             try:
                 overlay_data = self.drawing_overlay.get_elements_data()
-                if any(overlay_data.values()):  # If there are any elements to save
-                    self.element_manager.save_elements(
-                        self.drawing.id, self.project_id, overlay_data, self.current_page_number
-                    )
+                # Save if there are elements, or if edits (e.g. deleting the last one) await autosave
+                if any(overlay_data.values()) or self._autosave_timer.isActive():
+                    self._autosave_timer.stop()
+                    self._queue_page_save(overlay_data)
             except Exception as e:
                 print(f"Warning: Could not save elements for page {self.current_page_number}: {e}")
         
@@ -1031,13 +1091,15 @@ class DrawingInterface(HelpMixin, QMainWindow):
         QMessageBox.information(self, "Saved", "Drawing saved successfully.")
         
     def save_drawing_to_db(self):
-        """Save drawing data and elements to database"""
+        """Queue drawing data and elements for saving.
+        
+        The write happens on the autosave worker; the edits are journaled
+        first, so they survive a crash before it completes.
+        """
         if not self.drawing:
             return
             
         try:
-            session = get_session()
-            
             # Update drawing record
             if self.scale_manager.scale_string:
                 self.drawing.scale_string = self.scale_manager.scale_string
@@ -1060,30 +1122,78 @@ class DrawingInterface(HelpMixin, QMainWindow):
                 self.drawing.width_pixels = self.pdf_viewer.page_width
                 self.drawing.height_pixels = self.pdf_viewer.page_height
                 
-            session.merge(self.drawing)
-            session.commit()
-            session.close()
+            if self.autosave_queue is None:
+                session = get_session()
+                session.merge(self.drawing)
+                session.commit()
+                session.close()
+            else:
+                self.autosave_queue.enqueue_drawing(
+                    self.drawing.id, {name: getattr(self.drawing, name) for name in DRAWING_FIELDS}
+                )
             
             # Save drawing elements
             if self.drawing_overlay:
-                overlay_data = self.drawing_overlay.get_elements_data()
-                elements_saved = self.element_manager.save_elements(
-                    self.drawing.id, self.project_id, overlay_data, self.current_page_number
-                )
-                
-                if elements_saved > 0:
-                    self.status_bar.showMessage(f"Saved {elements_saved} drawing elements", 2000)
+                self._autosave_timer.stop()
+                self._queue_page_save(self.drawing_overlay.get_elements_data())
             
         except Exception as e:
             QMessageBox.warning(self, "Warning", f"Could not save drawing:\n{str(e)}")
             
+    def schedule_autosave(self):
+        """Queue the current page once overlay edits have paused"""
+        if self.autosave_queue is not None:
+            self._autosave_timer.start()
+            
+    def autosave_now(self):
+        """Queue the current page's elements for the autosave worker"""
+        if self.drawing and self.drawing_overlay:
+            try:
+                self._queue_page_save(self.drawing_overlay.get_elements_data())
+            except Exception as e:
+                print(f"Warning: Could not queue autosave for page {self.current_page_number}: {e}")
+                
+    def _queue_page_save(self, overlay_data):
+        """Queue one page of elements, or save it directly when autosave is unavailable"""
+        if self.autosave_queue is not None:
+            self.autosave_queue.enqueue_page(self.drawing.id, self.project_id, self.current_page_number, overlay_data)
+            return
+        elements_saved = self.element_manager.save_elements(
+            self.drawing.id, self.project_id, overlay_data, self.current_page_number
+        )
+        if elements_saved > 0:
+            self.status_bar.showMessage(f"Saved {elements_saved} drawing elements", 2000)
+            
+    def _drain_autosave(self, page_number=None):
+        """Wait for queued edits to reach the database before reading or writing elements directly
+
+        With a page number, waits only if that page has edits queued, so
+        switching to a page does not wait on saves of the page being left.
+        """
+        if self.autosave_queue is None:
+            return
+        if page_number is not None:
+            pending = self.autosave_queue.page_pending(self.drawing.id, page_number)
+        else:
+            pending = self.autosave_queue.pending_count()
+        if pending:
+            if not self.autosave_queue.flush(AUTOSAVE_DRAIN_TIMEOUT_S):
+                self.status_bar.showMessage("Autosave is behind; some recent edits are not saved yet", 5000)
+                
+    def _on_autosave_flushed(self, summary):
+        if summary.get('elements'):
+            self.status_bar.showMessage(f"Saved {summary['elements']} drawing elements", 2000)
+            
+    def _on_autosave_failed(self, message):
+        self.status_bar.showMessage(f"Autosave failed, will retry: {message}", 5000)
+            
     def load_saved_elements(self):
         """Load saved drawing elements from database for current page"""
         if not self.drawing or not self.drawing_overlay:
             return
             
         try:
-            overlay_data = self.element_manager.load_elements(self.drawing.id, self.current_page_number)
+            overlay_data = self._load_current_page()['elements']
             
             # Clean up orphaned elements - those marked converted_to_space but Space no longer exists
             overlay_data = self._cleanup_orphaned_space_elements(overlay_data)
@@ -1110,6 +1220,8 @@ class DrawingInterface(HelpMixin, QMainWindow):
             
             # Also load space rectangles from RoomBoundary records
             self.load_space_rectangles()
+            
+            self._prefetch_other_pages()
                 
         except Exception as e:
             QMessageBox.warning(self, "Warning", f"Could not load saved elements:\n{str(e)}")
@@ -1597,6 +1709,7 @@ class DrawingInterface(HelpMixin, QMainWindow):
             self.drawing_overlay.clear_all_elements()
             self.elements_list.clear()
             self.update_elements_display()
+            self.schedule_autosave()
 
     def clear_unsaved_elements(self):
         """Clear only elements not registered to saved HVAC paths.
@@ -2579,6 +2692,7 @@ class DrawingInterface(HelpMixin, QMainWindow):
                             break
                             
                 self.drawing_overlay.update()
+                self.schedule_autosave()
                 
             # Remove from list
             row = self.elements_list.row(item)
@@ -3254,13 +3368,10 @@ class DrawingInterface(HelpMixin, QMainWindow):
         try:
             session = get_session()
             
-            # Import HVACPath model
-            from models.hvac import HVACPath
-            
-            # Query HVAC paths for this project
-            hvac_paths = session.query(HVACPath).filter(
-                HVACPath.project_id == self.project_id
-            ).all()
+            # Query HVAC paths for this project; only those on the current page are registered
+            hvac_paths = self._query_hvac_paths(session)
+            page_path_ids = self._page_hvac_path_ids(session) if self.drawing else set()
+            page_paths = [p for p in hvac_paths if p.id in page_path_ids]
             
             # Clear the current list and visibility state
             self.paths_list.clear()
@@ -3278,21 +3389,18 @@ class DrawingInterface(HelpMixin, QMainWindow):
                 # Collect all path component positions WITH page numbers for proximity-based filtering
                 # This prevents cross-page contamination where components on different pages
                 # with similar positions are incorrectly matched
-                path_component_positions = set()
-                for hvac_path in hvac_paths:
+                # Positions are bucketed by page and tolerance-sized grid cell so each
+                # overlay component only checks the neighbouring cells
+                tol = 15.0  # pixels tolerance
+                path_component_positions = {}
+                for hvac_path in page_paths:
                     for seg in hvac_path.segments:
-                        if seg.from_component:
-                            path_component_positions.add((
-                                seg.from_component.x_position or 0,
-                                seg.from_component.y_position or 0,
-                                seg.from_component.page_number or 1  # Include page number
-                            ))
-                        if seg.to_component:
-                            path_component_positions.add((
-                                seg.to_component.x_position or 0,
-                                seg.to_component.y_position or 0,
-                                seg.to_component.page_number or 1  # Include page number
-                            ))
+                        for db_comp in (seg.from_component, seg.to_component):
+                            if db_comp is None or db_comp.drawing_id != self.drawing.id:
+                                continue
+                            px, py = db_comp.x_position or 0, db_comp.y_position or 0
+                            key = (db_comp.page_number or 1, int(px // tol), int(py // tol))  # Include page number
+                            path_component_positions.setdefault(key, []).append((px, py))
 
                 def is_near_path_position(comp):
                     """Check if component is near any path component position ON THE SAME PAGE."""
@@ -3301,14 +3409,14 @@ class DrawingInterface(HelpMixin, QMainWindow):
                         comp_zoom = 1.0
                     comp_x = comp.get('x', 0) / comp_zoom
                     comp_y = comp.get('y', 0) / comp_zoom
+                    # Only match positions on the SAME page to avoid cross-page contamination
                     comp_page = comp.get('page_number') or self.current_page_number
-                    tol = 15.0  # pixels tolerance
-                    for px, py, p_page in path_component_positions:
-                        # Only match positions on the SAME page to avoid cross-page contamination
-                        if p_page != comp_page:
-                            continue
-                        if abs(comp_x - (px or 0)) < tol and abs(comp_y - (py or 0)) < tol:
-                            return True
+                    cx, cy = int(comp_x // tol), int(comp_y // tol)
+                    for gx in (cx - 1, cx, cx + 1):
+                        for gy in (cy - 1, cy, cy + 1):
+                            for px, py in path_component_positions.get((comp_page, gx, gy), ()):
+                                if abs(comp_x - px) < tol and abs(comp_y - py) < tol:
+                                    return True
                     return False
 
                 # Remove components that either have path IDs OR are near path positions
@@ -3335,11 +3443,12 @@ class DrawingInterface(HelpMixin, QMainWindow):
             calculated_count = sum(1 for p in hvac_paths if p.calculated_noise)
             self.paths_summary_label.setText(f"{path_count} paths ({calculated_count} calculated)")
             
+            # Register path elements on this page for show/hide functionality
+            if self.drawing_overlay and page_paths:
+                self._register_page_paths(page_paths)
+            
             # Add paths to list with checkboxes
             for hvac_path in hvac_paths:
-                # Register path elements for show/hide functionality
-                if self.drawing_overlay:
-                    self.register_existing_path_elements(hvac_path)
                 
                 # Create list item with checkbox
                 item = QListWidgetItem()
@@ -4184,17 +4293,14 @@ class DrawingInterface(HelpMixin, QMainWindow):
             return
             
         try:
-            from models.hvac import HVACPath
             session = get_session()
             
-            # Query HVAC paths for this project
-            hvac_paths = session.query(HVACPath).filter(
-                HVACPath.project_id == self.project_id
-            ).all()
+            # Query HVAC paths with elements on this page
+            page_path_ids = self._page_hvac_path_ids(session) if self.drawing else set()
+            hvac_paths = self._query_hvac_paths(session, page_path_ids)
             
             # Register each path's elements
-            for hvac_path in hvac_paths:
-                self.register_existing_path_elements(hvac_path)
+            self._register_page_paths(hvac_paths)
                 
             session.close()
             print(f"DEBUG: Registered {len(hvac_paths)} HVAC paths for page {self.current_page_number}")
@@ -4202,13 +4308,62 @@ class DrawingInterface(HelpMixin, QMainWindow):
         except Exception as e:
             print(f"DEBUG: Error registering HVAC paths for page: {e}")
     
-    def register_existing_path_elements(self, hvac_path):
+    def _query_hvac_paths(self, session, path_ids=None):
+        """Project HVAC paths with their segments' components loaded up front"""
+        from sqlalchemy.orm import selectinload
+        from models.hvac import HVACPath, HVACSegment
+        
+        query = session.query(HVACPath).filter(HVACPath.project_id == self.project_id)
+        if path_ids is not None:
+            if not path_ids:
+                return []
+            query = query.filter(HVACPath.id.in_(path_ids))
+        return query.options(
+            selectinload(HVACPath.target_space),
+            selectinload(HVACPath.segments).selectinload(HVACSegment.from_component),
+            selectinload(HVACPath.segments).selectinload(HVACSegment.to_component),
+        ).all()
+    
+    def _page_hvac_path_ids(self, session):
+        """IDs of HVAC paths with linked elements or components on the current drawing page"""
+        from sqlalchemy import or_, select, union
+        from models.drawing_elements import DrawingElement
+        from models.hvac import HVACComponent, HVACSegment
+        
+        page_components = select(HVACComponent.id).where(
+            HVACComponent.drawing_id == self.drawing.id,
+            or_(HVACComponent.page_number == self.current_page_number, HVACComponent.page_number.is_(None))
+        )
+        linked = select(DrawingElement.hvac_path_id).where(
+            DrawingElement.drawing_id == self.drawing.id,
+            DrawingElement.page_number == self.current_page_number,
+            DrawingElement.hvac_path_id.isnot(None)
+        )
+        routed = select(HVACSegment.hvac_path_id).where(
+            or_(HVACSegment.from_component_id.in_(page_components),
+                HVACSegment.to_component_id.in_(page_components))
+        )
+        return set(session.execute(union(linked, routed)).scalars())
+    
+    def _register_page_paths(self, hvac_paths):
+        """Register several paths from one load of the current page's linked elements"""
+        if not hvac_paths:
+            return
+        path_elements = self._load_current_page()['path_elements']
+        for hvac_path in hvac_paths:
+            linked_data = path_elements.get(hvac_path.id) or {'components': [], 'segments': []}
+            self.register_existing_path_elements(hvac_path, linked_data)
+    
+    def register_existing_path_elements(self, hvac_path, linked_data=None):
         """Register existing path elements in the drawing overlay for show/hide functionality.
         
         This method first attempts to load linked drawing elements from the database,
         filtered to only include elements on the current drawing and page.
         If linked elements exist, they are added to the overlay and registered.
         If no linked elements are found, it falls back to position-based matching.
+        
+        linked_data, when given, is the path's entry from the current page's
+        path_elements (see DrawingElementManager.load_page) and saves the query.
         """
         if not self.drawing_overlay:
             return
@@ -4226,11 +4381,16 @@ class DrawingInterface(HelpMixin, QMainWindow):
             # Filter to only elements on the current drawing/page
             linked_elements_loaded = False
             try:
-                linked_data = self.element_manager.load_elements_for_path(
-                    path_id,
-                    drawing_id=current_drawing_id,
-                    page_number=current_page
-                )
+                if linked_data is None:
+                    self._drain_autosave()
+                    if self.page_cache is not None:
+                        linked_data = self.page_cache.get_path_elements(current_page, path_id)
+                    else:
+                        linked_data = self.element_manager.load_elements_for_path(
+                            path_id,
+                            drawing_id=current_drawing_id,
+                            page_number=current_page
+                        )
                 db_components = linked_data.get('components', [])
                 db_segments = linked_data.get('segments', [])
                 
@@ -4874,6 +5034,7 @@ class DrawingInterface(HelpMixin, QMainWindow):
                 normalized_segments.append(normalized)
             
             # Use the element manager to save path-linked elements
+            self._drain_autosave()
             elements_saved = self.element_manager.save_path_elements(
                 self.drawing.id,
                 self.project_id,
@@ -5544,6 +5705,11 @@ class DrawingInterface(HelpMixin, QMainWindow):
     def closeEvent(self, event):
         """Handle window close event"""
         self.save_drawing_to_db()
+        if self.autosave_queue is not None:
+            if not self.autosave_queue.shutdown(AUTOSAVE_DRAIN_TIMEOUT_S):
+                print("Warning: Unsaved drawing edits remain in the autosave journal and will be restored on reopen")
+        if self.page_cache is not None:
+            self.page_cache.shutdown()
         self.finished.emit()
         event.accept()
 
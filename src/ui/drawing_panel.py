@@ -94,13 +94,13 @@ class DrawingPanel(QWidget):
 		self._load_saved_elements()
 
 	def _update_overlay_geometry(self):
-		if self.pdf_viewer and self.pdf_viewer.pixmap and self.drawing_overlay:
+		page_size = self.pdf_viewer.get_page_pixel_size() if self.pdf_viewer else None
+		if page_size is not None and self.drawing_overlay:
 			label = self.pdf_viewer.pdf_label
-			pixmap = self.pdf_viewer.pixmap
 			try:
-				self.drawing_overlay.resize(pixmap.size())
-				offset_x = max((label.width() - pixmap.width()) // 2, 0)
-				offset_y = max((label.height() - pixmap.height()) // 2, 0)
+				self.drawing_overlay.resize(page_size)
+				offset_x = max((label.width() - page_size.width()) // 2, 0)
+				offset_y = max((label.height() - page_size.height()) // 2, 0)
 				self.drawing_overlay.move(offset_x, offset_y)
 			except Exception:
 				self.drawing_overlay.move(0, 0)
@@ -8,8 +8,8 @@ from PySide6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                              QTabWidget, QMenuBar, QStatusBar, QMessageBox,
                              QFileDialog, QSplitter, QTextEdit, QGroupBox, QDialog,
                              QTableWidget, QTableWidgetItem, QHeaderView, QCheckBox, QSizePolicy)
-from PySide6.QtCore import Qt, Signal
-from PySide6.QtGui import QFont, QIcon, QColor, QAction
+from PySide6.QtCore import Qt, Signal, QSize
+from PySide6.QtGui import QFont, QIcon, QColor, QAction, QPixmap
 
 from models import (
     get_session,
@@ -30,6 +30,7 @@ from ui.results_widget import ResultsWidget
 from ui.dialogs.hvac_path_dialog import HVACPathDialog
 from ui.dialogs.drawing_sets_dialog import DrawingSetsDialog
 from ui.drawing_comparison_interface import DrawingComparisonInterface
+from drawing.preview_cache import PreviewGenerationWorker, get_preview_cache, thumbnail_tag
 from data.excel_exporter import ExcelExporter, ExportOptions, EXCEL_EXPORT_AVAILABLE
 from help import HelpMixin
 from utils.settings_manager import get_settings_manager
@@ -52,6 +53,10 @@ class ProjectDashboard(HelpMixin, QMainWindow):
         # Store reference to component library dialog to keep it alive (non-modal)
         self.component_library_dialog = None
         
+        # Background thumbnail/preview generation workers (kept alive while running)
+        self._preview_workers = []
+        self._previews_requested = set()
+        
         self.load_project()
         self.init_ui()
         self.refresh_all_data()
@@ -367,6 +372,7 @@ class ProjectDashboard(HelpMixin, QMainWindow):
         # Drawings list
         self.drawings_list = QListWidget()
         self.apply_dark_list_style(self.drawings_list)
+        self.drawings_list.setIconSize(QSize(48, 48))
         self.drawings_list.itemDoubleClicked.connect(self.open_selected_drawing)
         # Keep the embedded preview synchronized with selection
         try:
@@ -584,16 +590,57 @@ class ProjectDashboard(HelpMixin, QMainWindow):
             drawings = session.query(Drawing).filter(Drawing.project_id == self.project_id).all()
             
             self.drawings_list.clear()
+            missing_previews = []
             for drawing in drawings:
                 item_text = f"📄 {drawing.name}"
                 item = QListWidgetItem(item_text)
                 item.setData(Qt.UserRole, drawing.id)
+                pdf_path = drawing.get_absolute_file_path()
+                item.setData(Qt.UserRole + 1, pdf_path)
+                icon = self._drawing_thumbnail_icon(pdf_path)
+                if icon is not None:
+                    item.setIcon(icon)
+                elif pdf_path:
+                    missing_previews.append(pdf_path)
                 self.drawings_list.addItem(item)
                 
             session.close()
             
+            self._generate_drawing_previews(missing_previews)
+            
         except Exception as e:
             QMessageBox.warning(self, "Warning", f"Could not load drawings:\n{str(e)}")
+    
+    def _drawing_thumbnail_icon(self, pdf_path):
+        """Icon from the cached first-page thumbnail of a drawing, or None if not cached yet"""
+        cache = get_preview_cache()
+        if not pdf_path or cache is None:
+            return None
+        image = cache.load_image(pdf_path, 0, thumbnail_tag())
+        return QIcon(QPixmap.fromImage(image)) if image is not None else None
+    
+    def _generate_drawing_previews(self, pdf_paths):
+        """Generate thumbnails and page previews in the background, once per file per session"""
+        pdf_paths = [p for p in pdf_paths
+                     if p and p not in self._previews_requested and os.path.exists(p)]
+        if not pdf_paths:
+            return
+        self._previews_requested.update(pdf_paths)
+        worker = PreviewGenerationWorker(pdf_paths, parent=self)
+        worker.preview_ready.connect(self._on_drawing_preview_ready)
+        worker.finished.connect(lambda w=worker: self._preview_workers.remove(w))
+        self._preview_workers.append(worker)
+        worker.start()
+    
+    def _on_drawing_preview_ready(self, pdf_path):
+        """Show a freshly generated thumbnail on the matching drawing items"""
+        icon = self._drawing_thumbnail_icon(pdf_path)
+        if icon is None or not hasattr(self, 'drawings_list'):
+            return
+        for row in range(self.drawings_list.count()):
+            item = self.drawings_list.item(row)
+            if item.data(Qt.UserRole + 1) == pdf_path:
+                item.setIcon(icon)
             
     def refresh_spaces(self):
         """Refresh the spaces list, grouped by drawing set, with enhanced status information"""
@@ -935,7 +982,7 @@ class ProjectDashboard(HelpMixin, QMainWindow):
                 session.commit()
                 session.close()
                 
-                # Refresh drawings list
+                # Refresh drawings list (starts background thumbnail/preview generation)
                 self.refresh_drawings()
                 
                 QMessageBox.information(self, "Success", f"Drawing '{drawing_name}' imported successfully.")
@@ -1856,6 +1903,11 @@ class ProjectDashboard(HelpMixin, QMainWindow):
         
     def closeEvent(self, event):
         """Handle window close event"""
+        # Workers stop before their next page render, so waiting is bounded
+        for worker in list(self._preview_workers):
+            worker.requestInterruption()
+        for worker in list(self._preview_workers):
+            worker.wait()
         self.finished.emit()
         event.accept()
 
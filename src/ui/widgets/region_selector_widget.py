@@ -8,7 +8,7 @@ with rectangle drawing, zoom/pan, and multi-region support.
 from __future__ import annotations
 
 from typing import Optional, List, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel,
@@ -29,7 +29,7 @@ class SelectionRect:
     width: int
     height: int
     label: str = "Selection"
-    color: QColor = QColor(0, 255, 0)
+    color: QColor = field(default_factory=lambda: QColor(0, 255, 0))
     
     def to_qrect(self) -> QRect:
         return QRect(self.x, self.y, self.width, self.height)
@@ -2,7 +2,6 @@
 Utils package - Utility modules for the Acoustic Analysis Tool
 """
 
-from .location_manager import LocationManager
 from .general_utils import (
     is_bundled_executable,
     get_resource_path,
@@ -16,6 +15,16 @@ from .general_utils import (
     log_environment_info
 )
 from .logging_config import get_logger, configure_logging
+from .startup_profiler import get_startup_profiler
+
+
+def __getattr__(name):
+    """Lazy load LocationManager so importing utils does not pull in the ORM models."""
+    if name == 'LocationManager':
+        from .location_manager import LocationManager
+        return LocationManager
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     'LocationManager',
@@ -31,4 +40,5 @@ __all__ = [
     'log_environment_info',
     'get_logger',
     'configure_logging',
+    'get_startup_profiler',
 ]
@@ -16,6 +16,8 @@ class SettingsManager:
     KEY_DATABASE_CUSTOM_PATH = "database/custom_path"
     KEY_DATABASE_USE_CUSTOM_PATH = "database/use_custom_path"
     KEY_HELP_PANEL_AUTO_HIDE = "help/auto_hide"
+    KEY_DATABASE_PERFORMANCE_PROFILE = "database/performance_profile"
+    KEY_DATABASE_PERFORMANCE_OVERRIDES = "database/performance"  # group: cache_size_kb, mmap_size_mb, ...
     
     def __init__(self):
         """Initialize the settings manager"""
@@ -85,6 +87,64 @@ class SettingsManager:
         self.settings.setValue(self.KEY_HELP_PANEL_AUTO_HIDE, auto_hide)
         self.settings.sync()
 
+    def get_database_performance_profile(self):
+        """
+        Get the name of the SQLite performance profile for project databases.
+        
+        Returns:
+            str or None: Profile name ('performance' or 'compatibility'), or None for the default
+        """
+        value = self.settings.value(self.KEY_DATABASE_PERFORMANCE_PROFILE, None, type=str)
+        return value or None
+    
+    def set_database_performance_profile(self, profile_name):
+        """
+        Set the SQLite performance profile (takes effect on next database open).
+        
+        Args:
+            profile_name (str or None): Profile name, or None to revert to the default
+        """
+        if profile_name:
+            self.settings.setValue(self.KEY_DATABASE_PERFORMANCE_PROFILE, profile_name)
+        else:
+            self.settings.remove(self.KEY_DATABASE_PERFORMANCE_PROFILE)
+        self.settings.sync()
+    
+    def get_database_performance_overrides(self):
+        """
+        Get numeric overrides for the SQLite performance profile.
+        
+        Returns:
+            dict: e.g. {'cache_size_kb': 131072}; only keys that are set are included
+        """
+        from models.sqlite_performance import OVERRIDABLE_FIELDS
+        overrides = {}
+        for field in OVERRIDABLE_FIELDS:
+            key = f"{self.KEY_DATABASE_PERFORMANCE_OVERRIDES}/{field}"
+            if self.settings.contains(key):
+                overrides[field] = self.settings.value(key, 0, type=int)
+        return overrides
+    
+    def set_database_performance_override(self, field, value):
+        """
+        Set (or clear with None) a numeric override for the SQLite performance profile.
+        
+        Args:
+            field (str): One of cache_size_kb, mmap_size_mb, statement_cache_size, query_cache_size
+            value (int or None): Override value, or None to remove the override
+        """
+        from models.sqlite_performance import OVERRIDABLE_FIELDS
+        if field not in OVERRIDABLE_FIELDS:
+            raise ValueError(f"Unknown database performance setting: {field}")
+        key = f"{self.KEY_DATABASE_PERFORMANCE_OVERRIDES}/{field}"
+        if value is None:
+            self.settings.remove(key)
+        else:
+            if int(value) < 0:
+                raise ValueError(f"{field} must be non-negative")
+            self.settings.setValue(key, int(value))
+        self.settings.sync()
+
 
 # Global instance
 _settings_manager = None
@@ -0,0 +1,286 @@
+"""
+Startup instrumentation for the Acoustic Analysis Tool.
+
+When enabled, records how long the application spends reaching a usable
+state, broken down into:
+1. Import time per module (cumulative and self time)
+2. Named startup phases (database migrations, materials catalog build, ...)
+3. Point-in-time marks (e.g. first window paint)
+
+The results are written to a JSON report.
+
+Enable with the ``ACOUSTIC_STARTUP_PROFILE`` environment variable (or the
+``--profile-startup`` flag of ``main.py``). The report path can be set with
+``ACOUSTIC_STARTUP_PROFILE_FILE``; by default it is written to the user data
+directory as ``startup_profile.json``.
+
+Usage:
+    from utils.startup_profiler import get_startup_profiler
+    profiler = get_startup_profiler()
+    with profiler.phase("Materials catalog", category="materials"):
+        build_catalog()
+    profiler.mark("first_window_paint")
+    profiler.write_report()
+
+All methods are cheap no-ops when profiling is disabled.
+"""
+
+import builtins
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Environment variables for configuration
+ENV_STARTUP_PROFILE = "ACOUSTIC_STARTUP_PROFILE"
+ENV_STARTUP_PROFILE_FILE = "ACOUSTIC_STARTUP_PROFILE_FILE"
+ENV_STARTUP_BUDGET = "ACOUSTIC_STARTUP_BUDGET_S"
+
+# Command line flag accepted by main.py
+STARTUP_PROFILE_FLAG = "--profile-startup"
+
+# Default cold-start budget in seconds (overridable via ACOUSTIC_STARTUP_BUDGET_S)
+DEFAULT_COLD_START_BUDGET_S = 5.0
+
+DEFAULT_REPORT_FILENAME = "startup_profile.json"
+
+# Module names under which this file may be imported (src/ on sys.path, or the
+# repository root on sys.path as used by the API package).
+_MODULE_ALIASES = ("utils.startup_profiler", "src.utils.startup_profiler")
+
+_TRUTHY = ("1", "true", "yes", "on")
+
+
+def is_startup_profiling_enabled() -> bool:
+    """Return True if startup profiling was requested via the environment."""
+    return os.environ.get(ENV_STARTUP_PROFILE, "").lower() in _TRUTHY
+
+
+def get_cold_start_budget() -> float:
+    """Get the configured cold-start budget in seconds."""
+    value = os.environ.get(ENV_STARTUP_BUDGET)
+    if value:
+        try:
+            return float(value)
+        except ValueError:
+            logger.warning(f"Invalid {ENV_STARTUP_BUDGET} value {value!r}, using default")
+    return DEFAULT_COLD_START_BUDGET_S
+
+
+class StartupProfiler:
+    """Collects import timings, startup phases and marks for one process."""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.start_time = time.perf_counter()
+        self.entry_point: Optional[str] = None
+        self.report_path: Optional[str] = None
+
+        self._lock = threading.Lock()
+        self._imports: List[Dict[str, Any]] = []
+        self._phases: List[Dict[str, Any]] = []
+        self._marks: Dict[str, float] = {}
+        self._local = threading.local()
+        self._original_import = None
+        self._finished = False
+
+    # ------------------------------------------------------------------
+    # Import timing
+    # ------------------------------------------------------------------
+
+    def install_import_hook(self):
+        """Start recording per-module import times (idempotent)."""
+        if not self.enabled or self._original_import is not None:
+            return
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+
+    def uninstall_import_hook(self):
+        """Stop recording import times and restore the original importer."""
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        original = self._original_import
+        try:
+            resolved = name
+            if level:
+                package = (globals or {}).get('__package__') or (globals or {}).get('__name__', '')
+                from importlib.util import resolve_name
+                resolved = resolve_name('.' * level + name, package)
+        except Exception:
+            return original(name, globals, locals, fromlist, level)
+
+        # Parent packages first: a dotted import executes their __init__ before the leaf
+        parts = resolved.split('.') if resolved else []
+        candidates = ['.'.join(parts[:i]) for i in range(1, len(parts) + 1)]
+        if fromlist:
+            candidates.extend(f"{resolved}.{item}" for item in fromlist if item != '*')
+        pending = [m for m in candidates if m not in sys.modules]
+        if not pending:
+            return original(name, globals, locals, fromlist, level)
+
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            child_time = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            loaded = next((m for m in pending if m in sys.modules), None)
+            if loaded is not None:
+                with self._lock:
+                    self._imports.append({
+                        'module': loaded,
+                        'cumulative_seconds': elapsed,
+                        'self_seconds': max(elapsed - child_time, 0.0),
+                    })
+
+    # ------------------------------------------------------------------
+    # Phases and marks
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def phase(self, name: str, category: str = "general"):
+        """Time a named startup phase."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            with self._lock:
+                self._phases.append({
+                    'name': name,
+                    'category': category,
+                    'start_seconds': start - self.start_time,
+                    'duration_seconds': end - start,
+                })
+
+    def mark(self, name: str):
+        """Record the time since profiler start for a named milestone (first wins)."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._marks.setdefault(name, time.perf_counter() - self.start_time)
+
+    def elapsed(self) -> float:
+        """Seconds since the profiler was created."""
+        return time.perf_counter() - self.start_time
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def build_report(self) -> Dict[str, Any]:
+        """Build the JSON-serializable startup report."""
+        with self._lock:
+            imports = sorted(self._imports, key=lambda r: r['cumulative_seconds'], reverse=True)
+            phases = list(self._phases)
+            marks = dict(self._marks)
+
+        categories: Dict[str, float] = {}
+        for phase in phases:
+            categories[phase['category']] = categories.get(phase['category'], 0.0) + phase['duration_seconds']
+
+        total = marks.get('ready', self.elapsed())
+        return {
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'entry_point': self.entry_point,
+            'python_version': sys.version.split()[0],
+            'total_seconds': total,
+            'budget_seconds': get_cold_start_budget(),
+            'marks': marks,
+            'phase_totals': categories,
+            'phases': phases,
+            'import_count': len(imports),
+            'import_self_seconds': sum(r['self_seconds'] for r in imports),
+            'imports': imports,
+        }
+
+    def _default_report_path(self) -> str:
+        path = os.environ.get(ENV_STARTUP_PROFILE_FILE)
+        if path:
+            return path
+        try:
+            from .general_utils import get_user_data_directory
+            user_dir = get_user_data_directory()
+        except Exception:
+            user_dir = os.getcwd()
+        return os.path.join(str(user_dir), DEFAULT_REPORT_FILENAME)
+
+    def write_report(self, path: Optional[str] = None) -> Optional[str]:
+        """Write the JSON report and return its path (None when disabled)."""
+        if not self.enabled:
+            return None
+        path = path or self.report_path or self._default_report_path()
+        report = self.build_report()
+        try:
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+            with open(path, 'w') as f:
+                json.dump(report, f, indent=2)
+            logger.info(f"Startup profile written to {path} ({report['total_seconds']:.3f}s)")
+        except OSError as e:
+            logger.warning(f"Could not write startup profile to {path}: {e}")
+            return None
+        return path
+
+    def finish(self, entry_point: Optional[str] = None) -> Optional[str]:
+        """Mark startup as complete, stop import timing and write the report (once)."""
+        if not self.enabled or self._finished:
+            return None
+        self._finished = True
+        if entry_point and not self.entry_point:
+            self.entry_point = entry_point
+        self.mark('ready')
+        self.uninstall_import_hook()
+        return self.write_report()
+
+
+_profiler: Optional[StartupProfiler] = None
+
+
+def get_startup_profiler() -> StartupProfiler:
+    """Get the process-wide startup profiler.
+
+    The profiler is shared even if this module is imported under both
+    ``utils.startup_profiler`` and ``src.utils.startup_profiler``.
+    """
+    global _profiler
+    if _profiler is None:
+        for alias in _MODULE_ALIASES:
+            module = sys.modules.get(alias)
+            existing = getattr(module, '_profiler', None) if module is not None else None
+            if existing is not None:
+                _profiler = existing
+                break
+        else:
+            _profiler = StartupProfiler(enabled=is_startup_profiling_enabled())
+    return _profiler
+
+
+def enable_startup_profiling(report_path: Optional[str] = None) -> StartupProfiler:
+    """Enable profiling programmatically (e.g. from a command line flag)."""
+    os.environ[ENV_STARTUP_PROFILE] = "1"
+    profiler = get_startup_profiler()
+    profiler.enabled = True
+    if report_path:
+        profiler.report_path = report_path
+    profiler.install_import_hook()
+    return profiler
@@ -0,0 +1,171 @@
+"""Tests for the write-behind autosave queue and its crash journal."""
+
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from PySide6.QtCore import QRect
+from PySide6.QtWidgets import QApplication
+
+from drawing.autosave import DrawingAutosaveQueue
+from models import initialize_database, close_database, get_session, Project, Drawing, DrawingElement, \
+    DrawingElementManager
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    app = QApplication.instance() or QApplication([])
+    yield app
+
+
+@pytest.fixture
+def drawing(tmp_path):
+    close_database()
+    initialize_database(str(tmp_path / 'test_autosave.db'))
+    session = get_session()
+    project = Project(name="Autosave")
+    session.add(project)
+    session.flush()
+    drawing = Drawing(project_id=project.id, name="M-101", file_path="m101.pdf")
+    session.add(drawing)
+    session.commit()
+    ids = (drawing.id, project.id)
+    session.close()
+    yield ids
+    close_database()
+
+
+def _component(k):
+    return {'type': 'component', 'component_type': 'vav', 'x': 10 * k, 'y': 20, 'saved_zoom': 1.0}
+
+
+def _stored(drawing_id):
+    session = get_session()
+    try:
+        return sorted((e.element_type, e.x_position, e.y_position)
+                      for e in session.query(DrawingElement).filter(DrawingElement.drawing_id == drawing_id))
+    finally:
+        session.close()
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_queued_edits_coalesce_into_one_write(qapp, drawing, tmp_path):
+    drawing_id, project_id = drawing
+    journal = str(tmp_path / 'journal.jsonl')
+    queue = DrawingAutosaveQueue(DrawingElementManager(get_session), journal, idle_delay=60)
+    try:
+        components = [_component(k) for k in range(3)]
+        rect = {'type': 'rectangle', 'x': 5, 'y': 5, 'width': 50, 'height': 40, 'bounds': QRect(5, 5, 50, 40)}
+        queue.enqueue_page(drawing_id, project_id, 1, {'components': components, 'rectangles': [rect]})
+        components[0]['y'] = 99
+        queue.enqueue_page(drawing_id, project_id, 1, {'components': components, 'rectangles': [rect]})
+        queue.enqueue_drawing(drawing_id, {'scale_string': '1/8"=1\'-0"', 'scale_ratio': 2.5})
+        queue.enqueue_drawing(drawing_id, {'scale_ratio': 3.0, 'name': 'ignored'})
+
+        # Journaled right away, written to the database only when idle or flushed
+        _wait_for(lambda: os.path.exists(journal) and os.path.getsize(journal) > 0)
+        assert _stored(drawing_id) == []
+        assert queue.pending_count() == 2
+
+        assert queue.flush(timeout=5)
+        assert queue.flush_count == 1
+        assert _stored(drawing_id) == [('component', 0.0, 99.0), ('component', 10.0, 20.0),
+                                       ('component', 20.0, 20.0), ('rectangle', 5.0, 5.0)]
+        assert os.path.getsize(journal) == 0
+
+        session = get_session()
+        saved = session.get(Drawing, drawing_id)
+        assert (saved.scale_string, saved.scale_ratio, saved.name) == ('1/8"=1\'-0"', 3.0, 'M-101')
+        session.close()
+
+        # Row ids reach the live overlay dicts on the GUI thread
+        _wait_for(lambda: (qapp.processEvents(), all('drawing_element_id' in c for c in components))[1])
+    finally:
+        queue.shutdown()
+
+
+def test_journal_replays_edits_after_a_failed_write(qapp, drawing, tmp_path):
+    drawing_id, project_id = drawing
+    journal = str(tmp_path / 'journal.jsonl')
+
+    @contextmanager
+    def broken_session():
+        raise RuntimeError("disk I/O error")
+        yield
+
+    crashed = DrawingAutosaveQueue(DrawingElementManager(get_session), journal, write_session=broken_session,
+                                   idle_delay=60)
+    crashed.enqueue_page(drawing_id, project_id, 1, {'components': [_component(1)]})
+    crashed.enqueue_page(drawing_id, project_id, 2, {'components': [_component(2)]})
+    crashed.enqueue_page(drawing_id, project_id, 1, {'components': [_component(3)]})
+    assert not crashed.shutdown(timeout=5)
+    assert _stored(drawing_id) == []
+
+    # A record torn by the crash is ignored
+    with open(journal, 'a', encoding='utf-8') as f:
+        f.write('{"op": "page", "drawing_')
+
+    reopened = DrawingAutosaveQueue(DrawingElementManager(get_session), journal, idle_delay=60)
+    try:
+        assert reopened.recovered_count == 3
+        assert reopened.flush(timeout=5)
+        assert _stored(drawing_id) == [('component', 20.0, 20.0), ('component', 30.0, 20.0)]
+        assert os.path.getsize(journal) == 0
+    finally:
+        reopened.shutdown()
+
+
+def test_failed_write_keeps_newer_edits(qapp, drawing, tmp_path):
+    drawing_id, project_id = drawing
+    failures = []
+
+    @contextmanager
+    def flaky_session():
+        from models import write_session
+        if not failures:
+            failures.append(True)
+            raise RuntimeError("database is locked")
+        with write_session() as session:
+            yield session
+
+    queue = DrawingAutosaveQueue(DrawingElementManager(get_session), str(tmp_path / 'journal.jsonl'),
+                                 write_session=flaky_session, idle_delay=0)
+    try:
+        queue.enqueue_page(drawing_id, project_id, 1, {'components': [_component(1)]})
+        _wait_for(lambda: failures)
+        queue.enqueue_page(drawing_id, project_id, 1, {'components': [_component(1), _component(4)]})
+        assert queue.flush(timeout=5)
+        assert _stored(drawing_id) == [('component', 10.0, 20.0), ('component', 40.0, 20.0)]
+    finally:
+        queue.shutdown()
+
+
+def test_deleted_elements_are_saved_and_pending_is_per_page(qapp, drawing, tmp_path):
+    drawing_id, project_id = drawing
+    queue = DrawingAutosaveQueue(DrawingElementManager(get_session), str(tmp_path / 'journal.jsonl'), idle_delay=60)
+    try:
+        components = [_component(k) for k in range(3)]
+        queue.enqueue_page(drawing_id, project_id, 1, {'components': components})
+        # Loading another page need not wait for this one's save
+        assert queue.page_pending(drawing_id, 1) and not queue.page_pending(drawing_id, 2)
+        assert queue.flush(timeout=5)
+        assert not queue.page_pending(drawing_id, 1)
+
+        # Deleting the last element queues an empty page, which removes the stored rows
+        queue.enqueue_page(drawing_id, project_id, 1, {'components': components[:1]})
+        queue.enqueue_page(drawing_id, project_id, 1, {'components': []})
+        assert queue.flush(timeout=5)
+        assert _stored(drawing_id) == []
+    finally:
+        queue.shutdown()
@@ -0,0 +1,179 @@
+"""Tests for per-sheet, one-to-one matching in the drawing set comparison engine."""
+
+import os
+import random
+import sys
+import time
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from drawing.assignment import solve_sparse_assignment
+from drawing.drawing_comparison import DrawingComparisonEngine
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return DrawingComparisonEngine()
+
+
+def _component(id, x, y, component_type='vav', drawing_id=1, page_number=1, noise_level=40.0):
+    return SimpleNamespace(id=id, name=f"C{id}", component_type=component_type, x_position=x, y_position=y,
+                           drawing_id=drawing_id, page_number=page_number, noise_level=noise_level)
+
+
+def _space(id, name, area, height=9.0, drawing_id=1):
+    return SimpleNamespace(id=id, name=name, floor_area=area, ceiling_height=height, drawing_id=drawing_id)
+
+
+def _by_type(changes, change_type):
+    return sorted(c.get('base_element_id') or c.get('compare_element_id')
+                  for c in changes if c['change_type'] == change_type)
+
+
+def test_compare_component_is_matched_at_most_once(engine):
+    base = [_component(1, 100, 100), _component(2, 108, 100)]
+    compare = [_component(11, 106, 100)]
+    changes = engine.detect_hvac_changes(base, compare)
+
+    # The closer base component keeps the match; the other is reported as removed
+    assert _by_type(changes, 'removed') == [1]
+    assert _by_type(changes, 'added') == []
+
+
+def test_components_only_match_on_the_same_sheet(engine):
+    page_keys = {1: ('m-101', 1), 2: ('m-102', 1), 11: ('m-101', 1), 12: ('m-102', 1), 13: ('m-103 rev', 1)}
+    base = [_component(1, 100, 100, drawing_id=1), _component(2, 500, 500, drawing_id=2),
+            _component(3, 900, 900, drawing_id=99)]
+    compare = [_component(11, 500, 500, drawing_id=11), _component(12, 100, 100, drawing_id=12),
+               _component(13, 902, 900, drawing_id=13)]
+    changes = engine.detect_hvac_changes(base, compare, page_keys)
+
+    assert _by_type(changes, 'removed') == [1, 2]
+    assert _by_type(changes, 'added') == [11, 12]
+    # Sheets without a counterpart still match each other
+    assert not any(c.get('base_element_id') == 3 for c in changes)
+
+
+def test_space_candidates_cover_every_pair_above_threshold(engine):
+    rng = random.Random(4)
+    names = [f"Office {i}" for i in range(30)] + [None]
+    base = [_space(i, rng.choice(names), rng.choice([120.0, 150.0, 150.0, 400.0, None]) or None,
+                   rng.choice([9.0, 10.0, None])) for i in range(150)]
+    compare = [_space(1000 + j, rng.choice(names), rng.choice([120.0, 125.0, 150.0, 410.0, None]),
+                      rng.choice([9.0, 10.0, None])) for j in range(150)]
+
+    brute = {}
+    for i, b in enumerate(base):
+        for j, c in enumerate(compare):
+            score = engine._calculate_space_similarity(b, c)
+            if score >= engine.SIMILARITY_THRESHOLD:
+                brute[(i, j)] = score
+    expected = solve_sparse_assignment({pair: -score for pair, score in brute.items()})
+    expected_total = sum(brute[(i, j)] for i, j in expected.items())
+
+    matches = engine._match_spaces_by_geometry(base, compare)
+    assert len({id(m.compare_element) for m in matches}) == len(matches)
+    assert sum(m.similarity_score for m in matches) == pytest.approx(expected_total)
+
+
+def test_forty_sheet_comparison_is_fast_and_deterministic(engine):
+    rng = random.Random(8)
+    page_keys, base, compare, base_spaces, compare_spaces = {}, [], [], [], []
+    for sheet in range(40):
+        page_keys[sheet] = (f"m-{sheet}", 1)
+        page_keys[1000 + sheet] = (f"m-{sheet}", 1)
+        for k in range(300):
+            x, y = rng.uniform(0, 3000), rng.uniform(0, 2000)
+            component_type = rng.choice(['vav', 'diffuser', 'grille'])
+            base.append(_component(len(base), x, y, component_type, drawing_id=sheet))
+            if rng.random() < 0.9:
+                compare.append(_component(100000 + len(compare), x + rng.uniform(-5, 5), y + rng.uniform(-5, 5),
+                                          component_type, drawing_id=1000 + sheet))
+        for k in range(60):
+            area = rng.choice([100.0, 120.0, 150.0, 200.0])
+            base_spaces.append(_space(len(base_spaces), f"Room {sheet}-{k}", area, drawing_id=sheet))
+            compare_spaces.append(_space(100000 + len(compare_spaces), f"Room {sheet}-{k}",
+                                         area * rng.choice([1.0, 1.1]), drawing_id=1000 + sheet))
+
+    start = time.perf_counter()
+    hvac_changes = engine.detect_hvac_changes(base, compare, page_keys)
+    space_changes = engine.detect_space_changes(base_spaces, compare_spaces, page_keys)
+    elapsed = time.perf_counter() - start
+    print(f"\nCompared {len(base)} components and {len(base_spaces)} spaces across 40 sheets in {elapsed*1000:.0f}ms")
+
+    assert elapsed < 10.0
+    assert len(_by_type(hvac_changes, 'removed')) == len(base) - len(compare)
+    assert _by_type(space_changes, 'added') == []
+    assert engine.detect_hvac_changes(base, compare, page_keys) == hvac_changes
+
+
+@pytest.fixture
+def comparison_database(tmp_path):
+    from models import initialize_database, close_database
+    close_database()
+    initialize_database(str(tmp_path / 'test_comparison.db'))
+    yield
+    close_database()
+
+
+def test_compare_drawing_sets_streams_committed_chunks(comparison_database, engine):
+    from models import get_session, get_read_session, Project, Drawing, DrawingSet, ChangeItem
+    from models.hvac import HVACComponent
+
+    session = get_session()
+    project = Project(name="Comparison")
+    session.add(project)
+    session.flush()
+    set_ids = []
+    for phase in ('DD', 'CD'):
+        drawing_set = DrawingSet(project_id=project.id, name=phase, phase_type=phase)
+        session.add(drawing_set)
+        session.flush()
+        drawing = Drawing(project_id=project.id, name="M-101", file_path="m101.pdf", drawing_set_id=drawing_set.id)
+        session.add(drawing)
+        session.flush()
+        # Disjoint positions: every component is an addition or a removal
+        offset = 0 if phase == 'DD' else 5000
+        for k in range(23):
+            session.add(HVACComponent(project_id=project.id, drawing_id=drawing.id, name=f"VAV-{k}",
+                                      component_type='vav', x_position=offset + k * 100.0, y_position=100.0))
+        set_ids.append(drawing_set.id)
+    session.commit()
+    session.close()
+
+    streamed, percents, visible = [], [], []
+
+    def on_progress(percent, message, rows):
+        percents.append(percent)
+        streamed.extend(rows)
+        if rows:
+            reader = get_read_session()
+            try:
+                visible.append(reader.query(ChangeItem).count())
+            finally:
+                reader.close()
+
+    comparison = engine.compare_drawing_sets(set_ids[0], set_ids[1], progress_callback=on_progress, chunk_size=10)
+
+    assert comparison.total_changes == 46
+    assert json_summary(comparison)['hvac_changes'] == 46
+    assert len(streamed) == 46 and len({row['id'] for row in streamed}) == 46
+    assert percents == sorted(percents) and percents[-1] == 100
+    # Each chunk is committed before it is reported
+    assert visible == [10, 20, 30, 40, 46]
+
+    session = get_session()
+    try:
+        stored = session.query(ChangeItem).filter(ChangeItem.comparison_id == comparison.id).all()
+        assert sorted(item.id for item in stored) == sorted(row['id'] for row in streamed)
+        assert {item.change_type for item in stored} == {'added', 'removed'}
+    finally:
+        session.close()
+
+
+def json_summary(comparison):
+    import json
+    return json.loads(comparison.comparison_results)['summary']
@@ -0,0 +1,113 @@
+"""Tests for diff-based page saves in DrawingElementManager."""
+
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from models import initialize_database, close_database, get_session, Project, Drawing, DrawingElement, \
+    DrawingElementManager
+
+
+@pytest.fixture
+def drawing(tmp_path):
+    close_database()
+    initialize_database(str(tmp_path / 'test_elements.db'))
+    session = get_session()
+    project = Project(name="Elements")
+    session.add(project)
+    session.flush()
+    drawing = Drawing(project_id=project.id, name="M-101", file_path="m101.pdf")
+    session.add(drawing)
+    session.commit()
+    ids = (drawing.id, project.id)
+    session.close()
+    yield ids
+    close_database()
+
+
+def _rectangle(k):
+    return {'type': 'rectangle', 'x': 10 * k, 'y': 20, 'width': 30, 'height': 40,
+            'area_formatted': f"{k} sf", 'saved_zoom': 1.0}
+
+
+def _component(k):
+    return {'type': 'component', 'component_type': 'vav', 'x': 5 * k, 'y': 7, 'saved_zoom': 1.0}
+
+
+def _stored_rows(drawing_id):
+    session = get_session()
+    try:
+        return {e.id: (e.element_type, e.x_position, e.modified_date)
+                for e in session.query(DrawingElement).filter(DrawingElement.drawing_id == drawing_id)}
+    finally:
+        session.close()
+
+
+def test_resave_keeps_row_ids_and_writes_only_the_delta(drawing):
+    drawing_id, project_id = drawing
+    manager = DrawingElementManager(get_session)
+    overlay = {'rectangles': [_rectangle(k) for k in range(3)], 'components': [_component(k) for k in range(3)]}
+
+    assert manager.save_elements(drawing_id, project_id, overlay) == 6
+    first = _stored_rows(drawing_id)
+    assert sorted(e['drawing_element_id'] for lst in overlay.values() for e in lst) == sorted(first)
+
+    # Unchanged save touches nothing
+    assert manager.save_elements(drawing_id, project_id, overlay) == 6
+    assert _stored_rows(drawing_id) == first
+
+    moved = overlay['components'][1]
+    moved['x'] = 999
+    removed = overlay['rectangles'].pop(0)
+    overlay['rectangles'].append(_rectangle(9))
+    assert manager.save_elements(drawing_id, project_id, overlay) == 6
+
+    second = _stored_rows(drawing_id)
+    assert removed['drawing_element_id'] not in second
+    assert second[moved['drawing_element_id']][1] == 999
+    unchanged = set(first) - {removed['drawing_element_id'], moved['drawing_element_id']}
+    assert all(second[i] == first[i] for i in unchanged)
+    assert overlay['rectangles'][-1]['drawing_element_id'] not in first
+
+
+def test_loaded_elements_resave_without_churn(drawing):
+    drawing_id, project_id = drawing
+    manager = DrawingElementManager(get_session)
+    manager.save_elements(drawing_id, project_id, {'rectangles': [_rectangle(1)], 'components': [_component(1)]})
+    first = _stored_rows(drawing_id)
+
+    # Elements loaded back carry their row id; plain dicts without ids match by content
+    loaded = manager.load_elements(drawing_id)
+    assert manager.save_elements(drawing_id, project_id, loaded) == 2
+    assert manager.save_elements(drawing_id, project_id, {'rectangles': [_rectangle(1)],
+                                                          'components': [_component(1)]}) == 2
+    assert _stored_rows(drawing_id) == first
+
+    # Other pages are untouched by a page save
+    manager.save_elements(drawing_id, project_id, {'components': [_component(2)]}, page_number=2)
+    manager.save_elements(drawing_id, project_id, {}, page_number=1)
+    assert [row[0] for row in _stored_rows(drawing_id).values()] == ['component']
+
+
+def test_autosave_on_dense_page_is_a_small_delta(drawing):
+    drawing_id, project_id = drawing
+    manager = DrawingElementManager(get_session)
+    overlay = {'components': [_component(k) for k in range(5000)]}
+    manager.save_elements(drawing_id, project_id, overlay)
+    before = _stored_rows(drawing_id)
+
+    for element in overlay['components'][:5]:
+        element['y'] = 70
+    start = time.perf_counter()
+    manager.save_elements(drawing_id, project_id, overlay)
+    elapsed = time.perf_counter() - start
+    print(f"\nRe-saved 5000 elements with 5 edits in {elapsed*1000:.0f}ms")
+
+    after = _stored_rows(drawing_id)
+    assert set(after) == set(before)
+    assert sum(after[i] != before[i] for i in before) == 5
+    assert elapsed < 5.0
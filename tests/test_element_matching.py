@@ -0,0 +1,140 @@
+"""Tests for the indexed coordinate and fuzzy matchers in the element matching service."""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from drawing.coordinate_normalizer import CoordinateNormalizer
+from drawing.element_matching_service import (ElementMatchingService, HybridFuzzyMatcher,
+                                              MatchingStrategy)
+
+
+def _candidates(count, seed=5):
+    rng = random.Random(seed)
+    elements = []
+    for i in range(count):
+        zoom = rng.choice([None, 0.5, 1.0, 1.5, 2.0])
+        element = {'type': rng.choice(['component', 'segment']), 'x': rng.randint(0, 8000),
+                   'y': rng.randint(0, 6000), 'width': rng.randint(10, 40), 'height': rng.randint(10, 40)}
+        if zoom:
+            element['saved_zoom'] = zoom
+        elements.append(element)
+    return elements
+
+
+def _targets(candidates, count, seed=9):
+    rng = random.Random(seed)
+    targets = []
+    for source in rng.sample(candidates, count):
+        zoom = source.get('saved_zoom', 1.0)
+        targets.append({'type': source['type'], 'x': source['x'] + rng.uniform(-6, 6) * zoom,
+                        'y': source['y'] + rng.uniform(-6, 6) * zoom, 'saved_zoom': zoom,
+                        'width': source['width'], 'height': source['height']})
+    return targets
+
+
+def _linear_coordinate_match(normalizer, target, candidates, tolerance=10.0):
+    """The pre-index scan: best confidence wins, earliest candidate on ties."""
+    target_coords = normalizer.normalize_element_coordinates(target)
+    best, best_confidence = None, 0.0
+    for candidate in candidates:
+        coords = normalizer.normalize_element_coordinates(candidate)
+        distance = ((target_coords.x - coords.x) ** 2 + (target_coords.y - coords.y) ** 2) ** 0.5
+        if distance <= tolerance:
+            confidence = max(0.1, 1.0 - distance / tolerance)
+            if confidence > best_confidence:
+                best, best_confidence = candidate, confidence
+    return best
+
+
+def test_batch_match_agrees_with_linear_scan():
+    candidates = _candidates(2000)
+    targets = _targets(candidates, 300)
+    service = ElementMatchingService()
+
+    results = service.batch_match_elements(targets, candidates)
+    reference = CoordinateNormalizer()
+    for target, result in zip(targets, results):
+        expected = _linear_coordinate_match(reference, target, candidates)
+        assert (result.matched_element if result.success else None) is expected
+        if result.success:
+            assert result.strategy_used == MatchingStrategy.COORDINATE_BASED
+
+
+def test_fuzzy_matcher_only_scores_candidates_within_tolerance():
+    candidates = [
+        {'type': 'component', 'x': 100, 'y': 100, 'width': 20, 'height': 20},
+        {'type': 'component', 'x': 500, 'y': 500, 'width': 20, 'height': 20},
+        {'type': 'component', 'x': 104, 'y': 101, 'width': 20, 'height': 20},
+    ]
+    service = ElementMatchingService()
+    context = service._build_matching_context(candidates, None)
+    matcher = HybridFuzzyMatcher(service.normalizer)
+
+    result = matcher.match({'type': 'component', 'x': 103, 'y': 101, 'width': 20, 'height': 20}, context)
+    assert result.success and result.matched_element is candidates[2]
+    assert not matcher.match({'type': 'component', 'x': 300, 'y': 300}, context).success
+    assert not matcher.match({'type': 'component', 'y': 300}, context).success
+
+
+def test_batch_match_on_dense_drawing_is_fast():
+    candidates = _candidates(20000, seed=21)
+    targets = _targets(candidates, 5000, seed=22)
+    service = ElementMatchingService()
+
+    start = time.perf_counter()
+    results = service.batch_match_elements(targets, candidates)
+    elapsed = time.perf_counter() - start
+    print(f"\nMatched 5000 targets against 20000 candidates in {elapsed*1000:.0f}ms")
+    assert sum(result.success for result in results) > 4500
+    assert elapsed < 5.0
+
+
+def test_assignment_never_gives_one_candidate_to_two_targets():
+    left = {'type': 'component', 'x': 95, 'y': 100}
+    right = {'type': 'component', 'x': 103, 'y': 100}
+    targets = [{'type': 'component', 'x': 100, 'y': 100}, {'type': 'component', 'x': 105, 'y': 100}]
+    service = ElementMatchingService()
+
+    greedy = service.batch_match_elements(targets, [left, right])
+    assert greedy[0].matched_element is greedy[1].matched_element is right
+
+    assigned = service.assign_elements(targets, [left, right])
+    assert [r.matched_element for r in assigned] == [left, right]
+    assert all(r.strategy_used == MatchingStrategy.COORDINATE_BASED for r in assigned)
+    assert assigned[1].confidence > assigned[0].confidence
+
+
+def test_assignment_prefers_id_hints_and_reports_unmatched():
+    near = {'type': 'component', 'x': 200, 'y': 200}
+    hinted = {'type': 'component', 'x': 260, 'y': 200, 'db_id': 7}
+    targets = [
+        {'type': 'component', 'x': 201, 'y': 200, 'db_id': 7},
+        {'type': 'component', 'x': 900, 'y': 900},
+    ]
+    results = ElementMatchingService().assign_elements(targets, [near, hinted])
+
+    assert results[0].matched_element is hinted
+    assert results[0].strategy_used == MatchingStrategy.DATABASE_ID
+    assert results[0].confidence == 0.80
+    assert not results[1].success
+
+
+def test_assignment_on_dense_drawing_is_one_to_one():
+    candidates = _candidates(20000, seed=31)
+    targets = _targets(candidates, 5000, seed=32)
+    service = ElementMatchingService()
+
+    start = time.perf_counter()
+    results = service.assign_elements(targets, candidates)
+    elapsed = time.perf_counter() - start
+    print(f"\nAssigned 5000 targets against 20000 candidates in {elapsed*1000:.0f}ms")
+    matched = [id(r.matched_element) for r in results if r.success]
+    assert len(matched) == len(set(matched))
+    assert len(matched) > 4500
+    assert elapsed < 5.0
+    assert [r.matched_element for r in service.assign_elements(targets, candidates)] == \
+        [r.matched_element for r in results]
@@ -0,0 +1,116 @@
+"""Tests for the content-addressed OCR result cache."""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from calculations.ocr_cache import OCRCache, OCR_CACHE_DIR_ENV, get_ocr_cache, image_key
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv(OCR_CACHE_DIR_ENV, str(tmp_path))
+    return tmp_path
+
+
+def _cell(k):
+    cell = np.full((40, 80), 255, dtype=np.uint8)
+    cell[10:10 + k % 5 + 2, 5:75] = 0
+    return cell
+
+
+def test_keys_follow_pixels_and_parameters():
+    image = _cell(1)
+    assert image_key(image, psm=6) == image_key(image.copy(), psm=6)
+    assert image_key(image, psm=6) != image_key(image, psm=7)
+    assert image_key(image, psm=6, whitelist=None) != image_key(image, psm=6, whitelist="0123456789")
+    changed = image.copy()
+    changed[0, 0] = 0
+    assert image_key(changed, psm=6) != image_key(image, psm=6)
+    # Same bytes, different layout
+    assert image_key(image.reshape(80, 40), psm=6) != image_key(image, psm=6)
+    # Non-contiguous crops hash their pixels
+    assert image_key(np.tile(image, 2)[:, :80], psm=6) == image_key(image, psm=6)
+
+
+def test_results_persist_and_eviction_keeps_recent_entries(tmp_path):
+    path = str(tmp_path / "ocr.sqlite3")
+    cache = OCRCache(path, max_bytes=20_000)
+    cache.put("first", [["AHU", "1"]])
+    assert cache.get("first") == [["AHU", "1"]]
+    assert cache.get("missing") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    for k in range(200):
+        cache.put(f"k{k}", "x" * 200)
+        cache.get("first")
+    assert cache.total_bytes() <= 20_000
+    assert cache.get("k0") is None and cache.get("k199") == "x" * 200
+    assert cache.get("first") == [["AHU", "1"]]
+    cache.close()
+
+    reopened = OCRCache(path, max_bytes=20_000)
+    assert reopened.get("k199") == "x" * 200
+    reopened.close()
+
+
+def test_repeat_cell_ocr_skips_tesseract(cache_dir, monkeypatch):
+    from calculations import image_table_to_csv as table_ocr
+
+    calls = []
+
+    def failing(image, config="", output_type=None):
+        calls.append("fail")
+        raise RuntimeError("tesseract is not installed")
+
+    def reader(image, config="", output_type=None):
+        calls.append("read")
+        dark = (np.asarray(image) < 128).any(axis=1)
+        rows = np.flatnonzero(dark)
+        tops = [int(r) for r in rows if r == 0 or not dark[r - 1]]
+        return {"text": ["word"] * len(tops), "top": tops, "height": [2] * len(tops)}
+
+    cells = [_cell(k) for k in range(30)]
+
+    # Failed passes are not cached, so installing Tesseract later is not masked
+    monkeypatch.setattr(table_ocr.pytesseract, "image_to_data", failing)
+    assert table_ocr.ocr_cells_to_text(cells) == [""] * 30
+    assert get_ocr_cache().entry_count() == 0
+
+    monkeypatch.setattr(table_ocr.pytesseract, "image_to_data", reader)
+    first = table_ocr.ocr_cells_to_text(cells)
+    assert first == ["word"] * 30
+    reads = calls.count("read")
+
+    assert table_ocr.ocr_cells_to_text(cells) == first
+    assert calls.count("read") == reads
+    # Different parameters miss
+    table_ocr.ocr_cells_to_text(cells, whitelist="0123456789")
+    assert calls.count("read") > reads
+
+
+def test_repeat_enhanced_ocr_text_is_served_from_cache(cache_dir, monkeypatch):
+    from calculations.enhanced_ocr import EnhancedOCR, OCREngine, OCRResult
+
+    monkeypatch.setattr(EnhancedOCR, "_check_tesseract", lambda self: True)
+    ocr = EnhancedOCR(preferred_engine=OCREngine.TESSERACT)
+    calls = []
+
+    def fake_tesseract(image):
+        calls.append(image.shape)
+        return OCRResult(text="VAV-1", confidence=0.9, engine_used=OCREngine.TESSERACT)
+
+    monkeypatch.setattr(ocr, "_extract_tesseract", fake_tesseract)
+    image = np.dstack([_cell(3)] * 3)
+
+    first = ocr.extract_text(image, bbox=(0, 0, 60, 30))
+    again = ocr.extract_text(image, bbox=(0, 0, 60, 30))
+    assert (again.text, again.confidence, again.engine_used) == ("VAV-1", 0.9, OCREngine.TESSERACT)
+    assert first.text == again.text and calls == [(30, 60, 3)]
+
+    ocr.extract_text(image, bbox=(0, 0, 61, 30))
+    assert len(calls) == 2
@@ -0,0 +1,117 @@
+"""Tests for the process-wide OCR and table-detection engine registry."""
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+pytest.importorskip("cv2")
+
+from calculations import enhanced_ocr, table_detection
+from calculations.enhanced_ocr import EnhancedOCR, OCREngine, get_ocr_engine
+from calculations.ocr_engines import EngineRegistry, engine_registry
+from calculations.table_detection import TableDetector, get_table_detector
+
+
+class FakePaddle:
+    def ocr(self, image, cls=True):
+        return [[[None, ("AHU-1", 0.9)]]]
+
+
+@pytest.fixture
+def loads():
+    """Count loads of fake backends registered in place of the real ones."""
+    counts = {"paddle": 0, "table_transformer": 0, "tesseract": 0}
+
+    def paddle():
+        counts["paddle"] += 1
+        time.sleep(0.05)
+        return FakePaddle()
+
+    def table_transformer():
+        counts["table_transformer"] += 1
+        time.sleep(0.05)
+        return "processor", object(), "cpu"
+
+    def no_tesseract():
+        counts["tesseract"] += 1
+        raise RuntimeError("tesseract is not installed")
+
+    engine_registry.register("paddle", paddle)
+    engine_registry.register("table_transformer", table_transformer)
+    engine_registry.register("tesseract", no_tesseract)
+    yield counts
+    engine_registry.register("paddle", enhanced_ocr._load_paddle)
+    engine_registry.register("table_transformer", table_detection._load_table_transformer)
+    engine_registry.register("tesseract", enhanced_ocr._load_tesseract)
+
+
+def test_backend_loads_once_across_threads_and_failures_are_remembered():
+    registry = EngineRegistry()
+    calls = []
+
+    def slow():
+        calls.append("load")
+        time.sleep(0.05)
+        return object()
+
+    def missing():
+        calls.append("missing")
+        raise ImportError("not installed")
+
+    registry.register("model", slow)
+    registry.register("missing", missing)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get("model"))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert calls == ["load"] and len({id(r) for r in results}) == 1
+    assert registry.get("missing") is None and registry.get("missing") is None
+    assert calls.count("missing") == 1 and "not installed" in registry.failure("missing")
+    registry.reset("missing")
+    assert registry.get("missing") is None and calls.count("missing") == 2
+
+
+def test_ocr_and_detector_instances_share_loaded_backends(loads):
+    import numpy as np
+
+    first, second = EnhancedOCR(), EnhancedOCR()
+    assert first.paddle_ocr is second.paddle_ocr and loads["paddle"] == 1
+    assert first.extract_text(np.full((20, 40, 3), 255, np.uint8), use_cache=False).text == "AHU-1"
+
+    assert get_ocr_engine(OCREngine.TESSERACT).preferred_engine == OCREngine.TESSERACT
+    assert get_ocr_engine(OCREngine.PADDLE) is get_ocr_engine(OCREngine.PADDLE)
+    assert get_table_detector(0.7).confidence_threshold == 0.7
+    assert get_table_detector(0.5) is get_table_detector(0.5)
+
+    strict, loose = TableDetector(0.9), TableDetector(0.3)
+    assert strict._init_model() and loose._init_model()
+    assert strict.model is loose.model and strict._model_lock is loose._model_lock
+    assert loads["table_transformer"] == 1
+
+
+def test_import_wizard_warms_only_the_engines_it_uses(loads, monkeypatch):
+    from PySide6.QtWidgets import QApplication
+    from ui.dialogs.mechanical_schedule_import_wizard import MechanicalScheduleImportWizard
+
+    app = QApplication.instance() or QApplication([])
+    monkeypatch.delenv("ACOUSTIC_OCR_WARMUP", raising=False)
+    for _ in range(2):
+        wizard = MechanicalScheduleImportWizard()
+        if wizard.warm_up_thread is not None:
+            wizard.warm_up_thread.join(5)
+        wizard.deleteLater()
+    app.processEvents()
+
+    assert loads == {"paddle": 0, "table_transformer": 0, "tesseract": 1}
+    assert not engine_registry.is_loaded("table_transformer")
+
+    monkeypatch.setenv("ACOUSTIC_OCR_WARMUP", "0")
+    assert MechanicalScheduleImportWizard().warm_up_thread is None
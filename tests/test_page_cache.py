@@ -0,0 +1,119 @@
+"""Tests for per-page element loading and the prefetching page cache."""
+
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from PySide6.QtWidgets import QApplication
+
+from drawing.page_cache import DrawingPageCache
+from models import initialize_database, close_database, get_session, Project, Drawing, DrawingElementManager
+from models.hvac import HVACPath
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    app = QApplication.instance() or QApplication([])
+    yield app
+
+
+@pytest.fixture
+def drawing(tmp_path):
+    close_database()
+    initialize_database(str(tmp_path / 'test_page_cache.db'))
+    session = get_session()
+    project = Project(name="Pages")
+    session.add(project)
+    session.flush()
+    drawing = Drawing(project_id=project.id, name="M-101", file_path="m101.pdf")
+    session.add(drawing)
+    session.flush()
+    path = HVACPath(project_id=project.id, name="Supply 1")
+    session.add(path)
+    session.commit()
+    ids = (drawing.id, project.id, path.id)
+    session.close()
+    yield ids
+    close_database()
+
+
+def _component(k):
+    return {'type': 'component', 'component_type': 'vav', 'x': 10 * k, 'y': 20, 'saved_zoom': 1.0}
+
+
+def _segment(k):
+    return {'type': 'segment', 'start_x': 10 * k, 'start_y': 20, 'end_x': 10 * k + 10, 'end_y': 20,
+            'length_real': 10.0}
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_load_page_separates_path_linked_elements(drawing):
+    drawing_id, project_id, path_id = drawing
+    manager = DrawingElementManager(get_session)
+    rect = {'type': 'rectangle', 'x': 5, 'y': 5, 'width': 50, 'height': 40}
+    manager.save_elements(drawing_id, project_id, {'components': [_component(1)], 'rectangles': [rect]})
+    manager.save_path_elements(drawing_id, project_id, path_id, [_component(2), _component(3)], [_segment(2)])
+
+    page = manager.load_page(drawing_id, 1)
+    assert [c['x'] for c in page['elements']['components']] == [10]
+    assert len(page['elements']['rectangles']) == 1
+    assert page['elements']['segments'] == []
+    assert sorted(page['path_elements']) == [path_id]
+    assert len(page['path_elements'][path_id]['components']) == 2
+    assert len(page['path_elements'][path_id]['segments']) == 1
+    assert page['elements'] == manager.load_elements(drawing_id, 1)
+
+
+def test_cache_reloads_only_when_the_page_changes(qapp, drawing):
+    drawing_id, project_id, path_id = drawing
+    manager = DrawingElementManager(get_session)
+    manager.save_elements(drawing_id, project_id, {'components': [_component(1)]})
+    cache = DrawingPageCache(manager, drawing_id)
+    try:
+        first = cache.get(1)
+        first['elements']['components'][0]['x'] = 999
+        assert cache.get(1)['elements']['components'][0]['x'] == 10
+        assert (cache.misses, cache.hits) == (1, 1)
+
+        # Any write to the page changes its signature
+        manager.save_elements(drawing_id, project_id, {'components': [_component(1), _component(2)]})
+        assert len(cache.get(1)['elements']['components']) == 2
+        manager.save_path_elements(drawing_id, project_id, path_id, [_component(5)], [])
+        assert len(cache.get_path_elements(1, path_id)['components']) == 1
+        assert cache.get_path_elements(1, path_id + 1) == {'components': [], 'segments': []}
+        assert cache.misses == 3
+    finally:
+        cache.shutdown()
+
+
+def test_prefetch_loads_neighbouring_pages_in_background(qapp, drawing):
+    drawing_id, project_id, path_id = drawing
+    manager = DrawingElementManager(get_session)
+    for page in range(1, 7):
+        manager.save_elements(drawing_id, project_id, {'components': [_component(page)]}, page_number=page)
+    cache = DrawingPageCache(manager, drawing_id, max_pages=4)
+    loaded = []
+    cache.page_loaded.connect(loaded.append)
+    try:
+        cache.get(3)
+        cache.prefetch_around(3, 6)
+        _wait_for(lambda: len(cache.cached_pages()) == 4)
+        # Nearest pages first, lower page on ties, up to the cache size
+        assert sorted(cache.cached_pages()) == [1, 2, 3, 4]
+
+        _wait_for(lambda: (qapp.processEvents(), len(loaded) == 3)[1])
+        assert loaded == [2, 4, 1]
+        assert cache.get(4)['elements']['components'][0]['x'] == 40
+        assert cache.misses == 1
+    finally:
+        cache.shutdown()
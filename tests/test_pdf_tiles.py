@@ -0,0 +1,252 @@
+"""Tests for tiled PDF page rendering and the tile cache."""
+
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+fitz = pytest.importorskip("fitz")
+QtWidgets = pytest.importorskip("PySide6.QtWidgets")
+
+from drawing.page_tiles import (TILE_SIZE, TileKey, TileCache, PageRenderSource, TileRenderService,
+                                zoom_bucket, page_pixel_size, tile_grid, tiles_in_rect)
+
+
+# 42" x 30" mechanical sheet in PDF points
+SHEET_WIDTH = 42 * 72
+SHEET_HEIGHT = 30 * 72
+
+
+@pytest.fixture(autouse=True)
+def isolated_preview_cache(tmp_path, monkeypatch):
+    """Keep page previews written by the viewer out of the user's data directory."""
+    from drawing import preview_cache
+    monkeypatch.setattr(preview_cache, "_preview_cache",
+                        preview_cache.PreviewCache(str(tmp_path / "preview_cache")))
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    app = QtWidgets.QApplication.instance()
+    return app or QtWidgets.QApplication([])
+
+
+@pytest.fixture
+def large_sheet_pdf(tmp_path):
+    """A large sheet with a dense grid of duct-like lines."""
+    doc = fitz.open()
+    page = doc.new_page(width=SHEET_WIDTH, height=SHEET_HEIGHT)
+    for i in range(0, SHEET_WIDTH, 24):
+        page.draw_line((i, 0), (i, SHEET_HEIGHT), color=(0, 0, 0), width=0.5)
+    for j in range(0, SHEET_HEIGHT, 24):
+        page.draw_line((0, j), (SHEET_WIDTH, j), color=(0, 0, 0), width=0.5)
+    page.insert_text((100, 100), "AHU-1 SUPPLY", fontsize=24)
+    path = str(tmp_path / "sheet.pdf")
+    doc.save(path)
+    doc.close()
+    return path
+
+
+class _Image:
+    def __init__(self, width, height):
+        self._w, self._h = width, height
+
+    def width(self):
+        return self._w
+
+    def height(self):
+        return self._h
+
+
+def _wait_for_tiles(qapp, canvas, timeout=10):
+    deadline = time.time() + timeout
+    qapp.processEvents()
+    while time.time() < deadline:
+        qapp.processEvents()
+        if not canvas._request_timer.isActive() and canvas.render_service.pending_count() == 0:
+            time.sleep(0.01)
+            qapp.processEvents()
+            if canvas.render_service.pending_count() == 0:
+                return
+        time.sleep(0.005)
+
+
+def test_zoom_bucket_shares_nearby_zooms():
+    assert zoom_bucket(1.0) == 1.0
+    assert zoom_bucket(1.01) == 1.25
+    assert zoom_bucket(1.2) == 1.25
+    assert zoom_bucket(0.1) == 0.25
+    assert zoom_bucket(3.0) == 3.0
+
+
+def test_tiles_in_rect_covers_viewport_only():
+    page_rect = fitz.Rect(0, 0, SHEET_WIDTH, SHEET_HEIGHT)
+    cols, rows = tile_grid(page_rect, 3.0)
+    visible = tiles_in_rect(0, 0, 1280, 800, page_rect, 3.0)
+    assert len(visible) == 3 * 2
+    assert len(visible) < cols * rows / 20
+
+
+def test_tile_cache_is_bounded_by_memory():
+    cost = TILE_SIZE * TILE_SIZE * 4
+    cache = TileCache(max_bytes=cost * 3)
+    for col in range(5):
+        cache.put(TileKey(0, 1.0, col, 0), _Image(TILE_SIZE, TILE_SIZE))
+    assert len(cache) == 3
+    assert cache.total_bytes <= cache.max_bytes
+    assert TileKey(0, 1.0, 0, 0) not in cache
+    assert TileKey(0, 1.0, 4, 0) in cache
+    assert cache.evictions == 2
+
+
+def test_tile_cache_lru_order():
+    cost = TILE_SIZE * TILE_SIZE * 4
+    cache = TileCache(max_bytes=cost * 2)
+    first, second, third = (TileKey(0, 1.0, c, 0) for c in range(3))
+    cache.put(first, _Image(TILE_SIZE, TILE_SIZE))
+    cache.put(second, _Image(TILE_SIZE, TILE_SIZE))
+    assert cache.get(first) is not None
+    cache.put(third, _Image(TILE_SIZE, TILE_SIZE))
+    assert first in cache and third in cache and second not in cache
+
+
+def test_placeholder_tiles_come_from_other_buckets():
+    page_rect = fitz.Rect(0, 0, SHEET_WIDTH, SHEET_HEIGHT)
+    cache = TileCache()
+    cache.put(TileKey(0, 1.0, 0, 0), _Image(TILE_SIZE, TILE_SIZE))
+    cache.put(TileKey(0, 0.5, 0, 0), _Image(TILE_SIZE, TILE_SIZE))
+    placeholders = [key for key, _ in cache.placeholder_tiles(0, 2.0, 0, 0, 512, 512, page_rect)]
+    # Coarsest first, closest to the requested bucket last
+    assert placeholders == [TileKey(0, 0.5, 0, 0), TileKey(0, 1.0, 0, 0)]
+
+
+def test_rendered_tile_matches_page_pixmap(qapp, large_sheet_pdf):
+    doc = fitz.open(large_sheet_pdf)
+    try:
+        source = PageRenderSource(doc)
+        tile = source.render_tile(TileKey(0, 1.0, 1, 1))
+        assert (tile.width(), tile.height()) == (TILE_SIZE, TILE_SIZE)
+
+        full = doc[0].get_pixmap(matrix=fitz.Matrix(1.0, 1.0), alpha=False)
+        for x, y in [(0, 0), (100, 37), (511, 511)]:
+            expected = full.pixel(TILE_SIZE + x, TILE_SIZE + y)
+            color = tile.pixelColor(x, y)
+            assert (color.red(), color.green(), color.blue()) == tuple(expected)
+
+        # Edge tiles are clipped to the page
+        cols, rows = tile_grid(doc[0].rect, 1.0)
+        width, height = page_pixel_size(doc[0].rect, 1.0)
+        edge = source.render_tile(TileKey(0, 1.0, cols - 1, rows - 1))
+        assert edge.width() == width - (cols - 1) * TILE_SIZE
+        assert edge.height() == height - (rows - 1) * TILE_SIZE
+    finally:
+        doc.close()
+
+
+def test_viewer_renders_only_visible_tiles_at_high_zoom(qapp, large_sheet_pdf):
+    from drawing.pdf_viewer import PDFViewer
+
+    viewer = PDFViewer()
+    viewer.resize(1200, 900)
+    viewer.show()
+    try:
+        assert viewer.load_pdf(large_sheet_pdf)
+        start = time.perf_counter()
+        viewer.set_zoom(3.0)
+        zoom_time = time.perf_counter() - start
+
+        canvas = viewer.pdf_label
+        size = viewer.get_page_pixel_size()
+        assert (size.width(), size.height()) == page_pixel_size(fitz.Rect(0, 0, SHEET_WIDTH, SHEET_HEIGHT), 3.0)
+
+        _wait_for_tiles(qapp, canvas)
+
+        cols, rows = tile_grid(fitz.Rect(0, 0, SHEET_WIDTH, SHEET_HEIGHT), 3.0)
+        rendered = [k for k in canvas.tile_cache._tiles if k.bucket == 3.0]
+        print(f"\nZoom to 300%: {zoom_time*1000:.1f}ms, {len(rendered)} of {cols*rows} tiles rendered")
+        assert 0 < len(rendered) < cols * rows / 10
+        assert zoom_time < 1.0
+    finally:
+        viewer.close_pdf()
+        viewer.close()
+
+
+def test_render_service_drops_stale_requests(qapp, large_sheet_pdf):
+    """A new request replaces queued work, so only the latest tiles (plus in-flight ones) render"""
+    service = TileRenderService(large_sheet_pdf, thread_count=1)
+    delivered = []
+    service.tile_ready.connect(lambda key, image: delivered.append(key))
+    try:
+        stale = [TileKey(0, 3.0, col, row) for row in range(6) for col in range(8)]
+        latest = [TileKey(0, 1.0, 0, 0), TileKey(0, 1.0, 1, 0)]
+        service.request(stale)
+        service.request(latest)
+
+        deadline = time.time() + 10
+        while not set(latest) <= set(delivered) and time.time() < deadline:
+            qapp.processEvents()
+            time.sleep(0.005)
+
+        assert set(latest) <= set(delivered)
+        stale_rendered = [k for k in delivered if k.bucket == 3.0]
+        assert len(stale_rendered) <= 1
+    finally:
+        service.shutdown()
+
+
+def test_slider_drag_renders_only_final_zoom(qapp, large_sheet_pdf):
+    """Dragging the zoom slider must not queue a rasterization per intermediate value"""
+    from drawing.pdf_viewer import PDFViewer
+
+    viewer = PDFViewer()
+    viewer.resize(1200, 900)
+    viewer.show()
+    try:
+        assert viewer.load_pdf(large_sheet_pdf)
+        canvas = viewer.pdf_label
+        _wait_for_tiles(qapp, canvas)
+        before = canvas.render_service.rendered_count
+
+        start = time.perf_counter()
+        for value in range(100, 301, 5):
+            viewer.zoom_slider.setValue(value)
+            qapp.processEvents()
+        drag_time = time.perf_counter() - start
+        _wait_for_tiles(qapp, canvas)
+
+        rendered = canvas.render_service.rendered_count - before
+        print(f"\nSlider drag over 41 values: {drag_time*1000:.1f}ms on GUI thread, {rendered} tiles rendered")
+        assert viewer.zoom_factor == 3.0
+        assert any(k.bucket == 3.0 for k in canvas.tile_cache._tiles)
+        # Far fewer than one viewport of tiles for each of the 41 intermediate zoom values
+        assert rendered < 41 * 6
+    finally:
+        viewer.close_pdf()
+        viewer.close()
+
+
+def test_pixmap_to_qimage_shares_pixmap_buffer(qapp):
+    """The QImage views the fitz samples in place instead of round-tripping through PPM"""
+    from drawing.page_tiles import pixmap_to_qimage
+
+    doc = fitz.open()
+    page = doc.new_page(width=200, height=100)
+    page.draw_rect((10, 10, 50, 50), color=(1, 0, 0), fill=(1, 0, 0))
+
+    pix = page.get_pixmap(alpha=False)
+    image = pixmap_to_qimage(pix)
+    assert (image.width(), image.height(), image.bytesPerLine()) == (pix.width, pix.height, pix.stride)
+    assert image.pixelColor(20, 20).getRgb()[:3] == (255, 0, 0)
+    pix.set_pixel(1, 1, (0, 255, 0))
+    assert image.pixelColor(1, 1).getRgb()[:3] == (0, 255, 0)
+
+    gray = pixmap_to_qimage(page.get_pixmap(colorspace=fitz.csGRAY, alpha=False))
+    assert gray.format() == gray.Format.Format_Grayscale8
+    assert gray.sizeInBytes() < image.sizeInBytes()
+
+    rgba = pixmap_to_qimage(page.get_pixmap(alpha=True))
+    assert rgba.hasAlphaChannel()
+    doc.close()
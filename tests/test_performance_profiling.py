@@ -473,11 +473,9 @@ class TestDatabasePerformanceBenchmarks:
     @pytest.fixture
     def temp_database(self, tmp_path):
         """Create temporary database for testing"""
-        import os
-        os.environ['DATABASE_PATH'] = str(tmp_path / 'test_perf.db')
-
         from models import initialize_database, get_session, Project, Space, close_database
-        initialize_database()
+        close_database()
+        initialize_database(str(tmp_path / 'test_perf.db'))
 
         yield get_session, Project, Space
 
@@ -538,6 +536,184 @@ class TestDatabasePerformanceBenchmarks:
         assert result.avg_time < 0.010, f"Project query too slow: {result.avg_time*1000:.2f}ms"
 
 
+class TestSQLitePerformanceProfileBenchmarks:
+    """Benchmarks validating the SQLite connection performance profiles"""
+
+    def _open(self, db_path, profile):
+        from models import initialize_database, get_session, close_database
+        close_database()
+        initialize_database(db_path, performance_profile=profile)
+        return get_session
+
+    def _commit_benchmark(self, get_session):
+        from models import Project
+
+        def run_commit():
+            session = get_session()
+            session.add(Project(name="Profile benchmark", default_units="feet"))
+            session.commit()
+            session.close()
+
+        return benchmark(run_commit, iterations=100)
+
+    def test_performance_profile_pragmas_applied(self, tmp_path):
+        """The performance profile must switch the database to WAL with tuned caches"""
+        from sqlalchemy import text
+        import models.database as db_module
+        from models.sqlite_performance import PERFORMANCE_PROFILE
+
+        self._open(str(tmp_path / 'wal.db'), PERFORMANCE_PROFILE)
+        try:
+            with db_module.engine.connect() as conn:
+                assert conn.execute(text("PRAGMA journal_mode")).scalar() == 'wal'
+                assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+                assert conn.execute(text("PRAGMA cache_size")).scalar() == -PERFORMANCE_PROFILE.cache_size_kb
+                assert conn.execute(text("PRAGMA temp_store")).scalar() == 2  # MEMORY
+                assert conn.execute(text("PRAGMA foreign_keys")).scalar() == 1
+        finally:
+            db_module.close_database()
+
+    def test_benchmark_commit_throughput_by_profile(self, tmp_path):
+        """Small-transaction commits should be faster with the performance profile"""
+        from models import close_database
+        from models.sqlite_performance import PERFORMANCE_PROFILE, COMPATIBILITY_PROFILE
+
+        try:
+            get_session = self._open(str(tmp_path / 'compat.db'), COMPATIBILITY_PROFILE)
+            compat = self._commit_benchmark(get_session)
+            get_session = self._open(str(tmp_path / 'perf.db'), PERFORMANCE_PROFILE)
+            perf = self._commit_benchmark(get_session)
+        finally:
+            close_database()
+
+        print(f"\nCompatibility profile:\n{compat}\nPerformance profile:\n{perf}")
+
+        # Allow some noise, but WAL + synchronous=NORMAL must not be slower
+        assert perf.avg_time <= compat.avg_time * 1.25, (
+            f"Performance profile commit {perf.avg_time*1000:.2f}ms vs "
+            f"compatibility {compat.avg_time*1000:.2f}ms"
+        )
+
+    def test_profile_selected_from_settings_manager(self, tmp_path):
+        """initialize_database picks up the profile and overrides from SettingsManager"""
+        QtCore = pytest.importorskip("PySide6.QtCore")
+        import models.database as db_module
+        from utils.settings_manager import SettingsManager
+
+        settings_manager = SettingsManager()
+        settings_manager.settings = QtCore.QSettings(str(tmp_path / 'settings.ini'), QtCore.QSettings.IniFormat)
+        settings_manager.set_database_performance_profile('compatibility')
+        settings_manager.set_database_performance_override('cache_size_kb', 8192)
+
+        import utils.settings_manager as settings_module
+        original = settings_module._settings_manager
+        settings_module._settings_manager = settings_manager
+        try:
+            profile = db_module._load_performance_profile()
+        finally:
+            settings_module._settings_manager = original
+
+        assert profile.name == 'compatibility'
+        assert profile.journal_mode == 'DELETE'
+        assert profile.cache_size_kb == 8192
+
+
+class TestConnectionPoolBenchmarks:
+    """Benchmarks for the reader/writer connection pools"""
+
+    @pytest.fixture
+    def pooled_database(self, tmp_path):
+        from models import initialize_database, close_database
+        close_database()
+        initialize_database(str(tmp_path / 'pool.db'))
+        yield
+        close_database()
+
+    def test_concurrent_writers_are_serialized(self, pooled_database):
+        """Writes from several threads queue on the writer instead of failing with 'database is locked'"""
+        import threading
+        from models import Project, write_session, read_session, get_pool_stats
+
+        errors = []
+
+        def writer(worker_id):
+            try:
+                for i in range(25):
+                    with write_session() as session:
+                        session.add(Project(name=f"Pool {worker_id}-{i}", default_units="feet"))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - start
+
+        assert errors == []
+        with read_session() as session:
+            assert session.query(Project).count() == 100
+
+        stats = get_pool_stats()
+        print(f"\n100 commits from 4 threads: {elapsed*1000:.1f}ms; writer stats: {stats['writer']}")
+        assert stats['writer']['peak_checked_out'] == 1
+        assert stats['writer']['connections_created'] == 1
+
+    def test_reads_proceed_during_open_write_transaction(self, pooled_database):
+        """Readers on the WAL reader pool are not blocked by an uncommitted write"""
+        import threading
+        from models import Project, write_session, read_session
+
+        read_times = []
+
+        def reader():
+            start = time.perf_counter()
+            with read_session() as session:
+                session.query(Project).count()
+            read_times.append(time.perf_counter() - start)
+
+        with write_session() as session:
+            session.add(Project(name="Open transaction", default_units="feet"))
+            session.flush()  # holds the SQLite write lock until commit
+            threads = [threading.Thread(target=reader) for _ in range(4)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join(timeout=5)
+
+        assert len(read_times) == 4
+        assert max(read_times) < 1.0
+
+    def test_reader_sessions_are_read_only(self, pooled_database):
+        """The reader pool refuses writes (PRAGMA query_only)"""
+        from sqlalchemy.exc import OperationalError
+        from models import Project, read_session
+
+        with pytest.raises(OperationalError):
+            with read_session() as session:
+                session.add(Project(name="Should fail", default_units="feet"))
+                session.flush()
+
+    def test_readonly_connection_opens_paths_with_uri_characters(self, tmp_path):
+        """Raw read-only connections open the named file even when its path needs quoting"""
+        import sqlite3
+        from models.connection_pool import readonly_connection
+
+        db_dir = tmp_path / "Acoustics #2 ?rev 50%"
+        db_dir.mkdir()
+        db_path = str(db_dir / "materials.db")
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("CREATE TABLE acoustic_materials (name TEXT)")
+            conn.execute("INSERT INTO acoustic_materials VALUES ('ACT')")
+
+        with readonly_connection(db_path) as conn:
+            assert conn.execute("SELECT name FROM acoustic_materials").fetchall() == [("ACT",)]
+            with pytest.raises(sqlite3.OperationalError):
+                conn.execute("DELETE FROM acoustic_materials")
+
+
 class TestMaterialSearchPerformanceBenchmarks:
     """Performance benchmarks for material search operations"""
 
@@ -625,6 +801,65 @@ class TestExcelExportPerformanceBenchmarks:
         assert result.avg_time < 0.100, f"Excel creation too slow: {result.avg_time*1000:.2f}ms"
 
 
+class TestImportFootprint:
+    """Import-time checks for the headless calculation stack"""
+
+    def test_engine_import_does_not_load_plotting_stack(self):
+        """Importing HVACNoiseEngine must not pull in pandas/matplotlib/seaborn"""
+        import subprocess
+        src_dir = os.path.join(os.path.dirname(__file__), '..', 'src')
+        code = (
+            "import sys\n"
+            "import calculations.hvac_noise_engine\n"
+            "heavy = [m for m in ('pandas', 'matplotlib', 'seaborn') if m in sys.modules]\n"
+            "print(','.join(heavy))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, '-c', code], cwd=src_dir,
+            capture_output=True, text=True, timeout=60
+        )
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == '', f"Heavy modules imported: {result.stdout.strip()}"
+
+
+class TestStartupBudget:
+    """Cold-start budget checks using the built-in startup profiler"""
+
+    def test_api_cold_start_within_budget(self, tmp_path):
+        """AcousticAnalysisAPI cold start must stay within ACOUSTIC_STARTUP_BUDGET_S"""
+        import json
+        import subprocess
+        from utils.startup_profiler import (
+            ENV_STARTUP_PROFILE, ENV_STARTUP_PROFILE_FILE, get_cold_start_budget
+        )
+
+        report_path = tmp_path / "startup_profile.json"
+        env = dict(os.environ)
+        env[ENV_STARTUP_PROFILE] = "1"
+        env[ENV_STARTUP_PROFILE_FILE] = str(report_path)
+        repo_root = os.path.join(os.path.dirname(__file__), '..')
+        result = subprocess.run(
+            [sys.executable, '-c', "from src.api import AcousticAnalysisAPI; AcousticAnalysisAPI()"],
+            cwd=repo_root, env=env, capture_output=True, text=True, timeout=120
+        )
+        assert result.returncode == 0, result.stderr
+
+        with open(report_path) as f:
+            report = json.load(f)
+
+        budget = get_cold_start_budget()
+        print(f"\nAPI cold start: {report['total_seconds']:.3f}s (budget {budget:.1f}s, "
+              f"{report['import_count']} modules imported)")
+        for entry in report['imports'][:10]:
+            print(f"  {entry['module']}: {entry['cumulative_seconds']*1000:.1f}ms")
+
+        assert report['entry_point'] == 'api'
+        assert report['imports'], "Import timings were not recorded"
+        assert report['total_seconds'] <= budget, (
+            f"API cold start {report['total_seconds']:.3f}s exceeds budget of {budget:.1f}s"
+        )
+
+
 class TestPerformanceSummary:
     """Generate overall performance summary"""
 
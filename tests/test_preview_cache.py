@@ -0,0 +1,125 @@
+"""Tests for the persistent drawing thumbnail/preview cache."""
+
+import os
+import shutil
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+fitz = pytest.importorskip("fitz")
+QtWidgets = pytest.importorskip("PySide6.QtWidgets")
+
+from drawing import preview_cache
+from drawing.page_tiles import preview_bucket
+from drawing.preview_cache import PreviewCache, thumbnail_tag, preview_tag
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    app = QtWidgets.QApplication.instance()
+    return app or QtWidgets.QApplication([])
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = PreviewCache(str(tmp_path / "preview_cache"))
+    monkeypatch.setattr(preview_cache, "_preview_cache", cache)
+    return cache
+
+
+def _make_pdf(path, pages=2, label="M-101"):
+    doc = fitz.open()
+    for i in range(pages):
+        page = doc.new_page(width=42 * 72, height=30 * 72)
+        page.draw_rect((100, 100, 2000, 1500), color=(0, 0, 0), width=2)
+        page.insert_text((150, 200), f"{label} sheet {i + 1}", fontsize=48)
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+def test_generate_stores_thumbnails_and_previews(qapp, cache, tmp_path):
+    pdf_path = _make_pdf(tmp_path / "mech.pdf")
+
+    assert cache.generate(pdf_path) == 4
+    assert cache.generate(pdf_path) == 0
+
+    thumb = cache.load_image(pdf_path, 0, thumbnail_tag())
+    assert thumb is not None and max(thumb.width(), thumb.height()) <= 256
+    bucket = preview_bucket(fitz.Rect(0, 0, 42 * 72, 30 * 72))
+    preview = cache.load_image(pdf_path, 1, preview_tag(bucket))
+    assert preview is not None and max(preview.width(), preview.height()) <= 1024
+
+
+def test_generate_stops_when_cancelled(qapp, cache, tmp_path):
+    pdf_path = _make_pdf(tmp_path / "cancel.pdf")
+    polls = []
+
+    def cancelled():
+        polls.append(None)
+        return len(polls) > 1
+
+    assert cache.generate(pdf_path, cancelled=cancelled) == 1
+    assert cache.generate(pdf_path) == 3
+
+
+def test_entries_are_content_addressed(qapp, cache, tmp_path):
+    pdf_path = _make_pdf(tmp_path / "original.pdf")
+    cache.generate(pdf_path)
+
+    copied = str(tmp_path / "renamed copy.pdf")
+    shutil.copyfile(pdf_path, copied)
+    assert cache.file_hash(copied, compute=False) is None
+    assert cache.generate(copied) == 0
+    assert cache.has_thumbnail(copied)
+
+    # Editing the sheet invalidates its previews
+    time.sleep(0.01)
+    _make_pdf(pdf_path, label="M-101 REV A")
+    assert not cache.has_thumbnail(pdf_path)
+    assert cache.generate(pdf_path) == 4
+
+
+def test_lru_eviction_respects_size_limit(cache):
+    cache.max_bytes = 2500
+    for i in range(5):
+        cache.put("ab" * 32, i, "t256", b"x" * 1000)
+        os.utime(cache.entry_path("ab" * 32, i, "t256"), ns=(i * 10**9, i * 10**9))
+    assert cache.total_bytes() <= cache.max_bytes
+    assert not os.path.exists(cache.entry_path("ab" * 32, 0, "t256"))
+    assert os.path.exists(cache.entry_path("ab" * 32, 4, "t256"))
+
+
+def test_reopened_drawing_paints_cached_preview_without_rendering(qapp, cache, tmp_path):
+    from drawing.pdf_viewer import PDFViewer
+
+    pdf_path = _make_pdf(tmp_path / "sheet.pdf", pages=1)
+    cache.generate(pdf_path, thumbnails=False)
+
+    viewer = PDFViewer()
+    try:
+        assert viewer.load_pdf(pdf_path)
+        canvas = viewer.pdf_label
+        assert canvas._preview_key() in canvas.tile_cache
+        assert canvas.render_service.rendered_count == 0
+    finally:
+        viewer.close_pdf()
+        viewer.close()
+
+
+def test_generation_worker_reports_ready(qapp, cache, tmp_path):
+    from drawing.preview_cache import PreviewGenerationWorker
+
+    pdf_path = _make_pdf(tmp_path / "import.pdf", pages=1)
+    ready = []
+    worker = PreviewGenerationWorker([pdf_path], cache=cache)
+    worker.preview_ready.connect(ready.append)
+    worker.start()
+    assert worker.wait(10000)
+    qapp.processEvents()
+
+    assert ready == [pdf_path]
+    assert cache.has_thumbnail(pdf_path)
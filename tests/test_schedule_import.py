@@ -0,0 +1,213 @@
+"""Tests for the mechanical schedule import pipeline (PDF pages, table grids, cell OCR)."""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+fitz = pytest.importorskip("fitz")
+pytest.importorskip("cv2")
+
+from calculations import pdf_table_to_mechanical_units as importer
+from calculations.image_table_to_csv import extract_table
+
+BANDS = "63 125 250 500 1k 2k 4k 8k"
+
+
+@pytest.fixture(autouse=True)
+def ocr_cache_dir(tmp_path, monkeypatch):
+    from calculations.ocr_cache import OCR_CACHE_DIR_ENV
+    monkeypatch.setenv(OCR_CACHE_DIR_ENV, str(tmp_path / "ocr_cache"))
+
+
+def _text_page(doc, rows):
+    page = doc.new_page(width=792, height=612)
+    for i, row in enumerate(rows):
+        page.insert_text((36, 72 + 18 * i), row, fontsize=10)
+
+
+def _grid_page(doc, n_rows=4, n_cols=5):
+    page = doc.new_page(width=612, height=792)
+    for r in range(n_rows):
+        for c in range(n_cols):
+            page.draw_rect(fitz.Rect(50 + c * 100, 100 + r * 40, 150 + c * 100, 140 + r * 40),
+                           color=(0, 0, 0), width=1.5)
+
+
+def test_pages_without_text_are_ocrd_together_and_kept_in_page_order(tmp_path, monkeypatch):
+    doc = fitz.open()
+    _text_page(doc, [f"MARK NUMBER {BANDS}", "AHU 1 60 62 64 66 68 70 72 74"])
+    _grid_page(doc)
+    _text_page(doc, [f"MARK NUMBER {BANDS}", "FCU 3 40 41 42 43 44 45 46 47"])
+    pdf_path = str(tmp_path / "schedule.pdf")
+    doc.save(pdf_path)
+
+    calls = []
+
+    def fake_ocr(path, page_indexes, debug=False, max_workers=None):
+        calls.append(list(page_indexes))
+        return {pi: [["VAV", "2", "30", "31", "32"]] for pi in page_indexes}
+
+    monkeypatch.setattr(importer, "ocr_pdf_pages", fake_ocr)
+    units = importer.extract_units_from_pdf(pdf_path)
+
+    assert calls == [[1]]
+    assert [u["name"] for u in units] == ["AHU-1", "VAV-2", "FCU-3"]
+
+
+def test_extract_table_accepts_rendered_grayscale_pages(tmp_path):
+    doc = fitz.open()
+    _grid_page(doc)
+    gray = importer.render_page_gray(doc[0])
+    assert gray.ndim == 2 and gray.shape == (3300, 2550)
+
+    import cv2
+    assert extract_table(gray) == extract_table(cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR))
+
+
+def test_process_pool_matches_in_process_ocr(tmp_path):
+    doc = fitz.open()
+    _grid_page(doc, n_rows=3, n_cols=4)
+    _grid_page(doc, n_rows=5, n_cols=2)
+    pdf_path = str(tmp_path / "scanned.pdf")
+    doc.save(pdf_path)
+
+    in_process = importer.ocr_pdf_pages(pdf_path, [0, 1], max_workers=1)
+    pooled = importer.ocr_pdf_pages(pdf_path, [0, 1], max_workers=2)
+
+    assert pooled == in_process
+    assert [len(in_process[0]), len(in_process[1])] == [3, 5]
+
+
+def _fake_image_to_data(calls):
+    """Stand-in for Tesseract: one word per dark horizontal stripe, named by stripe height."""
+    import numpy as np
+
+    def image_to_data(image, config="", output_type=None):
+        calls.append(config)
+        dark = (np.asarray(image) < 128).any(axis=1)
+        data = {"text": [], "top": [], "height": []}
+        y = 0
+        while y < len(dark):
+            if dark[y]:
+                start = y
+                while y < len(dark) and dark[y]:
+                    y += 1
+                data["text"].append(f"h{y - start}")
+                data["top"].append(start)
+                data["height"].append(y - start)
+            y += 1
+        return data
+
+    return image_to_data
+
+
+def test_cells_are_ocrd_in_one_montage_and_mapped_back_to_the_grid(monkeypatch):
+    import numpy as np
+    from calculations import image_table_to_csv as table_ocr
+
+    calls = []
+    monkeypatch.setattr(table_ocr.pytesseract, "image_to_data", _fake_image_to_data(calls))
+
+    # 30 x 20 cells; cell k holds (k % 3) + 1 bars of distinct thickness, some cells are blank
+    cells, expected = [], []
+    for k in range(600):
+        cell = np.full((60, 120), 255, dtype=np.uint8)
+        bars = [] if k % 7 == 0 else [(8 + 16 * b, 2 + b) for b in range(k % 3 + 1)]
+        for top, thickness in bars:
+            cell[top:top + thickness, 10:110] = 0
+        cells.append(cell)
+        # Upscaled 2x before OCR
+        expected.append(" ".join(f"h{2 * thickness}" for _, thickness in bars))
+
+    texts = table_ocr.ocr_cells_to_text(cells, psm=7, max_workers=2)
+
+    assert texts == expected
+    # 600 cells fit in about a dozen montages instead of 600 Tesseract launches
+    assert len(calls) == len(table_ocr._build_montages(cells)) < 20
+    assert all("--psm 6" in c for c in calls)
+
+
+def _cell_table_page(doc):
+    """Schedule whose every cell is its own text block, as CAD exports write them; FCU-3 has no 2k value."""
+    page = doc.new_page(width=792, height=612)
+    page.insert_text((36, 50), "EQUIPMENT SOUND POWER SCHEDULE", fontsize=12)
+    rows = [["MARK", "NUMBER"] + BANDS.split(),
+            ["AHU", "1", "60", "62", "64", "66", "68", "70", "72", "74"],
+            ["FCU", "3", "40", "41", "42", "43", "44", "", "46", "47"]]
+    columns = [36, 90] + [150 + 40 * b for b in range(8)]
+    for r, row in enumerate(rows):
+        for x, text in zip(columns, row):
+            if text:
+                page.insert_text((x, 90 + 18 * r), text, fontsize=9)
+    return page
+
+
+def _no_raster(*args, **kwargs):
+    raise AssertionError("vector text must not be rasterized")
+
+
+def test_vector_schedule_cells_are_aligned_to_columns_without_ocr(tmp_path, monkeypatch):
+    doc = fitz.open()
+    _cell_table_page(doc)
+    pdf_path = str(tmp_path / "vector.pdf")
+    doc.save(pdf_path)
+
+    monkeypatch.setattr(importer, "ocr_pdf_regions", _no_raster)
+    monkeypatch.setattr(importer, "ocr_pdf_pages", _no_raster)
+    monkeypatch.setattr(importer, "_plumber_units_by_page", _no_raster)
+    units = importer.extract_units_from_pdf(pdf_path)
+
+    import json
+    assert [u["name"] for u in units] == ["AHU-1", "FCU-3"]
+    fcu = json.loads(units[1]["outlet_levels_json"])
+    assert (fcu["1000"], fcu["2000"], fcu["4000"]) == ("44", "", "46")
+
+
+def test_only_images_without_vector_text_are_ocrd(tmp_path, monkeypatch):
+    scan = fitz.open()
+    _grid_page(scan, n_rows=2, n_cols=3)
+    png = scan[0].get_pixmap(dpi=72).tobytes("png")
+
+    doc = fitz.open()
+    page = _cell_table_page(doc)
+    page.insert_image(fitz.Rect(36, 300, 336, 500), stream=png, keep_proportion=False)
+    # A backdrop under vector text is not a scan
+    page.insert_image(fitz.Rect(450, 300, 750, 500), stream=png, keep_proportion=False)
+    page.insert_text((480, 400), "NOTES: ALL LEVELS IN dB re 1pW", fontsize=9)
+    pdf_path = str(tmp_path / "mixed.pdf")
+    doc.save(pdf_path)
+
+    calls = []
+
+    def fake_regions(path, regions, debug=False, max_workers=None):
+        regions = list(regions)
+        calls.append(regions)
+        return {region: [["VAV", "2", "30", "31", "32"]] for region in regions}
+
+    monkeypatch.setattr(importer, "ocr_pdf_regions", fake_regions)
+    monkeypatch.setattr(importer, "ocr_pdf_pages", _no_raster)
+    units = importer.extract_units_from_pdf(pdf_path)
+
+    assert calls == [[(0, (36.0, 300.0, 336.0, 500.0))]]
+    assert [u["name"] for u in units] == ["AHU-1", "FCU-3", "VAV-2"]
+
+
+def test_region_rows_read_vector_text_before_ocr(monkeypatch):
+    doc = fitz.open()
+    page = _cell_table_page(doc)
+    ocr_clips = []
+
+    def fake_ocr(page, clip=None, enhanced=False):
+        ocr_clips.append(clip)
+        return [["55"]]
+
+    monkeypatch.setattr(importer, "ocr_page_rows", fake_ocr)
+    # The data rows from NUMBER on
+    rows = importer.page_region_rows(page, clip=fitz.Rect(80, 96, 480, 130))
+    assert rows == [["1", "60", "62", "64", "66", "68", "70", "72", "74"],
+                    ["3", "40", "41", "42", "43", "44", "", "46", "47"]]
+    assert importer.page_region_rows(page, clip=fitz.Rect(36, 300, 336, 500)) == [["55"]]
+    assert ocr_clips == [fitz.Rect(36, 300, 336, 500)]
@@ -0,0 +1,92 @@
+"""Verify schema_migrations tracking lets migrated databases skip migrations."""
+
+import os
+import sqlite3
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import models.database as db_module
+from models import schema_migrations
+from models.schema_migrations import SCHEMA_MIGRATIONS, BASE_SCHEMA_ID, SchemaMigration
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Path for a fresh project database; closes the global engine afterwards."""
+    db_module.close_database()
+    yield str(tmp_path / "project.db")
+    db_module.close_database()
+
+
+def _applied_rows(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return dict(conn.execute("SELECT migration_id, version FROM schema_migrations").fetchall())
+    finally:
+        conn.close()
+
+
+def _count_calls(monkeypatch):
+    """Replace every registered migration function with a call counter."""
+    calls = []
+    for migration in SCHEMA_MIGRATIONS:
+        module = __import__(f"models.{migration.module}", fromlist=[migration.function])
+        monkeypatch.setattr(module, migration.function,
+                            lambda *args, _id=migration.migration_id: calls.append(_id))
+    return calls
+
+
+def test_fresh_database_records_all_migrations(db_path):
+    db_module.initialize_database(db_path)
+
+    rows = _applied_rows(db_path)
+    assert BASE_SCHEMA_ID in rows
+    for migration in SCHEMA_MIGRATIONS:
+        assert rows[migration.migration_id] == migration.version
+
+
+def test_migrated_database_skips_migrations(monkeypatch, db_path):
+    db_module.initialize_database(db_path)
+    db_module.close_database()
+
+    calls = _count_calls(monkeypatch)
+    create_all_calls = []
+    monkeypatch.setattr(db_module.Base.metadata, "create_all",
+                        lambda *args, **kwargs: create_all_calls.append(1))
+
+    db_module.initialize_database(db_path)
+
+    assert calls == []
+    assert create_all_calls == []
+
+
+def test_version_bump_reruns_only_that_migration(monkeypatch, db_path):
+    db_module.initialize_database(db_path)
+    db_module.close_database()
+
+    bumped = [
+        SchemaMigration(m.migration_id, m.version + 1, m.name, m.module, m.function, m.needs_session)
+        if m.migration_id == "space_polygon_schema" else m
+        for m in SCHEMA_MIGRATIONS
+    ]
+    monkeypatch.setattr(schema_migrations, "SCHEMA_MIGRATIONS", bumped)
+    calls = _count_calls(monkeypatch)
+
+    db_module.initialize_database(db_path)
+
+    assert calls == ["space_polygon_schema"]
+    assert _applied_rows(db_path)["space_polygon_schema"] == 2
+
+
+def test_failed_migration_is_not_recorded(monkeypatch, db_path):
+    import models.migrate_space_polygon_schema as polygon_migration
+    monkeypatch.setattr(polygon_migration, "ensure_space_polygon_schema", lambda: False)
+
+    db_module.initialize_database(db_path)
+
+    rows = _applied_rows(db_path)
+    assert "space_polygon_schema" not in rows
+    assert "hvac_schema" in rows
@@ -0,0 +1,334 @@
+"""Tests for the grid spatial index used by DrawingOverlay hit-testing."""
+
+import os
+import random
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+QtWidgets = pytest.importorskip("PySide6.QtWidgets")
+from PySide6.QtCore import QPoint, QRect
+
+from drawing.spatial_index import GridIndex, component_bounds, segment_bounds
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    app = QtWidgets.QApplication.instance()
+    return app or QtWidgets.QApplication([])
+
+
+def _dense_elements(count, seed=7):
+    rng = random.Random(seed)
+    components, segments = [], []
+    for i in range(count):
+        x, y = rng.randint(0, 6000), rng.randint(0, 4000)
+        components.append({'type': 'component', 'id': i, 'x': x, 'y': y, 'component_type': 'ahu'})
+        segments.append({'type': 'segment', 'id': i, 'start_x': x, 'start_y': y,
+                         'end_x': x + rng.randint(-300, 300), 'end_y': y + rng.randint(-300, 300)})
+    return components, segments
+
+
+def _linear_component_hit(components, point):
+    for comp in components:
+        if abs(point.x() - comp['x']) <= 16 and abs(point.y() - comp['y']) <= 16:
+            return comp
+    return None
+
+
+def _linear_segment_hit(segments, point):
+    for seg in segments:
+        sx, sy, ex, ey = seg['start_x'], seg['start_y'], seg['end_x'], seg['end_y']
+        if abs(point.x() - sx) <= 8 and abs(point.y() - sy) <= 8:
+            return {'segment': seg, 'endpoint': 'start'}
+        if abs(point.x() - ex) <= 8 and abs(point.y() - ey) <= 8:
+            return {'segment': seg, 'endpoint': 'end'}
+        if min(sx, ex) - 8 <= point.x() <= max(sx, ex) + 8 and min(sy, ey) - 8 <= point.y() <= max(sy, ey) + 8:
+            return {'segment': seg, 'endpoint': None}
+    return None
+
+
+def test_query_returns_candidates_in_insertion_order():
+    index = GridIndex(component_bounds)
+    a, b, c = {'x': 100, 'y': 100}, {'x': 105, 'y': 95}, {'x': 900, 'y': 900}
+    index.rebuild([a, b, c])
+    assert index.query_point(102, 98, 16) == [a, b]
+    assert index.query_rect(0, 0, 1000, 1000) == [a, b, c]
+    assert index.query_point(500, 500, 16) == []
+
+
+def test_update_and_remove_move_elements_between_cells():
+    index = GridIndex(component_bounds)
+    comp = {'x': 10, 'y': 10}
+    index.rebuild([comp])
+    comp['x'], comp['y'] = 2000, 1500
+    index.update(comp)
+    assert index.query_point(10, 10, 16) == []
+    assert index.query_point(2000, 1500, 16) == [comp]
+    index.remove(comp)
+    assert len(index) == 0 and index.query_point(2000, 1500, 16) == []
+
+
+def test_long_segments_are_found_anywhere_along_their_bounds():
+    index = GridIndex(segment_bounds)
+    seg = {'start_x': 0, 'start_y': 0, 'end_x': 5000, 'end_y': 4000}
+    index.rebuild([seg])
+    assert index.query_point(2500, 2000, 8) == [seg]
+    assert index.query_point(6000, 2000, 8) == []
+
+
+def test_staleness_detects_direct_list_edits():
+    index = GridIndex(component_bounds)
+    elements = [{'x': 1, 'y': 1}]
+    index.rebuild(elements)
+    assert not index.is_stale(elements)
+    elements.append({'x': 2, 'y': 2})
+    assert index.is_stale(elements)
+    index.insert_appended(elements)
+    assert not index.is_stale(elements)
+    assert index.query_point(2, 2) == [elements[1]]
+    assert index.is_stale(list(elements))
+
+
+def test_overlay_hit_tests_match_linear_scan(qapp):
+    from drawing.drawing_overlay import DrawingOverlay
+
+    overlay = DrawingOverlay()
+    components, segments = _dense_elements(3000)
+    overlay.components = components
+    overlay.segments = segments
+
+    rng = random.Random(11)
+    points = [QPoint(rng.randint(0, 6000), rng.randint(0, 4000)) for _ in range(300)]
+    points += [QPoint(c['x'] + 5, c['y'] - 5) for c in components[:100]]
+    for point in points:
+        assert overlay._hit_test_component(point) is _linear_component_hit(components, point)
+        expected = _linear_segment_hit(segments, point)
+        hit = overlay._hit_test_segment(point)
+        if expected is None:
+            assert hit is None
+        else:
+            assert hit['segment'] is expected['segment'] and hit['endpoint'] == expected['endpoint']
+
+    start = time.perf_counter()
+    for point in points:
+        overlay._handle_hover_detection(point)
+    indexed = time.perf_counter() - start
+    start = time.perf_counter()
+    for point in points:
+        _linear_component_hit(components, point) or _linear_segment_hit(segments, point)
+    linear = time.perf_counter() - start
+    print(f"\nHover over {len(points)} points, 3000 components + 3000 segments: "
+          f"indexed {indexed*1000:.1f}ms, linear {linear*1000:.1f}ms")
+
+
+def test_overlay_index_follows_drag_zoom_and_rubber_band(qapp):
+    from drawing.drawing_overlay import DrawingOverlay
+
+    overlay = DrawingOverlay()
+    comp = {'type': 'component', 'x': 100, 'y': 100, 'component_type': 'ahu'}
+    other = {'type': 'component', 'x': 400, 'y': 300, 'component_type': 'vav'}
+    overlay.components = [comp, other]
+    assert overlay._hit_test_component(QPoint(100, 100)) is comp
+
+    # Drag the first component
+    overlay._handle_select_press(QPoint(100, 100))
+    overlay._handle_select_move(QPoint(250, 180))
+    overlay._handle_select_release(QPoint(250, 180))
+    assert overlay._hit_test_component(QPoint(100, 100)) is None
+    assert overlay._hit_test_component(QPoint(250, 180)) is comp
+
+    # Zooming re-projects coordinates and re-indexes them
+    overlay.set_zoom_factor(2.0)
+    assert overlay._hit_test_component(QPoint(500, 360)) is comp
+    assert overlay._hit_test_component(QPoint(800, 600)) is other
+    assert overlay._hit_test_component(QPoint(250, 180)) is None
+
+    # Rubber-band selection only picks elements inside the band
+    overlay._selected_components = []
+    overlay._selection_rect = QRect(QPoint(450, 300), QPoint(600, 400))
+    overlay._handle_select_release(QPoint(600, 400))
+    assert overlay._selected_components == [comp]
+
+
+def _linear_component_in_paths(comp, registered):
+    """The pre-index visible-path check: DB ID, element ID, then type + base coordinates."""
+    comp_db_id = comp.get('db_component_id')
+    for reg in registered:
+        if comp_db_id and reg.get('db_component_id') == comp_db_id:
+            return True
+        if comp.get('_element_id') and reg.get('_element_id') == comp.get('_element_id'):
+            return True
+        if comp.get('component_type') == reg.get('component_type'):
+            z1, z2 = comp.get('saved_zoom') or 1.0, reg.get('saved_zoom') or 1.0
+            if abs(comp['x'] / z1 - reg['x'] / z2) < 5 and abs(comp['y'] / z1 - reg['y'] / z2) < 5:
+                return True
+    return False
+
+
+def test_path_membership_matches_pairwise_comparison():
+    from drawing.spatial_index import PathMembershipIndex
+
+    rng = random.Random(3)
+    registered = [{'component_type': rng.choice(['fan', 'elbow']), 'x': rng.randint(0, 2000),
+                   'y': rng.randint(0, 2000), 'saved_zoom': rng.choice([1.0, 1.5, 2.0])}
+                  for _ in range(400)]
+    registered[0]['db_component_id'] = 77
+    registered[1]['_element_id'] = 'elem_9'
+    membership = PathMembershipIndex(components=registered)
+
+    probes = [{'component_type': rng.choice(['fan', 'elbow']), 'x': rng.randint(0, 2000),
+               'y': rng.randint(0, 2000), 'saved_zoom': rng.choice([1.0, 2.0])} for _ in range(500)]
+    probes += [dict(reg, x=reg['x'] + 3) for reg in registered[:50]]
+    probes += [{'component_type': 'other', 'x': -500, 'y': -500, 'db_component_id': 77},
+               {'component_type': 'other', 'x': -500, 'y': -500, '_element_id': 'elem_9'}]
+    for probe in probes:
+        assert membership.contains_component(probe) == _linear_component_in_paths(probe, registered)
+
+    seg = {'start_x': 10, 'start_y': 10, 'end_x': 300, 'end_y': 20, 'saved_zoom': 2.0}
+    membership = PathMembershipIndex(segments=[seg])
+    assert membership.contains_segment({'start_x': 7, 'start_y': 6, 'end_x': 152, 'end_y': 12})
+    assert not membership.contains_segment({'start_x': 7, 'start_y': 6, 'end_x': 160, 'end_y': 12})
+
+
+def test_path_only_paint_uses_cached_membership(qapp):
+    from drawing.drawing_overlay import DrawingOverlay
+
+    overlay = DrawingOverlay()
+    components, segments = _dense_elements(1500)
+    overlay.components = components
+    overlay.segments = segments
+    for path_id in range(60):
+        overlay.path_element_mapping[path_id] = {
+            'components': components[path_id * 20:(path_id + 1) * 20],
+            'segments': segments[path_id * 20:(path_id + 1) * 20],
+        }
+    overlay.path_only_mode = True
+    overlay.set_visible_paths(range(0, 60, 2))
+
+    start = time.perf_counter()
+    visible = [c for c in components if overlay._is_component_in_visible_path(c)]
+    elapsed = time.perf_counter() - start
+    print(f"\nPath-only visibility for 1500 components against 30 visible paths: {elapsed*1000:.1f}ms")
+    assert components[0] in visible and components[20] not in visible
+    assert overlay._is_segment_in_visible_path(segments[45])
+
+    # Direct edits to visible_paths (as DrawingInterface does) are picked up
+    overlay.visible_paths[1] = True
+    assert overlay._is_component_in_visible_path(components[20])
+
+    # Moving a registered element's twin keeps coordinate matching current
+    twin = dict(components[0], _element_id=None, id=None)
+    twin['x'] += 100
+    assert not overlay._is_component_in_visible_path(twin)
+    components[0]['x'] += 100
+    overlay._index_element('component', components[0])
+    assert overlay._is_component_in_visible_path(twin)
+
+
+def test_overlay_static_layer_is_reused_for_dynamic_repaints(qapp, monkeypatch):
+    from PySide6.QtGui import QImage, QPainter
+    from drawing.drawing_overlay import DrawingOverlay
+
+    overlay = DrawingOverlay()
+    overlay.resize(6100, 4100)
+    components, segments = _dense_elements(1000)
+    for i, comp in enumerate(components):
+        comp['db_component_id'] = i + 1
+    overlay.components = components
+    overlay.segments = segments
+
+    recordings = []
+    original = DrawingOverlay.draw_components
+    monkeypatch.setattr(DrawingOverlay, 'draw_components',
+                        lambda self, painter: (recordings.append(1), original(self, painter)))
+
+    def render():
+        image = QImage(1200, 900, QImage.Format_ARGB32_Premultiplied)
+        image.fill(0)
+        painter = QPainter(image)
+        start = time.perf_counter()
+        painter.drawPicture(0, 0, overlay._get_static_layer())
+        overlay._draw_dynamic_layer(painter)
+        painter.end()
+        return image, time.perf_counter() - start
+
+    _, first = render()
+    # Highlighting and selecting from the analysis panel only touch the dynamic layer
+    target = next(c for c in components if 20 < c['x'] < 1180 and 20 < c['y'] < 880)
+    overlay.set_highlighted_element(target['id'], 'component')
+    # The component and segment sharing that id are repainted, not the 6100x4100 widget
+    region = overlay._dynamic_region.boundingRect()
+    assert not region.isEmpty()
+    assert region.width() < 700 and region.height() < 700
+    image, cached = render()
+    assert len(recordings) == 1
+    # Highlight outline (radius 12) drawn over the cached normal-style component
+    assert image.pixelColor(target['x'] + 11, target['y']).getRgb()[:3] == (33, 150, 243)
+    print(f"\nOverlay paint with 1000 components + 1000 segments: "
+          f"first {first*1000:.1f}ms, cached {cached*1000:.1f}ms")
+
+    overlay.clear_highlighted_element()
+    overlay._handle_select_press(QPoint(-500, -500))   # empty spot starts a rubber band
+    overlay._handle_select_move(QPoint(-400, -420))
+    overlay._refresh_dynamic_layer()
+    assert overlay._dynamic_region.boundingRect().contains(QRect(-500, -500, 100, 80))
+    render()
+    assert len(recordings) == 1
+
+    # Editing an element in place and calling update() re-records the static layer
+    components[0]['component_type'] = 'fan'
+    overlay.update()
+    render()
+    assert len(recordings) == 2
+
+
+def test_overlay_drag_keeps_static_layer_until_release(qapp, monkeypatch):
+    from PySide6.QtGui import QImage, QPainter
+    from drawing.drawing_overlay import DrawingOverlay
+
+    overlay = DrawingOverlay()
+    overlay.resize(2000, 2000)
+    components, segments = _dense_elements(200)
+    comp = {'type': 'component', '_element_id': 'drag', 'x': 100, 'y': 100, 'component_type': 'fan'}
+    seg = {'type': 'segment', 'start_x': 100, 'start_y': 100, 'end_x': 160, 'end_y': 100,
+           'from_component': comp, 'from_element_id': 'drag'}
+    overlay.components = components + [comp]
+    overlay.segments = segments + [seg]
+
+    recordings = []
+    original = DrawingOverlay.draw_components
+    monkeypatch.setattr(DrawingOverlay, 'draw_components',
+                        lambda self, painter: (recordings.append(1), original(self, painter)))
+
+    def render():
+        image = QImage(400, 400, QImage.Format_ARGB32_Premultiplied)
+        image.fill(0)
+        painter = QPainter(image)
+        painter.drawPicture(0, 0, overlay._get_static_layer())
+        overlay._draw_dynamic_layer(painter)
+        painter.end()
+        return image
+
+    render()
+    overlay._handle_select_press(QPoint(100, 100))
+    for x in range(110, 200, 10):
+        overlay._handle_select_move(QPoint(x, 100 + x // 2))
+        overlay._refresh_dynamic_layer()
+        image = render()
+    # Recorded once without the dragged elements, then replayed for every move
+    assert len(recordings) == 2
+    assert overlay._drag_components == [comp] and overlay._drag_segments == [seg]
+    region = overlay._dynamic_region.boundingRect()
+    assert region.contains(QPoint(190, 195)) and region.width() < 200 and region.height() < 200
+    assert image.pixelColor(196, 195).getRgb()[:3] == (255, 100, 100)
+    assert image.pixelColor(100, 100).getRgb()[:3] != (255, 100, 100)
+
+    overlay._handle_select_release(QPoint(190, 195))
+    assert overlay._drag_components == [] and overlay._drag_segments == []
+    image = render()
+    assert len(recordings) == 3
+    assert image.pixelColor(196, 195).getRgb()[:3] == (255, 100, 100)